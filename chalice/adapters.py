@@ -0,0 +1,155 @@
+"""Adapters for serving a chalice app with WSGI and ASGI servers.
+
+The adapters go through the same API Gateway emulation as
+``chalice local``, including route matching, CORS preflight requests
+and authorizers, which lets the same app run under servers such as
+gunicorn or uvicorn::
+
+    from chalice.adapters import WSGIAdapter, ASGIAdapter
+
+    wsgi_app = WSGIAdapter(app)
+    asgi_app = ASGIAdapter(app)
+
+"""
+from __future__ import annotations
+import asyncio
+from concurrent.futures import Executor
+from urllib.parse import quote
+from http.server import BaseHTTPRequestHandler
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Iterable  # noqa
+
+from chalice.app import Chalice  # noqa
+from chalice.config import Config
+from chalice.local import LocalGateway
+from chalice.local import handle_http_request, make_thread_safe
+
+
+HeaderList = List[Tuple[str, str]]
+AdapterResponse = Tuple[int, HeaderList, bytes]
+ASGIReceive = Callable[[], Any]
+ASGISend = Callable[[Dict[str, Any]], Any]
+
+
+class _GatewayAdapter(object):
+    def __init__(self, app_object: Chalice,
+                 config: Optional[Config] = None) -> None:
+        if config is None:
+            config = Config()
+        # Requests can be handled from multiple threads, so the current
+        # request needs to be thread local.
+        make_thread_safe(app_object)
+        self.app_object = app_object
+        self._gateway = LocalGateway(app_object, config)
+
+    def handle_request(self, method: str, path: str,
+                       headers: Dict[str, str],
+                       body: Optional[bytes]) -> AdapterResponse:
+        return handle_http_request(self._gateway, method, path, headers, body)
+
+
+class WSGIAdapter(_GatewayAdapter):
+    """Expose a chalice app as a WSGI application."""
+
+    def __call__(self, environ: Dict[str, Any],
+                 start_response: Callable[..., Any]) -> Iterable[bytes]:
+        # PATH_INFO is decoded, but route matching expects the path
+        # as it was sent by the client.  SCRIPT_NAME is left out so the
+        # app's routes match when it's mounted under a prefix.
+        path = quote(environ.get('PATH_INFO', '/').encode('latin-1'))
+        if environ.get('QUERY_STRING'):
+            path += '?' + environ['QUERY_STRING']
+        headers = self._get_headers(environ)
+        body = None
+        content_length = int(environ.get('CONTENT_LENGTH') or 0)
+        if content_length > 0:
+            body = environ['wsgi.input'].read(content_length)
+        status_code, header_list, response_body = self.handle_request(
+            environ['REQUEST_METHOD'], path, headers, body)
+        start_response(_status_line(status_code), header_list)
+        return [response_body]
+
+    def _get_headers(self, environ: Dict[str, Any]) -> Dict[str, str]:
+        headers = {}
+        for key, value in environ.items():
+            if key.startswith('HTTP_'):
+                headers[key[5:].replace('_', '-').lower()] = value
+        for key in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            if environ.get(key):
+                headers[key.replace('_', '-').lower()] = environ[key]
+        return headers
+
+
+class ASGIAdapter(_GatewayAdapter):
+    """Expose a chalice app as an ASGI application.
+
+    View functions are synchronous so they're run in ``executor``, or
+    the event loop's default executor if one isn't provided.
+    """
+
+    def __init__(self, app_object: Chalice,
+                 config: Optional[Config] = None,
+                 executor: Optional[Executor] = None) -> None:
+        super(ASGIAdapter, self).__init__(app_object, config)
+        self._executor = executor
+
+    async def __call__(self, scope: Dict[str, Any], receive: ASGIReceive,
+                       send: ASGISend) -> None:
+        if scope['type'] == 'lifespan':
+            await self._handle_lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError("Unsupported ASGI scope type: %s"
+                             % scope['type'])
+        body = b''
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get('body', b'')
+            more_body = message.get('more_body', False)
+        loop = asyncio.get_running_loop()
+        status_code, header_list, response_body = await loop.run_in_executor(
+            self._executor, self.handle_request, scope['method'],
+            self._get_path(scope), self._get_headers(scope), body or None)
+        await send({
+            'type': 'http.response.start',
+            'status': status_code,
+            'headers': [(k.encode('latin-1'), v.encode('latin-1'))
+                        for k, v in header_list],
+        })
+        await send({'type': 'http.response.body', 'body': response_body})
+
+    def _get_path(self, scope: Dict[str, Any]) -> str:
+        raw_path = scope.get('raw_path')
+        if raw_path:
+            path = raw_path.decode('latin-1')
+        else:
+            path = quote(scope['path'])
+        if scope.get('query_string'):
+            path += '?' + scope['query_string'].decode('latin-1')
+        return path
+
+    def _get_headers(self, scope: Dict[str, Any]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        for name, value in scope.get('headers', []):
+            key = name.decode('latin-1').lower()
+            if key in headers:
+                headers[key] += ', ' + value.decode('latin-1')
+            else:
+                headers[key] = value.decode('latin-1')
+        return headers
+
+    async def _handle_lifespan(self, receive: ASGIReceive,
+                               send: ASGISend) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def _status_line(status_code: int) -> str:
+    reason = BaseHTTPRequestHandler.responses.get(status_code, ('',))[0]
+    return '%s %s' % (status_code, reason)
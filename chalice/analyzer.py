@@ -1,3 +1,4 @@
+# pylint: disable=too-many-lines
 """Source code analyzer for chalice app.
 
 The main point of this module is to analyze your source code
@@ -40,7 +41,11 @@ from typing import Dict, Set, Any, Optional, List, Union, cast  # noqa
 
 
 APICallT = Dict[str, Set[str]]
+# service_name -> method_name -> [{param_name: [kind, value]}]
+CallArgumentsT = Dict[str, Dict[str, List[Dict[str, List[str]]]]]
+ImportedTypesT = Optional[Dict[str, Dict[str, Any]]]
 OptASTSet = Optional[Set[ast.AST]]
+OptStrSet = Optional[Set[str]]
 ComprehensionNode = Union[ast.DictComp, ast.GeneratorExp, ast.ListComp]
 
 
@@ -60,6 +65,17 @@ def get_client_calls(source_code):
     return api_calls
 
 
+def get_handler_imports(source_code):
+    # type: (str) -> HandlerImports
+    """Return the top level imports each handler in an app needs.
+
+    This is used to defer importing modules that a Lambda function's
+    handler never uses.  See :class:`HandlerImports`.
+
+    """
+    return HandlerImportCollector().collect(ast.parse(source_code))
+
+
 def get_client_calls_for_app(source_code):
     # type: (str) -> APICallT
     """Return client calls for a chalice app.
@@ -77,6 +93,181 @@ def get_client_calls_for_app(source_code):
     return api_calls
 
 
+def get_module_imports(source_code, module_name, is_package=False):
+    # type: (str, str, bool) -> List[str]
+    """Return the names of all the modules a module may import.
+
+    Relative imports are resolved against ``module_name``.  For
+    ``from a import b`` both ``a`` and ``a.b`` are returned because
+    ``b`` may be a submodule.
+
+    """
+    return _collect_imports(ast.parse(source_code), module_name, is_package)
+
+
+def get_module_attribute_writes(source_code, module_name, is_package=False):
+    # type: (str, str, bool) -> List[str]
+    """Return the attributes of other modules a module assigns to.
+
+    Each is returned as a dotted name, e.g. ``settings.BUCKET = 'b'``
+    after ``from chalicelib import settings`` returns
+    ``chalicelib.settings.BUCKET``.
+
+    """
+    tree = ast.parse(source_code)
+    bindings = _collect_import_bindings(tree, module_name, is_package)
+    writes = set()  # type: Set[str]
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, (ast.AugAssign, ast.AnnAssign)):
+            targets = [node.target]
+        elif isinstance(node, (ast.For, ast.AsyncFor)):
+            targets = [node.target]
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            targets = [item.optional_vars for item in node.items
+                       if item.optional_vars is not None]
+        else:
+            continue
+        for target in targets:
+            for child in ast.walk(target):
+                name = _get_attribute_write(child, bindings)
+                if name is not None:
+                    writes.add(name)
+    return sorted(writes)
+
+
+def _collect_import_bindings(tree, module_name, is_package):
+    # type: (ast.AST, str, bool) -> Dict[str, str]
+    # Map the names that imports bind to the module names they refer
+    # to.  Scoping is ignored, an import in any function is included.
+    bindings = {}  # type: Dict[str, str]
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname is not None:
+                    bindings[alias.asname] = alias.name
+                else:
+                    name = alias.name.split('.')[0]
+                    bindings[name] = name
+        elif isinstance(node, ast.ImportFrom):
+            base = _resolve_import_from(node, module_name, is_package)
+            if base is None:
+                continue
+            for alias in node.names:
+                if alias.name != '*':
+                    bindings[alias.asname or alias.name] = '%s.%s' % (
+                        base, alias.name)
+    return bindings
+
+
+def _get_attribute_write(node, bindings):
+    # type: (ast.AST, Dict[str, str]) -> Optional[str]
+    if not isinstance(node, ast.Attribute) or \
+            not isinstance(node.ctx, ast.Store):
+        return None
+    parts = [node.attr]
+    value = node.value
+    while isinstance(value, ast.Attribute):
+        parts.append(value.attr)
+        value = value.value
+    if not isinstance(value, ast.Name) or value.id not in bindings:
+        return None
+    parts.append(bindings[value.id])
+    return '.'.join(reversed(parts))
+
+
+def analyze_module(source_code,          # type: str
+                   module_name,          # type: str
+                   filename,             # type: str
+                   is_app=False,         # type: bool
+                   is_package=False,     # type: bool
+                   imported_types=None,  # type: ImportedTypesT
+                   unresolved_names=None,  # type: OptStrSet
+                   ):
+    # type: (...) -> ModuleAnalysis
+    """Analyze a single module of a chalice app.
+
+    For the app module only chalice views are assumed to be called, for
+    any other module every top level function is.  ``imported_types``
+    maps module names to the types those modules export (see
+    ``ModuleAnalysis.exports``) so a client created in one module can be
+    tracked in the modules that import it.  ``unresolved_names`` are
+    module level names that other modules assign to (see
+    ``get_module_attribute_writes``), so they aren't constants.
+
+    """
+    parsed = parse_code(source_code, filename)
+    if is_app:
+        t = AppViewTypeInfer(parsed, unresolved_names)
+    else:
+        t = LibraryTypeInfer(parsed, unresolved_names)
+    if imported_types:
+        seeded = _get_imported_names(cast(ast.Module, parsed.parsed_ast),
+                                     module_name, is_package, imported_types)
+        for name, inferred_type in seeded.items():
+            parsed.symbol_table.set_inferred_type(name, inferred_type)
+    binder = t.bind_types()
+    collector = APICallCollector(binder)
+    return ModuleAnalysis(
+        imports=_collect_imports(parsed.parsed_ast, module_name, is_package),
+        client_calls=collector.collect_api_calls(parsed.parsed_ast),
+        exports=t.exported_types(),
+        call_arguments=collector.call_arguments,
+    )
+
+
+def _collect_imports(tree, module_name, is_package):
+    # type: (ast.AST, str, bool) -> List[str]
+    imports = set()  # type: Set[str]
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = _resolve_import_from(node, module_name, is_package)
+            if base is None:
+                continue
+            imports.add(base)
+            imports.update('%s.%s' % (base, alias.name)
+                           for alias in node.names if alias.name != '*')
+    return sorted(imports)
+
+
+def _resolve_import_from(node, module_name, is_package):
+    # type: (ast.ImportFrom, str, bool) -> Optional[str]
+    if not node.level:
+        return node.module
+    if is_package:
+        package = module_name
+    else:
+        package = module_name.rpartition('.')[0]
+    parts = package.split('.') if package else []
+    if node.level - 1 > len(parts):
+        return None
+    parts = parts[:len(parts) - (node.level - 1)]
+    if node.module:
+        parts.append(node.module)
+    return '.'.join(parts) or None
+
+
+def _get_imported_names(tree,            # type: ast.Module
+                        module_name,     # type: str
+                        is_package,      # type: bool
+                        imported_types,  # type: Dict[str, Dict[str, Any]]
+                        ):
+    # type: (...) -> Dict[str, Any]
+    names = {}  # type: Dict[str, Any]
+    for node in tree.body:
+        if not isinstance(node, ast.ImportFrom):
+            continue
+        base = _resolve_import_from(node, module_name, is_package)
+        exports = imported_types.get(base or '', {})
+        for alias in node.names:
+            if alias.name in exports:
+                names[alias.asname or alias.name] = exports[alias.name]
+    return names
+
+
 def parse_code(source_code, filename='app.py'):
     # type: (str, str) -> ParsedCode
     parsed = ast.parse(source_code, filename)
@@ -188,9 +379,17 @@ class FunctionType(BaseType):
 
 
 class StringLiteral(object):
-    def __init__(self, value):
-        # type: (str) -> None
+    def __init__(self, value, ambiguous=False):
+        # type: (str, bool) -> None
         self.value = value
+        #: Whether the name this was assigned to may hold other values.
+        self.ambiguous = ambiguous
+
+
+class EnvironmentVariable(object):
+    def __init__(self, name):
+        # type: (str) -> None
+        self.name = name
 
 
 def get_string_literal_value(node):
@@ -200,6 +399,50 @@ def get_string_literal_value(node):
     return None
 
 
+def get_environment_variable_name(node):
+    # type: (ast.AST) -> Optional[str]
+    """Return the name of the environment variable a node reads.
+
+    This handles ``os.environ['NAME']``, ``os.environ.get('NAME')``
+    and ``os.getenv('NAME')``.
+
+    """
+    if isinstance(node, ast.Subscript) and _is_os_attribute(
+            node.value, 'environ'):
+        return get_string_literal_value(node.slice)
+    if isinstance(node, ast.Call) and node.args and \
+            isinstance(node.func, ast.Attribute):
+        func = node.func
+        if (func.attr == 'get' and _is_os_attribute(func.value, 'environ')) \
+                or _is_os_attribute(func, 'getenv'):
+            return get_string_literal_value(node.args[0])
+    return None
+
+
+def get_constant_value(inferred_type):
+    # type: (Any) -> Optional[List[str]]
+    if isinstance(inferred_type, StringLiteral):
+        if inferred_type.ambiguous:
+            return None
+        return ['string', inferred_type.value]
+    elif isinstance(inferred_type, EnvironmentVariable):
+        return ['env', inferred_type.name]
+    return None
+
+
+def _is_conflicting_constant(existing_type, new_type):
+    # type: (Any, Any) -> bool
+    existing = get_constant_value(existing_type)
+    new = get_constant_value(new_type)
+    return existing is not None and new is not None and existing != new
+
+
+def _is_os_attribute(node, attr):
+    # type: (ast.AST, str) -> bool
+    return isinstance(node, ast.Attribute) and node.attr == attr and \
+        isinstance(node.value, ast.Name) and node.value.id == 'os'
+
+
 class ParsedCode(object):
     def __init__(self, parsed_ast, symbol_table):
         # type: (ast.AST, ChainedSymbolTable) -> None
@@ -212,10 +455,14 @@ class APICallCollector(ast.NodeVisitor):
 
     This visitor assumes you've ran type inference on the AST.
     It will search through the AST and collect any API calls.
+    The keyword arguments of each call whose values are string
+    constants or environment variables are collected in
+    ``call_arguments``.
     """
     def __init__(self, binder):
         # type: (TypeBinder) -> None
         self.api_calls = {}  # type: APICallT
+        self.call_arguments = {}  # type: CallArgumentsT
         self._binder = binder
 
     def collect_api_calls(self, node):
@@ -229,8 +476,35 @@ class APICallCollector(ast.NodeVisitor):
         if isinstance(inferred_type, Boto3ClientMethodCallType):
             self.api_calls.setdefault(inferred_type.service_name, set()).add(
                 inferred_type.method_name)
+            if isinstance(node, ast.Call):
+                self._collect_call_arguments(inferred_type, node)
         ast.NodeVisitor.visit(self, node)
 
+    def _collect_call_arguments(self, inferred_type, node):
+        # type: (Boto3ClientMethodCallType, ast.Call) -> None
+        arguments = {}  # type: Dict[str, List[str]]
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                continue
+            value = self._get_constant_value(keyword.value)
+            if value is not None:
+                arguments[keyword.arg] = value
+        calls = self.call_arguments.setdefault(
+            inferred_type.service_name, {}).setdefault(
+                inferred_type.method_name, [])
+        if arguments not in calls:
+            calls.append(arguments)
+
+    def _get_constant_value(self, node):
+        # type: (ast.AST) -> Optional[List[str]]
+        string_value = get_string_literal_value(node)
+        if string_value is not None:
+            return ['string', string_value]
+        env_name = get_environment_variable_name(node)
+        if env_name is not None:
+            return ['env', env_name]
+        return get_constant_value(self._binder.get_type_for_node(node))
+
 
 class ChainedSymbolTable(object):
     def __init__(self, local_table, global_table):
@@ -342,8 +616,13 @@ class SymbolTableTypeInfer(ast.NodeVisitor):
     _SDK_PACKAGE = 'boto3'
     _CREATE_CLIENT = 'client'
 
-    def __init__(self, parsed_code, binder=None, visited=None):
-        # type: (ParsedCode, Optional[TypeBinder], OptASTSet) -> None
+    def __init__(self,
+                 parsed_code,            # type: ParsedCode
+                 binder=None,            # type: Optional[TypeBinder]
+                 visited=None,           # type: OptASTSet
+                 unresolved_names=None,  # type: OptStrSet
+                 ):
+        # type: (...) -> None
         self._symbol_table = parsed_code.symbol_table
         self._current_ast_namespace = parsed_code.parsed_ast
         self._node_inference = {}  # type: Dict[ast.AST, Any]
@@ -353,12 +632,33 @@ class SymbolTableTypeInfer(ast.NodeVisitor):
             visited = set()
         self._binder = binder
         self._visited = visited
+        # The constant assigned to each name in this scope, and the names
+        # that may hold a value other than a single known constant.
+        self._assigned_constants = {}  # type: Dict[str, Optional[List[str]]]
+        self._unresolved_names = set()  # type: Set[str]
+        if unresolved_names is not None:
+            self._unresolved_names.update(unresolved_names)
+        self._conditional_depth = 0
 
     def bind_types(self):
         # type: () -> TypeBinder
+        self._unresolved_names.update(
+            self._find_rebound_names(self._current_ast_namespace))
         self.visit(self._current_ast_namespace)
         return self._binder
 
+    def _find_rebound_names(self, namespace):
+        # type: (ast.AST) -> Set[str]
+        # A nested function that declares a name global or nonlocal can
+        # assign it whenever it's called, so the value isn't known here.
+        names = set()  # type: Set[str]
+        is_module = isinstance(namespace, ast.Module)
+        for node in ast.walk(namespace):
+            if isinstance(node, ast.Nonlocal) or (
+                    is_module and isinstance(node, ast.Global)):
+                names.update(node.names)
+        return names
+
     def known_types(self, scope_name=None):
         # type: (Optional[str]) -> Dict[str, Any]
         table = None
@@ -422,10 +722,100 @@ class SymbolTableTypeInfer(ast.NodeVisitor):
             if string_value is not None:
                 rhs_inferred_type = StringLiteral(string_value)
                 self._set_inferred_type_for_node(node.value, rhs_inferred_type)
+            env_name = get_environment_variable_name(node.value)
+            if env_name is not None:
+                rhs_inferred_type = EnvironmentVariable(env_name)
+                self._set_inferred_type_for_node(node.value, rhs_inferred_type)
         for t in node.targets:
             if isinstance(t, ast.Name):
-                self._symbol_table.set_inferred_type(t.id, rhs_inferred_type)
-                self._set_inferred_type_for_node(node, rhs_inferred_type)
+                inferred_type = rhs_inferred_type
+                if self._is_ambiguous_assignment(t.id, inferred_type):
+                    self._unresolved_names.add(t.id)
+                if t.id in self._unresolved_names:
+                    inferred_type = self._unresolved_type(inferred_type)
+                self._symbol_table.set_inferred_type(t.id, inferred_type)
+                self._set_inferred_type_for_node(node, inferred_type)
+            else:
+                self._unresolve_targets(t)
+
+    def _is_ambiguous_assignment(self, name, inferred_type):
+        # type: (str, Any) -> bool
+        # A constant is only used if it's the one value the name is ever
+        # assigned in this scope, outside of any branch or loop.
+        value = get_constant_value(inferred_type)
+        previous = self._assigned_constants.get(name, value)
+        self._assigned_constants[name] = value
+        if value is not None and self._conditional_depth:
+            return True
+        return previous != value or _is_conflicting_constant(
+            self._symbol_table.get_inferred_type(name), inferred_type)
+
+    def _unresolved_type(self, inferred_type):
+        # type: (Any) -> Any
+        # The name could hold other values, so it isn't a constant.  The
+        # last string is kept to infer the service of a client created
+        # with it, as this was done before constants were tracked.
+        if isinstance(inferred_type, StringLiteral):
+            return StringLiteral(inferred_type.value, ambiguous=True)
+        elif isinstance(inferred_type, EnvironmentVariable):
+            return None
+        return inferred_type
+
+    def _unresolve_targets(self, target):
+        # type: (ast.AST) -> None
+        for node in ast.walk(target):
+            if isinstance(node, ast.Name) and \
+                    isinstance(node.ctx, ast.Store):
+                self._unresolved_names.add(node.id)
+                self._symbol_table.set_inferred_type(
+                    node.id, self._unresolved_type(
+                        self._symbol_table.get_inferred_type(node.id)))
+
+    def _visit_conditional(self, node):
+        # type: (ast.AST) -> None
+        self._conditional_depth += 1
+        self.generic_visit(node)
+        self._conditional_depth -= 1
+
+    def visit_If(self, node):
+        # type: (ast.If) -> None
+        self._visit_conditional(node)
+
+    def visit_While(self, node):
+        # type: (ast.While) -> None
+        self._visit_conditional(node)
+
+    def visit_Try(self, node):
+        # type: (ast.Try) -> None
+        self._visit_conditional(node)
+
+    def visit_Match(self, node):
+        # type: (ast.AST) -> None
+        self._visit_conditional(node)
+
+    def visit_For(self, node):
+        # type: (ast.For) -> None
+        self._unresolve_targets(node.target)
+        self._visit_conditional(node)
+
+    def visit_AsyncFor(self, node):
+        # type: (ast.AsyncFor) -> None
+        self._unresolve_targets(node.target)
+        self._visit_conditional(node)
+
+    def visit_With(self, node):
+        # type: (ast.With) -> None
+        for item in node.items:
+            if item.optional_vars is not None:
+                self._unresolve_targets(item.optional_vars)
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node):
+        # type: (ast.AugAssign) -> None
+        self.generic_visit(node)
+        if isinstance(node.target, ast.Name):
+            self._unresolved_names.add(node.target.id)
+            self._symbol_table.set_inferred_type(node.target.id, None)
 
     def visit_Attribute(self, node):
         # type: (ast.Attribute) -> None
@@ -679,13 +1069,13 @@ class AppViewTypeInfer(ast.NodeVisitor):
         'on_ws_disconnect',
     ]
 
-    def __init__(self, parsed_code):
-        # type: (ParsedCode) -> None
+    def __init__(self, parsed_code, unresolved_names=None):
+        # type: (ParsedCode, OptStrSet) -> None
         self._binder = TypeBinder()
         self._visited = set()  # type: Set[ast.AST]
         self._parsed_code = parsed_code
         self._type_infer = SymbolTableTypeInfer(
-            self._parsed_code, self._binder, self._visited)
+            self._parsed_code, self._binder, self._visited, unresolved_names)
 
     def bind_types(self):
         # type: () -> TypeBinder
@@ -702,6 +1092,26 @@ class AppViewTypeInfer(ast.NodeVisitor):
                 ParsedCode(node, sub_table), self._binder, self._visited)
             child_infer.bind_types()
 
+    def exported_types(self):
+        # type: () -> Dict[str, Any]
+        """Return the types other modules can import.
+
+        This is any module level client or string constant, or function
+        that returns a client.
+
+        """
+        exported = {}  # type: Dict[str, Any]
+        for name, inferred_type in self._type_infer.known_types().items():
+            if _is_exported_type(inferred_type):
+                exported[name] = inferred_type
+        module = self._parsed_code.parsed_ast
+        for node in getattr(module, 'body', []):
+            if isinstance(node, ast.FunctionDef):
+                inferred_type = self._binder.get_type_for_node(node)
+                if _is_exported_type(inferred_type):
+                    exported[node.name] = inferred_type
+        return exported
+
     def _is_chalice_view(self, node):
         # type: (ast.FunctionDef) -> bool
         # We can certainly improve on this, but this check is more
@@ -717,3 +1127,142 @@ class AppViewTypeInfer(ast.NodeVisitor):
                 if decorator.func.attr in self._CHALICE_DECORATORS:
                     return True
         return False
+
+
+class LibraryTypeInfer(AppViewTypeInfer):
+    """Infer types for a module that's imported by an app.
+
+    Any top level function in the module may be called by the app, so
+    all of them are analyzed rather than only chalice views.
+
+    """
+
+    def _is_chalice_view(self, node):
+        # type: (ast.FunctionDef) -> bool
+        return True
+
+
+def _is_exported_type(inferred_type):
+    # type: (Any) -> bool
+    if isinstance(inferred_type, FunctionType):
+        return isinstance(inferred_type.return_type, Boto3ClientType)
+    return isinstance(inferred_type, (Boto3ClientType, StringLiteral,
+                                      EnvironmentVariable))
+
+
+class ModuleAnalysis(object):
+    def __init__(self, imports, client_calls, exports, call_arguments):
+        # type: (List[str], APICallT, Dict[str, Any], CallArgumentsT) -> None
+        #: The names of the modules this module may import.
+        self.imports = imports
+        #: The client calls made in the module.
+        self.client_calls = client_calls
+        #: The clients, client factories and constants defined by the
+        #: module.
+        self.exports = exports
+        #: The constant keyword arguments passed to each client call.
+        self.call_arguments = call_arguments
+
+
+class HandlerImports(object):
+    """The top level ``import x`` statements of an app and their users.
+
+    Modules that are used by code that runs at import time, by
+    middleware, or by the handler itself are needed when the app is
+    imported.  Any other module that's imported with ``import x`` is
+    only used by other handlers and can be deferred until first use.
+
+    Modules that are imported but never referenced are assumed to be
+    imported for their side effects and are never deferred.
+
+    """
+
+    def __init__(self,
+                 imports,         # type: Dict[str, str]
+                 eager_modules,   # type: Set[str]
+                 module_names,    # type: Set[str]
+                 function_names,  # type: Dict[str, Set[str]]
+                 shared_functions,  # type: Set[str]
+                 ):
+        # type: (...) -> None
+        self._imports = imports
+        self._eager_modules = eager_modules
+        self._module_names = module_names
+        self._function_names = function_names
+        self._shared_functions = shared_functions
+
+    def lazy_imports(self, handler_name):
+        # type: (str) -> List[str]
+        needed = set(self._module_names)
+        pending = [handler_name] + sorted(
+            self._shared_functions | (needed & set(self._function_names)))
+        visited = set()  # type: Set[str]
+        while pending:
+            name = pending.pop()
+            if name in visited or name not in self._function_names:
+                continue
+            visited.add(name)
+            names = self._function_names[name]
+            needed.update(names)
+            pending.extend(names & set(self._function_names))
+        referenced = set(self._module_names)
+        for names in self._function_names.values():
+            referenced.update(names)
+        lazy = set()  # type: Set[str]
+        eager = set(self._eager_modules)
+        for binding, module_name in self._imports.items():
+            if binding in needed or binding not in referenced:
+                eager.add(module_name)
+            else:
+                lazy.add(module_name)
+        return sorted(lazy - eager)
+
+
+class HandlerImportCollector(object):
+    _SHARED_DECORATORS = ['middleware']
+
+    def collect(self, module):
+        # type: (ast.Module) -> HandlerImports
+        imports = {}  # type: Dict[str, str]
+        eager_modules = set()  # type: Set[str]
+        module_names = set()  # type: Set[str]
+        function_names = {}  # type: Dict[str, Set[str]]
+        shared_functions = set()  # type: Set[str]
+        for node in module.body:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if '.' in alias.name:
+                        # Importing a submodule imports its parents.
+                        eager_modules.add(alias.name.split('.')[0])
+                    else:
+                        imports[alias.asname or alias.name] = alias.name
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                # Decorators and default values are evaluated when
+                # the module is imported, the body is not.
+                module_names.update(self._names(
+                    node.decorator_list + node.args.defaults +
+                    [d for d in node.args.kw_defaults if d is not None]))
+                function_names[node.name] = self._names(node.body)
+                if self._is_shared(node):
+                    shared_functions.add(node.name)
+            else:
+                module_names.update(self._names([node]))
+        return HandlerImports(imports, eager_modules, module_names,
+                              function_names, shared_functions)
+
+    def _names(self, nodes):
+        # type: (List[Any]) -> Set[str]
+        return set(
+            child.id for node in nodes for child in ast.walk(node)
+            if isinstance(child, ast.Name)
+        )
+
+    def _is_shared(self, node):
+        # type: (Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> bool
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Call):
+                decorator = decorator.func
+            if isinstance(decorator, ast.Attribute) and \
+                    decorator.attr in self._SHARED_DECORATORS:
+                return True
+        return False
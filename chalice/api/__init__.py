@@ -6,7 +6,13 @@ to mature so for the time being this is an internal-only API.
 """
 import os
 from typing import Optional, Dict, Any
+from botocore.session import Session
+from chalice.awsclient import TypedAWSClient
 from chalice.cli.factory import CLIFactory
+from chalice.deploy.appgraph import ApplicationGraphBuilder, DependencyBuilder
+from chalice.deploy.deployer import create_build_stage
+from chalice.deploy.swagger import TemplatedSwaggerGenerator
+from chalice.utils import OSUtils, UI
 
 
 def package_app(project_dir: str,
@@ -25,3 +31,44 @@ def package_app(project_dir: str,
                                            package_format=package_format,
                                            template_format=template_format)
     packager.package_app(config, output_dir, stage)
+
+
+def build_app(project_dir: str,
+              stage: str,
+              chalice_config: Optional[Dict[str, Any]] = None,
+              ui: Optional[UI] = None) -> None:
+    """Build an app's deployment packages without deploying it.
+
+    The packages are saved in the project's ``.chalice/deployments``
+    directory, where they're reused by the next deploy of the app.
+
+    """
+    factory = CLIFactory(project_dir, environ=os.environ)
+    config = factory.create_config_obj(
+        stage, user_provided_params=dict(chalice_config or {}))
+    if ui is None:
+        ui = UI()
+    application = ApplicationGraphBuilder().build(config, stage)
+    resources = DependencyBuilder().build_dependencies(application)
+    build_stage = create_build_stage(
+        OSUtils(), ui, TemplatedSwaggerGenerator(), config)
+    build_stage.execute(config, resources)
+
+
+def deploy_app(project_dir: str,
+               stage: str,
+               chalice_config: Optional[Dict[str, Any]] = None,
+               profile: Optional[str] = None,
+               session: Optional[Session] = None,
+               client: Optional[TypedAWSClient] = None,
+               ui: Optional[UI] = None) -> Dict[str, Any]:
+    factory = CLIFactory(project_dir, profile=profile, environ=os.environ)
+    config = factory.create_config_obj(
+        stage, user_provided_params=dict(chalice_config or {}))
+    if session is None:
+        session = factory.create_botocore_session(config=config)
+    if ui is None:
+        ui = UI()
+    d = factory.create_default_deployer(session=session, config=config,
+                                        ui=ui, client=client)
+    return d.deploy(config, chalice_stage_name=stage)
@@ -1468,9 +1468,10 @@ class AuthResponse(object):
 
     def _generate_allowed_resources(self, request: AuthRequest) -> List[str]:
         allowed_resources = []
+        seen = set()
         for route in self.routes:
             if isinstance(route, AuthRoute):
-                methods = route.methods
+                methods = self._collapse_methods(route.methods)
                 path = route.path
             elif route == '*':
                 # A string route of '*' means that all paths and
@@ -1483,11 +1484,26 @@ class AuthResponse(object):
                 # generate a policy that allows all HTTP methods.
                 methods = ['*']
                 path = route
+            if path == '*' and methods == ['*']:
+                # Every other resource is redundant, so we can keep
+                # the policy as small as possible.
+                return [self._generate_arn(path, request, '*')]
             for method in methods:
-                allowed_resources.append(
-                    self._generate_arn(path, request, method))
+                arn = self._generate_arn(path, request, method)
+                if arn not in seen:
+                    seen.add(arn)
+                    allowed_resources.append(arn)
         return allowed_resources
 
+    def _collapse_methods(self, methods: List[str]) -> List[str]:
+        # A single wildcard resource is used instead of one resource
+        # per method when a route allows every HTTP method.
+        upper_methods = set(method.upper() for method in methods)
+        if '*' in upper_methods or \
+                upper_methods.issuperset(self.ALL_HTTP_METHODS):
+            return ['*']
+        return methods
+
     def _generate_arn(
             self,
             route: str,
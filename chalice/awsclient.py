@@ -18,7 +18,10 @@ from __future__ import annotations
 # pylint: disable=too-many-lines
 import os
 import time
+import asyncio
+import functools
 import tempfile
+import threading
 from datetime import datetime
 import zipfile
 import shutil
@@ -26,8 +29,11 @@ import json
 import re
 import uuid
 from collections import OrderedDict
+from concurrent.futures import Executor
 from typing import (
     Any,
+    AsyncIterator,
+    Awaitable,
     Optional,
     Dict,
     Callable,
@@ -150,6 +156,10 @@ class TypedAWSClient(object):
         self._session = session
         self._sleep = sleep
         self._client_cache: Dict[str, Any] = {}
+        # Clients may be requested from several threads, e.g. by
+        # chalice delete and chalice logs, and botocore doesn't make
+        # creating clients from one session thread safe.
+        self._client_lock = threading.Lock()
         loader = create_loader('data_loader')
         endpoints = loader.load_data('endpoints')
         self._endpoint_resolver = EndpointResolver(endpoints)
@@ -1455,9 +1465,10 @@ class TypedAWSClient(object):
         log_group_name: str,
         start_time: Optional[datetime] = None,
         next_token: Optional[str] = None,
+        log_stream_names: OptStrList = None,
     ) -> LogEventsResponse:
         logs = self._client('logs')
-        kwargs = {
+        kwargs: Dict[str, Any] = {
             'logGroupName': log_group_name,
             'interleaved': True,
         }
@@ -1465,6 +1476,8 @@ class TypedAWSClient(object):
             kwargs['startTime'] = int(datetime2timestamp(start_time) * 1000)
         if next_token is not None:
             kwargs['nextToken'] = next_token
+        if log_stream_names is not None:
+            kwargs['logStreamNames'] = log_stream_names
         try:
             response = logs.filter_log_events(**kwargs)
         except logs.exceptions.ResourceNotFoundException:
@@ -1477,15 +1490,51 @@ class TypedAWSClient(object):
         self._convert_types_on_response(response)
         return response
 
+    def get_log_stream_names(
+        self, log_group_name: str, start_time: Optional[datetime] = None
+    ) -> List[str]:
+        """Return the log streams that may have events after start_time.
+
+        A log stream's ``lastEventTimestamp`` is only eventually
+        consistent, so the last ingestion time is used to exclude
+        streams that can't have any events after ``start_time``.
+
+        """
+        logs = self._client('logs')
+        paginator = logs.get_paginator('describe_log_streams')
+        min_ingestion_time = None
+        if start_time is not None:
+            min_ingestion_time = int(datetime2timestamp(start_time) * 1000)
+        stream_names = []
+        try:
+            for page in paginator.paginate(logGroupName=log_group_name):
+                for stream in page['logStreams']:
+                    last_ingestion_time = stream.get('lastIngestionTime')
+                    if (
+                        min_ingestion_time is not None
+                        and last_ingestion_time is not None
+                        and last_ingestion_time < min_ingestion_time
+                    ):
+                        continue
+                    stream_names.append(stream['logStreamName'])
+        except logs.exceptions.ResourceNotFoundException:
+            # Same as iter_log_events(), a log group won't exist
+            # until the function has been invoked.
+            pass
+        return stream_names
+
     def _convert_types_on_response(self, response: Dict[str, Any]) -> None:
         response['events'] = list(self._iter_log_messages([response]))
 
     def _client(self, service_name: str) -> Any:
-        if service_name not in self._client_cache:
-            self._client_cache[service_name] = self._session.create_client(
-                service_name
-            )
-        return self._client_cache[service_name]
+        client = self._client_cache.get(service_name)
+        if client is None:
+            with self._client_lock:
+                client = self._client_cache.get(service_name)
+                if client is None:
+                    client = self._session.create_client(service_name)
+                    self._client_cache[service_name] = client
+        return client
 
     def add_permission_for_authorizer(
         self,
@@ -2084,3 +2133,210 @@ class TypedAWSClient(object):
 
     def _random_id(self) -> str:
         return str(uuid.uuid4())
+
+
+_FunctionWait = Tuple[str, str]
+
+
+class _NonBlockingWaitAWSClient(TypedAWSClient):
+    # The function state waiters are the only places where TypedAWSClient
+    # blocks for an unbounded amount of time.  Instead of waiting, the
+    # waits a call needs are recorded so AsyncTypedAWSClient can poll for
+    # the function state on the event loop.  Calls run in executor
+    # threads, so the waits are recorded per thread.
+    def __init__(
+        self,
+        session: botocore.session.Session,
+        sleep: Callable[[int], None] = time.sleep,
+    ) -> None:
+        super().__init__(session, sleep)
+        self._pending = threading.local()
+
+    def _wait_for_active(self, function_name: str) -> None:
+        self._pending.waits.append(('active', function_name))
+
+    def _wait_for_function_update(self, function_name: str) -> None:
+        self._pending.waits.append(('updated', function_name))
+
+    def _call_without_waiting(
+        self, method: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Tuple[Any, List[_FunctionWait]]:
+        self._pending.waits = []
+        try:
+            return method(*args, **kwargs), self._pending.waits
+        finally:
+            del self._pending.waits
+
+
+class AsyncTypedAWSClient(object):
+    """Awaitable variant of TypedAWSClient.
+
+    Every public method of ``TypedAWSClient`` is available as a coroutine
+    function with the same signature.  The underlying botocore calls are
+    run in ``executor`` (the event loop's default executor if not
+    provided), but waiting for a Lambda function to become active or to
+    finish updating is done by polling on the event loop, so in-flight
+    waits do not occupy a thread.
+
+    """
+
+    # This class calls the private, non-waiting steps of its own
+    # _NonBlockingWaitAWSClient.
+    # pylint: disable=protected-access
+
+    # Mirrors the botocore ``function_active`` and ``function_updated``
+    # waiter configuration.
+    POLL_DELAY = 5
+    MAX_POLL_ATTEMPTS = 60
+
+    def __init__(
+        self,
+        session: botocore.session.Session,
+        executor: Optional[Executor] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._client = _NonBlockingWaitAWSClient(session)
+        self._executor = executor
+        self._sleep = sleep
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        async def _call(*args: Any, **kwargs: Any) -> Any:
+            return await self._run_and_wait(attr, *args, **kwargs)
+
+        return _call
+
+    async def _run(
+        self, method: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(method, *args, **kwargs)
+        )
+
+    async def _run_and_wait(
+        self, method: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        # Run a TypedAWSClient method and then poll for any function
+        # state it would have waited for.
+        result, waits = await self._run(
+            self._client._call_without_waiting, method, *args, **kwargs
+        )
+        for wait_type, function_name in waits:
+            if wait_type == 'active':
+                await self.wait_for_function_active(function_name)
+            else:
+                await self.wait_for_function_updated(function_name)
+        return result
+
+    async def update_function(
+        self,
+        function_name: str,
+        zip_contents: str,
+        environment_variables: Optional[StrMap] = None,
+        runtime: OptStr = None,
+        tags: Optional[StrMap] = None,
+        xray: Optional[bool] = None,
+        timeout: OptInt = None,
+        memory_size: OptInt = None,
+        role_arn: OptStr = None,
+        subnet_ids: OptStrList = None,
+        security_group_ids: OptStrList = None,
+        layers: OptStrList = None,
+    ) -> Dict[str, Any]:
+        # This follows the same sequence of calls as
+        # TypedAWSClient.update_function, waiting for the code update
+        # to complete before updating the function configuration.
+        return_value = await self._run_and_wait(
+            self._client._update_function_code,
+            function_name=function_name,
+            zip_contents=zip_contents,
+        )
+        await self._run_and_wait(
+            self._client._update_function_config,
+            environment_variables=environment_variables,
+            runtime=runtime,
+            timeout=timeout,
+            memory_size=memory_size,
+            role_arn=role_arn,
+            xray=xray,
+            subnet_ids=subnet_ids,
+            security_group_ids=security_group_ids,
+            function_name=function_name,
+            layers=layers,
+        )
+        if tags is not None:
+            await self._run(
+                self._client._update_function_tags,
+                return_value['FunctionArn'],
+                tags,
+            )
+        return return_value
+
+    async def wait_for_function_active(self, function_name: str) -> None:
+        await self._poll_function_state(
+            'FunctionActive',
+            function_name,
+            key='State',
+            success='Active',
+            failure='Failed',
+        )
+
+    async def wait_for_function_updated(self, function_name: str) -> None:
+        await self._poll_function_state(
+            'FunctionUpdated',
+            function_name,
+            key='LastUpdateStatus',
+            success='Successful',
+            failure='Failed',
+        )
+
+    async def _poll_function_state(
+        self,
+        waiter_name: str,
+        function_name: str,
+        key: str,
+        success: str,
+        failure: str,
+    ) -> None:
+        for _ in range(self.MAX_POLL_ATTEMPTS):
+            response = await self._run(
+                self._client.get_function_configuration, function_name
+            )
+            status = response.get(key)
+            if status == success:
+                return
+            if status == failure:
+                raise botocore.exceptions.WaiterError(
+                    name=waiter_name,
+                    reason='Waiter encountered a terminal failure state',
+                    last_response=response,
+                )
+            await self._sleep(self.POLL_DELAY)
+        raise botocore.exceptions.WaiterError(
+            name=waiter_name,
+            reason='Max attempts exceeded',
+            last_response=response,
+        )
+
+    async def iter_log_events(
+        self,
+        log_group_name: str,
+        start_time: Optional[datetime] = None,
+    ) -> AsyncIterator[CWLogEvent]:
+        next_token = None
+        while True:
+            response = await self._run(
+                self._client.filter_log_events,
+                log_group_name=log_group_name,
+                start_time=start_time,
+                next_token=next_token,
+            )
+            for event in response['events']:
+                yield event
+            next_token = response.get('nextToken')
+            if next_token is None:
+                return
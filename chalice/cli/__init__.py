@@ -16,7 +16,7 @@ import json
 
 import botocore.exceptions
 import click
-from typing import Dict, Any, Optional, cast  # noqa
+from typing import Dict, Any, Optional, List, Sequence, Union, cast  # noqa
 
 from chalice import __version__ as chalice_version
 from chalice.app import Chalice  # noqa
@@ -26,18 +26,22 @@ from chalice.cli.factory import CLIFactory
 from chalice.cli.factory import NoSuchFunctionError
 from chalice.config import Config  # noqa
 from chalice.logs import display_logs, LogRetrieveOptions
+from chalice.logs import LogRetriever, MultiLogRetriever  # noqa
 from chalice.utils import create_zip_file
 from chalice.deploy.validate import validate_routes, validate_python_version
 from chalice.deploy.validate import ExperimentalFeatureError
 from chalice.utils import UI, serialize_to_json
+from chalice.utils import OSUtils
 from chalice.constants import DEFAULT_STAGE_NAME
 from chalice.local import LocalDevServer  # noqa
+from chalice.local import SERVER_BACKENDS
 from chalice.constants import DEFAULT_HANDLER_NAME
 from chalice.invoke import UnhandledLambdaError
 from chalice.deploy.swagger import TemplatedSwaggerGenerator
 from chalice.deploy.planner import PlanEncoder
 from chalice.deploy.appgraph import ApplicationGraphBuilder, GraphPrettyPrint
 from chalice.cli import newproj
+from chalice.coldstart import ColdStartProfileError, format_report
 
 
 def _configure_logging(level, format_string=None):
@@ -107,16 +111,49 @@ def _configure_cli_env_vars():
 @click.option('--autoreload/--no-autoreload',
               default=True,
               help='Automatically restart server when code changes.')
+@click.option('--server-backend', default='threaded',
+              type=click.Choice(SERVER_BACKENDS),
+              help=('The server implementation to use.  "threaded" uses '
+                    'a thread per connection, "threadpool" uses a bounded '
+                    'pool of threads, and "asyncio" handles connections '
+                    'on an event loop.'))
+@click.option('--threads', type=click.IntRange(min=1),
+              help=('Maximum number of threads used to handle requests '
+                    'with the "threadpool" and "asyncio" backends.'))
+@click.option('--workers', default=1, type=click.IntRange(min=1),
+              help=('Number of processes that share the listening socket. '
+                    'Only supported on platforms with fork().'))
+@click.option('--reload-ignore', multiple=True,
+              help=('A glob pattern of files or directories that should '
+                    'not trigger a reload, e.g. "vendor" or "*.log".  '
+                    'Can be specified multiple times.'))
+@click.option('--hot-reload/--no-hot-reload', default=False,
+              help=('Reload changed modules in the running server instead '
+                    'of restarting it when possible.  Requires '
+                    '--autoreload.'))
 @click.pass_context
-def local(ctx, host='127.0.0.1', port=8000, stage=DEFAULT_STAGE_NAME,
-          autoreload=True):
-    # type: (click.Context, str, int, str, bool) -> None
+def local(ctx,  # type: click.Context
+          host='127.0.0.1',  # type: str
+          port=8000,  # type: int
+          stage=DEFAULT_STAGE_NAME,  # type: str
+          autoreload=True,  # type: bool
+          server_backend='threaded',  # type: str
+          threads=None,  # type: Optional[int]
+          workers=1,  # type: int
+          reload_ignore=(),  # type: Sequence[str]
+          hot_reload=False,  # type: bool
+          ):
+    # type: (...) -> None
     factory = ctx.obj['factory']  # type: CLIFactory
     from chalice.cli import reloader
+    if workers > 1 and not hasattr(os, 'fork'):
+        raise click.UsageError(
+            "--workers is not supported on this platform.")
     # We don't create the server here because that will bind the
     # socket and we only want to do this in the worker process.
     server_factory = functools.partial(
-        create_local_server, factory, host, port, stage)
+        create_local_server, factory, host, port, stage,
+        backend=server_backend, max_threads=threads, workers=workers)
     # When running `chalice local`, a stdout logger is configured
     # so you'll see the same stdout logging as you would when
     # running in lambda.  This is configuring the root logger.
@@ -128,16 +165,25 @@ def local(ctx, host='127.0.0.1', port=8000, stage=DEFAULT_STAGE_NAME,
         project_dir = factory.create_config_obj(
             chalice_stage_name=stage).project_dir
         rc = reloader.run_with_reloader(
-            server_factory, os.environ, project_dir)
+            server_factory, os.environ, project_dir,
+            ignore_patterns=list(reload_ignore), hot_reload=hot_reload)
         # Click doesn't sys.exit() with the RC this function.  The
         # recommended way to do this is to use sys.exit() directly,
         # see: https://github.com/pallets/click/issues/747
         sys.exit(rc)
-    run_local_server(factory, host, port, stage)
-
-
-def create_local_server(factory, host, port, stage):
-    # type: (CLIFactory, str, int, str) -> LocalDevServer
+    run_local_server(factory, host, port, stage, backend=server_backend,
+                     max_threads=threads, workers=workers)
+
+
+def create_local_server(factory,  # type: CLIFactory
+                        host,  # type: str
+                        port,  # type: int
+                        stage,  # type: str
+                        backend='threaded',  # type: str
+                        max_threads=None,  # type: Optional[int]
+                        workers=1,  # type: int
+                        ):
+    # type: (...) -> LocalDevServer
     config = factory.create_config_obj(
         chalice_stage_name=stage
     )
@@ -146,13 +192,16 @@ def create_local_server(factory, host, port, stage):
     # there is no point in testing locally.
     routes = config.chalice_app.routes
     validate_routes(routes)
-    server = factory.create_local_server(app_obj, config, host, port)
+    server = factory.create_local_server(
+        app_obj, config, host, port, backend=backend,
+        max_threads=max_threads, workers=workers)
     return server
 
 
-def run_local_server(factory, host, port, stage):
-    # type: (CLIFactory, str, int, str) -> None
-    server = create_local_server(factory, host, port, stage)
+def run_local_server(factory, host, port, stage, **server_options):
+    # type: (CLIFactory, str, int, str, Any) -> None
+    server = create_local_server(factory, host, port, stage,
+                                 **server_options)
     server.serve_forever()
 
 
@@ -182,7 +231,7 @@ def deploy(ctx, autogen_policy, profile, api_gateway_stage, stage,
         api_gateway_stage=api_gateway_stage,
     )
     session = factory.create_botocore_session(
-        connection_timeout=connection_timeout)
+        connection_timeout=connection_timeout, config=config)
     ui = UI()
     d = factory.create_default_deployer(session=session,
                                         config=config,
@@ -238,7 +287,7 @@ def plan(ctx, autogen_policy, profile, api_gateway_stage, stage):
         chalice_stage_name=stage, autogen_policy=autogen_policy,
         api_gateway_stage=api_gateway_stage,
     )
-    session = factory.create_botocore_session()
+    session = factory.create_botocore_session(config=config)
     ui = UI()
     d = factory.create_plan_only_deployer(
         session=session, config=config, ui=ui)
@@ -325,14 +374,19 @@ def invoke(ctx, name, profile, stage):
 @click.option('--profile', help='Override profile at deploy time.')
 @click.option('--stage', default=DEFAULT_STAGE_NAME,
               help='Name of the Chalice stage to delete.')
+@click.option('--max-workers', default=1, type=click.IntRange(min=1),
+              help=('Maximum number of resources to delete concurrently. '
+                    'Resources are still deleted after any resources '
+                    'that depend on them.'))
 @click.pass_context
-def delete(ctx, profile, stage):
-    # type: (click.Context, str, str) -> None
+def delete(ctx, profile, stage, max_workers):
+    # type: (click.Context, str, str, int) -> None
     factory = ctx.obj['factory']  # type: CLIFactory
     factory.profile = profile
     config = factory.create_config_obj(chalice_stage_name=stage)
-    session = factory.create_botocore_session()
-    d = factory.create_deletion_deployer(session=session, ui=UI())
+    session = factory.create_botocore_session(config=config)
+    d = factory.create_deletion_deployer(session=session, ui=UI(),
+                                         max_workers=max_workers)
     d.deploy(config, chalice_stage_name=stage)
 
 
@@ -344,9 +398,12 @@ def delete(ctx, profile, stage):
               help='Controls whether or not lambda log messages are included.')
 @click.option('--stage', default=DEFAULT_STAGE_NAME,
               help='Name of the Chalice stage to get logs for.')
-@click.option('-n', '--name',
-              help='The name of the lambda function to retrieve logs from.',
-              default=DEFAULT_HANDLER_NAME)
+@click.option('-n', '--name', multiple=True,
+              help=('The name of the lambda function to retrieve logs from.  '
+                    'This option can be specified multiple times to '
+                    'retrieve the logs of several functions as a single '
+                    'interleaved stream.'),
+              default=[DEFAULT_HANDLER_NAME])
 @click.option('-s', '--since',
               help=('Only display logs since the provided time.  If the '
                     '-f/--follow option is specified, then this value will '
@@ -365,20 +422,38 @@ def delete(ctx, profile, stage):
                     'is a best effort attempt, and in certain cases can '
                     'miss log messages.  This option is intended for '
                     'interactive usage only.'))
+@click.option('--parallel/--no-parallel',
+              default=False,
+              help=('Discover the log streams with events since the '
+                    '-s/--since time and fetch them concurrently.  '
+                    'Requires -s/--since.  This option has no effect '
+                    'when -f/--follow is specified.'))
 @click.option('--profile', help='The profile to use for fetching logs.')
 @click.pass_context
-def logs(ctx, num_entries, include_lambda_messages, stage,
-         name, since, follow, profile):
-    # type: (click.Context, int, bool, str, str, str, bool, str) -> None
+def logs(ctx,                      # type: click.Context
+         num_entries,              # type: int
+         include_lambda_messages,  # type: bool
+         stage,                    # type: str
+         name,                     # type: Sequence[str]
+         since,                    # type: str
+         follow,                   # type: bool
+         parallel,                 # type: bool
+         profile,                  # type: str
+         ):
+    # type: (...) -> None
     factory = ctx.obj['factory']  # type: CLIFactory
+    if parallel and not follow and since is None:
+        # Without a start time every stream the log group has ever had
+        # would be fetched before any event could be displayed.
+        raise click.UsageError("--parallel requires -s/--since.")
     factory.profile = profile
     config = factory.create_config_obj(stage, False)
     deployed = config.deployed_resources(stage)
-    if name in deployed.resource_names():
-        lambda_arn = deployed.resource_values(name)['lambda_arn']
-        session = factory.create_botocore_session()
-        retriever = factory.create_log_retriever(
-            session, lambda_arn, follow)
+    lambda_arns = [deployed.resource_values(n)['lambda_arn'] for n in name
+                   if n in deployed.resource_names()]
+    if lambda_arns:
+        retriever = _create_log_retriever(
+            factory, config, lambda_arns, follow, parallel)
         options = LogRetrieveOptions.create(
             max_entries=num_entries,
             since=since,
@@ -387,15 +462,43 @@ def logs(ctx, num_entries, include_lambda_messages, stage,
         display_logs(retriever, sys.stdout, options)
 
 
+def _create_log_retriever(
+        factory,  # type: CLIFactory
+        config,  # type: Config
+        lambda_arns,  # type: List[str]
+        follow,  # type: bool
+        parallel,  # type: bool
+):
+    # type: (...) -> Union[LogRetriever, MultiLogRetriever]
+    session = factory.create_botocore_session(config=config)
+    retrievers = [
+        factory.create_log_retriever(session, lambda_arn, follow, parallel)
+        for lambda_arn in lambda_arns
+    ]
+    if len(retrievers) == 1:
+        return retrievers[0]
+    return MultiLogRetriever(retrievers, follow=follow)
+
+
 @cli.command('gen-policy')
 @click.option('--filename',
-              help='The filename to analyze.  Otherwise app.py is assumed.')
+              help=('The filename to analyze.  Otherwise app.py and the '
+                    'chalicelib modules it imports are analyzed.'))
 @click.pass_context
 def gen_policy(ctx, filename):
     # type: (click.Context, str) -> None
     from chalice import policy
     if filename is None:
-        filename = os.path.join(ctx.obj['project_dir'], 'app.py')
+        project_dir = ctx.obj['project_dir']
+        if not os.path.isfile(os.path.join(project_dir, 'app.py')):
+            click.echo("App file does not exist: %s"
+                       % os.path.join(project_dir, 'app.py'), err=True)
+            raise click.Abort()
+        analyzer = policy.ProjectAnalyzer(OSUtils())
+        generated = policy.PolicyBuilder().build_policy_from_api_calls(
+            analyzer.get_client_calls(project_dir))
+        click.echo(serialize_to_json(generated))
+        return
     if not os.path.isfile(filename):
         click.echo("App file does not exist: %s" % filename, err=True)
         raise click.Abort()
@@ -521,12 +624,16 @@ def generate_models(ctx, stage):
               type=click.Choice(['json', 'yaml'], case_sensitive=False),
               help=('Specify if the generated template should be serialized '
                     'as either JSON or YAML.  CloudFormation only.'))
+@click.option('--swagger-file', is_flag=True, default=False,
+              help=('Write the REST API definition to a separate swagger '
+                    'file in the output directory instead of inlining it '
+                    'in the template.  CloudFormation only.'))
 @click.option('--profile', help='Override profile at packaging time.')
 @click.argument('out')
 @click.pass_context
 def package(ctx, single_file, stage, merge_template,
-            out, pkg_format, template_format, profile):
-    # type: (click.Context, bool, str, str, str, str, str, str) -> None
+            out, pkg_format, template_format, swagger_file, profile):
+    # type: (click.Context, bool, str, str, str, str, str, bool, str) -> None
     factory = ctx.obj['factory']  # type: CLIFactory
     factory.profile = profile
     config = factory.create_config_obj(stage)
@@ -534,15 +641,18 @@ def package(ctx, single_file, stage, merge_template,
     packager = factory.create_app_packager(config, options,
                                            pkg_format,
                                            template_format,
-                                           merge_template)
+                                           merge_template,
+                                           swagger_file)
     if pkg_format == 'terraform' and (merge_template or
                                       single_file or
+                                      swagger_file or
                                       template_format != 'json'):
         # I don't see any reason we couldn't support --single-file for
         # terraform if we wanted to.
         click.echo((
             "Terraform format does not support "
-            "--merge-template, --single-file, or --template-format"))
+            "--merge-template, --single-file, --swagger-file, or "
+            "--template-format"))
         raise click.Abort()
 
     if single_file:
@@ -556,6 +666,113 @@ def package(ctx, single_file, stage, merge_template,
         packager.package_app(config, out, stage)
 
 
+@cli.command('profile-coldstart')
+@click.option('--stage', default=DEFAULT_STAGE_NAME,
+              help="Chalice Stage to profile.")
+@click.option('--budget', type=float,
+              help=('Maximum import time in milliseconds.  The command '
+                    'exits with a non-zero RC if this is exceeded.'))
+@click.option('--max-depth', default=3, type=click.IntRange(min=1),
+              help='How many levels of the import tree to show.')
+@click.option('--min-ms', default=1.0, type=float,
+              help='Hide imports that took less than this many ms.')
+@click.option('--output-format', default='text',
+              type=click.Choice(['text', 'json']),
+              help='Output the profile as text or as JSON.')
+@click.pass_context
+def profile_coldstart(ctx,  # type: click.Context
+                      stage,  # type: str
+                      budget,  # type: Optional[float]
+                      max_depth,  # type: int
+                      min_ms,  # type: float
+                      output_format,  # type: str
+                      ):
+    # type: (...) -> None
+    """Profile how long it takes to import your app in Lambda.
+
+    The deployment package is built and app.py is imported from it in
+    a new python interpreter to measure the import time of each module
+    and the time taken to register each handler.
+    """
+    factory = ctx.obj['factory']  # type: CLIFactory
+    config = factory.create_config_obj(stage)
+    profiler = factory.create_coldstart_profiler()
+    try:
+        profile = profiler.profile(config)
+    except ColdStartProfileError as e:
+        click.echo(str(e), err=True)
+        raise click.Abort()
+    if output_format == 'json':
+        click.echo(json.dumps(profile.to_dict(), indent=2))
+    else:
+        click.echo(format_report(profile, max_depth=max_depth,
+                                 min_ms=min_ms, budget_ms=budget), nl=False)
+    if budget is not None and profile.exceeds_budget(budget):
+        click.echo("Import time of %.1f ms exceeds budget of %.1f ms."
+                   % (profile.import_time_ms, budget), err=True)
+        sys.exit(1)
+
+
+@cli.command('deploy-many')
+@click.option('--stage', default=DEFAULT_STAGE_NAME,
+              help='Name of the Chalice stage to deploy every app to.')
+@click.option('--profile', help='Override profile at deploy time.')
+@click.option('--build-workers', default=4, type=click.IntRange(min=1),
+              help='Number of processes to build apps with.')
+@click.option('--wheel-cache-dir',
+              help=('Directory to cache downloaded and built wheels in.  '
+                    'The cache is shared by every app.'))
+@click.option('--connection-timeout',
+              type=int,
+              help=('Overrides the default botocore connection '
+                    'timeout.'))
+@click.option('--output-format', default='text',
+              type=click.Choice(['text', 'json']),
+              help='Output the deployment report as text or as JSON.')
+@click.argument('project_dirs', nargs=-1, required=True)
+@click.pass_context
+def deploy_many(ctx,  # type: click.Context
+                stage,  # type: str
+                profile,  # type: Optional[str]
+                build_workers,  # type: int
+                wheel_cache_dir,  # type: Optional[str]
+                connection_timeout,  # type: Optional[int]
+                output_format,  # type: str
+                project_dirs,  # type: Sequence[str]
+                ):
+    # type: (...) -> None
+    """Deploy multiple apps to the same stage.
+
+    The apps are built in parallel and then deployed one at a time.  An
+    app that lists other apps in its ``depends_on`` config is deployed
+    after them, and is skipped if any of them fail to deploy.
+
+        \b
+        $ chalice deploy-many --stage prod users/ orders/ billing/
+    """
+    from chalice import deploymany
+    factory = ctx.obj['factory']  # type: CLIFactory
+    try:
+        projects = deploymany.load_projects(list(project_dirs), stage)
+        deploymany.order_projects(projects)
+    except deploymany.DeployManyError as e:
+        click.echo(str(e), err=True)
+        raise click.Abort()
+    # Progress goes to stderr so the JSON report can be piped.
+    multi_deployer = deploymany.create_multi_app_deployer(
+        stage, profile=profile, debug=factory.debug,
+        build_workers=build_workers, wheel_cache_dir=wheel_cache_dir,
+        connection_timeout=connection_timeout,
+        use_stderr=output_format == 'json')
+    report = multi_deployer.deploy(projects)
+    if output_format == 'json':
+        click.echo(json.dumps(report.to_dict(), indent=2))
+    else:
+        click.echo(deploymany.format_report(report), nl=False)
+    if not report.succeeded:
+        sys.exit(1)
+
+
 @cli.command('generate-pipeline')
 @click.option('--pipeline-version',
               default='v1',
@@ -24,6 +24,7 @@ from chalice.constants import DEFAULT_APIGATEWAY_STAGE_NAME
 from chalice.constants import DEFAULT_ENDPOINT_TYPE
 from chalice.logs import LogRetriever, LogEventGenerator
 from chalice.logs import FollowLogEventGenerator
+from chalice.logs import ParallelLogEventGenerator
 from chalice.logs import BaseLogEventGenerator
 from chalice import local
 from chalice.utils import UI  # noqa
@@ -33,6 +34,12 @@ from chalice.deploy import validate
 from chalice.invoke import LambdaInvokeHandler
 from chalice.invoke import LambdaInvoker
 from chalice.invoke import LambdaResponseFormatter
+from chalice.coldstart import ColdStartProfiler
+from chalice.deploy.packager import LambdaDeploymentPackager
+from chalice.deploy.packager import DependencyBuilder
+from chalice.deploy.packager import PipRunner
+from chalice.deploy.packager import SubprocessPip
+from chalice.utils import OSUtils
 
 
 OptStr = Optional[str]
@@ -45,6 +52,8 @@ def create_botocore_session(
     connection_timeout: OptInt = None,
     read_timeout: OptInt = None,
     max_retries: OptInt = None,
+    max_pool_connections: OptInt = None,
+    tcp_keepalive: Optional[bool] = None,
 ) -> Session:
     s = Session(profile=profile)
     _add_chalice_user_agent(s)
@@ -57,6 +66,10 @@ def create_botocore_session(
         config_args['read_timeout'] = read_timeout
     if max_retries is not None:
         config_args['retries'] = {'max_attempts': max_retries}
+    if max_pool_connections is not None:
+        config_args['max_pool_connections'] = max_pool_connections
+    if tcp_keepalive is not None:
+        config_args['tcp_keepalive'] = tcp_keepalive
     if config_args:
         config = BotocoreConfig(**config_args)
         s.set_default_client_config(config)
@@ -128,19 +141,37 @@ class CLIFactory(object):
         connection_timeout: OptInt = None,
         read_timeout: OptInt = None,
         max_retries: OptInt = None,
+        config: Optional[Config] = None,
     ) -> Session:
+        # Explicitly provided values take precedence over any
+        # values specified in the project's config file.
+        max_pool_connections = None
+        tcp_keepalive = None
+        if config is not None:
+            if connection_timeout is None:
+                connection_timeout = config.connection_timeout
+            if read_timeout is None:
+                read_timeout = config.read_timeout
+            max_pool_connections = config.max_pool_connections
+            tcp_keepalive = config.tcp_keepalive
         return create_botocore_session(
             profile=self.profile,
             debug=self.debug,
             connection_timeout=connection_timeout,
             read_timeout=read_timeout,
             max_retries=max_retries,
+            max_pool_connections=max_pool_connections,
+            tcp_keepalive=tcp_keepalive,
         )
 
     def create_default_deployer(
-        self, session: Session, config: Config, ui: UI
+        self,
+        session: Session,
+        config: Config,
+        ui: UI,
+        client: Optional[TypedAWSClient] = None,
     ) -> deployer.Deployer:
-        return deployer.create_default_deployer(session, config, ui)
+        return deployer.create_default_deployer(session, config, ui, client)
 
     def create_plan_only_deployer(
         self, session: Session, config: Config, ui: UI
@@ -148,9 +179,11 @@ class CLIFactory(object):
         return deployer.create_plan_only_deployer(session, config, ui)
 
     def create_deletion_deployer(
-        self, session: Session, ui: UI
+        self, session: Session, ui: UI, max_workers: int = 1
     ) -> deployer.Deployer:
-        return deployer.create_deletion_deployer(TypedAWSClient(session), ui)
+        return deployer.create_deletion_deployer(
+            TypedAWSClient(session), ui, max_workers=max_workers
+        )
 
     def create_deployment_reporter(
         self, ui: UI
@@ -218,6 +251,7 @@ class CLIFactory(object):
         package_format: str,
         template_format: str,
         merge_template: OptStr = None,
+        swagger_file: bool = False,
     ) -> AppPackager:
         return create_app_packager(
             config,
@@ -225,16 +259,25 @@ class CLIFactory(object):
             package_format,
             template_format,
             merge_template=merge_template,
+            swagger_file=swagger_file,
         )
 
     def create_log_retriever(
-        self, session: Session, lambda_arn: str, follow_logs: bool
+        self,
+        session: Session,
+        lambda_arn: str,
+        follow_logs: bool,
+        parallel: bool = False,
     ) -> LogRetriever:
         client = TypedAWSClient(session)
         if follow_logs:
             event_generator = cast(
                 BaseLogEventGenerator, FollowLogEventGenerator(client)
             )
+        elif parallel:
+            event_generator = cast(
+                BaseLogEventGenerator, ParallelLogEventGenerator(client)
+            )
         else:
             event_generator = cast(
                 BaseLogEventGenerator, LogEventGenerator(client)
@@ -336,12 +379,35 @@ class CLIFactory(object):
             return json.loads(f.read())
 
     def create_local_server(
-        self, app_obj: Chalice, config: Config, host: str, port: int
+        self,
+        app_obj: Chalice,
+        config: Config,
+        host: str,
+        port: int,
+        backend: str = 'threaded',
+        max_threads: Optional[int] = None,
+        workers: int = 1,
     ) -> local.LocalDevServer:
-        return local.create_local_server(app_obj, config, host, port)
+        return local.create_local_server(
+            app_obj, config, host, port, backend=backend,
+            max_threads=max_threads, workers=workers,
+        )
 
     def create_package_options(self) -> PackageOptions:
         """Create the package options that are required to target regions."""
         s = Session(profile=self.profile)
         client = TypedAWSClient(session=s)
         return PackageOptions(client)
+
+    def create_coldstart_profiler(self) -> ColdStartProfiler:
+        osutils = OSUtils()
+        pip_runner = PipRunner(pip=SubprocessPip(osutils=osutils),
+                               osutils=osutils)
+        packager = LambdaDeploymentPackager(
+            osutils=osutils,
+            dependency_builder=DependencyBuilder(osutils=osutils,
+                                                 pip_runner=pip_runner),
+            # Progress goes to stderr so the report can be piped.
+            ui=UI(out=sys.stderr),
+        )
+        return ColdStartProfiler(packager)
@@ -1,10 +1,76 @@
+import os
+import re
+import time
+import fnmatch
 import threading
 
-from typing import Callable, Optional, Type  # noqa
+from typing import Callable, Optional, Type, List, Iterator, Tuple  # noqa
 from chalice.local import HTTPServerThread  # noqa
+from chalice.utils import OSUtils  # noqa
+from chalice.cli.filewatch.hotreload import HotReloader  # noqa
 
 
 RESTART_REQUEST_RC = 3
+# Files that change often but never affect the running app.  These
+# are skipped entirely when scanning the project directory.
+DEFAULT_IGNORE_PATTERNS = [
+    '.git',
+    '__pycache__',
+    '*.pyc',
+    '*.pyo',
+    '.*.swp',
+    '*~',
+    '.chalice/deployed',
+    '.chalice/deployments',
+]
+
+
+class PathFilter(object):
+    """Match paths in a project directory against ignore globs.
+
+    A pattern matches if it matches the path relative to the project
+    directory, any of its parent directories, or any single path
+    component, e.g. ``__pycache__`` ignores every ``__pycache__``
+    directory while ``.chalice/deployments`` only ignores that one.
+
+    """
+    def __init__(self, root_dir, patterns=None):
+        # type: (str, Optional[List[str]]) -> None
+        self._root_dir = root_dir
+        if patterns is None:
+            patterns = []
+        all_patterns = DEFAULT_IGNORE_PATTERNS + patterns
+        self._regex = re.compile('|'.join(
+            '(?:%s)' % fnmatch.translate(p.rstrip('/'))
+            for p in all_patterns))
+
+    def is_ignored(self, path):
+        # type: (str) -> bool
+        relpath = os.path.relpath(path, self._root_dir)
+        if relpath == os.curdir or relpath.startswith(os.pardir):
+            return False
+        parts = relpath.split(os.sep)
+        for i, part in enumerate(parts):
+            if self._regex.match(part) or \
+                    self._regex.match('/'.join(parts[:i + 1])):
+                return True
+        return False
+
+    def walk(self, osutils, root_dir):
+        # type: (OSUtils, str) -> Iterator[Tuple[str, List[str], List[str]]]
+        """Walk a directory, skipping ignored directories and files."""
+        for rootdir, dirnames, filenames in osutils.walk(root_dir):
+            # Pruning dirnames in place stops the walk from
+            # descending into ignored directories.
+            dirnames[:] = [
+                d for d in dirnames
+                if not self.is_ignored(osutils.joinpath(rootdir, d))
+            ]
+            filenames = [
+                f for f in filenames
+                if not self.is_ignored(osutils.joinpath(rootdir, f))
+            ]
+            yield rootdir, dirnames, filenames
 
 
 class FileWatcher(object):
@@ -23,20 +89,54 @@ class FileWatcher(object):
 
 class WorkerProcess(object):
     """Worker that runs the chalice dev server."""
-    def __init__(self, http_thread):
-        # type: (HTTPServerThread) -> None
+
+    # After a change is detected, we wait until there haven't been
+    # any changes for DEBOUNCE_DELAY seconds before restarting, so
+    # saving several files at once only restarts the server once.
+    DEBOUNCE_DELAY = 0.2
+    MAX_DEBOUNCE_TIME = 2.0
+
+    def __init__(self,
+                 http_thread,  # type: HTTPServerThread
+                 ignore_patterns=None,  # type: Optional[List[str]]
+                 hot_reloader=None,  # type: Optional[HotReloader]
+                 ):
+        # type: (...) -> None
         self._http_thread = http_thread
         self._restart_event = threading.Event()
+        self._ignore_patterns = ignore_patterns
+        self._hot_reloader = hot_reloader
 
     def main(self, project_dir, timeout=None):
         # type: (str, Optional[int]) -> int
         self._http_thread.start()
         self._start_file_watcher(project_dir)
-        if self._restart_event.wait(timeout):
-            self._http_thread.shutdown()
-            return RESTART_REQUEST_RC
+        while self._restart_event.wait(timeout):
+            self._wait_for_changes_to_settle()
+            if not self._reload_in_place():
+                self._http_thread.shutdown()
+                return RESTART_REQUEST_RC
         return 0
 
+    def _reload_in_place(self):
+        # type: () -> bool
+        server = self._http_thread.server
+        if self._hot_reloader is None or server is None:
+            return False
+        return self._hot_reloader.reload(server)
+
+    def _wait_for_changes_to_settle(self):
+        # type: () -> None
+        deadline = time.time() + self.MAX_DEBOUNCE_TIME
+        while time.time() < deadline:
+            self._restart_event.clear()
+            if not self._restart_event.wait(self.DEBOUNCE_DELAY):
+                return
+
+    def _create_path_filter(self, project_dir):
+        # type: (str) -> PathFilter
+        return PathFilter(project_dir, self._ignore_patterns)
+
     def _start_file_watcher(self, project_dir):
         # type: (str) -> None
         raise NotImplementedError("_start_file_watcher")
@@ -5,6 +5,7 @@ import watchdog.observers  # pylint: disable=import-error
 from watchdog import events  # pylint: disable=import-error
 
 from chalice.cli.filewatch import FileWatcher, WorkerProcess
+from chalice.cli.filewatch import PathFilter  # noqa
 
 
 class WatchdogWorkerProcess(WorkerProcess):
@@ -12,7 +13,8 @@ class WatchdogWorkerProcess(WorkerProcess):
 
     def _start_file_watcher(self, project_dir):
         # type: (str) -> None
-        restart_callback = WatchdogRestarter(self._restart_event)
+        restart_callback = WatchdogRestarter(
+            self._restart_event, self._create_path_filter(project_dir))
         watcher = WatchdogFileWatcher()
         watcher.watch_for_file_changes(
             project_dir, restart_callback)
@@ -28,10 +30,11 @@ class WatchdogFileWatcher(FileWatcher):
 
 class WatchdogRestarter(events.FileSystemEventHandler):
 
-    def __init__(self, restart_event):
-        # type: (threading.Event) -> None
+    def __init__(self, restart_event, path_filter=None):
+        # type: (threading.Event, Optional[PathFilter]) -> None
         # The reason we're using threading
         self.restart_event = restart_event
+        self._path_filter = path_filter
 
     def on_any_event(self, event):
         # type: (events.FileSystemEvent) -> None
@@ -40,6 +43,9 @@ class WatchdogRestarter(events.FileSystemEventHandler):
         # We only care about reloading is a file is modified.
         if event.is_directory:
             return
+        if self._path_filter is not None and \
+                self._path_filter.is_ignored(event.src_path):
+            return
         self()
 
     def __call__(self):
@@ -0,0 +1,242 @@
+"""Reload changed app modules without restarting the dev server.
+
+When a file changes, the modules from the project directory whose
+source changed are reloaded along with every project module that
+imports them, and then ``app.py`` is reloaded.  The state of the new
+app object (routes, handlers, middleware, etc.) is then copied onto the
+app object the dev server is already using.
+
+If an in place reload isn't safe, e.g. a route was added or removed, a
+file other than a python module changed, or the modules to reload
+import each other, ``reload`` returns False and the caller falls back
+to restarting the worker process.
+
+"""
+import importlib
+import logging
+import os
+import sys
+import time
+
+from typing import Any, Dict, List, Optional, Set, Tuple  # noqa
+
+from chalice.analyzer import get_module_imports
+from chalice.app import Chalice  # noqa
+from chalice.local import LocalDevServer  # noqa
+
+
+LOGGER = logging.getLogger(__name__)
+# Attributes of the live app object that must not be replaced.
+_PER_REQUEST_ATTRS = frozenset(['current_request', 'lambda_context'])
+_THIRD_PARTY_DIRS = ('site-packages', 'dist-packages')
+AppShape = Tuple[Any, ...]
+
+
+class HotReloader(object):
+    def __init__(self, project_dir, app_module_name='app', modules=None):
+        # type: (str, str, Optional[Dict[str, Any]]) -> None
+        self._project_dir = os.path.realpath(project_dir)
+        self._vendor_dir = os.path.join(self._project_dir, 'vendor')
+        self._app_module_name = app_module_name
+        if modules is None:
+            modules = sys.modules
+        self._modules = modules
+        # Modules imported after this time are considered stale if
+        # their source was modified afterwards.
+        self._start_time = time.time()
+        self._mtimes = {}  # type: Dict[str, float]
+        # filename -> (mtime, names of the modules it imports)
+        self._imports = {}  # type: Dict[str, Tuple[float, List[str]]]
+
+    def reload(self, server):
+        # type: (LocalDevServer) -> bool
+        """Reload the app used by ``server`` in place.
+
+        Returns True if the app was reloaded, and False if the
+        worker process needs to be restarted instead.
+
+        """
+        if server.workers > 1:
+            # Forked workers have their own copy of the app.
+            return False
+        changed = self.changed_modules()
+        if not changed:
+            # Something other than a python module changed, for
+            # example .chalice/config.json.
+            return False
+        LOGGER.debug("Reloading modules: %s", ', '.join(sorted(changed)))
+        live_app = server.app_object
+        old_shape = get_app_shape(live_app)
+        try:
+            order = self.reload_order(changed)
+            if order is None:
+                LOGGER.debug("Modules to reload import each other.")
+                return False
+            for name in order:
+                importlib.reload(self._modules[name])
+        except Exception:
+            LOGGER.debug("Unable to reload modules.", exc_info=True)
+            return False
+        finally:
+            self._record_mtimes()
+        app_module = self._modules.get(self._app_module_name)
+        new_app = getattr(app_module, 'app', None)
+        if not isinstance(new_app, Chalice) or \
+                get_app_shape(new_app) != old_shape:
+            return False
+        update_app_in_place(live_app, new_app)
+        setattr(app_module, 'app', live_app)
+        server.local_gateway.clear_cache()
+        LOGGER.info("Reloaded app without restarting.")
+        return True
+
+    def changed_modules(self):
+        # type: () -> Optional[Set[str]]
+        changed = set()
+        for name, filename in self._project_modules().items():
+            try:
+                mtime = os.stat(filename).st_mtime
+            except OSError:
+                return None
+            if mtime > self._mtimes.get(name, self._start_time):
+                changed.add(name)
+        return changed
+
+    def reload_order(self, changed):
+        # type: (Set[str]) -> Optional[List[str]]
+        """Order modules that need reloading, dependencies first.
+
+        The app module is always reloaded, and always last, so the
+        app object is rebuilt from the reloaded modules.  Returns None
+        if the modules that need reloading import each other, as
+        there's no order that reloads them correctly.
+
+        """
+        project_modules = self._project_modules()
+        dependencies = {
+            name: self._find_dependencies(name, filename, project_modules)
+            for name, filename in project_modules.items()
+        }
+        affected = set(changed)
+        pending = list(changed)
+        while pending:
+            name = pending.pop()
+            for other, deps in dependencies.items():
+                if name in deps and other not in affected:
+                    affected.add(other)
+                    pending.append(other)
+        affected.discard(self._app_module_name)
+        order = []  # type: List[str]
+        visited = set()  # type: Set[str]
+        for name in sorted(affected):
+            if not self._visit(name, affected, dependencies, visited,
+                               set(), order):
+                return None
+        order.append(self._app_module_name)
+        return order
+
+    def _visit(self,
+               name,  # type: str
+               affected,  # type: Set[str]
+               dependencies,  # type: Dict[str, Set[str]]
+               visited,  # type: Set[str]
+               visiting,  # type: Set[str]
+               order,  # type: List[str]
+               ):
+        # type: (...) -> bool
+        if name in visiting:
+            return False
+        if name in visited:
+            return True
+        visited.add(name)
+        visiting.add(name)
+        for dep in sorted(dependencies[name] & affected):
+            if not self._visit(dep, affected, dependencies, visited,
+                               visiting, order):
+                return False
+        visiting.discard(name)
+        order.append(name)
+        return True
+
+    def _find_dependencies(self, name, filename, project_modules):
+        # type: (str, str, Dict[str, str]) -> Set[str]
+        # A module only needs reloading when a module it imports is
+        # reloaded.  A package isn't a dependent of its submodules just
+        # because they're set as attributes on it when imported.
+        imports = self._get_imports(name, filename)
+        return set(
+            dep for dep in imports if dep != name and dep in project_modules)
+
+    def _get_imports(self, name, filename):
+        # type: (str, str) -> List[str]
+        try:
+            mtime = os.stat(filename).st_mtime
+            cached = self._imports.get(filename)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            with open(filename, 'rb') as f:
+                source = f.read()
+        except OSError:
+            return []
+        try:
+            imports = get_module_imports(
+                source.decode('utf-8'), name,
+                os.path.basename(filename) == '__init__.py')
+        except (SyntaxError, ValueError):
+            # The module can't be reloaded anyway, which reload()
+            # handles.
+            imports = []
+        self._imports[filename] = (mtime, imports)
+        return imports
+
+    def _project_modules(self):
+        # type: () -> Dict[str, str]
+        project_modules = {}
+        for name, module in list(self._modules.items()):
+            filename = getattr(module, '__file__', None)
+            if name == '__main__' or not filename or \
+                    not filename.endswith('.py'):
+                continue
+            filename = os.path.realpath(filename)
+            if self._is_project_file(filename):
+                project_modules[name] = filename
+        return project_modules
+
+    def _is_project_file(self, filename):
+        # type: (str) -> bool
+        if not filename.startswith(self._project_dir + os.sep) or \
+                filename.startswith(self._vendor_dir + os.sep):
+            return False
+        parts = filename[len(self._project_dir):].split(os.sep)
+        return not any(p in _THIRD_PARTY_DIRS for p in parts)
+
+    def _record_mtimes(self):
+        # type: () -> None
+        for name, filename in self._project_modules().items():
+            try:
+                self._mtimes[name] = os.stat(filename).st_mtime
+            except OSError:
+                pass
+
+
+def get_app_shape(app):
+    # type: (Chalice) -> AppShape
+    """Return the parts of an app that the dev server depends on.
+
+    The local gateway builds its route matcher when the server starts,
+    so apps with a different shape can't be swapped in place.
+
+    """
+    routes = tuple(sorted(
+        (path, tuple(sorted(methods)))
+        for path, methods in app.routes.items()
+    ))
+    return routes, tuple(app.api.binary_types)
+
+
+def update_app_in_place(live_app, new_app):
+    # type: (Chalice, Chalice) -> None
+    vars(live_app).update(
+        (key, value) for key, value in vars(new_app).items()
+        if key not in _PER_REQUEST_ATTRS
+    )
@@ -0,0 +1,187 @@
+"""File watcher using the Linux inotify API directly.
+
+This is used when watchdog is not installed.  Unlike the stat() based
+watcher it doesn't need to rescan the project directory to find
+changes, so changes are picked up as soon as they're written.
+
+"""
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import threading
+
+from typing import Callable, Dict, Iterator, Optional, Tuple  # noqa
+
+from chalice.cli.filewatch import FileWatcher, WorkerProcess
+from chalice.cli.filewatch import PathFilter  # noqa
+from chalice.utils import OSUtils
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _load_libc():
+    # type: () -> ctypes.CDLL
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+                           use_errno=True)
+    except OSError:
+        raise ImportError("Unable to load libc.")
+    if not hasattr(libc, 'inotify_init1'):
+        raise ImportError("inotify is not supported on this platform.")
+    return libc
+
+
+_LIBC = _load_libc()
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM |
+              IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+# struct inotify_event {int wd; uint32_t mask, cookie, len; char name[];}
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWorkerProcess(WorkerProcess):
+    """Worker that uses inotify to watch for file changes."""
+
+    def _start_file_watcher(self, project_dir):
+        # type: (str) -> None
+        watcher = InotifyFileWatcher(
+            path_filter=self._create_path_filter(project_dir))
+        watcher.watch_for_file_changes(project_dir, self._on_file_change)
+
+    def _on_file_change(self):
+        # type: () -> None
+        self._restart_event.set()
+
+
+class InotifyFileWatcher(FileWatcher):
+    POLL_INTERVAL = 1
+    READ_SIZE = 64 * 1024
+
+    def __init__(self, osutils=None, path_filter=None):
+        # type: (Optional[OSUtils], Optional[PathFilter]) -> None
+        if osutils is None:
+            osutils = OSUtils()
+        self._osutils = osutils
+        self._path_filter = path_filter
+        self._watches = {}  # type: Dict[int, str]
+        self._fd = -1
+        self._shutdown_event = threading.Event()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    def watch_for_file_changes(self, root_dir, callback):
+        # type: (str, Callable[[], None]) -> None
+        self._fd = _LIBC.inotify_init1(IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._add_watches(root_dir)
+        t = threading.Thread(target=self._watch_fd, args=(callback,))
+        t.daemon = True
+        t.start()
+        self._thread = t
+
+    def shutdown(self):
+        # type: () -> None
+        self._shutdown_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_watches(self, root_dir):
+        # type: (str) -> int
+        # Returns the number of files found so callers can tell if
+        # files were written to a new directory before it was watched.
+        if self._path_filter is not None:
+            walker = self._path_filter.walk(self._osutils, root_dir)
+        else:
+            walker = self._osutils.walk(root_dir)
+        num_files = 0
+        for rootdir, _, filenames in walker:
+            self._add_watch(rootdir)
+            num_files += len(filenames)
+        return num_files
+
+    def _add_watch(self, path):
+        # type: (str) -> None
+        wd = _LIBC.inotify_add_watch(
+            self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err not in (errno.ENOENT, errno.ENOTDIR):
+                LOGGER.debug("Unable to watch %s: %s", path,
+                             os.strerror(err))
+            return
+        self._watches[wd] = path
+
+    def _watch_fd(self, callback):
+        # type: (Callable[[], None]) -> None
+        while not self._shutdown_event.is_set():
+            readable, _, _ = select.select(
+                [self._fd], [], [], self.POLL_INTERVAL)
+            if not readable:
+                continue
+            data = os.read(self._fd, self.READ_SIZE)
+            if self._process_events(data):
+                callback()
+
+    def _process_events(self, data):
+        # type: (bytes) -> bool
+        changed = False
+        for wd, mask, path in self._parse_events(data):
+            if mask & IN_Q_OVERFLOW:
+                changed = True
+            elif mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+            elif path is None or self._is_ignored(path):
+                continue
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may have been written to the new directory
+                    # before we started watching it.
+                    if self._add_watches(path):
+                        changed = True
+            else:
+                changed = True
+        return changed
+
+    def _parse_events(self, data):
+        # type: (bytes) -> Iterator[Tuple[int, int, Optional[str]]]
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            directory = self._watches.get(wd)
+            if directory is None:
+                yield wd, mask, None
+            elif name:
+                yield wd, mask, os.path.join(directory, os.fsdecode(name))
+            else:
+                yield wd, mask, directory
+
+    def _is_ignored(self, path):
+        # type: (str) -> bool
+        return self._path_filter is not None and \
+            self._path_filter.is_ignored(path)
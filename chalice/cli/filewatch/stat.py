@@ -5,6 +5,7 @@ import time
 from typing import Callable, Dict, Optional, Iterator  # noqa
 
 from chalice.cli.filewatch import FileWatcher, WorkerProcess
+from chalice.cli.filewatch import PathFilter  # noqa
 from chalice.utils import OSUtils
 
 
@@ -14,7 +15,8 @@ LOGGER = logging.getLogger(__name__)
 class StatWorkerProcess(WorkerProcess):
     def _start_file_watcher(self, project_dir):
         # type: (str) -> None
-        watcher = StatFileWatcher()
+        watcher = StatFileWatcher(
+            path_filter=self._create_path_filter(project_dir))
         watcher.watch_for_file_changes(project_dir, self._on_file_change)
 
     def _on_file_change(self):
@@ -25,14 +27,15 @@ class StatWorkerProcess(WorkerProcess):
 class StatFileWatcher(FileWatcher):
     POLL_INTERVAL = 1
 
-    def __init__(self, osutils=None):
-        # type: (Optional[OSUtils]) -> None
+    def __init__(self, osutils=None, path_filter=None):
+        # type: (Optional[OSUtils], Optional[PathFilter]) -> None
         self._mtime_cache = {}  # type: Dict[str, float]
         self._shutdown_event = threading.Event()
         self._thread = None  # type: Optional[threading.Thread]
         if osutils is None:
             osutils = OSUtils()
         self._osutils = osutils
+        self._path_filter = path_filter
 
     def watch_for_file_changes(self, root_dir, callback):
         # type: (str, Callable[[], None]) -> None
@@ -53,10 +56,8 @@ class StatFileWatcher(FileWatcher):
 
     def _seed_mtime_cache(self, root_dir):
         # type: (str) -> None
-        for rootdir, _, filenames in self._osutils.walk(root_dir):
-            for filename in filenames:
-                path = self._osutils.joinpath(rootdir, filename)
-                self._mtime_cache[path] = self._osutils.mtime(path)
+        for path in self._recursive_walk_files(root_dir):
+            self._mtime_cache[path] = self._osutils.mtime(path)
 
     def _single_pass_poll(self, root_dir, callback):
         # type: (str, Callable[[], None]) -> None
@@ -90,7 +91,11 @@ class StatFileWatcher(FileWatcher):
 
     def _recursive_walk_files(self, root_dir):
         # type: (str) -> Iterator[str]
-        for rootdir, _, filenames in self._osutils.walk(root_dir):
+        if self._path_filter is not None:
+            walker = self._path_filter.walk(self._osutils, root_dir)
+        else:
+            walker = self._osutils.walk(root_dir)
+        for rootdir, _, filenames in walker:
             for filename in filenames:
                 path = self._osutils.joinpath(rootdir, filename)
                 yield path
@@ -22,20 +22,39 @@ If this env var is set, the process is intended to be a worker process (as
 opposed the parent process which just watches for restart requests from the
 worker process).
 
+On platforms that support ``fork()``, the parent process acts as a
+"zygote".  Rather than starting a new python interpreter for every
+restart, which has to import chalice, botocore, etc. from scratch, the
+parent forks itself and the child starts the dev server directly.  The
+parent never imports the user's app, so each forked child still loads
+the latest version of the app.
+
 """
 import subprocess
+import importlib
+import functools
 import logging
 import copy
 import sys
+import os
+import signal
 
-from typing import MutableMapping, Type, Callable, Optional  # noqa
+from typing import MutableMapping, Type, Callable, Optional, List  # noqa
 
 from chalice.cli.filewatch import RESTART_REQUEST_RC, WorkerProcess
+from chalice.cli.filewatch.hotreload import HotReloader
 from chalice.local import LocalDevServer, HTTPServerThread  # noqa
 
 
 LOGGER = logging.getLogger(__name__)
 WorkerProcType = Optional[Type[WorkerProcess]]
+# Modules that every worker needs.  These are imported once in the
+# zygote process so forked workers don't have to import them again.
+PRELOAD_MODULES = [
+    'chalice.app',
+    'chalice.local',
+    'botocore.session',
+]
 
 
 def get_best_worker_process():
@@ -44,6 +63,12 @@ def get_best_worker_process():
         from chalice.cli.filewatch.eventbased import WatchdogWorkerProcess
         LOGGER.debug("Using watchdog worker process.")
         return WatchdogWorkerProcess
+    except ImportError:
+        pass
+    try:
+        from chalice.cli.filewatch.inotify import InotifyWorkerProcess
+        LOGGER.debug("Using inotify worker process.")
+        return InotifyWorkerProcess
     except ImportError:
         from chalice.cli.filewatch.stat import StatWorkerProcess
         LOGGER.debug("Using stat() based worker process.")
@@ -56,12 +81,36 @@ def start_parent_process(env):
     process.main()
 
 
-def start_worker_process(server_factory, root_dir, worker_process_cls=None):
-    # type: (Callable[[], LocalDevServer], str, WorkerProcType) -> int
+def start_zygote_process(env, worker_main):
+    # type: (MutableMapping, Callable[[], int]) -> None
+    _preload_modules()
+    process = ZygoteParentProcess(env, worker_main)
+    process.main()
+
+
+def _preload_modules():
+    # type: () -> None
+    for module_name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass
+
+
+def start_worker_process(server_factory,  # type: Callable[[], LocalDevServer]
+                         root_dir,  # type: str
+                         worker_process_cls=None,  # type: WorkerProcType
+                         ignore_patterns=None,  # type: Optional[List[str]]
+                         hot_reload=False,  # type: bool
+                         ):
+    # type: (...) -> int
     if worker_process_cls is None:
         worker_process_cls = get_best_worker_process()
+    hot_reloader = None
+    if hot_reload:
+        hot_reloader = HotReloader(root_dir)
     t = HTTPServerThread(server_factory)
-    worker = worker_process_cls(t)
+    worker = worker_process_cls(t, ignore_patterns, hot_reloader)
     LOGGER.debug("Starting worker...")
     rc = worker.main(root_dir)
     LOGGER.info("Restarting local dev server.")
@@ -93,8 +142,87 @@ class ParentProcess(object):
                 raise
 
 
-def run_with_reloader(server_factory, env, root_dir, worker_process_cls=None):
-    # type: (Callable, MutableMapping, str, WorkerProcType) -> int
+class ZygoteParentProcess(object):
+    """Forks a child worker and restarts it as needed."""
+    def __init__(self,
+                 env,  # type: MutableMapping
+                 worker_main,  # type: Callable[[], int]
+                 fork=None,  # type: Optional[Callable[[], int]]
+                 waitpid=None,  # type: Optional[Callable[[int], int]]
+                 kill=None,  # type: Optional[Callable[[int], None]]
+                 exit_process=None,  # type: Optional[Callable[[int], None]]
+                 ):
+        # type: (...) -> None
+        self._env = env
+        self._worker_main = worker_main
+        if fork is None:
+            fork = os.fork
+        if waitpid is None:
+            waitpid = _waitpid
+        if kill is None:
+            kill = _kill
+        if exit_process is None:
+            # pylint: disable=protected-access
+            exit_process = os._exit
+        self._fork = fork
+        self._waitpid = waitpid
+        self._kill = kill
+        self._exit_process = exit_process
+
+    def main(self):
+        # type: () -> None
+        while True:
+            LOGGER.debug("Parent process forking child worker process...")
+            pid = self._fork()
+            if pid == 0:
+                self._run_child()
+                return
+            try:
+                rc = self._waitpid(pid)
+                if rc != RESTART_REQUEST_RC:
+                    return
+            except KeyboardInterrupt:
+                self._kill(pid)
+                raise
+
+    def _run_child(self):
+        # type: () -> None
+        self._env['CHALICE_WORKER'] = 'true'
+        rc = 0
+        try:
+            rc = self._worker_main()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # The child must never return into the parent's stack.
+            sys.stdout.flush()
+            sys.stderr.flush()
+            self._exit_process(rc)
+
+
+def _waitpid(pid):
+    # type: (int) -> int
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status)
+
+
+def _kill(pid):
+    # type: (int) -> None
+    try:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+    except OSError:
+        pass
+
+
+def run_with_reloader(server_factory,  # type: Callable
+                      env,  # type: MutableMapping
+                      root_dir,  # type: str
+                      worker_process_cls=None,  # type: WorkerProcType
+                      ignore_patterns=None,  # type: Optional[List[str]]
+                      hot_reload=False,  # type: bool
+                      ):
+    # type: (...) -> int
     # This function is invoked in two possible modes, as the parent process
     # or as a chalice worker.
     try:
@@ -102,7 +230,14 @@ def run_with_reloader(server_factory, env, root_dir, worker_process_cls=None):
             # This is a chalice worker.  We need to start the main dev server
             # in a daemon thread and install a file watcher.
             return start_worker_process(server_factory, root_dir,
-                                        worker_process_cls)
+                                        worker_process_cls, ignore_patterns,
+                                        hot_reload)
+        elif hasattr(os, 'fork'):
+            # Fork workers directly from this process so they don't
+            # pay the interpreter and import startup cost on restart.
+            start_zygote_process(env, functools.partial(
+                start_worker_process, server_factory, root_dir,
+                worker_process_cls, ignore_patterns, hot_reload))
         else:
             # This is the parent process.  It's just is to spawn an identical
             # process but with the ``CHALICE_WORKER`` env var set.  It then
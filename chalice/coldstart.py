@@ -0,0 +1,251 @@
+"""Profile the cold start import time of a chalice app.
+
+The deployment package for an app is built and extracted, and
+``app.py`` is imported from it in a new interpreter started with
+``-X importtime``.  The resulting import tree, along with how long it
+took to register each handler, is used to show where cold start time
+is spent.
+
+"""
+from __future__ import annotations
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+from dataclasses import dataclass, field
+from zipfile import ZipFile
+
+from typing import Any, Callable, Dict, List, Optional, Tuple  # noqa
+
+from chalice.config import Config  # noqa
+from chalice.deploy.packager import BaseLambdaDeploymentPackager  # noqa
+
+
+BEGIN_MARKER = 'chalice-coldstart-begin'
+END_MARKER = 'chalice-coldstart-end'
+# This script runs in the new interpreter.  Importing chalice.app is
+# done after the begin marker so it's attributed to the app's cold start
+# just like it would be in Lambda.
+PROFILE_SCRIPT = '''
+import sys, time, json
+sys.path.insert(0, sys.argv[1])
+sys.stderr.write('%(begin)s\\n')
+sys.stderr.flush()
+start = time.perf_counter()
+import chalice.app
+registrations = []
+original = chalice.app.Chalice._register_handler
+def _register_handler(self, handler_type, name, *args, **kwargs):
+    registration_start = time.perf_counter()
+    try:
+        return original(self, handler_type, name, *args, **kwargs)
+    finally:
+        registrations.append([handler_type, name,
+                              time.perf_counter() - registration_start])
+chalice.app.Chalice._register_handler = _register_handler
+import app
+elapsed = time.perf_counter() - start
+sys.stderr.write('%(end)s\\n')
+sys.stderr.flush()
+print(json.dumps({'import_time': elapsed, 'registrations': registrations}))
+''' % {'begin': BEGIN_MARKER, 'end': END_MARKER}
+CommandRunner = Callable[[List[str], Dict[str, str], str],
+                         Tuple[int, str, str]]
+
+
+class ColdStartProfileError(Exception):
+    pass
+
+
+@dataclass
+class ImportNode:
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: List[ImportNode] = field(default_factory=list)
+
+    @property
+    def self_ms(self) -> float:
+        return self.self_us / 1000.0
+
+    @property
+    def cumulative_ms(self) -> float:
+        return self.cumulative_us / 1000.0
+
+
+@dataclass
+class HandlerRegistration:
+    handler_type: str
+    name: str
+    duration_ms: float
+
+
+@dataclass
+class ColdStartProfile:
+    import_time_ms: float
+    imports: List[ImportNode]
+    registrations: List[HandlerRegistration]
+
+    def exceeds_budget(self, budget_ms: Optional[float]) -> bool:
+        return budget_ms is not None and self.import_time_ms > budget_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'import_time_ms': self.import_time_ms,
+            'imports': [_node_to_dict(node) for node in self.imports],
+            'registrations': [
+                {'handler_type': r.handler_type, 'name': r.name,
+                 'duration_ms': r.duration_ms}
+                for r in self.registrations
+            ],
+        }
+
+
+def _node_to_dict(node: ImportNode) -> Dict[str, Any]:
+    return {
+        'name': node.name,
+        'self_ms': node.self_ms,
+        'cumulative_ms': node.cumulative_ms,
+        'children': [_node_to_dict(child) for child in node.children],
+    }
+
+
+def parse_importtime(lines: List[str]) -> List[ImportNode]:
+    """Parse ``-X importtime`` output into a tree of imports.
+
+    A module is printed after all the modules it imports, indented
+    one level less, so children are collected until their parent
+    is seen.  Siblings are sorted by cumulative time, slowest first.
+
+    """
+    pending: Dict[int, List[ImportNode]] = {}
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        raw_name = parts[2].rstrip()
+        name = raw_name.lstrip()
+        level = (len(raw_name) - len(name) - 1) // 2
+        node = ImportNode(name=name, self_us=int(parts[0]),
+                          cumulative_us=int(parts[1]))
+        node.children = _sort_nodes(pending.pop(level + 1, []))
+        pending.setdefault(level, []).append(node)
+    roots: List[ImportNode] = []
+    for level in sorted(pending):
+        roots.extend(pending[level])
+    return _sort_nodes(roots)
+
+
+def _sort_nodes(nodes: List[ImportNode]) -> List[ImportNode]:
+    return sorted(nodes, key=lambda n: n.cumulative_us, reverse=True)
+
+
+def _run_command(cmd: List[str], env: Dict[str, str],
+                 cwd: str) -> Tuple[int, str, str]:
+    p = subprocess.Popen(cmd, env=env, cwd=cwd, stdout=subprocess.PIPE,
+                         stderr=subprocess.PIPE)
+    stdout, stderr = p.communicate()
+    return (p.returncode, stdout.decode('utf-8', 'replace'),
+            stderr.decode('utf-8', 'replace'))
+
+
+class ColdStartProfiler(object):
+    def __init__(self,
+                 packager: BaseLambdaDeploymentPackager,
+                 run_command: Optional[CommandRunner] = None,
+                 python_exe: Optional[str] = None) -> None:
+        self._packager = packager
+        if run_command is None:
+            run_command = _run_command
+        self._run_command = run_command
+        if python_exe is None:
+            python_exe = sys.executable
+        self._python_exe = python_exe
+
+    def profile(self, config: Config) -> ColdStartProfile:
+        zip_filename = self._packager.create_deployment_package(
+            config.project_dir, config.lambda_python_version)
+        extract_dir = tempfile.mkdtemp(prefix='chalice-coldstart-')
+        try:
+            with ZipFile(zip_filename) as z:
+                z.extractall(extract_dir)
+            return self.profile_extracted_package(
+                extract_dir, config.environment_variables)
+        finally:
+            shutil.rmtree(extract_dir, ignore_errors=True)
+
+    def profile_extracted_package(
+            self, package_dir: str,
+            environment_variables: Dict[str, str]) -> ColdStartProfile:
+        env = dict(os.environ)
+        env.update(environment_variables)
+        # -I keeps the current directory, PYTHONPATH, and the user's
+        # site-packages off sys.path so modules are only imported from
+        # the package (or the interpreter's own site-packages, which
+        # stands in for what the Lambda runtime provides).
+        cmd = [self._python_exe, '-I', '-X', 'importtime', '-c',
+               PROFILE_SCRIPT, package_dir]
+        rc, stdout, stderr = self._run_command(cmd, env, package_dir)
+        if rc != 0:
+            raise ColdStartProfileError(
+                "Unable to import app.py from the deployment package:\n%s"
+                % _strip_importtime(stderr))
+        return self._create_profile(stdout, stderr)
+
+    def _create_profile(self, stdout: str, stderr: str) -> ColdStartProfile:
+        lines = stderr.splitlines()
+        try:
+            begin = lines.index(BEGIN_MARKER)
+            end = lines.index(END_MARKER, begin)
+            result = json.loads(stdout.strip().splitlines()[-1])
+        except (ValueError, IndexError):
+            raise ColdStartProfileError(
+                "Unable to parse cold start profile:\n%s" % stderr)
+        return ColdStartProfile(
+            import_time_ms=result['import_time'] * 1000.0,
+            imports=parse_importtime(lines[begin + 1:end]),
+            registrations=sorted(
+                [HandlerRegistration(handler_type, name, duration * 1000.0)
+                 for handler_type, name, duration in result['registrations']],
+                key=lambda r: r.duration_ms, reverse=True),
+        )
+
+
+def _strip_importtime(stderr: str) -> str:
+    return '\n'.join(line for line in stderr.splitlines()
+                     if not line.startswith('import time:') and
+                     line not in (BEGIN_MARKER, END_MARKER))
+
+
+def format_report(profile: ColdStartProfile,
+                  max_depth: int = 3,
+                  min_ms: float = 1.0,
+                  budget_ms: Optional[float] = None) -> str:
+    lines = ['Total import time: %.1f ms' % profile.import_time_ms]
+    if budget_ms is not None:
+        status = 'EXCEEDED' if profile.exceeds_budget(budget_ms) else 'OK'
+        lines.append('Budget: %.1f ms (%s)' % (budget_ms, status))
+    lines.extend(['', 'Imports (cumulative ms / self ms):'])
+    _format_nodes(profile.imports, lines, 1, max_depth, min_ms)
+    lines.extend(['', 'Handler registration (ms):'])
+    for registration in profile.registrations:
+        lines.append('  %8.3f  %s %s' % (registration.duration_ms,
+                                         registration.handler_type,
+                                         registration.name))
+    return '\n'.join(lines) + '\n'
+
+
+def _format_nodes(nodes: List[ImportNode], lines: List[str],
+                  depth: int, max_depth: int, min_ms: float) -> None:
+    for node in nodes:
+        if node.cumulative_ms < min_ms:
+            # Nodes are sorted so the remaining siblings are smaller.
+            break
+        lines.append('%s%8.1f %8.1f  %s' % ('  ' * depth, node.cumulative_ms,
+                                            node.self_ms, node.name))
+        if depth < max_depth:
+            _format_nodes(node.children, lines, depth + 1, max_depth, min_ms)
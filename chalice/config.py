@@ -3,7 +3,7 @@ import os
 import sys
 import json
 
-from typing import Dict, Any, Optional, List, Union  # noqa
+from typing import Dict, Any, Optional, List, Tuple, Union  # noqa
 from chalice import __version__ as current_chalice_version
 from chalice.app import Chalice  # noqa
 from chalice.constants import DEFAULT_STAGE_NAME
@@ -72,6 +72,11 @@ class Config(object):
 
         {"TABLE": "prodtable", "S3BUCKET": "prodbucket"}
 
+    Looked up values are cached, so the params and config dicts
+    shouldn't be modified once a value has been looked up.  Configs
+    returned from ``scope()`` are also cached, one per stage and
+    function.
+
     """
 
     def __init__(self,
@@ -84,8 +89,8 @@ class Config(object):
                  ) -> None:
         #: Params that a user provided explicitly,
         #: typically via the command line.
-        self.chalice_stage = chalice_stage
-        self.function_name = function_name
+        self._chalice_stage = chalice_stage
+        self._function_name = function_name
         if user_provided_params is None:
             user_provided_params = {}
         self._user_provided_params = user_provided_params
@@ -98,6 +103,11 @@ class Config(object):
         self._default_params = default_params
         self._chalice_app = None
         self._layers = layers
+        self._resolved: Dict[Tuple[bool, bool], StrMap] = {}
+        self._merged: Dict[str, StrMap] = {}
+        # These are shared with every config created by scope().
+        self._resolved_for_stage: Dict[Optional[str], StrMap] = {}
+        self._scopes: Dict[Tuple[str, str], Config] = {}
 
     @classmethod
     def create(cls, chalice_stage: str = DEFAULT_STAGE_NAME,
@@ -106,6 +116,14 @@ class Config(object):
         return cls(chalice_stage=chalice_stage,
                    user_provided_params=kwargs.copy())
 
+    @property
+    def chalice_stage(self) -> str:
+        return self._chalice_stage
+
+    @property
+    def function_name(self) -> str:
+        return self._function_name
+
     @property
     def profile(self) -> str:
         return self._chain_lookup('profile')
@@ -180,48 +198,81 @@ class Config(object):
 
     def _chain_lookup(self, name: str, varies_per_chalice_stage: bool = False,
                       varies_per_function: bool = False) -> Any:
-        search_dicts = [self._user_provided_params]
+        flags = (varies_per_chalice_stage, varies_per_function)
+        resolved = self._resolved.get(flags)
+        if resolved is None:
+            resolved = self._resolve(*flags)
+            self._resolved[flags] = resolved
+        return resolved.get(name)
+
+    def _resolve(self, varies_per_chalice_stage: bool,
+                 varies_per_function: bool) -> StrMap:
+        # Rather than searching each dict for every value that's looked
+        # up, the dicts are merged into a single dict, lowest precedence
+        # first, which is then used for every lookup.
+        if not varies_per_function:
+            stage_name = None
+            if varies_per_chalice_stage:
+                stage_name = self.chalice_stage
+            return self._resolve_for_stage(stage_name)
+        # search order:
+        # config['stages']['lambda_functions']
+        # config['stages']
+        # config['lambda_functions']
+        # The user provided params are merged again so they take
+        # precedence over the function specific values.
+        resolved = self._resolve_for_stage(None).copy()
+        _update_non_null(
+            resolved, self._config_from_disk.get('lambda_functions', {}).get(
+                self.function_name, {}))
         if varies_per_chalice_stage:
-            search_dicts.append(
-                self._config_from_disk.get('stages', {}).get(
-                    self.chalice_stage, {}))
-        if varies_per_function:
-            # search order:
-            # config['stages']['lambda_functions']
-            # config['stages']
-            # config['lambda_functions']
-            search_dicts.insert(
-                0, self._config_from_disk.get('stages', {}).get(
-                    self.chalice_stage, {}).get('lambda_functions', {}).get(
-                        self.function_name, {}))
-            search_dicts.append(
-                self._config_from_disk.get('lambda_functions', {}).get(
-                    self.function_name, {}))
-        search_dicts.extend([self._config_from_disk, self._default_params])
-        for cfg_dict in search_dicts:
-            if isinstance(cfg_dict, dict) and cfg_dict.get(name) is not None:
-                return cfg_dict[name]
+            _update_non_null(resolved, self._get_stage_config())
+        _update_non_null(resolved, self._user_provided_params)
+        _update_non_null(resolved, self._get_stage_function_config())
+        return resolved
+
+    def _resolve_for_stage(self, stage_name: Optional[str]) -> StrMap:
+        # These values don't vary per function so they're shared by every
+        # scoped config.
+        resolved = self._resolved_for_stage.get(stage_name)
+        if resolved is None:
+            resolved = {}
+            _update_non_null(resolved, self._default_params)
+            _update_non_null(resolved, self._config_from_disk)
+            if stage_name is not None:
+                _update_non_null(resolved, self._get_stage_config())
+            _update_non_null(resolved, self._user_provided_params)
+            self._resolved_for_stage[stage_name] = resolved
+        return resolved
+
+    def _get_stage_config(self) -> StrMap:
+        return self._config_from_disk.get('stages', {}).get(
+            self.chalice_stage, {})
+
+    def _get_stage_function_config(self) -> StrMap:
+        return self._get_stage_config().get('lambda_functions', {}).get(
+            self.function_name, {})
 
     def _chain_merge(self, name: str) -> Dict[str, Any]:
         # Merge values for all search dicts instead of returning on first
-        # found.
-        search_dicts = [
-            # This is reverse order to _chain_lookup().
-            self._default_params,
-            self._config_from_disk,
-            self._config_from_disk.get('stages', {}).get(
-                self.chalice_stage, {}),
-            self._config_from_disk.get('stages', {}).get(
-                self.chalice_stage, {}).get('lambda_functions', {}).get(
-                    self.function_name, {}),
-            self._user_provided_params,
-        ]
-        final = {}
-        for cfg_dict in search_dicts:
-            value = cfg_dict.get(name, {})
-            if isinstance(value, dict):
-                final.update(value)
-        return final
+        # found.  Callers are free to modify the merged dict so they
+        # get a copy of the cached one.
+        if name not in self._merged:
+            search_dicts = [
+                # This is reverse order to _chain_lookup().
+                self._default_params,
+                self._config_from_disk,
+                self._get_stage_config(),
+                self._get_stage_function_config(),
+                self._user_provided_params,
+            ]
+            final: Dict[str, Any] = {}
+            for cfg_dict in search_dicts:
+                value = cfg_dict.get(name, {})
+                if isinstance(value, dict):
+                    final.update(value)
+            self._merged[name] = final
+        return self._merged[name].copy()
 
     @property
     def config_file_version(self) -> str:
@@ -273,6 +324,12 @@ class Config(object):
                                   varies_per_chalice_stage=True,
                                   varies_per_function=True)
 
+    @property
+    def requirements_file(self) -> Optional[str]:
+        return self._chain_lookup('requirements_file',
+                                  varies_per_chalice_stage=True,
+                                  varies_per_function=True)
+
     @property
     def automatic_layer(self) -> bool:
         v = self._chain_lookup('automatic_layer',
@@ -282,6 +339,15 @@ class Config(object):
             return False
         return v
 
+    @property
+    def lazy_handler_imports(self) -> bool:
+        v = self._chain_lookup('lazy_handler_imports',
+                               varies_per_chalice_stage=True,
+                               varies_per_function=False)
+        if v is None:
+            return False
+        return v
+
     @property
     def iam_role_arn(self) -> str:
         return self._chain_lookup('iam_role_arn',
@@ -308,6 +374,24 @@ class Config(object):
                                   varies_per_chalice_stage=True,
                                   varies_per_function=True)
 
+    @property
+    def autogen_policy_workers(self) -> int:
+        v = self._chain_lookup('autogen_policy_workers',
+                               varies_per_chalice_stage=True,
+                               varies_per_function=False)
+        if v is None:
+            return 1
+        return v
+
+    @property
+    def autogen_policy_scoped_resources(self) -> bool:
+        v = self._chain_lookup('autogen_policy_scoped_resources',
+                               varies_per_chalice_stage=True,
+                               varies_per_function=False)
+        if v is None:
+            return False
+        return v
+
     @property
     def xray_enabled(self) -> bool:
         return self._chain_lookup('xray',
@@ -343,20 +427,50 @@ class Config(object):
                                   varies_per_chalice_stage=True,
                                   varies_per_function=True)
 
+    @property
+    def max_pool_connections(self) -> int:
+        return self._chain_lookup('max_pool_connections',
+                                  varies_per_chalice_stage=True)
+
+    @property
+    def tcp_keepalive(self) -> bool:
+        return self._chain_lookup('tcp_keepalive',
+                                  varies_per_chalice_stage=True)
+
+    @property
+    def connection_timeout(self) -> int:
+        return self._chain_lookup('connection_timeout',
+                                  varies_per_chalice_stage=True)
+
+    @property
+    def read_timeout(self) -> int:
+        return self._chain_lookup('read_timeout',
+                                  varies_per_chalice_stage=True)
+
+    @property
+    def depends_on(self) -> List[str]:
+        return self._chain_lookup('depends_on',
+                                  varies_per_chalice_stage=True)
+
     def scope(self, chalice_stage: str, function_name: str) -> Config:
-        # Used to create a new config object that's scoped to a different
-        # stage and/or function.  This creates a completely separate copy.
-        # This is preferred over mutating the existing config obj.
-        # We technically don't need to do a copy here, but this avoids
-        # any possible issues if we ever mutate the config values.
-        clone = self.__class__(
-            chalice_stage=chalice_stage,
-            function_name=function_name,
-            user_provided_params=self._user_provided_params,
-            config_from_disk=self._config_from_disk,
-            default_params=self._default_params,
-        )
-        return clone
+        # Used to get a config object that's scoped to a different
+        # stage and/or function.  Configs can't be modified so a scoped
+        # config is only created once per stage and function, and then
+        # shared along with the values it has looked up.
+        key = (chalice_stage, function_name)
+        if key not in self._scopes:
+            # pylint: disable=protected-access
+            clone = self.__class__(
+                chalice_stage=chalice_stage,
+                function_name=function_name,
+                user_provided_params=self._user_provided_params,
+                config_from_disk=self._config_from_disk,
+                default_params=self._default_params,
+            )
+            clone._resolved_for_stage = self._resolved_for_stage
+            clone._scopes = self._scopes
+            self._scopes[key] = clone
+        return self._scopes[key]
 
     def deployed_resources(self, chalice_stage_name: str) -> DeployedResources:
         """Return resources associated with a given stage.
@@ -449,6 +563,15 @@ class Config(object):
         ])
 
 
+def _update_non_null(resolved: StrMap, values: Any) -> None:
+    # A value of None is the same as the key not being set.
+    if not isinstance(values, dict):
+        return
+    if None in values.values():
+        values = {k: v for k, v in values.items() if v is not None}
+    resolved.update(values)
+
+
 class DeployedResources(object):
     def __init__(self, deployed_values: Dict[str, Any]) -> None:
         self._deployed_values = deployed_values['resources']
@@ -22,6 +22,7 @@ class ApplicationGraphBuilder(object):
     def __init__(self) -> None:
         self._known_roles: Dict[str, models.IAMRole] = {}
         self._managed_layer: Optional[models.LambdaLayer] = None
+        self._function_packages: Dict[str, models.DeploymentPackage] = {}
 
     def build(self, config: Config, stage_name: str) -> models.Application:
         resources: List[models.Model] = []
@@ -454,6 +455,19 @@ class ApplicationGraphBuilder(object):
             )
         return self._managed_layer
 
+    def _get_function_deployment_package(
+        self, requirements_file: str
+    ) -> models.DeploymentPackage:
+        # Functions that specify the same requirements file share a
+        # deployment package.
+        if requirements_file not in self._function_packages:
+            package = models.DeploymentPackage(
+                models.Placeholder.BUILD_STAGE,
+                requirements_filename=requirements_file,
+            )
+            self._function_packages[requirements_file] = package
+        return self._function_packages[requirements_file]
+
     def _get_role_reference(
         self, config: Config, stage_name: str, function_name: str
     ) -> models.IAMRole:
@@ -558,6 +572,15 @@ class ApplicationGraphBuilder(object):
         )
         security_group_ids, subnet_ids = self._get_vpc_params(name, config)
         lambda_layers = self._get_lambda_layers(config)
+        managed_layer = None
+        if config.requirements_file:
+            # A function with its own requirements is packaged with just
+            # those dependencies, so it doesn't use the managed layer.
+            deployment = self._get_function_deployment_package(
+                config.requirements_file
+            )
+        else:
+            managed_layer = self._get_managed_lambda_layer(config)
         function = models.LambdaFunction(
             resource_name=name,
             function_name=function_name,
@@ -573,7 +596,7 @@ class ApplicationGraphBuilder(object):
             subnet_ids=subnet_ids,
             reserved_concurrency=config.reserved_concurrency,
             layers=lambda_layers,
-            managed_layer=self._get_managed_lambda_layer(config),
+            managed_layer=managed_layer,
             xray=config.xray_enabled,
         )
         self._inject_role_traits(function, role)
@@ -721,32 +744,62 @@ class ApplicationGraphBuilder(object):
         return ddb_event_source
 
 
+class CyclicDependencyError(ChaliceBuildError):
+    pass
+
+
 class DependencyBuilder(object):
     def __init__(self) -> None:
         pass
 
     def build_dependencies(self, graph: models.Model) -> List[models.Model]:
-        seen: Set[int] = set()
-        ordered: List[models.Model] = []
+        # Models are compared by identity, not equality, so they're keyed
+        # by id().  Dicts preserve insertion order so ``ordered`` is an
+        # ordered set, and ``path`` is the chain of resources currently
+        # being visited.
+        ordered: Dict[int, models.Model] = {}
+        path: Dict[int, models.Model] = {}
         for resource in graph.dependencies():
-            self._traverse(resource, ordered, seen)
-        return ordered
+            self._traverse(resource, ordered, path)
+        return list(ordered.values())
 
     def _traverse(
         self,
         resource: models.Model,
-        ordered: List[models.Model],
-        seen: Set[int],
+        ordered: Dict[int, models.Model],
+        path: Dict[int, models.Model],
     ) -> None:
-        for dep in resource.dependencies():
-            if id(dep) not in seen:
-                seen.add(id(dep))
-                self._traverse(dep, ordered, seen)
-        # If recreating this list is a perf issue later on,
-        # we can create yet-another set of ids that gets updated
-        # when we add a resource to the ordered list.
-        if id(resource) not in [id(r) for r in ordered]:
-            ordered.append(resource)
+        # This is a depth first search that adds a resource after all of
+        # its dependencies.  It uses an explicit stack so deep graphs
+        # don't hit the recursion limit.
+        if id(resource) in ordered:
+            return
+        path[id(resource)] = resource
+        stack = [(resource, iter(resource.dependencies()))]
+        while stack:
+            current, deps = stack[-1]
+            for dep in deps:
+                if id(dep) in ordered:
+                    continue
+                if id(dep) in path:
+                    raise CyclicDependencyError(
+                        "Circular dependency between resources: %s"
+                        % self._format_cycle(path, dep))
+                path[id(dep)] = dep
+                stack.append((dep, iter(dep.dependencies())))
+                break
+            else:
+                stack.pop()
+                del path[id(current)]
+                ordered[id(current)] = current
+
+    def _format_cycle(
+        self, path: Dict[int, models.Model], resource: models.Model
+    ) -> str:
+        start = list(path).index(id(resource))
+        chain = list(path.values())[start:] + [resource]
+        return ' -> '.join(
+            getattr(r, 'resource_name', r.__class__.__name__) for r in chain)
 
 
 class GraphPrettyPrint(object):
@@ -86,13 +86,18 @@ import json
 import textwrap
 import socket
 import logging
+import functools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import botocore.exceptions
 from botocore.vendored.requests import ConnectionError as \
     RequestsConnectionError
 from botocore.session import Session  # noqa
-from typing import Optional, Dict, List, Any, Type, cast  # noqa
+from typing import Optional, Dict, List, Any, Type, Callable, cast  # noqa
 
+from chalice.analyzer import HandlerImports  # noqa
+from chalice.analyzer import get_handler_imports
 from chalice.config import Config  # noqa
 from chalice.compat import is_broken_pipe_error
 from chalice.awsclient import DeploymentPackageTooLargeError
@@ -113,6 +118,7 @@ from chalice.deploy.appgraph import ApplicationGraphBuilder, DependencyBuilder
 from chalice.deploy.executor import BaseExecutor  # noqa
 from chalice.deploy.executor import Executor
 from chalice.deploy.executor import DisplayOnlyExecutor
+from chalice.deploy.executor import ParallelDeletionExecutor
 from chalice.deploy.packager import PipRunner
 from chalice.deploy.packager import SubprocessPip
 from chalice.deploy.packager import DependencyBuilder as PipDependencyBuilder
@@ -121,6 +127,7 @@ from chalice.deploy.packager import AppOnlyDeploymentPackager
 from chalice.deploy.packager import LayerDeploymentPackager
 from chalice.deploy.packager import BaseLambdaDeploymentPackager  # noqa
 from chalice.deploy.packager import EmptyPackageError
+from chalice.deploy.packager import LazyEntryModuleInjector
 from chalice.deploy.planner import PlanStage
 from chalice.deploy.planner import RemoteState
 from chalice.deploy.planner import NoopPlanner
@@ -129,6 +136,8 @@ from chalice.deploy.swagger import SwaggerGenerator  # noqa
 from chalice.deploy.sweeper import ResourceSweeper
 from chalice.deploy.validate import validate_configuration
 from chalice.policy import AppPolicyGenerator
+from chalice.policy import PolicyBuilder
+from chalice.policy import ProjectAnalyzer
 from chalice.utils import OSUtils
 from chalice.utils import UI
 from chalice.utils import serialize_to_json
@@ -256,9 +265,10 @@ def create_plan_only_deployer(session, config, ui):
                             NoopResultsRecorder)
 
 
-def create_default_deployer(session, config, ui):
-    # type: (Session, Config, UI) -> Deployer
-    return _create_deployer(session, config, ui, Executor, ResultsRecorder)
+def create_default_deployer(session, config, ui, client=None):
+    # type: (Session, Config, UI, Optional[TypedAWSClient]) -> Deployer
+    return _create_deployer(session, config, ui, Executor, ResultsRecorder,
+                            client)
 
 
 def _create_deployer(session,       # type: Session
@@ -266,15 +276,18 @@ def _create_deployer(session,       # type: Session
                      ui,            # type: UI
                      executor_cls,  # type: Type[BaseExecutor]
                      recorder_cls,  # type: Type[ResultsRecorder]
+                     client=None,   # type: Optional[TypedAWSClient]
                      ):
     # type: (...) -> Deployer
-    client = TypedAWSClient(session)
+    if client is None:
+        client = TypedAWSClient(session)
     osutils = OSUtils()
     return Deployer(
         application_builder=ApplicationGraphBuilder(),
         deps_builder=DependencyBuilder(),
         build_stage=create_build_stage(
-            osutils, UI(), TemplatedSwaggerGenerator(), config
+            osutils, UI(), TemplatedSwaggerGenerator(), config,
+            session=session,
         ),
         plan_stage=PlanStage(
             osutils=osutils, remote_state=RemoteState(
@@ -286,8 +299,13 @@ def _create_deployer(session,       # type: Session
     )
 
 
-def create_build_stage(osutils, ui, swagger_gen, config):
-    # type: (OSUtils, UI, SwaggerGenerator, Config) -> BuildStage
+def create_build_stage(osutils,       # type: OSUtils
+                       ui,            # type: UI
+                       swagger_gen,   # type: SwaggerGenerator
+                       config,        # type: Config
+                       session=None,  # type: Optional[Session]
+                       ):
+    # type: (...) -> BuildStage
     pip_runner = PipRunner(pip=SubprocessPip(osutils=osutils),
                            osutils=osutils)
     dependency_builder = PipDependencyBuilder(
@@ -306,7 +324,12 @@ def create_build_stage(osutils, ui, swagger_gen, config):
                 osutils=osutils,
                 dependency_builder=dependency_builder,
                 ui=ui,
-            )
+            ),
+            function_packager=LambdaDeploymentPackager(
+                osutils=osutils,
+                dependency_builder=dependency_builder,
+                ui=ui,
+            ),
         )
     else:
         deployment_packager = DeploymentPackager(
@@ -320,9 +343,18 @@ def create_build_stage(osutils, ui, swagger_gen, config):
         steps=[
             InjectDefaults(),
             deployment_packager,
+            LazyHandlerImports(
+                injector=LazyEntryModuleInjector(osutils=osutils),
+                osutils=osutils,
+            ),
             PolicyGenerator(
                 policy_gen=AppPolicyGenerator(
-                    osutils=osutils
+                    osutils=osutils,
+                    policy_builder=PolicyBuilder(session=session),
+                    project_analyzer=ProjectAnalyzer(
+                        osutils=osutils,
+                        max_workers=config.autogen_policy_workers,
+                    ),
                 ),
                 osutils=osutils,
             ),
@@ -336,15 +368,20 @@ def create_build_stage(osutils, ui, swagger_gen, config):
     return build_stage
 
 
-def create_deletion_deployer(client, ui):
-    # type: (TypedAWSClient, UI) -> Deployer
+def create_deletion_deployer(client, ui, max_workers=1):
+    # type: (TypedAWSClient, UI, int) -> Deployer
+    sweeper = ResourceSweeper()
+    executor = Executor(client, ui)  # type: BaseExecutor
+    if max_workers > 1:
+        executor = ParallelDeletionExecutor(
+            client, ui, sweeper, max_workers=max_workers)
     return Deployer(
         application_builder=ApplicationGraphBuilder(),
         deps_builder=DependencyBuilder(),
         build_stage=BuildStage(steps=[]),
         plan_stage=NoopPlanner(),
-        sweeper=ResourceSweeper(),
-        executor=Executor(client, ui),
+        sweeper=sweeper,
+        executor=executor,
         recorder=ResultsRecorder(osutils=OSUtils()),
     )
 
@@ -411,6 +448,10 @@ class Deployer(object):
 
 
 class BaseDeployStep(object):
+    def prepare(self, config, resources):
+        # type: (Config, List[models.Model]) -> None
+        pass
+
     def handle(self, config, resource):
         # type: (Config, models.Model) -> None
         name = 'handle_%s' % resource.__class__.__name__.lower()
@@ -442,16 +483,93 @@ class InjectDefaults(BaseDeployStep):
                 DEFAULT_TLS_VERSION)
 
 
+class PackageBuildQueue(object):
+    """Build deployment packages concurrently.
+
+    Packages that result in the same zip file, e.g. functions whose
+    requirements files have the same contents, are only built once.
+
+    """
+
+    def __init__(self, config):
+        # type: (Config) -> None
+        self._config = config
+        self._builds = []  # type: List[Callable[[], None]]
+        self._packages = {}  # type: Dict[str, List[models.DeploymentPackage]]
+
+    def add_build(self, build):
+        # type: (Callable[[], None]) -> None
+        self._builds.append(build)
+
+    def add_package(self,
+                    packager,  # type: BaseLambdaDeploymentPackager
+                    package,   # type: models.DeploymentPackage
+                    ):
+        # type: (...) -> None
+        filename = packager.deployment_package_filename(
+            self._config.project_dir, self._config.lambda_python_version,
+            package.requirements_filename)
+        if filename in self._packages:
+            self._packages[filename].append(package)
+            return
+        self._packages[filename] = [package]
+        self.add_build(functools.partial(
+            self._create_package, packager, self._packages[filename]))
+
+    def _create_package(self,
+                        packager,  # type: BaseLambdaDeploymentPackager
+                        packages,  # type: List[models.DeploymentPackage]
+                        ):
+        # type: (...) -> None
+        zip_filename = packager.create_deployment_package(
+            self._config.project_dir, self._config.lambda_python_version,
+            packages[0].requirements_filename)
+        for package in packages:
+            package.filename = zip_filename
+
+    def build(self):
+        # type: () -> None
+        if len(self._builds) < 2:
+            for build in self._builds:
+                build()
+            return
+        with ThreadPoolExecutor(max_workers=len(self._builds)) as pool:
+            futures = [pool.submit(build) for build in self._builds]
+            for future in futures:
+                future.result()
+
+
+def _get_function_packages(resources):
+    # type: (List[models.Model]) -> List[models.DeploymentPackage]
+    packages = OrderedDict()  # type: Dict[int, models.DeploymentPackage]
+    for resource in resources:
+        if isinstance(resource, models.LambdaFunction):
+            package = resource.deployment_package
+            if isinstance(package.filename, models.Placeholder):
+                packages[id(package)] = package
+    return list(packages.values())
+
+
 class DeploymentPackager(BaseDeployStep):
     def __init__(self, packager):
         # type: (LambdaDeploymentPackager) -> None
         self._packager = packager
 
+    def prepare(self, config, resources):
+        # type: (Config, List[models.Model]) -> None
+        # Functions with their own requirements_file have their own
+        # deployment package.  All the packages are built concurrently.
+        queue = PackageBuildQueue(config)
+        for package in _get_function_packages(resources):
+            queue.add_package(self._packager, package)
+        queue.build()
+
     def handle_deploymentpackage(self, config, resource):
         # type: (Config, models.DeploymentPackage) -> None
         if isinstance(resource.filename, models.Placeholder):
             zip_filename = self._packager.create_deployment_package(
-                config.project_dir, config.lambda_python_version)
+                config.project_dir, config.lambda_python_version,
+                resource.requirements_filename)
             resource.filename = zip_filename
 
 
@@ -459,22 +577,45 @@ class ManagedLayerDeploymentPackager(BaseDeployStep):
     # If we're creating a layer for non-app code there's two different
     # packagers we need.  One for the Lambda functions (app code) and
     # one for the Lambda layer (requirements.txt + vendor).
+    # Functions with their own requirements_file don't use the layer,
+    # so a third packager builds their dependencies and app code.
     def __init__(self,
                  lambda_packager,  # type: BaseLambdaDeploymentPackager
                  layer_packager,   # type: BaseLambdaDeploymentPackager
+                 function_packager,  # type: BaseLambdaDeploymentPackager
                  ):
         # type: (...) -> None
         self._lambda_packager = lambda_packager
         self._layer_packager = layer_packager
+        self._function_packager = function_packager
+
+    def prepare(self, config, resources):
+        # type: (Config, List[models.Model]) -> None
+        queue = PackageBuildQueue(config)
+        for resource in resources:
+            if isinstance(resource, models.LambdaLayer):
+                queue.add_build(functools.partial(
+                    self.handle_lambdalayer, config, resource))
+        for package in _get_function_packages(resources):
+            queue.add_package(self._get_packager(package), package)
+        queue.build()
+
+    def _get_packager(self, package):
+        # type: (models.DeploymentPackage) -> BaseLambdaDeploymentPackager
+        if package.requirements_filename is not None:
+            return self._function_packager
+        return self._lambda_packager
 
     def handle_lambdafunction(self, config, resource):
         # type: (Config, models.LambdaFunction) -> None
-        if isinstance(resource.deployment_package.filename,
-                      models.Placeholder):
-            zip_filename = self._lambda_packager.create_deployment_package(
-                config.project_dir, config.lambda_python_version
+        package = resource.deployment_package
+        if isinstance(package.filename, models.Placeholder):
+            packager = self._get_packager(package)
+            zip_filename = packager.create_deployment_package(
+                config.project_dir, config.lambda_python_version,
+                package.requirements_filename
             )
-            resource.deployment_package.filename = zip_filename
+            package.filename = zip_filename
         if resource.managed_layer is not None and \
                 resource.managed_layer.is_empty:
             # Lambda doesn't allow us to create an empty layer so if we've
@@ -500,6 +641,48 @@ class ManagedLayerDeploymentPackager(BaseDeployStep):
                 resource.is_empty = True
 
 
+class LazyHandlerImports(BaseDeployStep):
+    """Point each function at an entry module that defers imports.
+
+    When ``lazy_handler_imports`` is enabled, modules from app.py that a
+    function's handler doesn't use are deferred until they're first
+    accessed.  For the API handler that means a view's modules are
+    imported the first time a request is routed to it.
+
+    """
+
+    def __init__(self, injector, osutils):
+        # type: (LazyEntryModuleInjector, OSUtils) -> None
+        self._injector = injector
+        self._osutils = osutils
+        self._handler_imports = {}  # type: Dict[str, HandlerImports]
+
+    def handle_lambdafunction(self, config, resource):
+        # type: (Config, models.LambdaFunction) -> None
+        if not config.lazy_handler_imports:
+            return
+        filename = resource.deployment_package.filename
+        module_name, _, handler_name = resource.handler.rpartition('.')
+        # Handlers registered by blueprints aren't defined in app.py
+        # so they keep their original handler.
+        if module_name != 'app' or \
+                isinstance(filename, models.Placeholder):
+            return
+        handler_imports = self._get_handler_imports(config.project_dir)
+        resource.handler = self._injector.inject_entry_module(
+            filename, module_name, handler_name,
+            handler_imports.lazy_imports(handler_name))
+
+    def _get_handler_imports(self, project_dir):
+        # type: (str) -> HandlerImports
+        if project_dir not in self._handler_imports:
+            source = self._osutils.get_file_contents(
+                self._osutils.joinpath(project_dir, 'app.py'),
+                binary=False)
+            self._handler_imports[project_dir] = get_handler_imports(source)
+        return self._handler_imports[project_dir]
+
+
 class SwaggerBuilder(BaseDeployStep):
     def __init__(self, swagger_generator):
         # type: (SwaggerGenerator) -> None
@@ -647,6 +830,8 @@ class BuildStage(object):
 
     def execute(self, config, resources):
         # type: (Config, List[models.Model]) -> None
+        for step in self._steps:
+            step.prepare(config, resources)
         for resource in resources:
             for step in self._steps:
                 step.handle(config, resource)
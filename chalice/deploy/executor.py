@@ -1,11 +1,16 @@
 import re
+import time
 import pprint
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, Future, wait  # noqa
+from concurrent.futures import FIRST_COMPLETED
 from dataclasses import asdict, is_dataclass
 
 import jmespath
-from typing import Dict, List, Any  # noqa
+from typing import Dict, List, Any, Set, Tuple, Optional  # noqa
 
 from chalice.deploy import models # noqa
+from chalice.deploy.sweeper import ResourceSweeper, ResourceDeletion  # noqa
 from chalice.awsclient import TypedAWSClient  # noqa
 from chalice.utils import UI  # noqa
 
@@ -167,6 +172,142 @@ class Executor(BaseExecutor):
             raise
 
 
+class ParallelDeletionExecutor(BaseExecutor):
+    """Execute the deletions planned by a sweeper concurrently.
+
+    Each deleted resource only waits for the resources that have to be
+    removed before it, e.g. event source mappings are deleted before their
+    Lambda function, and Lambda functions are deleted before their
+    IAM role.  Any other instructions in the plan are executed serially
+    before the deletions start.
+
+    """
+
+    # Maps a resource type to the resource types that must be
+    # deleted before any resource of that type can be deleted.
+    DELETION_DEPENDENCIES = {
+        'domain_name': ['domain_api_mappings'],
+        'rest_api': ['domain_api_mappings'],
+        'websocket_api': ['domain_api_mappings'],
+        'lambda_function': [
+            's3_event', 'sns_event', 'sqs_event', 'kinesis_event',
+            'dynamodb_event', 'cloudwatch_event', 'rest_api',
+            'websocket_api',
+        ],
+        'iam_role': ['lambda_function'],
+        'lambda_layer': ['lambda_function'],
+    }  # type: Dict[str, List[str]]
+
+    def __init__(self, client, ui, sweeper, max_workers):
+        # type: (TypedAWSClient, UI, ResourceSweeper, int) -> None
+        super(ParallelDeletionExecutor, self).__init__(client, ui)
+        self._sweeper = sweeper
+        self._max_workers = max_workers
+        self.time_per_resource_type = {}  # type: Dict[str, float]
+        self.count_per_resource_type = {}  # type: Dict[str, int]
+
+    def execute(self, plan):
+        # type: (models.Plan) -> None
+        deletions = self._sweeper.deletions
+        deletion_ids = set(
+            id(instruction) for deletion in deletions
+            for instruction in deletion.instructions
+        )
+        remaining = [instruction for instruction in plan.instructions
+                     if id(instruction) not in deletion_ids]
+        if remaining:
+            executor = Executor(self._client, self._ui)
+            executor.execute(models.Plan(remaining, plan.messages))
+            self.resource_values = executor.resource_values
+        if deletions:
+            self._execute_deletions(deletions)
+            self._display_summary()
+
+    def _execute_deletions(self, deletions):
+        # type: (List[ResourceDeletion]) -> None
+        waiting_on, dependents = self._build_dependency_graph(deletions)
+        by_name = {d.resource_name: d for d in deletions}
+        ready = [d.resource_name for d in deletions
+                 if not waiting_on[d.resource_name]]
+        in_flight = {}  # type: Dict[Future, ResourceDeletion]
+        completed = 0
+        error = None  # type: Optional[Exception]
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            while in_flight or (ready and error is None):
+                while ready and error is None:
+                    deletion = by_name[ready.pop(0)]
+                    if deletion.message is not None:
+                        self._ui.write(deletion.message)
+                    future = pool.submit(self._delete_resource, deletion)
+                    in_flight[future] = deletion
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    deletion = in_flight.pop(future)
+                    try:
+                        self._record_duration(deletion, future.result())
+                    except Exception as e:
+                        # Let the in-flight deletions finish, but don't
+                        # start any new ones.
+                        error = error or e
+                        continue
+                    completed += 1
+                    self._ui.write('[%s/%s] Deleted %s: %s\n' % (
+                        completed, len(deletions), deletion.resource_type,
+                        deletion.resource_name))
+                    for name in dependents[deletion.resource_name]:
+                        waiting_on[name].discard(deletion.resource_name)
+                        if not waiting_on[name]:
+                            ready.append(name)
+        if error is not None:
+            raise error
+
+    def _build_dependency_graph(self,
+                                deletions,  # type: List[ResourceDeletion]
+                                ):
+        # type: (...) -> Tuple[Dict[str, Set[str]], Dict[str, List[str]]]
+        names_by_type = defaultdict(list)  # type: Dict[str, List[str]]
+        for deletion in deletions:
+            names_by_type[deletion.resource_type].append(
+                deletion.resource_name)
+        waiting_on = {}  # type: Dict[str, Set[str]]
+        dependents = defaultdict(list)  # type: Dict[str, List[str]]
+        for deletion in deletions:
+            name = deletion.resource_name
+            waiting_on[name] = set()
+            for dependency_type in self.DELETION_DEPENDENCIES.get(
+                    deletion.resource_type, []):
+                for dependency in names_by_type[dependency_type]:
+                    waiting_on[name].add(dependency)
+                    dependents[dependency].append(name)
+        return waiting_on, dependents
+
+    def _delete_resource(self, deletion):
+        # type: (ResourceDeletion) -> float
+        # Each deletion gets its own executor so the variables used
+        # by one resource's instructions can't clobber another's.
+        start_time = time.time()
+        executor = Executor(self._client, self._ui)
+        executor.execute(models.Plan(list(deletion.instructions), {}))
+        return time.time() - start_time
+
+    def _record_duration(self, deletion, duration):
+        # type: (ResourceDeletion, float) -> None
+        resource_type = deletion.resource_type
+        self.time_per_resource_type[resource_type] = \
+            self.time_per_resource_type.get(resource_type, 0.0) + duration
+        self.count_per_resource_type[resource_type] = \
+            self.count_per_resource_type.get(resource_type, 0) + 1
+
+    def _display_summary(self):
+        # type: () -> None
+        self._ui.write('\nTime spent per resource type:\n')
+        for resource_type in sorted(self.time_per_resource_type):
+            self._ui.write('  %-22s %4s resource(s) %8.2fs\n' % (
+                resource_type,
+                self.count_per_resource_type[resource_type],
+                self.time_per_resource_type[resource_type]))
+
+
 class VariableResolver(object):
     def resolve_variables(self, value, variables):
         # type: (Any, Dict[str, str]) -> Any
@@ -135,6 +135,7 @@ class Application(Model):
 @dataclass
 class DeploymentPackage(Model):
     filename: DV[str]
+    requirements_filename: Opt[str] = None
 
 
 @dataclass
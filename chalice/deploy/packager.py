@@ -10,6 +10,7 @@ import functools
 from email.parser import FeedParser
 from email.message import Message  # noqa
 from zipfile import ZipFile  # noqa
+from zipfile import ZipInfo
 
 from typing import Any, Set, List, Optional, Tuple, Iterable, Callable  # noqa
 from typing import Iterator  # noqa
@@ -23,6 +24,7 @@ from chalice.constants import MISSING_DEPENDENCIES_TEMPLATE
 
 import chalice
 from chalice import app
+from chalice import lazyimport
 
 
 StrMap = Dict[str, Any]
@@ -62,6 +64,15 @@ class EmptyPackageError(Exception):
     """A deployment package cannot be an empty zip file."""
 
 
+class MissingRequirementsFileError(Exception):
+    """A function's requirements file does not exist."""
+
+    def __init__(self, requirements_filename: str) -> None:
+        super(MissingRequirementsFileError, self).__init__(
+            'Requirements file does not exist: %s' % requirements_filename
+        )
+
+
 class UnsupportedPackageError(Exception):
     """Unable to parse package metadata."""
 
@@ -91,13 +102,25 @@ class BaseLambdaDeploymentPackager(object):
         self._ui = ui
 
     def create_deployment_package(
-        self, project_dir: str, python_version: str
+        self,
+        project_dir: str,
+        python_version: str,
+        requirements_filename: Optional[str] = None,
     ) -> str:
         raise NotImplementedError("create_deployment_package")
 
-    def _get_requirements_filename(self, project_dir: str) -> str:
-        # Gets the path to a requirements.txt file out of a project dir path
-        return self._osutils.joinpath(project_dir, 'requirements.txt')
+    def _get_requirements_filename(
+        self, project_dir: str, requirements_filename: Optional[str] = None
+    ) -> str:
+        # Gets the path to a requirements.txt file out of a project dir path.
+        # A function with its own requirements file is packaged with
+        # that file instead, relative to the project dir.
+        if requirements_filename is None:
+            return self._osutils.joinpath(project_dir, 'requirements.txt')
+        filename = self._osutils.joinpath(project_dir, requirements_filename)
+        if not self._osutils.file_exists(filename):
+            raise MissingRequirementsFileError(filename)
+        return filename
 
     def _add_vendor_files(
         self, zipped: ZipFile, dirname: str, prefix: str = ''
@@ -116,7 +139,10 @@ class BaseLambdaDeploymentPackager(object):
                 zipped.write(full_path, zip_path)
 
     def deployment_package_filename(
-        self, project_dir: str, python_version: str
+        self,
+        project_dir: str,
+        python_version: str,
+        requirements_filename: Optional[str] = None,
     ) -> str:
         # Computes the name of the deployment package zipfile
         # based on a hash of the requirements file.
@@ -126,14 +152,24 @@ class BaseLambdaDeploymentPackager(object):
         # to the end of the filename since the the dependencies may not change
         # but if the python version changes then the dependencies need to be
         # re-downloaded since they will not be compatible.
-        return self._deployment_package_filename(project_dir, python_version)
+        return self._deployment_package_filename(
+            project_dir,
+            python_version,
+            requirements_filename=requirements_filename,
+        )
 
     def _deployment_package_filename(
-        self, project_dir: str, python_version: str, prefix: str = ''
+        self,
+        project_dir: str,
+        python_version: str,
+        prefix: str = '',
+        requirements_filename: Optional[str] = None,
     ) -> str:
-        requirements_filename = self._get_requirements_filename(project_dir)
+        requirements_filepath = self._get_requirements_filename(
+            project_dir, requirements_filename
+        )
         hash_contents = self._hash_project_dir(
-            requirements_filename,
+            requirements_filepath,
             self._osutils.joinpath(project_dir, self._VENDOR_DIR),
             project_dir,
         )
@@ -302,13 +338,18 @@ class BaseLambdaDeploymentPackager(object):
 
 class LambdaDeploymentPackager(BaseLambdaDeploymentPackager):
     def create_deployment_package(
-        self, project_dir: str, python_version: str
+        self,
+        project_dir: str,
+        python_version: str,
+        requirements_filename: Optional[str] = None,
     ) -> str:
         msg = "Creating deployment package."
+        if requirements_filename is not None:
+            msg = "Creating deployment package for %s." % requirements_filename
         self._ui.write("%s\n" % msg)
         logger.debug(msg)
         package_filename = self.deployment_package_filename(
-            project_dir, python_version
+            project_dir, python_version, requirements_filename
         )
         if self._osutils.file_exists(package_filename):
             self._ui.write("Reusing existing deployment package.\n")
@@ -316,7 +357,7 @@ class LambdaDeploymentPackager(BaseLambdaDeploymentPackager):
         self._create_output_dir_if_needed(package_filename)
         with self._osutils.tempdir() as tmpdir:
             requirements_filepath = self._get_requirements_filename(
-                project_dir
+                project_dir, requirements_filename
             )
             self._build_python_dependencies(
                 python_version, requirements_filepath, site_packages_dir=tmpdir
@@ -334,7 +375,10 @@ class LambdaDeploymentPackager(BaseLambdaDeploymentPackager):
 
 class AppOnlyDeploymentPackager(BaseLambdaDeploymentPackager):
     def create_deployment_package(
-        self, project_dir: str, python_version: str
+        self,
+        project_dir: str,
+        python_version: str,
+        requirements_filename: Optional[str] = None,
     ) -> str:
         msg = "Creating app deployment package."
         self._ui.write("%s\n" % msg)
@@ -353,14 +397,21 @@ class AppOnlyDeploymentPackager(BaseLambdaDeploymentPackager):
         return package_filename
 
     def deployment_package_filename(
-        self, project_dir: str, python_version: str
+        self,
+        project_dir: str,
+        python_version: str,
+        requirements_filename: Optional[str] = None,
     ) -> str:
         return self._deployment_package_filename(
             project_dir, python_version, prefix='appcode-'
         )
 
     def _deployment_package_filename(
-        self, project_dir: str, python_version: str, prefix: str = ''
+        self,
+        project_dir: str,
+        python_version: str,
+        prefix: str = '',
+        requirements_filename: Optional[str] = None,
     ) -> str:
         h = hashlib.md5(b'')
         for filename, _ in self._iter_app_filenames(project_dir):
@@ -384,7 +435,10 @@ class LayerDeploymentPackager(BaseLambdaDeploymentPackager):
     _PREFIX = 'python/lib/%s/site-packages'
 
     def create_deployment_package(
-        self, project_dir: str, python_version: str
+        self,
+        project_dir: str,
+        python_version: str,
+        requirements_filename: Optional[str] = None,
     ) -> str:
         msg = "Creating shared layer deployment package."
         self._ui.write("%s\n" % msg)
@@ -439,14 +493,21 @@ class LayerDeploymentPackager(BaseLambdaDeploymentPackager):
                 raise EmptyPackageError(package_filename)
 
     def deployment_package_filename(
-        self, project_dir: str, python_version: str
+        self,
+        project_dir: str,
+        python_version: str,
+        requirements_filename: Optional[str] = None,
     ) -> str:
         return self._deployment_package_filename(
             project_dir, python_version, prefix='managed-layer-'
         )
 
     def _deployment_package_filename(
-        self, project_dir: str, python_version: str, prefix: str = ''
+        self,
+        project_dir: str,
+        python_version: str,
+        prefix: str = '',
+        requirements_filename: Optional[str] = None,
     ) -> str:
         requirements_filename = self._get_requirements_filename(project_dir)
         if not self._osutils.file_exists(requirements_filename):
@@ -470,6 +531,84 @@ class LayerDeploymentPackager(BaseLambdaDeploymentPackager):
         return deployment_package_filename
 
 
+class LazyEntryModuleInjector(object):
+    """Add per function entry modules to a deployment package.
+
+    Each entry module imports the app with the modules its handler
+    doesn't need deferred, see :mod:`chalice.lazyimport`.
+
+    """
+
+    ENTRY_MODULE_PREFIX = '_chalice_entry_'
+    _RUNTIME_ZIP_PATH = 'chalice/lazyimport.py'
+    _ENTRY_MODULE_TEMPLATE = (
+        '# Generated by chalice, do not edit.\n'
+        'from chalice.lazyimport import import_app\n'
+        '\n'
+        'handler = import_app(%r, %r, %r)\n'
+    )
+
+    def __init__(self, osutils: OSUtils) -> None:
+        self._osutils = osutils
+
+    def inject_entry_module(self, deployment_package_filename: str,
+                            app_module_name: str, handler_name: str,
+                            lazy_modules: List[str]) -> str:
+        """Add an entry module for a handler to a deployment package.
+
+        Returns the handler string to use for the Lambda function.  The
+        zip file is only rewritten if it has an out of date version of
+        the entry module.
+
+        """
+        entry_module = self.ENTRY_MODULE_PREFIX + handler_name
+        files = {
+            '%s.py' % entry_module: (
+                self._ENTRY_MODULE_TEMPLATE % (
+                    app_module_name, handler_name, lazy_modules)
+            ).encode('utf-8'),
+            self._RUNTIME_ZIP_PATH: cast(
+                bytes, self._osutils.get_file_contents(
+                    self._runtime_filename(), binary=True)),
+        }
+        with self._osutils.open_zip(
+                deployment_package_filename, 'r') as z:
+            existing = set(z.namelist())
+            stale = set(name for name, contents in files.items()
+                        if name in existing and z.read(name) != contents)
+        if stale:
+            self._remove_files(deployment_package_filename, stale)
+        missing = [name for name in sorted(files)
+                   if name not in existing or name in stale]
+        if missing:
+            with self._osutils.open_zip(
+                    deployment_package_filename, 'a') as z:
+                for name in missing:
+                    zinfo = ZipInfo(name)
+                    zinfo.external_attr = 0o644 << 16
+                    zinfo.compress_type = self._osutils.ZIP_DEFLATED
+                    z.writestr(zinfo, files[name])
+        return '%s.handler' % entry_module
+
+    def _runtime_filename(self) -> str:
+        filename = inspect.getfile(lazyimport)
+        if filename.endswith('.pyc'):
+            filename = filename[:-1]
+        return filename
+
+    def _remove_files(self, deployment_package_filename: str,
+                      filenames: Set[str]) -> None:
+        tmpzip = deployment_package_filename + '.tmp.zip'
+        with self._osutils.open_zip(deployment_package_filename, 'r') as inzip:
+            with self._osutils.open_zip(
+                tmpzip, 'w', self._osutils.ZIP_DEFLATED
+            ) as outzip:
+                for el in inzip.infolist():
+                    if el.filename not in filenames:
+                        outzip.writestr(el, inzip.read(el.filename))
+        self._osutils.move(tmpzip, deployment_package_filename)
+
+
 class DependencyBuilder(object):
     """Build site-packages by manually downloading and unpacking wheels.
 
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import ( # noqa
     List,
     Dict,
@@ -20,6 +21,17 @@ ResourceValueType = Dict[str, Union[Sequence[Instruction], str]]
 HandlerArgsType = List[Union[Dict[str, Any], str]]
 
 
+@dataclass(frozen=True)
+class ResourceDeletion:
+    # The instructions needed to delete a single deployed resource.
+    # These are independent of the instructions for any other resource,
+    # so separate deletions can be executed concurrently.
+    resource_name: str
+    resource_type: str
+    instructions: Tuple[Instruction, ...]
+    message: Optional[str] = None
+
+
 class ResourceSweeper(object):
 
     specific_resources = (
@@ -35,11 +47,13 @@ class ResourceSweeper(object):
         # type: () -> None
         self.plan = models.Plan()
         self.marked = {}  # type: Dict
+        self.deletions = []  # type: List[ResourceDeletion]
 
     def execute(self, plan, config):
         # type: (models.Plan, Config) -> None
         self.plan = plan
         self.marked = self._mark_resources()
+        self.deletions = []
 
         deployed = config.deployed_resources(config.chalice_stage)
         if deployed is not None:
@@ -456,3 +470,9 @@ class ResourceSweeper(object):
                 message,
                 insert=insert
             )
+            self.deletions.append(ResourceDeletion(
+                resource_name=name,
+                resource_type=resource_type,
+                instructions=instructions,
+                message=message,
+            ))
@@ -0,0 +1,410 @@
+"""Deploy multiple chalice apps, for example every app in a monorepo.
+
+The deployment packages of every app are built in parallel, each app in
+a separate process.  Apps are then deployed one at a time, as soon as
+their packages are built and the apps they depend on (the apps listed in
+``depends_on`` in their config file) have been deployed.  If an app
+fails to build or deploy, the apps that depend on it are skipped.
+
+Apps that are deployed with the same connection settings share a
+botocore session and clients.
+
+"""
+from __future__ import annotations
+import os
+import sys
+import time
+import functools
+import contextlib
+from concurrent import futures
+from dataclasses import dataclass, field
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple  # noqa
+
+from botocore.session import Session  # noqa
+
+from chalice import api
+from chalice.awsclient import TypedAWSClient
+from chalice.cli.factory import CLIFactory
+from chalice.config import Config  # noqa
+from chalice.deploy.deployer import DeploymentReporter
+from chalice.utils import UI
+
+
+DEPLOYED = 'deployed'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+
+class DeployManyError(Exception):
+    pass
+
+
+@dataclass
+class AppProject:
+    project_dir: str
+    app_name: str
+    depends_on: List[str] = field(default_factory=list)
+
+
+@dataclass
+class AppDeployResult:
+    project: AppProject
+    status: str
+    build_time: float = 0.0
+    deploy_time: float = 0.0
+    error: Optional[str] = None
+    deployed_values: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        resources = []
+        if self.deployed_values is not None:
+            resources = self.deployed_values['resources']
+        return {
+            'app_name': self.project.app_name,
+            'project_dir': self.project.project_dir,
+            'depends_on': self.project.depends_on,
+            'status': self.status,
+            'build_time': self.build_time,
+            'deploy_time': self.deploy_time,
+            'error': self.error,
+            'resources': resources,
+        }
+
+
+@dataclass
+class DeployManyReport:
+    stage: str
+    results: List[AppDeployResult]
+
+    @property
+    def succeeded(self) -> bool:
+        return all(result.status == DEPLOYED for result in self.results)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'stage': self.stage,
+            'succeeded': self.succeeded,
+            'apps': [result.to_dict() for result in self.results],
+        }
+
+
+BuildFunction = Callable[[str, str], float]
+DeployFunction = Callable[[AppProject], Dict[str, Any]]
+
+
+@contextlib.contextmanager
+def isolated_app_imports(project_dir: str) -> Iterator[None]:
+    """Unload a project's app once it's no longer needed.
+
+    Every project's app is imported from a module named ``app``, usually
+    along with its own ``chalicelib`` package, so these modules have to
+    be removed before another project's app can be loaded.  Only these
+    modules are removed, other modules in the project dir, such as a
+    virtualenv's packages, are kept.  Loading an app also adds its
+    environment variables to ``os.environ`` and its project dir to
+    ``sys.path``, which are restored as well.
+
+    """
+    project_dir = os.path.realpath(project_dir)
+    sys_path = list(sys.path)
+    environ = dict(os.environ)
+    try:
+        yield
+    finally:
+        for name, module in list(sys.modules.items()):
+            if _is_project_app_module(name, module, project_dir):
+                del sys.modules[name]
+        sys.path[:] = sys_path
+        os.environ.clear()
+        os.environ.update(environ)
+
+
+def _is_project_app_module(name: str, module: Any, project_dir: str) -> bool:
+    if name not in ('app', 'chalicelib') and \
+            not name.startswith('chalicelib.'):
+        return False
+    filenames = list(getattr(module, '__path__', None) or [])
+    filenames.append(getattr(module, '__file__', None) or '')
+    return any(os.path.realpath(filename).startswith(project_dir + os.sep)
+               for filename in filenames if filename)
+
+
+def load_projects(project_dirs: List[str], stage: str) -> List[AppProject]:
+    projects = []
+    for project_dir in project_dirs:
+        try:
+            config = CLIFactory(project_dir).create_config_obj(stage)
+        except RuntimeError as e:
+            raise DeployManyError("%s: %s" % (project_dir, e))
+        projects.append(AppProject(project_dir=project_dir,
+                                   app_name=config.app_name,
+                                   depends_on=list(config.depends_on or [])))
+    return projects
+
+
+def order_projects(projects: List[AppProject]) -> List[AppProject]:
+    """Sort projects so they come after the projects they depend on.
+
+    Otherwise projects are kept in the order they're given.
+
+    """
+    by_name: Dict[str, AppProject] = {}
+    for project in projects:
+        if project.app_name in by_name:
+            raise DeployManyError(
+                "Multiple projects have the app name %s: %s, %s" % (
+                    project.app_name, by_name[project.app_name].project_dir,
+                    project.project_dir))
+        by_name[project.app_name] = project
+    ordered: Dict[str, AppProject] = {}
+    for project in projects:
+        _add_project(project, by_name, ordered, [])
+    return list(ordered.values())
+
+
+def _add_project(project: AppProject, by_name: Dict[str, AppProject],
+                 ordered: Dict[str, AppProject], path: List[str]) -> None:
+    if project.app_name in ordered:
+        return
+    if project.app_name in path:
+        cycle = path[path.index(project.app_name):] + [project.app_name]
+        raise DeployManyError(
+            "Circular dependency between apps: %s" % ' -> '.join(cycle))
+    for name in project.depends_on:
+        if name not in by_name:
+            raise DeployManyError(
+                "%s depends on %s, which isn't one of the apps being "
+                "deployed." % (project.app_name, name))
+        _add_project(by_name[name], by_name, ordered,
+                     path + [project.app_name])
+    ordered[project.app_name] = project
+
+
+def build_project(project_dir: str, stage: str,
+                  use_stderr: bool = False) -> float:
+    """Build a project's deployment packages, returning the time taken.
+
+    This runs in a build process, which may build several projects.
+
+    """
+    start = time.perf_counter()
+    ui = UI(out=sys.stderr) if use_stderr else UI()
+    with isolated_app_imports(project_dir):
+        api.build_app(project_dir, stage, ui=ui)
+    return time.perf_counter() - start
+
+
+def init_build_process(wheel_cache_dir: Optional[str]) -> None:
+    if wheel_cache_dir is not None:
+        # pip caches the wheels it downloads and builds here, so a wheel
+        # is only downloaded or built once for every project.
+        os.environ['PIP_CACHE_DIR'] = os.path.abspath(wheel_cache_dir)
+
+
+class SharedSessionAppDeployer(object):
+    """Deploy apps, sharing botocore sessions and clients between them."""
+
+    def __init__(self,
+                 stage: str,
+                 profile: Optional[str] = None,
+                 debug: bool = False,
+                 connection_timeout: Optional[int] = None,
+                 ui: Optional[UI] = None) -> None:
+        self._stage = stage
+        self._profile = profile
+        self._debug = debug
+        self._connection_timeout = connection_timeout
+        if ui is None:
+            ui = UI()
+        self._ui = ui
+        self._sessions: Dict[Tuple[Any, ...],
+                             Tuple[Session, TypedAWSClient]] = {}
+
+    def deploy(self, project: AppProject) -> Dict[str, Any]:
+        with isolated_app_imports(project.project_dir):
+            factory = CLIFactory(project.project_dir, debug=self._debug,
+                                 profile=self._profile)
+            session, client = self._get_session(
+                factory, factory.create_config_obj(self._stage))
+            return api.deploy_app(project.project_dir, self._stage,
+                                  profile=self._profile, session=session,
+                                  client=client, ui=self._ui)
+
+    def _get_session(self, factory: CLIFactory,
+                     config: Config) -> Tuple[Session, TypedAWSClient]:
+        # Apps can configure their own connection settings, so only apps
+        # with the same settings share a session.
+        connection_timeout = self._connection_timeout
+        if connection_timeout is None:
+            connection_timeout = config.connection_timeout
+        key = (connection_timeout, config.read_timeout,
+               config.max_pool_connections, config.tcp_keepalive)
+        if key not in self._sessions:
+            session = factory.create_botocore_session(
+                connection_timeout=connection_timeout, config=config)
+            self._sessions[key] = (session, TypedAWSClient(session))
+        return self._sessions[key]
+
+
+class MultiAppDeployer(object):
+    def __init__(self,
+                 stage: str,
+                 build_executor: futures.Executor,
+                 deploy_app: DeployFunction,
+                 build_app: BuildFunction = build_project,
+                 ui: Optional[UI] = None) -> None:
+        self._stage = stage
+        self._build_executor = build_executor
+        self._deploy_app = deploy_app
+        self._build_app = build_app
+        if ui is None:
+            ui = UI()
+        self._ui = ui
+
+    def deploy(self, projects: List[AppProject]) -> DeployManyReport:
+        """Build and deploy every project.
+
+        The build executor is shut down once all the projects have
+        been deployed.
+
+        """
+        remaining = order_projects(projects)
+        results: Dict[str, AppDeployResult] = {}
+        builds: Dict[str, Tuple[float, Optional[str]]] = {}
+        with self._build_executor as executor:
+            pending = {
+                executor.submit(self._build_app, project.project_dir,
+                                self._stage): project.app_name
+                for project in remaining
+            }
+            while remaining:
+                project = self._next_project(remaining, results, builds)
+                if project is None:
+                    done, _ = futures.wait(
+                        pending, return_when=futures.FIRST_COMPLETED)
+                    for future in done:
+                        builds[pending.pop(future)] = _build_result(future)
+                    continue
+                remaining.remove(project)
+                results[project.app_name] = self._deploy_project(
+                    project, results, builds)
+            for future in pending:
+                future.cancel()
+        return DeployManyReport(
+            stage=self._stage,
+            results=[results[project.app_name] for project in
+                     order_projects(projects)])
+
+    def _next_project(
+        self,
+        remaining: List[AppProject],
+        results: Dict[str, AppDeployResult],
+        builds: Dict[str, Tuple[float, Optional[str]]],
+    ) -> Optional[AppProject]:
+        # The projects are in dependency order, so the first project's
+        # dependencies are always finished.  Later projects can only
+        # go first if their dependencies are finished too.
+        for project in remaining:
+            if not all(name in results for name in project.depends_on):
+                continue
+            if project.app_name in builds or self._failed_dependencies(
+                    project, results):
+                return project
+        return None
+
+    def _failed_dependencies(
+        self, project: AppProject, results: Dict[str, AppDeployResult]
+    ) -> List[str]:
+        return [name for name in project.depends_on
+                if results[name].status != DEPLOYED]
+
+    def _deploy_project(
+        self,
+        project: AppProject,
+        results: Dict[str, AppDeployResult],
+        builds: Dict[str, Tuple[float, Optional[str]]],
+    ) -> AppDeployResult:
+        failed = self._failed_dependencies(project, results)
+        if failed:
+            return AppDeployResult(
+                project, SKIPPED,
+                error="Not deployed because %s wasn't deployed." % (
+                    ', '.join(failed)))
+        build_time, error = builds[project.app_name]
+        if error is not None:
+            return AppDeployResult(project, FAILED, build_time,
+                                   error='Build failed: %s' % error)
+        self._ui.write('Deploying %s (%s)\n' % (project.app_name,
+                                                project.project_dir))
+        start = time.perf_counter()
+        try:
+            deployed_values = self._deploy_app(project)
+        except Exception as e:
+            return AppDeployResult(project, FAILED, build_time,
+                                   time.perf_counter() - start,
+                                   error=_format_error(e))
+        return AppDeployResult(project, DEPLOYED, build_time,
+                               time.perf_counter() - start,
+                               deployed_values=deployed_values)
+
+
+def create_multi_app_deployer(
+    stage: str,
+    profile: Optional[str] = None,
+    debug: bool = False,
+    build_workers: int = 4,
+    wheel_cache_dir: Optional[str] = None,
+    connection_timeout: Optional[int] = None,
+    use_stderr: bool = False,
+) -> MultiAppDeployer:
+    ui = UI(out=sys.stderr) if use_stderr else UI()
+    app_deployer = SharedSessionAppDeployer(
+        stage, profile=profile, debug=debug,
+        connection_timeout=connection_timeout, ui=ui)
+    return MultiAppDeployer(
+        stage,
+        build_executor=futures.ProcessPoolExecutor(
+            max_workers=build_workers,
+            initializer=init_build_process,
+            initargs=(wheel_cache_dir,)),
+        deploy_app=app_deployer.deploy,
+        build_app=functools.partial(build_project, use_stderr=use_stderr),
+        ui=ui,
+    )
+
+
+def _build_result(future: futures.Future) -> Tuple[float, Optional[str]]:
+    try:
+        return future.result(), None
+    except Exception as e:
+        return 0.0, _format_error(e)
+
+
+def _format_error(error: Exception) -> str:
+    return str(error) or error.__class__.__name__
+
+
+def format_report(report: DeployManyReport) -> str:
+    deployed = [r for r in report.results if r.status == DEPLOYED]
+    lines = ['Deployed %s of %s apps to stage %s.' % (
+        len(deployed), len(report.results), report.stage)]
+    reporter = DeploymentReporter(ui=UI())
+    for result in report.results:
+        times = []
+        if result.build_time:
+            times.append('build %.1fs' % result.build_time)
+        if result.deploy_time:
+            times.append('deploy %.1fs' % result.deploy_time)
+        status = result.status
+        if times:
+            status = '%s (%s)' % (status, ', '.join(times))
+        lines.extend(['', '%s (%s): %s' % (
+            result.project.app_name, result.project.project_dir, status)])
+        details = ''
+        if result.deployed_values is not None:
+            details = reporter.generate_report(result.deployed_values)
+        elif result.error is not None:
+            details = result.error
+        lines.extend('  %s' % line for line in details.splitlines())
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,55 @@
+"""Import a chalice app with some of its imports deferred.
+
+This module is included in the deployment package of apps that set
+``lazy_handler_imports``.  Each Lambda function gets a small generated
+entry module that calls :func:`import_app` with the top level modules
+that its handler doesn't use.  Those modules are created with
+``importlib.util.LazyLoader``, so their code doesn't run until an
+attribute is first accessed, i.e. the first time a view or event
+handler that uses them is invoked.
+
+"""
+import importlib
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import sys
+from typing import Any, Iterable, Optional, Sequence, Set  # noqa
+
+
+class LazyModuleFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, module_names: Iterable[str]) -> None:
+        self._module_names = frozenset(module_names)
+        self._finding: Set[str] = set()
+
+    def find_spec(
+        self, fullname: str, path: Optional[Sequence[str]], target: Any = None
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        if fullname not in self._module_names or fullname in self._finding:
+            return None
+        # Let the rest of sys.meta_path find the module and only wrap
+        # its loader.
+        self._finding.add(fullname)
+        try:
+            spec = importlib.util.find_spec(fullname)
+        finally:
+            self._finding.discard(fullname)
+        if spec is None or spec.loader is None:
+            return None
+        try:
+            spec.loader = importlib.util.LazyLoader(spec.loader)
+        except TypeError:
+            # The loader doesn't support exec_module().
+            return None
+        return spec
+
+
+def import_app(module_name: str, handler_name: str,
+               lazy_modules: Sequence[str]) -> Any:
+    finder = LazyModuleFinder(lazy_modules)
+    sys.meta_path.insert(0, finder)
+    try:
+        module = importlib.import_module(module_name)
+    finally:
+        sys.meta_path.remove(finder)
+    return getattr(module, handler_name)
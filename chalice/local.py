@@ -3,9 +3,15 @@
 This is intended only for local development purposes.
 
 """
+# pylint: disable=too-many-lines
 from __future__ import print_function
 from __future__ import annotations
+import os
+import io
 import re
+import signal
+import socket
+import asyncio
 import threading
 import time
 import uuid
@@ -13,6 +19,9 @@ import base64
 import functools
 import warnings
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http.client import parse_headers
 import json
 
 from six.moves.BaseHTTPServer import HTTPServer
@@ -26,6 +35,7 @@ from typing import (
     Callable,
     Optional,
     Union,
+    Pattern,
 )  # noqa
 
 from chalice.app import Chalice  # noqa
@@ -46,8 +56,9 @@ EventType = Dict[str, Any]
 ContextType = Dict[str, Any]
 HeaderType = Dict[str, Any]
 ResponseType = Dict[str, Any]
+HTTPResponse = Tuple[int, List[Tuple[str, str]], bytes]
 HandlerCls = Callable[..., 'ChaliceRequestHandler']
-ServerCls = Callable[..., 'HTTPServer']
+ServerCls = Callable[..., Any]
 
 
 class Clock(object):
@@ -55,12 +66,42 @@ class Clock(object):
         return time.time()
 
 
+SERVER_BACKENDS = ['threaded', 'threadpool', 'asyncio']
+
+
 def create_local_server(app_obj: Chalice,
                         config: Config,
-                        host: str, port: int) -> LocalDevServer:
-    CustomLocalChalice.__bases__ = (LocalChalice, app_obj.__class__)
-    app_obj.__class__ = CustomLocalChalice
-    return LocalDevServer(app_obj, config, host, port)
+                        host: str, port: int,
+                        backend: str = 'threaded',
+                        max_threads: Optional[int] = None,
+                        workers: int = 1) -> LocalDevServer:
+    make_thread_safe(app_obj)
+    local_gateway = LocalGateway(app_obj, config)
+    server_cls: ServerCls = ThreadedHTTPServer
+    if backend == 'threadpool':
+        server_cls = functools.partial(
+            ThreadPoolHTTPServer, max_threads=max_threads)
+    elif backend == 'asyncio':
+        server_cls = functools.partial(
+            AsyncioHTTPServer, gateway=local_gateway,
+            max_threads=max_threads)
+    elif backend != 'threaded':
+        raise ValueError("Unknown server backend: %s" % backend)
+    return LocalDevServer(app_obj, config, host, port,
+                          server_cls=server_cls, workers=workers,
+                          local_gateway=local_gateway)
+
+
+def make_thread_safe(app_obj: Chalice) -> None:
+    """Store the app's current request in a thread local.
+
+    This lets a single app object handle requests from multiple
+    threads concurrently.
+    """
+    if isinstance(app_obj, LocalChalice):
+        return
+    app_obj.__class__ = type(
+        'CustomLocalChalice', (LocalChalice, app_obj.__class__), {})
 
 
 class LocalARNBuilder(object):
@@ -89,26 +130,37 @@ class LocalARNBuilder(object):
         )
 
 
+def _arn_glob_to_regex(resource: str) -> str:
+    # Arn matching supports two special case characters that are not
+    # escapable. * represents a glob which translates to a non-greedy
+    # match of any number of characters. ? which is any single character.
+    # These are easy to translate to a regex using .*? and . respectively.
+    escaped_resource = re.escape(resource)
+    return escaped_resource.replace(r'\?', '.').replace(r'\*', '.*?')
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_arn_patterns(resources: Tuple[str, ...]) -> Pattern[str]:
+    """Compile ARN globs into a single regex that matches any of them.
+
+    This lets a policy with many resources be checked with a single
+    match instead of matching each resource in turn.
+    """
+    unique_resources = sorted(set(resources))
+    if not unique_resources:
+        # A regex that never matches.
+        return re.compile(r'(?!)')
+    return re.compile('^(?:%s)$' % '|'.join(
+        _arn_glob_to_regex(resource) for resource in unique_resources))
+
+
 class ARNMatcher(object):
     def __init__(self, target_arn: str) -> None:
         self._arn = target_arn
 
-    def _resource_match(self, resource: str) -> bool:
-        # Arn matching supports two special case characters that are not
-        # escapable. * represents a glob which translates to a non-greedy
-        # match of any number of characters. ? which is any single character.
-        # These are easy to translate to a regex using .*? and . respectively.
-        escaped_resource = re.escape(resource)
-        resource_regex = escaped_resource.replace(r'\?', '.').replace(
-            r'\*', '.*?')
-        resource_regex = '^%s$' % resource_regex
-        return re.match(resource_regex, self._arn) is not None
-
     def does_any_resource_match(self, resources: List[str]) -> bool:
-        for resource in resources:
-            if self._resource_match(resource):
-                return True
-        return False
+        pattern = compile_arn_patterns(tuple(resources))
+        return pattern.match(self._arn) is not None
 
 
 class RouteMatcher(object):
@@ -194,12 +246,16 @@ class LambdaEventConverter(object):
             # If no query parameters are provided, API gateway maps
             # this to None so we're doing this for parity.
             event['multiValueQueryStringParameters'] = None
+        self._add_body(event, headers, body)
+        return event
+
+    def _add_body(self, event: EventType, headers: Dict[str, Any],
+                  body: Optional[bytes]) -> None:
         if self._is_binary(headers) and body is not None:
             event['body'] = base64.b64encode(body).decode('ascii')
             event['isBase64Encoded'] = True
         else:
             event['body'] = body
-        return event
 
 
 class LocalGatewayException(Exception):
@@ -227,7 +283,8 @@ class NotAuthorizedError(LocalGatewayException):
 class LambdaContext(object):
     def __init__(self, function_name: str, memory_size: int,
                  max_runtime_ms: int = 3000,
-                 time_source: Optional[Clock] = None) -> None:
+                 time_source: Optional[Clock] = None,
+                 aws_request_id: Optional[str] = None) -> None:
         if time_source is None:
             time_source = Clock()
         self._time_source = time_source
@@ -259,7 +316,9 @@ class LambdaContext(object):
 
         # AWS request ID associated with the request. This is the ID returned
         # to the client that called the invoke method.
-        self.aws_request_id = str(uuid.uuid4())
+        if aws_request_id is None:
+            aws_request_id = str(uuid.uuid4())
+        self.aws_request_id = aws_request_id
 
         # The name of the CloudWatch log group where you can find logs written
         # by your Lambda function.
@@ -293,13 +352,91 @@ class LambdaContext(object):
 
 
 LocalAuthPair = Tuple[EventType, LambdaContext]
+AuthCacheKey = Tuple[str, str]
+
+
+class CachedAuthResult(object):
+    def __init__(self, auth_result: ResponseType, expires_at: float) -> None:
+        self.auth_result = auth_result
+        self.expires_at = expires_at
+        self._allowed_resources = compile_arn_patterns(
+            tuple(_allowed_invoke_resources(auth_result)))
+
+    def can_invoke(self, arn: str) -> bool:
+        return self._allowed_resources.match(arn) is not None
+
+
+class AuthorizerResultCache(object):
+    """Cache authorizer results the same way API Gateway does.
+
+    Results are cached per authorizer and identity source (the
+    authorization token) for the authorizer's ``ttl_seconds``.  The
+    policy in a cached result is checked against the ARN of each
+    request, so a cached policy can allow some routes and not others.
+    """
+
+    DEFAULT_TTL_SECONDS = 300
+    MAX_ENTRIES = 1000
+
+    def __init__(self, clock: Optional[Clock] = None,
+                 max_entries: int = MAX_ENTRIES) -> None:
+        if clock is None:
+            clock = Clock()
+        self._clock = clock
+        self._max_entries = max_entries
+        self._entries: Dict[AuthCacheKey, CachedAuthResult] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: AuthCacheKey) -> Optional[CachedAuthResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock.time():
+                del self._entries[key]
+                entry = None
+            return entry
+
+    def put(self, key: AuthCacheKey, auth_result: ResponseType,
+            ttl_seconds: Optional[int]) -> CachedAuthResult:
+        if ttl_seconds is None:
+            ttl_seconds = self.DEFAULT_TTL_SECONDS
+        now = self._clock.time()
+        entry = CachedAuthResult(auth_result, now + ttl_seconds)
+        if ttl_seconds <= 0:
+            # A TTL of 0 disables caching for the authorizer.
+            return entry
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self._max_entries:
+                self._evict(now)
+            self._entries[key] = entry
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self, now: float) -> None:
+        expired = [k for k, v in self._entries.items() if v.expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        # Entries are kept in insertion order, so if nothing has expired
+        # we drop the oldest entries.
+        while len(self._entries) >= self._max_entries:
+            del self._entries[next(iter(self._entries))]
 
 
 class LocalGatewayAuthorizer(object):
     """A class for running user defined authorizers in local mode."""
-    def __init__(self, app_object: Chalice) -> None:
+    def __init__(self, app_object: Chalice,
+                 cache: Optional[AuthorizerResultCache] = None) -> None:
         self._app_object = app_object
         self._arn_builder = LocalARNBuilder()
+        if cache is None:
+            cache = AuthorizerResultCache()
+        self._cache = cache
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
 
     def authorize(self,
                   raw_path: str,
@@ -355,16 +492,10 @@ class LocalGatewayAuthorizer(object):
         arn = self._arn_builder.build_arn(method, raw_path)
         auth_event = self._prepare_authorizer_event(arn, lambda_event,
                                                     lambda_context)
-        auth_result = authorizer(auth_event, lambda_context)
-        if auth_result is None:
-            raise InvalidAuthorizerError(
-                {'x-amzn-RequestId': lambda_context.aws_request_id,
-                 'x-amzn-ErrorType': 'AuthorizerConfigurationException'},
-                b'{"message":null}'
-            )
-        authed = self._check_can_invoke_view_function(arn, auth_result)
-        if authed:
-            lambda_event = self._update_lambda_event(lambda_event, auth_result)
+        cached = self._get_auth_result(authorizer, auth_event, lambda_context)
+        if cached.can_invoke(arn):
+            lambda_event = self._update_lambda_event(
+                lambda_event, cached.auth_result)
         else:
             raise ForbiddenError(
                 {'x-amzn-RequestId': lambda_context.aws_request_id,
@@ -373,21 +504,24 @@ class LocalGatewayAuthorizer(object):
                  b'"User is not authorized to access this resource"}'))
         return lambda_event, lambda_context
 
-    def _check_can_invoke_view_function(self,
-                                        arn: str,
-                                        auth_result: ResponseType) -> bool:
-        policy = auth_result.get('policyDocument', {})
-        statements = policy.get('Statement', [])
-        allow_resource_statements = []
-        for statement in statements:
-            if statement.get('Effect') == 'Allow' and \
-                    (statement.get('Action') == 'execute-api:Invoke' or
-                     'execute-api:Invoke' in statement.get('Action')):
-                for resource in statement.get('Resource'):
-                    allow_resource_statements.append(resource)
-
-        arn_matcher = ARNMatcher(arn)
-        return arn_matcher.does_any_resource_match(allow_resource_statements)
+    def _get_auth_result(self, authorizer: Any,
+                         auth_event: EventType,
+                         lambda_context: LambdaContext) -> CachedAuthResult:
+        key = (authorizer.name, auth_event['authorizationToken'])
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        auth_result = authorizer(auth_event, lambda_context)
+        if auth_result is None:
+            raise InvalidAuthorizerError(
+                {'x-amzn-RequestId': lambda_context.aws_request_id,
+                 'x-amzn-ErrorType': 'AuthorizerConfigurationException'},
+                b'{"message":null}'
+            )
+        ttl_seconds = None
+        if authorizer.config is not None:
+            ttl_seconds = authorizer.config.ttl_seconds
+        return self._cache.put(key, auth_result, ttl_seconds)
 
     def _route_for_event(self,
                          lambda_event: EventType) -> Optional[RouteEntry]:
@@ -408,7 +542,9 @@ class LocalGatewayAuthorizer(object):
 
     def _update_lambda_event(self, lambda_event: EventType,
                              auth_result: ResponseType) -> EventType:
-        auth_context = auth_result['context']
+        # The auth result can be cached and reused across requests,
+        # so we don't modify its context in place.
+        auth_context = dict(auth_result['context'])
         auth_context.update({
             'principalId': auth_result['principalId']
         })
@@ -444,6 +580,19 @@ class LocalGatewayAuthorizer(object):
         return value
 
 
+def _allowed_invoke_resources(auth_result: ResponseType) -> List[str]:
+    policy = auth_result.get('policyDocument', {})
+    statements = policy.get('Statement', [])
+    allow_resource_statements = []
+    for statement in statements:
+        if statement.get('Effect') == 'Allow' and \
+                (statement.get('Action') == 'execute-api:Invoke' or
+                 'execute-api:Invoke' in statement.get('Action')):
+            for resource in statement.get('Resource'):
+                allow_resource_statements.append(resource)
+    return allow_resource_statements
+
+
 class LocalGateway(object):
     """A class for faking the behavior of API Gateway."""
 
@@ -458,6 +607,9 @@ class LocalGateway(object):
         )
         self._authorizer = LocalGatewayAuthorizer(app_object)
 
+    def clear_cache(self) -> None:
+        self._authorizer.clear_cache()
+
     def _generate_lambda_context(self) -> LambdaContext:
         if self._config.lambda_timeout is None:
             timeout = self.MAX_LAMBDA_EXECUTION_TIME * 1000
@@ -578,6 +730,47 @@ class LocalGateway(object):
         return cors_headers
 
 
+def handle_http_request(gateway: LocalGateway, method: str, path: str,
+                        headers: HeaderType,
+                        body: Optional[bytes]) -> HTTPResponse:
+    """Handle a request with the gateway and return the HTTP response.
+
+    The response is returned as the status code, a list of header
+    names and values, and the response body.
+    """
+    try:
+        response = gateway.handle_request(
+            method=method, path=path, headers=headers, body=body)
+    except LocalGatewayException as e:
+        return _create_http_response(e.CODE, e.headers, e.body)
+    response_headers = response['headers'].copy()
+    response_headers.update(response['multiValueHeaders'])
+    response_body = response['body']
+    if response.get('isBase64Encoded'):
+        response_body = base64.b64decode(response_body)
+    return _create_http_response(
+        response['statusCode'], response_headers, response_body)
+
+
+def _create_http_response(status_code: int, headers: HeaderType,
+                          body: Optional[Union[str, bytes]]) -> HTTPResponse:
+    header_list: List[Tuple[str, str]] = []
+    if body is None:
+        body = b''
+    else:
+        if not isinstance(body, bytes):
+            body = body.encode('utf-8')
+        header_list.append(
+            ('Content-Type', headers.pop('Content-Type', 'application/json')))
+    header_list.append(('Content-Length', str(len(body))))
+    for name, value in headers.items():
+        if isinstance(value, list):
+            header_list.extend((name, str(v)) for v in value)
+        else:
+            header_list.append((name, str(value)))
+    return status_code, header_list, body
+
+
 class ChaliceRequestHandler(BaseHTTPRequestHandler):
     """A class for mapping raw HTTP events to and from LocalGateway."""
     protocol_version = 'HTTP/1.1'
@@ -587,8 +780,11 @@ class ChaliceRequestHandler(BaseHTTPRequestHandler):
                  client_address: Tuple[str, int],
                  server: HTTPServer,
                  app_object: Chalice,
-                 config: Config) -> None:
-        self.local_gateway = LocalGateway(app_object, config)
+                 config: Config,
+                 local_gateway: Optional[LocalGateway] = None) -> None:
+        if local_gateway is None:
+            local_gateway = LocalGateway(app_object, config)
+        self.local_gateway = local_gateway
         BaseHTTPRequestHandler.__init__(
             self, request, client_address, server)  # type: ignore
 
@@ -602,76 +798,17 @@ class ChaliceRequestHandler(BaseHTTPRequestHandler):
 
     def _generic_handle(self) -> None:
         headers, body = self._parse_payload()
-        try:
-            response = self.local_gateway.handle_request(
-                method=self.command,
-                path=self.path,
-                headers=headers,
-                body=body
-            )
-            status_code = response['statusCode']
-            headers = response['headers'].copy()
-            headers.update(response['multiValueHeaders'])
-            response = self._handle_binary(response)
-            body = response['body']
-            self._send_http_response(status_code, headers, body)
-        except LocalGatewayException as e:
-            self._send_error_response(e)
-
-    def _handle_binary(self, response: Dict[str, Any]) -> Dict[str, Any]:
-        if response.get('isBase64Encoded'):
-            body = base64.b64decode(response['body'])
-            response['body'] = body
-        return response
-
-    def _send_error_response(self, error: LocalGatewayException) -> None:
-        code = error.CODE
-        headers = error.headers
-        body = error.body
-        self._send_http_response(code, headers, body)
-
-    def _send_http_response(self,
-                            code: int,
-                            headers: HeaderType,
-                            body: Optional[Union[str, bytes]]) -> None:
-        if body is None:
-            self._send_http_response_no_body(code, headers)
-        else:
-            self._send_http_response_with_body(code, headers, body)
-
-    def _send_http_response_with_body(self,
-                                      code: int,
-                                      headers: HeaderType,
-                                      body: Union[str, bytes]) -> None:
-        self.send_response(code)
-        if not isinstance(body, bytes):
-            body = body.encode('utf-8')
-        self.send_header('Content-Length', str(len(body)))
-        content_type = headers.pop(
-            'Content-Type', 'application/json')
-        self.send_header('Content-Type', content_type)
-        self._send_headers(headers)
-        self.wfile.write(body)
+        status_code, response_headers, response_body = handle_http_request(
+            self.local_gateway, self.command, self.path, headers, body)
+        self.send_response(status_code)
+        for name, value in response_headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(response_body)
 
     do_GET = do_PUT = do_POST = do_HEAD = do_DELETE = \
         do_PATCH = do_OPTIONS = _generic_handle
 
-    def _send_http_response_no_body(self,
-                                    code: int,
-                                    headers: HeaderType) -> None:
-        headers['Content-Length'] = '0'
-        self.send_response(code)
-        self._send_headers(headers)
-
-    def _send_headers(self, headers: HeaderType) -> None:
-        for header_name, header_value in headers.items():
-            if isinstance(header_value, list):
-                for value in header_value:
-                    self.send_header(header_name, value)
-            else:
-                self.send_header(header_name, header_value)
-        self.end_headers()
-
 
 class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
     """Threading mixin to better support browsers.
@@ -684,6 +821,208 @@ class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
     """
 
     daemon_threads = True
+    # The socketserver default backlog of 5 causes connections to be
+    # refused under any real amount of concurrency.
+    request_queue_size = socket.SOMAXCONN
+
+
+class ThreadPoolHTTPServer(HTTPServer):
+    """HTTP server that handles connections with a bounded thread pool.
+
+    Unlike ``ThreadedHTTPServer`` this won't create a new thread for
+    every connection.  Idle keep-alive connections are closed after
+    ``keep_alive_timeout`` seconds so they can't hold on to a worker
+    thread indefinitely.
+    """
+
+    request_queue_size = socket.SOMAXCONN
+    keep_alive_timeout = 5
+    MAX_THREADS = 32
+
+    def __init__(self,
+                 server_address: Tuple[str, int],
+                 request_handler_cls: HandlerCls,
+                 max_threads: Optional[int] = None) -> None:
+        HTTPServer.__init__(self, server_address, request_handler_cls)
+        if max_threads is None:
+            max_threads = self.MAX_THREADS
+        # Threads are only started on demand, so it's safe to create
+        # the pool before forking worker processes.
+        self._pool = ThreadPoolExecutor(max_workers=max_threads)
+
+    def process_request(self, request: Any,
+                        client_address: Tuple[str, int]) -> None:
+        self._pool.submit(self._process_request_in_pool,
+                          request, client_address)
+
+    def _process_request_in_pool(self, request: Any,
+                                 client_address: Tuple[str, int]) -> None:
+        try:
+            request.settimeout(self.keep_alive_timeout)
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        HTTPServer.server_close(self)
+        self._pool.shutdown(wait=False)
+
+
+class AsyncioHTTPServer(object):
+    """HTTP/1.1 server built on asyncio streams.
+
+    Connections are handled on the event loop so open keep-alive
+    connections are cheap, and pipelined requests on a connection are
+    answered in order.  View functions are synchronous so they're run
+    in a bounded thread pool.  The interface mirrors the parts of
+    ``socketserver.BaseServer`` used by ``LocalDevServer``.
+    """
+
+    keep_alive_timeout = 30
+    MAX_THREADS = 32
+    _CONNECTION_ERRORS = (
+        ConnectionError, ValueError, asyncio.IncompleteReadError,
+        asyncio.LimitOverrunError, asyncio.TimeoutError,
+    )
+
+    def __init__(self,
+                 server_address: Tuple[str, int],
+                 request_handler_cls: Optional[HandlerCls] = None,
+                 gateway: Optional[LocalGateway] = None,
+                 max_threads: Optional[int] = None) -> None:
+        # request_handler_cls is only accepted so this can be used as a
+        # server_cls of LocalDevServer, requests go directly through the
+        # gateway.
+        if gateway is None:
+            raise TypeError("AsyncioHTTPServer requires a gateway.")
+        self._gateway = gateway
+        if max_threads is None:
+            max_threads = self.MAX_THREADS
+        self._max_threads = max_threads
+        # The socket is bound up front, but the event loop is only
+        # created when we start serving so this works with forked
+        # worker processes.
+        self.socket = socket.create_server(
+            server_address, backlog=socket.SOMAXCONN)
+        self.server_address = self.socket.getsockname()[:2]
+        self.server_port = self.server_address[1]
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._shutdown_requested: Optional[asyncio.Event] = None
+        self._is_shut_down = threading.Event()
+        self._shutdown_called = False
+        self._lock = threading.Lock()
+
+    def serve_forever(self) -> None:
+        self._is_shut_down.clear()
+        try:
+            asyncio.run(self._serve_forever())
+        finally:
+            self._shutdown_called = False
+            self._is_shut_down.set()
+
+    def handle_request(self) -> None:
+        asyncio.run(self._handle_single_request())
+
+    def shutdown(self) -> None:
+        # Like socketserver, this must be called from another thread
+        # than the one running serve_forever().
+        with self._lock:
+            self._shutdown_called = True
+            loop, shutdown_requested = self._loop, self._shutdown_requested
+        if loop is not None and shutdown_requested is not None:
+            loop.call_soon_threadsafe(shutdown_requested.set)
+            self._is_shut_down.wait()
+
+    def server_close(self) -> None:
+        self.socket.close()
+
+    async def _serve_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=self._max_threads))
+        with self._lock:
+            if self._shutdown_called:
+                return
+            self._shutdown_requested = asyncio.Event()
+            self._loop = loop
+        server = await asyncio.start_server(
+            self._handle_connection, sock=self.socket)
+        try:
+            await self._shutdown_requested.wait()
+        finally:
+            self._loop = None
+            server.close()
+
+    async def _handle_single_request(self) -> None:
+        self.socket.setblocking(False)
+        loop = asyncio.get_running_loop()
+        conn, _ = await loop.sock_accept(self.socket)
+        reader, writer = await asyncio.open_connection(sock=conn)
+        await self._handle_connection(reader, writer, max_requests=1)
+
+    async def _handle_connection(self,
+                                 reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter,
+                                 max_requests: Optional[int] = None) -> None:
+        loop = asyncio.get_running_loop()
+        handled = 0
+        try:
+            keep_alive = True
+            while keep_alive and handled != max_requests:
+                # Pipelined requests are already buffered in the reader,
+                # so they're read and answered one after another.
+                request = await asyncio.wait_for(
+                    self._read_request(reader), self.keep_alive_timeout)
+                if request is None:
+                    break
+                method, path, headers, body, keep_alive = request
+                response = await loop.run_in_executor(
+                    None, self._handle_request, method, path, headers, body,
+                    keep_alive)
+                writer.write(response)
+                await writer.drain()
+                handled += 1
+        except self._CONNECTION_ERRORS:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, str, HeaderType, Optional[bytes], bool]]:
+        try:
+            raw_headers = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            # The client closed the connection between requests.
+            return None
+        request_line, _, header_block = raw_headers.partition(b'\r\n')
+        method, path, version = request_line.decode('iso-8859-1').split()
+        message = parse_headers(io.BytesIO(header_block))
+        body = None
+        content_length = int(message.get('content-length', '0'))
+        if content_length > 0:
+            body = await reader.readexactly(content_length)
+        connection = message.get('connection', '').lower()
+        if version == 'HTTP/1.0':
+            keep_alive = connection == 'keep-alive'
+        else:
+            keep_alive = connection != 'close'
+        return method, path, dict(message), body, keep_alive
+
+    def _handle_request(self, method: str, path: str, headers: HeaderType,
+                        body: Optional[bytes], keep_alive: bool) -> bytes:
+        status_code, header_list, response_body = handle_http_request(
+            self._gateway, method, path, headers, body)
+        reason = BaseHTTPRequestHandler.responses.get(status_code, ('',))[0]
+        lines = ['HTTP/1.1 %s %s' % (status_code, reason),
+                 'Date: %s' % formatdate(usegmt=True)]
+        lines.extend('%s: %s' % header for header in header_list)
+        if not keep_alive:
+            lines.append('Connection: close')
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('iso-8859-1')
+        return head + response_body
 
 
 class LocalDevServer(object):
@@ -691,22 +1030,65 @@ class LocalDevServer(object):
                  app_object: Chalice,
                  config: Config, host: str, port: int,
                  handler_cls: HandlerCls = ChaliceRequestHandler,
-                 server_cls: ServerCls = ThreadedHTTPServer) -> None:
+                 server_cls: ServerCls = ThreadedHTTPServer,
+                 workers: int = 1,
+                 local_gateway: Optional[LocalGateway] = None) -> None:
         self.app_object = app_object
         self.host = host
         self.port = port
+        self.workers = workers
+        if local_gateway is None:
+            local_gateway = LocalGateway(app_object, config)
+        self.local_gateway = local_gateway
+        # A single gateway is shared by every connection so state such
+        # as cached authorizer results is shared across requests.
         self._wrapped_handler = functools.partial(
-            handler_cls, app_object=app_object, config=config)
+            handler_cls, app_object=app_object, config=config,
+            local_gateway=local_gateway)
         self.server = server_cls((host, port), self._wrapped_handler)
+        self._worker_pids: List[int] = []
 
     def handle_single_request(self) -> None:
         self.server.handle_request()
 
     def serve_forever(self) -> None:
         print("Serving on http://%s:%s" % (self.host, self.port))
-        self.server.serve_forever()
+        if self.workers > 1:
+            self._serve_forever_in_workers()
+        else:
+            self.server.serve_forever()
+
+    def _serve_forever_in_workers(self) -> None:
+        # The listening socket is already bound, so each forked worker
+        # accepts connections from the same socket and the kernel
+        # spreads the connections across the processes.
+        for _ in range(self.workers):
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    self.server.serve_forever()
+                finally:
+                    os._exit(0)  # pylint: disable=protected-access
+            self._worker_pids.append(pid)
+        try:
+            for pid in self._worker_pids:
+                os.waitpid(pid, 0)
+        finally:
+            self._stop_workers()
+
+    def _stop_workers(self) -> None:
+        pids, self._worker_pids = self._worker_pids, []
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
 
     def shutdown(self) -> None:
+        if self.workers > 1:
+            self._stop_workers()
+            return
         # This must be called from another thread of else it
         # will deadlock.
         self.server.shutdown()
@@ -726,6 +1108,10 @@ class HTTPServerThread(threading.Thread):
         self._server: Optional[LocalDevServer] = None
         self.daemon = True
 
+    @property
+    def server(self) -> Optional[LocalDevServer]:
+        return self._server
+
     def run(self) -> None:
         self._server = self._server_factory()
         self._server.serve_forever()
@@ -751,7 +1137,3 @@ class LocalChalice(Chalice):
     @current_request.setter
     def current_request(self, value: Request) -> None:  # type: ignore
         self._THREAD_LOCAL.current_request = value
-
-
-class CustomLocalChalice(LocalChalice):
-    pass
@@ -6,17 +6,39 @@ with the logs generated by AWS Lambda.
 """
 from __future__ import annotations
 import time
+import heapq
+import logging
+import queue
+import itertools
+import threading
 from datetime import datetime, timedelta
-from dataclasses import dataclass
-from collections import defaultdict
-
-from typing import Any, Optional, Iterator, Dict, IO, Callable, Set  # noqa
+from dataclasses import dataclass, replace
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from typing import (  # noqa
+    Any,
+    Optional,
+    Iterator,
+    Dict,
+    IO,
+    Callable,
+    Set,
+    List,
+    Deque,
+    Tuple,
+    Sequence,
+    Union,
+)
 from botocore.session import Session  # noqa
 
 from chalice.awsclient import TypedAWSClient, CWLogEvent  # noqa
 from chalice.utils import TimestampConverter
 
 
+LOGGER = logging.getLogger(__name__)
+
+
 @dataclass
 class LogRetrieveOptions(object):
     max_entries: Optional[int] = None
@@ -44,7 +66,7 @@ class LogRetrieveOptions(object):
 
 
 def display_logs(
-    retriever: LogRetriever,
+    retriever: Union[LogRetriever, MultiLogRetriever],
     stream: IO[str],
     retrieve_options: LogRetrieveOptions,
 ) -> None:
@@ -152,6 +174,71 @@ class LogRetriever(object):
                 return
 
 
+class MultiLogRetriever(object):
+    """Retrieve logs from multiple log groups as a single stream.
+
+    When the underlying retrievers are finite the events are merged in
+    timestamp order.  When following logs, events are written as they
+    arrive from any of the log groups.
+
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self, retrievers: Sequence[LogRetriever], follow: bool = False
+    ) -> None:
+        self._retrievers = retrievers
+        self._follow = follow
+
+    def retrieve_logs(
+        self, retrieve_options: LogRetrieveOptions
+    ) -> Iterator[CWLogEvent]:
+        # max_entries applies to the combined output, not to each
+        # individual log group.
+        options = replace(retrieve_options, max_entries=None)
+        all_events = [r.retrieve_logs(options) for r in self._retrievers]
+        if self._follow:
+            events = self._interleave_as_received(all_events)
+        else:
+            events = heapq.merge(*all_events, key=_event_timestamp)
+        yield from itertools.islice(events, retrieve_options.max_entries)
+
+    def _interleave_as_received(
+        self, all_events: List[Iterator[CWLogEvent]]
+    ) -> Iterator[CWLogEvent]:
+        received: queue.Queue = queue.Queue()
+        for events in all_events:
+            t = threading.Thread(
+                target=self._forward_events, args=(events, received)
+            )
+            t.daemon = True
+            t.start()
+        remaining = len(all_events)
+        try:
+            while remaining:
+                event = received.get()
+                if event is self._STOP:
+                    remaining -= 1
+                    continue
+                yield event
+        except KeyboardInterrupt:
+            pass
+
+    def _forward_events(
+        self, events: Iterator[CWLogEvent], received: queue.Queue
+    ) -> None:
+        try:
+            for event in events:
+                received.put(event)
+        finally:
+            received.put(self._STOP)
+
+
+def _event_timestamp(event: CWLogEvent) -> datetime:
+    return event['timestamp']
+
+
 class BaseLogEventGenerator(object):
     def __init__(self, client: TypedAWSClient) -> None:
         self._client = client
@@ -172,6 +259,183 @@ class LogEventGenerator(BaseLogEventGenerator):
         yield from logs
 
 
+class ParallelLogEventGenerator(BaseLogEventGenerator):
+    """Fetch the log streams of a log group concurrently.
+
+    The log streams with events after the requested start time are
+    discovered up front, the pages of each stream are fetched in a
+    thread pool, and the per stream events are merged by timestamp.
+
+    The first page of every stream is needed before any event can be
+    merged, so without a start time, or with more than ``max_streams``
+    streams, the log group is paginated through instead.
+
+    """
+
+    _MAX_WORKERS = 10
+    _MAX_STREAMS = 100
+
+    def __init__(
+        self,
+        client: TypedAWSClient,
+        max_workers: int = _MAX_WORKERS,
+        max_streams: int = _MAX_STREAMS,
+    ) -> None:
+        super(ParallelLogEventGenerator, self).__init__(client)
+        self._max_workers = max_workers
+        self._max_streams = max_streams
+
+    def iter_log_events(
+        self, log_group_name: str, options: LogRetrieveOptions
+    ) -> Iterator[CWLogEvent]:
+        if options.start_time is None:
+            yield from self._iter_log_group_events(log_group_name, options)
+            return
+        stream_names = self._client.get_log_stream_names(
+            log_group_name, start_time=options.start_time
+        )
+        if not stream_names:
+            return
+        if len(stream_names) > self._max_streams:
+            yield from self._iter_log_group_events(log_group_name, options)
+            return
+        pool = ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            # The first page of every stream is requested before we start
+            # merging so they're all fetched concurrently.  After that,
+            # each stream prefetches its next page while its current
+            # page is being consumed.
+            first_pages = [
+                self._fetch_page(
+                    pool, log_group_name, name, options.start_time
+                )
+                for name in stream_names
+            ]
+            streams = [
+                self._iter_stream_events(
+                    pool, first_page, log_group_name, name, options.start_time
+                )
+                for first_page, name in zip(first_pages, stream_names)
+            ]
+            yield from heapq.merge(*streams, key=_event_timestamp)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_log_group_events(
+        self, log_group_name: str, options: LogRetrieveOptions
+    ) -> Iterator[CWLogEvent]:
+        return self._client.iter_log_events(
+            log_group_name=log_group_name, start_time=options.start_time
+        )
+
+    def _fetch_page(
+        self,
+        pool: ThreadPoolExecutor,
+        log_group_name: str,
+        stream_name: str,
+        start_time: Optional[datetime],
+        next_token: Optional[str] = None,
+    ) -> Future:
+        return pool.submit(
+            self._client.filter_log_events,
+            log_group_name=log_group_name,
+            start_time=start_time,
+            next_token=next_token,
+            log_stream_names=[stream_name],
+        )
+
+    def _iter_stream_events(
+        self,
+        pool: ThreadPoolExecutor,
+        page: Future,
+        log_group_name: str,
+        stream_name: str,
+        start_time: Optional[datetime],
+    ) -> Iterator[CWLogEvent]:
+        while True:
+            response = page.result()
+            next_token = response.get('nextToken')
+            if next_token is not None:
+                page = self._fetch_page(
+                    pool, log_group_name, stream_name, start_time, next_token
+                )
+            yield from response['events']
+            if next_token is None:
+                return
+
+
+class LogEventIdCache(object):
+    """Track the ids of recently seen log events.
+
+    Entries are kept in insertion order so the oldest ones can be
+    evicted in O(1) once they fall outside of the time window, and
+    the number of entries is capped so memory use stays bounded
+    regardless of how long logs are followed.
+
+    """
+
+    _MAX_ENTRIES = 10000
+
+    def __init__(
+        self,
+        window: Optional[timedelta] = None,
+        max_entries: int = _MAX_ENTRIES,
+    ) -> None:
+        self._window = window
+        self._max_entries = max_entries
+        self._entries: Deque[Tuple[datetime, str]] = deque()
+        self._seen: Set[Tuple[datetime, str]] = set()
+        self.most_recent: Optional[datetime] = None
+        self.duplicate_count = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, event: CWLogEvent) -> bool:
+        """Add an event to the cache.
+
+        Returns False, and increments ``duplicate_count``, if the
+        event has already been seen.
+
+        """
+        key = (event['timestamp'], event['eventId'])
+        if key in self._seen:
+            self.duplicate_count += 1
+            return False
+        self._seen.add(key)
+        self._entries.append(key)
+        if self.most_recent is None or key[0] > self.most_recent:
+            self.most_recent = key[0]
+        self.evict()
+        return True
+
+    def evict(self) -> None:
+        """Remove entries older than the time window.
+
+        Entries are removed from the oldest end until we hit one that's
+        still inside the window, so an out of order entry can
+        temporarily keep older entries alive until the size cap is
+        reached.
+
+        """
+        if self.most_recent is None:
+            return
+        cutoff = self.most_recent
+        if self._window is not None:
+            cutoff = cutoff - self._window
+        entries = self._entries
+        while entries and (
+            entries[0][0] < cutoff or len(entries) > self._max_entries
+        ):
+            self._seen.discard(entries.popleft())
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._seen.clear()
+        self.most_recent = None
+        self.duplicate_count = 0
+
+
 class FollowLogEventGenerator(BaseLogEventGenerator):
 
     _POLL_TIME = 5
@@ -181,12 +445,22 @@ class FollowLogEventGenerator(BaseLogEventGenerator):
         client: TypedAWSClient,
         sleep: Callable[[int], None] = time.sleep,
         poll_time: int = _POLL_TIME,
+        event_id_cache: Optional[LogEventIdCache] = None,
     ) -> None:
         self._client = client
         self._sleep = sleep
-        self._event_id_cache: Dict[datetime, Set[str]] = defaultdict(set)
+        if event_id_cache is None:
+            # We poll using the most recent timestamp we've seen as the
+            # start time, so we only need to remember the events at or
+            # after that timestamp to dedupe the next poll.
+            event_id_cache = LogEventIdCache()
+        self._event_id_cache = event_id_cache
         self._poll_time = poll_time
 
+    @property
+    def duplicate_count(self) -> int:
+        return self._event_id_cache.duplicate_count
+
     def iter_log_events(
         self, log_group_name: str, options: LogRetrieveOptions
     ) -> Iterator[CWLogEvent]:
@@ -197,6 +471,12 @@ class FollowLogEventGenerator(BaseLogEventGenerator):
             )
         except KeyboardInterrupt:
             pass
+        finally:
+            LOGGER.debug(
+                "Skipped %s duplicate log events from %s",
+                self.duplicate_count,
+                log_group_name,
+            )
 
     def _loop_on_filter_log_events(
         self, log_group_name: str, start_time: Optional[datetime]
@@ -209,8 +489,7 @@ class FollowLogEventGenerator(BaseLogEventGenerator):
         while True:
             response = self._client.filter_log_events(**kwargs)
             for event in response['events']:
-                if not self._in_cache(event):
-                    self._add_to_cache(event)
+                if self._event_id_cache.add(event):
                     yield event
             if 'nextToken' in response:
                 # If there's more pages we go through the normal pagination
@@ -218,7 +497,8 @@ class FollowLogEventGenerator(BaseLogEventGenerator):
                 kwargs['next_token'] = response['nextToken']
             else:
                 kwargs.pop('next_token', None)
-                if self._event_id_cache:
+                most_recent_start_time = self._event_id_cache.most_recent
+                if most_recent_start_time is not None:
                     # However, if there's no nextToken it means we've iterated
                     # through all the existing log events.  We now need to
                     # start polling for new events.  To do this, we need
@@ -232,18 +512,5 @@ class FollowLogEventGenerator(BaseLogEventGenerator):
                     # a log stream and the new start time we're going to use
                     # to start polling, especially at high rates of log
                     # generation.
-                    most_recent_start_time = max(self._event_id_cache)
                     kwargs['start_time'] = most_recent_start_time
-                    self._prune_old_cache_entries(most_recent_start_time)
                     self._sleep(self._poll_time)
-
-    def _in_cache(self, event: CWLogEvent) -> bool:
-        return event['eventId'] in self._event_id_cache[event['timestamp']]
-
-    def _add_to_cache(self, event: CWLogEvent) -> None:
-        self._event_id_cache[event['timestamp']].add(event['eventId'])
-
-    def _prune_old_cache_entries(self, timestamp: datetime) -> None:
-        surviving_entries = self._event_id_cache[timestamp]
-        self._event_id_cache.clear()
-        self._event_id_cache[timestamp] = surviving_entries
@@ -1,12 +1,15 @@
 # pylint: disable=too-many-lines
 
 import copy
+import dataclasses
+import enum
+import hashlib
 import json
 import os
 import re
 
 import six
-from typing import Any, Optional, Dict, List, Set, Union  # noqa
+from typing import Any, Optional, Dict, List, Set, Union, IO  # noqa
 from typing import cast
 
 import yaml
@@ -19,6 +22,7 @@ from chalice.deploy.swagger import (
 from chalice.utils import (
     OSUtils, UI, serialize_to_json, to_cfn_resource_name
 )
+from chalice import __version__ as chalice_version
 from chalice.awsclient import TypedAWSClient  # noqa
 from chalice.config import Config  # noqa
 from chalice.deploy import models
@@ -27,14 +31,21 @@ from chalice.deploy.deployer import BuildStage  # noqa
 from chalice.deploy.deployer import create_build_stage
 
 
-def create_app_packager(
-        config, options, package_format='cloudformation',
-        template_format='json', merge_template=None):
-    # type: (Config, PackageOptions, str, str, Optional[str]) -> AppPackager
+# The libyaml bindings are much faster than the pure Python dumper
+# when they're available.
+_SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+def create_app_packager(config,  # type: Config
+                        options,  # type: PackageOptions
+                        package_format='cloudformation',  # type: str
+                        template_format='json',  # type: str
+                        merge_template=None,  # type: Optional[str]
+                        swagger_file=False,  # type: bool
+                        ):
+    # type: (...) -> AppPackager
     osutils = OSUtils()
     ui = UI()
-    application_builder = ApplicationGraphBuilder()
-    deps_builder = DependencyBuilder()
     post_processors = []  # type: List[TemplatePostProcessor]
     generator = None  # type: Union[None, TemplateGenerator]
 
@@ -57,7 +68,11 @@ def create_app_packager(
                 osutils=osutils,
                 merger=TemplateDeepMerger(),
                 template_serializer=template_serializer,
-                merge_template=merge_template)])
+                merge_template=merge_template,
+                template_cache=TemplateCache(osutils))])
+        if swagger_file:
+            post_processors.append(SAMSwaggerFilePostProcessor(
+                osutils=osutils, template_serializer=template_serializer))
         generator = SAMTemplateGenerator(config, options)
     else:
         build_stage = create_build_stage(
@@ -67,14 +82,15 @@ def create_app_packager(
             TerraformCodeLocationPostProcessor(osutils=osutils))
 
     resource_builder = ResourceBuilder(
-        application_builder, deps_builder, build_stage)
+        ApplicationGraphBuilder(), DependencyBuilder(), build_stage)
 
     return AppPackager(
         generator,
         resource_builder,
         CompositePostProcessor(post_processors),
         template_serializer,
-        osutils)
+        osutils,
+        TemplateCache(osutils))
 
 
 class UnsupportedFeatureError(Exception):
@@ -90,6 +106,11 @@ class PackageOptions(object):
         # type: (TypedAWSClient) -> None
         self._client = client  # type: TypedAWSClient
 
+    @property
+    def region_name(self):
+        # type: () -> str
+        return self._client.region_name
+
     def service_principal(self, service):
         # type: (str) -> str
         dns_suffix = self._client.endpoint_dns_suffix(service,
@@ -140,6 +161,12 @@ class TemplateGenerator(object):
         # type: (List[models.Model]) -> Dict[str, Any]
         raise NotImplementedError()
 
+    def cache_key_inputs(self):
+        # type: () -> List[Any]
+        """Return everything besides the resources a template depends on."""
+        return [self.__class__.__name__, self._config.app_name,
+                self._config.chalice_stage, self._options.region_name]
+
     def _generate_filebasediampolicy(self, resource, template):
         # type: (models.FileBasedIAMPolicy, Dict[str, Any]) -> None
         pass
@@ -1452,6 +1479,103 @@ class TerraformGenerator(TemplateGenerator):
         pass
 
 
+class TemplateCache(object):
+    """Reuse templates created from the same inputs.
+
+    Templates are stored in ``.chalice/package-cache.json`` keyed by a
+    hash of everything they were created from.  Only the latest
+    template for each name is kept, e.g. one generated template per
+    package format and stage, so the file doesn't grow over time.
+    Nothing is cached for projects without a ``.chalice`` directory, or
+    for templates that JSON can't store unchanged, e.g. YAML templates
+    with unquoted dates or integer keys.
+
+    """
+
+    CACHE_FILENAME = 'package-cache.json'
+
+    def __init__(self, osutils):
+        # type: (OSUtils) -> None
+        self._osutils = osutils
+
+    def get(self, project_dir, name, key):
+        # type: (str, str, str) -> Optional[Dict[str, Any]]
+        entry = self._load(project_dir).get(name)
+        if entry is None or entry['key'] != key:
+            return None
+        return entry['template']
+
+    def set(self, project_dir, name, key, template):
+        # type: (str, str, str, Dict[str, Any]) -> None
+        filename = self._cache_filename(project_dir)
+        if filename is None or not self._is_json_safe(template):
+            return
+        cache = self._load(project_dir)
+        cache[name] = {'key': key, 'template': template}
+        self._osutils.set_file_contents(
+            filename,
+            json.dumps({'version': chalice_version, 'templates': cache}),
+            binary=False)
+
+    def _is_json_safe(self, template):
+        # type: (Dict[str, Any]) -> bool
+        try:
+            return json.loads(json.dumps(template)) == template
+        except (TypeError, ValueError):
+            return False
+
+    def _load(self, project_dir):
+        # type: (str) -> Dict[str, Any]
+        filename = self._cache_filename(project_dir)
+        if filename is None or not self._osutils.file_exists(filename):
+            return {}
+        try:
+            cache = json.loads(
+                self._osutils.get_file_contents(filename, binary=False))
+        except ValueError:
+            return {}
+        if cache.get('version') != chalice_version:
+            return {}
+        return cache['templates']
+
+    def _cache_filename(self, project_dir):
+        # type: (str) -> Optional[str]
+        chalice_dir = self._osutils.joinpath(project_dir, '.chalice')
+        if not self._osutils.directory_exists(chalice_dir):
+            return None
+        return self._osutils.joinpath(chalice_dir, self.CACHE_FILENAME)
+
+
+def template_cache_key(inputs):
+    # type: (Any) -> str
+    """Return a hash of JSON serializable data and resource models."""
+    return hashlib.sha256(json.dumps(
+        _encode_cache_inputs(inputs), sort_keys=True,
+        separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def _encode_cache_inputs(value):
+    # type: (Any) -> Any
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = dict((f.name, getattr(value, f.name))
+                      for f in dataclasses.fields(value))
+        fields['__class__'] = value.__class__.__name__
+        value = fields
+    elif isinstance(value, enum.Enum):
+        return [value.__class__.__name__, value.value]
+    if isinstance(value, dict):
+        return {str(k): _encode_cache_inputs(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_encode_cache_inputs(v) for v in value]
+    elif isinstance(value, (set, frozenset)):
+        return sorted(_encode_cache_inputs(list(value)), key=json.dumps)
+    elif value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    # There's no stable way to encode anything else, so make sure
+    # the key can't match a previous one.
+    return ['unknown', id(value)]
+
+
 class AppPackager(object):
     def __init__(self,
                  templater,  # type: TemplateGenerator
@@ -1459,6 +1583,7 @@ class AppPackager(object):
                  post_processor,  # type: TemplatePostProcessor
                  template_serializer,  # type: TemplateSerializer
                  osutils,  # type: OSUtils
+                 template_cache=None,  # type: Optional[TemplateCache]
                  ):
         # type: (...) -> None
         self._templater = templater
@@ -1466,6 +1591,7 @@ class AppPackager(object):
         self._template_post_processor = post_processor
         self._template_serializer = template_serializer
         self._osutils = osutils
+        self._template_cache = template_cache
 
     def _to_json(self, doc):
         # type: (Any) -> str
@@ -1481,23 +1607,51 @@ class AppPackager(object):
         resources = self._resource_builder.construct_resources(
             config, chalice_stage_name)
 
-        template = self._templater.generate(resources)
+        template = self._generate_template(config, chalice_stage_name,
+                                           resources)
         if not self._osutils.directory_exists(outdir):
             self._osutils.makedirs(outdir)
         self._template_post_processor.process(
             template, config, outdir, chalice_stage_name)
-        contents = self._template_serializer.serialize_template(template)
         extension = self._template_serializer.file_extension
         template_file = self._templater.template_file
         if template_file is None:
             raise RuntimeError("No template file configured for packager.")
         filename = os.path.join(
             outdir, template_file) + '.' + extension
-        self._osutils.set_file_contents(
-            filename=filename,
-            contents=contents,
-            binary=False
-        )
+        write_template_file(self._osutils, self._template_serializer,
+                            template, filename)
+
+    def _generate_template(self, config, chalice_stage_name, resources):
+        # type: (Config, str, List[models.Model]) -> Dict[str, Any]
+        if self._template_cache is None:
+            return self._templater.generate(resources)
+        # The deployment packages are named after a hash of their
+        # contents, so this also changes whenever the app's code does.
+        key = template_cache_key(
+            [chalice_version, self._templater.cache_key_inputs(),
+             resources])
+        name = '%s:%s' % (self._templater.template_file, chalice_stage_name)
+        template = self._template_cache.get(config.project_dir, name, key)
+        if template is None:
+            template = self._templater.generate(resources)
+            self._template_cache.set(config.project_dir, name, key, template)
+        return template
+
+
+def write_template_file(osutils, template_serializer, template, filename):
+    # type: (OSUtils, TemplateSerializer, Dict[str, Any], str) -> None
+    # The template is streamed to a temporary file that only replaces
+    # the existing file if they're different, so its mtime only changes
+    # when the template does.
+    tmp_filename = filename + '.tmp'
+    with osutils.open(tmp_filename, 'w') as f:
+        template_serializer.write_template(template, f)
+    if osutils.file_exists(filename) and \
+            osutils.file_contents_equal(tmp_filename, filename):
+        osutils.remove_file(tmp_filename)
+        return
+    osutils.move(tmp_filename, filename)
 
 
 class TemplatePostProcessor(object):
@@ -1509,6 +1663,19 @@ class TemplatePostProcessor(object):
         # type: (Dict[str, Any], Config, str, str) -> None
         raise NotImplementedError()
 
+    def _copy_deployment_package(self, filename, outdir, name, copied):
+        # type: (str, str, str, Dict[str, str]) -> str
+        # Functions with their own requirements_file have their own
+        # deployment package.  Any package other than the first one is
+        # named after the first function that uses it.
+        if filename not in copied:
+            basename = 'deployment.zip'
+            if copied:
+                basename = 'deployment-%s.zip' % name
+            self._osutils.copy(filename, os.path.join(outdir, basename))
+            copied[filename] = basename
+        return copied[filename]
+
 
 class SAMCodeLocationPostProcessor(TemplatePostProcessor):
 
@@ -1524,15 +1691,12 @@ class SAMCodeLocationPostProcessor(TemplatePostProcessor):
         # outdir.  That would require plumbing through user
         # provided params such as "outdir" into the build stage
         # somehow, which isn't currently possible.
-        copied = False
-        for resource in template['Resources'].values():
+        copied = {}  # type: Dict[str, str]
+        for name, resource in template['Resources'].items():
             if resource['Type'] == 'AWS::Serverless::Function':
-                original_location = resource['Properties']['CodeUri']
-                new_location = os.path.join(outdir, 'deployment.zip')
-                if not copied:
-                    self._osutils.copy(original_location, new_location)
-                    copied = True
-                resource['Properties']['CodeUri'] = './deployment.zip'
+                basename = self._copy_deployment_package(
+                    resource['Properties']['CodeUri'], outdir, name, copied)
+                resource['Properties']['CodeUri'] = './%s' % basename
             elif resource['Type'] == 'AWS::Serverless::LayerVersion':
                 original_location = resource['Properties']['ContentUri']
                 new_location = os.path.join(outdir, 'layer-deployment.zip')
@@ -1545,16 +1709,14 @@ class TerraformCodeLocationPostProcessor(TemplatePostProcessor):
     def process(self, template, config, outdir, chalice_stage_name):
         # type: (Dict[str, Any], Config, str, str) -> None
 
-        copied = False
+        copied_packages = {}  # type: Dict[str, str]
         resources = template['resource']
-        for r in resources.get('aws_lambda_function', {}).values():
-            if not copied:
-                asset_path = os.path.join(outdir, 'deployment.zip')
-                self._osutils.copy(r['filename'], asset_path)
-                copied = True
-            r['filename'] = "${path.module}/deployment.zip"
+        for name, r in resources.get('aws_lambda_function', {}).items():
+            basename = self._copy_deployment_package(
+                r['filename'], outdir, name, copied_packages)
+            r['filename'] = "${path.module}/%s" % basename
             r['source_code_hash'] = \
-                '${filebase64sha256("${path.module}/deployment.zip")}'
+                '${filebase64sha256("${path.module}/%s")}' % basename
         copied = False
         for r in resources.get('aws_lambda_layer_version', {}).values():
             if not copied:
@@ -1572,34 +1734,84 @@ class TemplateMergePostProcessor(TemplatePostProcessor):
                  merger,  # type: TemplateMerger
                  template_serializer,  # type: TemplateSerializer
                  merge_template=None,  # type: Optional[str]
+                 template_cache=None,  # type: Optional[TemplateCache]
                  ):
         # type: (...) -> None
         super(TemplateMergePostProcessor, self).__init__(osutils)
         self._merger = merger
         self._template_serializer = template_serializer
         self._merge_template = merge_template
+        self._template_cache = template_cache
 
     def process(self, template, config, outdir, chalice_stage_name):
         # type: (Dict[str, Any], Config, str, str) -> None
         if self._merge_template is None:
             return
-        loaded_template = self._load_template_to_merge()
+        loaded_template = self._load_template_to_merge(config.project_dir)
         merged = self._merger.merge(loaded_template, template)
         template.clear()
         template.update(merged)
 
-    def _load_template_to_merge(self):
-        # type: () -> Dict[str, Any]
+    def _load_template_to_merge(self, project_dir):
+        # type: (str) -> Dict[str, Any]
         template_name = cast(str, self._merge_template)
         filepath = os.path.abspath(template_name)
         if not self._osutils.file_exists(filepath):
             raise RuntimeError('Cannot find template file: %s' % filepath)
         template_data = self._osutils.get_file_contents(filepath, binary=False)
-        loaded_template = self._template_serializer.load_template(
-            template_data, filepath)
+        if self._template_cache is None:
+            return self._template_serializer.load_template(
+                template_data, filepath)
+        # Loading a large YAML template is slow, so the loaded template
+        # is cached until the file changes.
+        key = template_cache_key(
+            [chalice_version, self._template_serializer.__class__.__name__,
+             template_data])
+        loaded_template = self._template_cache.get(
+            project_dir, 'merge-template', key)
+        if loaded_template is None:
+            loaded_template = self._template_serializer.load_template(
+                template_data, filepath)
+            self._template_cache.set(
+                project_dir, 'merge-template', key, loaded_template)
         return loaded_template
 
 
+class SAMSwaggerFilePostProcessor(TemplatePostProcessor):
+    """Write the REST API's swagger document to its own file.
+
+    The document references other resources in the template, which
+    isn't supported by ``DefinitionUri``, so it's included with the
+    ``AWS::Include`` transform instead.
+
+    """
+
+    def __init__(self, osutils, template_serializer):
+        # type: (OSUtils, TemplateSerializer) -> None
+        super(SAMSwaggerFilePostProcessor, self).__init__(osutils)
+        self._template_serializer = template_serializer
+
+    def process(self, template, config, outdir, chalice_stage_name):
+        # type: (Dict[str, Any], Config, str, str) -> None
+        for resource in template['Resources'].values():
+            if resource['Type'] != 'AWS::Serverless::Api':
+                continue
+            properties = resource['Properties']
+            swagger_doc = properties.get('DefinitionBody')
+            if not isinstance(swagger_doc, dict) or \
+                    'Fn::Transform' in swagger_doc:
+                continue
+            basename = 'swagger.%s' % self._template_serializer.file_extension
+            write_template_file(self._osutils, self._template_serializer,
+                                swagger_doc, os.path.join(outdir, basename))
+            properties['DefinitionBody'] = {
+                'Fn::Transform': {
+                    'Name': 'AWS::Include',
+                    'Parameters': {'Location': './%s' % basename},
+                }
+            }
+
+
 class CompositePostProcessor(TemplatePostProcessor):
     def __init__(self, processors):
         # type: (List[TemplatePostProcessor]) -> None
@@ -1648,6 +1860,10 @@ class TemplateSerializer(object):
         # type: (Dict[str, Any]) -> str
         raise NotImplementedError("serialize_template")
 
+    def write_template(self, contents, stream):
+        # type: (Dict[str, Any], IO[str]) -> None
+        stream.write(self.serialize_template(contents))
+
 
 class JSONTemplateSerializer(TemplateSerializer):
     file_extension = 'json'
@@ -1656,6 +1872,12 @@ class JSONTemplateSerializer(TemplateSerializer):
         # type: (Dict[str, Any]) -> str
         return serialize_to_json(contents)
 
+    def write_template(self, contents, stream):
+        # type: (Dict[str, Any], IO[str]) -> None
+        # Same format as serialize_to_json().
+        json.dump(contents, stream, indent=2, separators=(',', ': '))
+        stream.write('\n')
+
     def load_template(self, file_contents, filename=''):
         # type: (str, str) -> Dict[str, Any]
         try:
@@ -1676,7 +1898,11 @@ class YAMLTemplateSerializer(TemplateSerializer):
 
     def serialize_template(self, contents):
         # type: (Dict[str, Any]) -> str
-        return yaml.safe_dump(contents, allow_unicode=True)
+        return yaml.dump(contents, Dumper=_SafeDumper, allow_unicode=True)
+
+    def write_template(self, contents, stream):
+        # type: (Dict[str, Any], IO[str]) -> None
+        yaml.dump(contents, stream, Dumper=_SafeDumper, allow_unicode=True)
 
     def load_template(self, file_contents, filename=''):
         # type: (str, str) -> Dict[str, Any]
@@ -7,12 +7,25 @@ for you.
 """
 from __future__ import print_function
 import os
+import re
 import json
 import uuid
+import hashlib
+from concurrent.futures import Executor, ProcessPoolExecutor
+from urllib.parse import urlparse
 
-from typing import Optional, Any, List, Dict, Set  # noqa
+from typing import Optional, Any, List, Dict, Set, Callable, Tuple  # noqa
+from typing import cast
 import botocore.session
 
+from chalice import __version__ as chalice_version
+from chalice.analyzer import analyze_module
+from chalice.analyzer import get_module_imports
+from chalice.analyzer import get_module_attribute_writes
+from chalice.analyzer import ModuleAnalysis
+from chalice.analyzer import Boto3ClientType, FunctionType
+from chalice.analyzer import EnvironmentVariable, StringLiteral
+from chalice.analyzer import CallArgumentsT, get_constant_value
 from chalice.constants import (
     CLOUDWATCH_LOGS, VPC_ATTACH_POLICY, XRAY_POLICY)
 from chalice.utils import OSUtils  # noqa
@@ -20,12 +33,19 @@ from chalice.config import Config  # noqa
 
 APIPolicyT = Dict[str, Dict[str, str]]
 CustomPolicyT = Dict[str, Dict[str, List[str]]]
+ClientCallsT = Dict[str, Set[str]]
+# service_name -> method_name -> [resource ARNs]
+ResourcesT = Dict[str, Dict[str, List[str]]]
+ExecutorFactory = Callable[[int], Executor]
 
 
-def policy_from_source_code(source_code: str) -> Dict[str, Any]:
+def policy_from_source_code(source_code: str,
+                            builder: Optional['PolicyBuilder'] = None
+                            ) -> Dict[str, Any]:
     from chalice.analyzer import get_client_calls_for_app
     client_calls = get_client_calls_for_app(source_code)
-    builder = PolicyBuilder()
+    if builder is None:
+        builder = PolicyBuilder()
     policy = builder.build_policy_from_api_calls(client_calls)
     return policy
 
@@ -38,6 +58,46 @@ def load_custom_policy_actions() -> CustomPolicyT:
     return _load_json_file('policies-extra.json')
 
 
+class PolicyIndex(object):
+    """Map client method names to IAM actions, one service at a time.
+
+    The index is generated from ``policies.json`` by
+    ``scripts/build-policy-index`` and has one small file per service,
+    so only the services an app uses are loaded.
+
+    """
+
+    INDEX_DIR = 'policy-index'
+    _SERVICE_NAME_REGEX = re.compile(r'^[a-z0-9][a-z0-9-]*$')
+
+    def __init__(self, index_dir: Optional[str] = None) -> None:
+        if index_dir is None:
+            index_dir = os.path.join(
+                os.path.dirname(os.path.abspath(__file__)), self.INDEX_DIR)
+        self._index_dir = index_dir
+        self._services: Dict[str, Optional[Dict[str, str]]] = {}
+
+    def get_actions(self, service: str) -> Optional[Dict[str, str]]:
+        """Return the method name to IAM action mapping for a service.
+
+        Returns None if the service isn't supported.
+
+        """
+        if service not in self._services:
+            self._services[service] = self._load_service(service)
+        return self._services[service]
+
+    def _load_service(self, service: str) -> Optional[Dict[str, str]]:
+        if not self._SERVICE_NAME_REGEX.match(service):
+            return None
+        filename = os.path.join(self._index_dir, '%s.json' % service)
+        try:
+            with open(filename) as f:
+                return json.loads(f.read())
+        except (IOError, OSError):
+            return None
+
+
 def _load_json_file(relative_filename: str) -> Dict[str, Any]:
     policy_json = os.path.join(
         os.path.dirname(os.path.abspath(__file__)),
@@ -69,21 +129,447 @@ def _create_simple_format(policy: Dict[str, Any]) -> Set[str]:
     return actions
 
 
+class ProjectModule(object):
+    def __init__(self, name: str, filename: str, source: str,
+                 is_package: bool) -> None:
+        self.name = name
+        self.filename = filename
+        self.source = source
+        self.is_package = is_package
+        self.digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        self.imports: List[str] = []
+        #: Module level names that other modules assign to.
+        self.unresolved_names: List[str] = []
+
+
+class ProjectAnalyzer(object):
+    """Find the client calls made by an app and the modules it imports.
+
+    Analysis starts at ``app.py`` and follows imports of ``chalicelib``
+    modules.  Modules are analyzed after the modules they import so
+    clients created in one module are tracked where they're used.
+
+    The results for each module are cached in
+    ``.chalice/policy-analysis-cache.json``, keyed by a hash of the
+    module's source and the types it imports, so only modules that
+    changed are analyzed again.  With ``max_workers`` > 1 modules that
+    don't depend on each other are analyzed in separate processes.
+
+    """
+
+    CACHE_FILENAME = 'policy-analysis-cache.json'
+    _CACHE_FORMAT = 3
+    _LIB_PACKAGE = 'chalicelib'
+
+    def __init__(self, osutils: OSUtils, max_workers: int = 1,
+                 executor_factory: Optional[ExecutorFactory] = None) -> None:
+        self._osutils = osutils
+        self._max_workers = max_workers
+        if executor_factory is None:
+            executor_factory = _create_process_pool
+        self._executor_factory = executor_factory
+        self._cache: Dict[str, Any] = {}
+        self._cache_filename: Optional[str] = None
+
+    def get_client_calls(self, project_dir: str) -> ClientCallsT:
+        return self.analyze_project(project_dir)[0]
+
+    def analyze_project(
+            self, project_dir: str) -> Tuple[ClientCallsT, CallArgumentsT]:
+        """Return the client calls made by an app and their arguments.
+
+        See ``chalice.analyzer.APICallCollector`` for the format of the
+        call arguments.
+
+        """
+        self._load_cache(project_dir)
+        used: Dict[str, Any] = {'imports': {}, 'writes': {}, 'modules': {}}
+        modules = self._find_modules(project_dir, used)
+        exports: Dict[str, Dict[str, Any]] = {}
+        client_calls: ClientCallsT = {}
+        call_arguments: CallArgumentsT = {}
+        for wave in self._analysis_order(modules):
+            for name, entry in self._analyze_wave(
+                    [modules[name] for name in wave], exports, used):
+                exports[name] = _decode_exports(entry['exports'])
+                for service, methods in entry['client_calls'].items():
+                    client_calls.setdefault(service, set()).update(methods)
+                _merge_call_arguments(call_arguments,
+                                      entry['call_arguments'])
+        self._save_cache(used)
+        return client_calls, call_arguments
+
+    def _find_modules(self, project_dir: str,
+                      used: Dict[str, Any]) -> Dict[str, ProjectModule]:
+        modules: Dict[str, ProjectModule] = {}
+        attribute_writes: Dict[str, List[str]] = {}
+        pending = ['app']
+        while pending:
+            name = pending.pop()
+            if name in modules:
+                continue
+            module = self._load_module(project_dir, name)
+            if module is None:
+                continue
+            key = _cache_key([module.name, module.is_package, module.digest])
+            imports = self._cached(used, 'imports', key, get_module_imports,
+                                   module)
+            attribute_writes[name] = self._cached(
+                used, 'writes', key, get_module_attribute_writes, module)
+            module.imports = [
+                n for n in self._project_imports(imports) if n != name]
+            modules[name] = module
+            pending.extend(module.imports)
+        for module in modules.values():
+            module.imports = [n for n in module.imports if n in modules]
+        self._set_unresolved_names(modules, attribute_writes)
+        return modules
+
+    def _set_unresolved_names(
+            self, modules: Dict[str, ProjectModule],
+            attribute_writes: Dict[str, List[str]]) -> None:
+        # A constant that another module assigns to could have any value.
+        unresolved: Dict[str, Set[str]] = {}
+        for writes in attribute_writes.values():
+            for write in writes:
+                module_name, _, attr = write.rpartition('.')
+                if module_name in modules:
+                    unresolved.setdefault(module_name, set()).add(attr)
+        for name, names in unresolved.items():
+            modules[name].unresolved_names = sorted(names)
+
+    def _cached(self, used: Dict[str, Any], section: str, key: str,
+                find: Callable[[str, str, bool], List[str]],
+                module: ProjectModule) -> List[str]:
+        names = self._cache.get(section, {}).get(key)
+        if names is None:
+            names = find(module.source, module.name, module.is_package)
+        used[section][key] = names
+        return names
+
+    def _project_imports(self, imports: List[str]) -> List[str]:
+        names = set()
+        for name in imports:
+            parts = name.split('.')
+            if parts[0] != self._LIB_PACKAGE:
+                continue
+            # Importing a submodule imports its parent packages too.
+            for i in range(1, len(parts) + 1):
+                names.add('.'.join(parts[:i]))
+        return sorted(names)
+
+    def _load_module(self, project_dir: str,
+                     name: str) -> Optional[ProjectModule]:
+        if name == 'app':
+            candidates = [('app.py', False)]
+        else:
+            path = name.replace('.', os.sep)
+            candidates = [(path + '.py', False),
+                          (os.path.join(path, '__init__.py'), True)]
+        for relpath, is_package in candidates:
+            filename = self._osutils.joinpath(project_dir, relpath)
+            if self._osutils.file_exists(filename):
+                source = self._osutils.get_file_contents(
+                    filename, binary=False)
+                return ProjectModule(name, relpath, source, is_package)
+        return None
+
+    def _analysis_order(
+            self, modules: Dict[str, ProjectModule]) -> List[List[str]]:
+        # Group modules into waves where every module only imports
+        # modules from previous waves.  An import cycle is broken by
+        # analyzing the remaining module with the fewest imports.
+        done: Set[str] = set()
+        waves = []
+        remaining = set(modules)
+        while remaining:
+            wave = sorted(name for name in remaining
+                          if set(modules[name].imports) <= done)
+            if not wave:
+                wave = [min(sorted(remaining),
+                            key=lambda n: len(modules[n].imports))]
+            waves.append(wave)
+            done.update(wave)
+            remaining.difference_update(wave)
+        return waves
+
+    def _analyze_wave(self, wave: List[ProjectModule],
+                      exports: Dict[str, Dict[str, Any]],
+                      used: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        results = []
+        to_analyze = []
+        for module in wave:
+            imported = {name: exports[name] for name in module.imports
+                        if exports.get(name)}
+            key = _cache_key([module.name, module.is_package, module.digest,
+                              _encode_imported(imported),
+                              module.unresolved_names])
+            entry = self._cache.get('modules', {}).get(key)
+            if entry is None:
+                to_analyze.append((key, module, imported))
+            else:
+                used['modules'][key] = entry
+                results.append((module.name, entry))
+        analyzed = self._run_analysis(
+            [module for _, module, _ in to_analyze],
+            [imported for _, _, imported in to_analyze])
+        for (key, module, _), analysis in zip(to_analyze, analyzed):
+            entry = {
+                'client_calls': {k: sorted(v) for k, v in
+                                 analysis.client_calls.items()},
+                'exports': _encode_exports(analysis.exports),
+                'call_arguments': analysis.call_arguments,
+            }
+            used['modules'][key] = entry
+            results.append((module.name, entry))
+        return results
+
+    def _run_analysis(
+            self, modules: List[ProjectModule],
+            imported: List[Dict[str, Dict[str, Any]]]
+    ) -> List[ModuleAnalysis]:
+        args = [(m.source, m.name, m.filename, m.name == 'app',
+                 m.is_package, i, m.unresolved_names)
+                for m, i in zip(modules, imported)]
+        if self._max_workers <= 1 or len(args) <= 1:
+            return [_analyze(arg) for arg in args]
+        with self._executor_factory(self._max_workers) as executor:
+            return list(executor.map(_analyze, args))
+
+    def _load_cache(self, project_dir: str) -> None:
+        chalice_dir = self._osutils.joinpath(project_dir, '.chalice')
+        if not self._osutils.directory_exists(chalice_dir):
+            self._cache_filename = None
+            self._cache = {}
+            return
+        filename = self._osutils.joinpath(chalice_dir, self.CACHE_FILENAME)
+        if filename == self._cache_filename:
+            return
+        self._cache_filename = filename
+        self._cache = {}
+        if self._osutils.file_exists(filename):
+            try:
+                cache = json.loads(self._osutils.get_file_contents(
+                    filename, binary=False))
+            except ValueError:
+                return
+            if cache.get('version') == chalice_version and \
+                    cache.get('format') == self._CACHE_FORMAT:
+                self._cache = cache
+
+    def _save_cache(self, used: Dict[str, Any]) -> None:
+        # Only entries used by this analysis are kept so the cache
+        # doesn't grow as modules change.
+        used['version'] = chalice_version
+        used['format'] = self._CACHE_FORMAT
+        if used == self._cache:
+            return
+        self._cache = used
+        if self._cache_filename is not None:
+            self._osutils.set_file_contents(
+                self._cache_filename, json.dumps(used, sort_keys=True),
+                binary=False)
+
+
+def _analyze(args: Tuple[str, str, str, bool, bool,
+                         Dict[str, Dict[str, Any]],
+                         List[str]]) -> ModuleAnalysis:
+    source, name, filename, is_app, is_package, imported, unresolved = args
+    return analyze_module(source, name, filename, is_app=is_app,
+                          is_package=is_package, imported_types=imported,
+                          unresolved_names=set(unresolved))
+
+
+def _create_process_pool(max_workers: int) -> Executor:
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def _cache_key(value: Any) -> str:
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _merge_call_arguments(call_arguments: CallArgumentsT,
+                          new: CallArgumentsT) -> None:
+    for service, methods in new.items():
+        service_calls = call_arguments.setdefault(service, {})
+        for method, calls in methods.items():
+            method_calls = service_calls.setdefault(method, [])
+            method_calls.extend(c for c in calls if c not in method_calls)
+
+
+def _encode_exports(exports: Dict[str, Any]) -> Dict[str, List[str]]:
+    encoded = {}
+    for name, inferred_type in exports.items():
+        if isinstance(inferred_type, FunctionType):
+            encoded[name] = ['function',
+                             inferred_type.return_type.service_name]
+        elif isinstance(inferred_type, Boto3ClientType):
+            encoded[name] = ['client', inferred_type.service_name]
+        else:
+            constant = get_constant_value(inferred_type)
+            if constant is not None:
+                encoded[name] = constant
+    return encoded
+
+
+def _decode_exports(encoded: Dict[str, List[str]]) -> Dict[str, Any]:
+    exports: Dict[str, Any] = {}
+    for name, (kind, value) in encoded.items():
+        if kind == 'string':
+            exports[name] = StringLiteral(value)
+        elif kind == 'env':
+            exports[name] = EnvironmentVariable(value)
+        elif kind == 'function':
+            exports[name] = FunctionType(Boto3ClientType(value))
+        else:
+            exports[name] = Boto3ClientType(value)
+    return exports
+
+
+def _encode_imported(
+        imported: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {name: _encode_exports(exports)
+            for name, exports in imported.items()}
+
+
+def _table_arns(table_name: str) -> Optional[List[str]]:
+    if table_name.startswith('arn:'):
+        arn = table_name
+    elif re.match(r'^[a-zA-Z0-9_.-]+$', table_name):
+        arn = 'arn:*:dynamodb:*:*:table/%s' % table_name
+    else:
+        return None
+    # Indexes and streams are sub resources of the table.
+    return [arn, '%s/*' % arn]
+
+
+def _bucket_arns(bucket: str) -> Optional[List[str]]:
+    if bucket.startswith('arn:'):
+        arn = bucket
+    elif re.match(r'^[a-zA-Z0-9_.-]+$', bucket):
+        arn = 'arn:*:s3:::%s' % bucket
+    else:
+        return None
+    # Object level actions apply to the keys in the bucket.
+    return [arn, '%s/*' % arn]
+
+
+def _queue_arns(queue_url: str) -> Optional[List[str]]:
+    parts = urlparse(queue_url).path.strip('/').split('/')
+    if len(parts) != 2 or not all(
+            re.match(r'^[a-zA-Z0-9_.-]+$', part) for part in parts):
+        return None
+    return ['arn:*:sqs:*:%s:%s' % (parts[0], parts[1])]
+
+
+class ResourceArnResolver(object):
+    """Work out the resources client calls are made against.
+
+    A call is resolved if the parameter that names its resource, e.g
+    ``TableName`` for DynamoDB, is a string constant or an environment
+    variable from the app's config.  Region and account IDs that
+    aren't part of the name are left as wildcards.
+
+    """
+
+    # service_name -> (param_name, function that returns the ARNs)
+    RESOURCE_PARAMS: Dict[
+        str, Tuple[str, Callable[[str], Optional[List[str]]]]] = {
+        'dynamodb': ('TableName', _table_arns),
+        's3': ('Bucket', _bucket_arns),
+        'sqs': ('QueueUrl', _queue_arns),
+    }
+
+    def __init__(self, environment_variables: Dict[str, str]) -> None:
+        self._environment_variables = environment_variables
+
+    def resolve(self, call_arguments: CallArgumentsT) -> ResourcesT:
+        """Return the resource ARNs for each method that can be resolved.
+
+        Methods that are missing from the result may be called with
+        any resource.
+
+        """
+        resources: ResourcesT = {}
+        for service, methods in call_arguments.items():
+            for method, calls in methods.items():
+                arns = self._resolve_calls(service, calls)
+                if arns is not None:
+                    resources.setdefault(service, {})[method] = arns
+        return resources
+
+    def _resolve_calls(self, service: str,
+                       calls: List[Dict[str, List[str]]]
+                       ) -> Optional[List[str]]:
+        if service not in self.RESOURCE_PARAMS or not calls:
+            return None
+        param_name, get_arns = self.RESOURCE_PARAMS[service]
+        resolved: Set[str] = set()
+        for arguments in calls:
+            value = self._resolve_value(arguments.get(param_name))
+            if value is None:
+                return None
+            arns = get_arns(value)
+            if arns is None:
+                return None
+            resolved.update(arns)
+        return sorted(resolved)
+
+    def _resolve_value(self, value: Optional[List[str]]) -> Optional[str]:
+        if value is None:
+            return None
+        kind, name = value
+        if kind == 'env':
+            return self._environment_variables.get(name)
+        return name
+
+
+def _get_policy_environment_variables(config: Config) -> Dict[str, str]:
+    # All the functions share the same policy, so a variable that a
+    # function sets to a different value can't be used.
+    variables = dict(config.environment_variables)
+    function_names = config.config_from_disk.get('stages', {}).get(
+        config.chalice_stage, {}).get('lambda_functions', {})
+    for function_name in function_names:
+        scoped = config.scope(config.chalice_stage, function_name)
+        for key, value in scoped.environment_variables.items():
+            if variables.get(key) != value:
+                variables.pop(key, None)
+    return variables
+
+
 class AppPolicyGenerator(object):
-    def __init__(self, osutils: OSUtils) -> None:
+    def __init__(self, osutils: OSUtils,
+                 policy_builder: Optional['PolicyBuilder'] = None,
+                 project_analyzer: Optional[ProjectAnalyzer] = None) -> None:
         self._osutils = osutils
+        self._policy_builder = policy_builder
+        if project_analyzer is None:
+            project_analyzer = ProjectAnalyzer(osutils)
+        self._project_analyzer = project_analyzer
 
     def generate_policy(self, config: Config) -> Dict[str, Any]:
         """Auto generate policy for an application."""
-        # Admittedly, this is pretty bare bones logic for the time
-        # being.  All it really does it work out, given a Config instance,
-        # which files need to analyzed and then delegates to the
-        # appropriately analyzer functions to do the real work.
-        # This may change in the future.
+        # The analyzer starts at app.py and follows imports into
+        # chalicelib/, see ProjectAnalyzer for the details.
         app_py = os.path.join(config.project_dir, 'app.py')
         assert self._osutils.file_exists(app_py)
-        app_source = self._osutils.get_file_contents(app_py, binary=False)
-        app_policy = policy_from_source_code(app_source)
+        resources: Optional[ResourcesT] = None
+        if config.autogen_policy_scoped_resources:
+            client_calls, call_arguments = \
+                self._project_analyzer.analyze_project(config.project_dir)
+            resources = ResourceArnResolver(
+                _get_policy_environment_variables(config)).resolve(
+                    call_arguments)
+        else:
+            client_calls = self._project_analyzer.get_client_calls(
+                config.project_dir)
+        builder = self._policy_builder
+        if builder is None:
+            builder = PolicyBuilder()
+        app_policy = builder.build_policy_from_api_calls(client_calls,
+                                                         resources)
         app_policy['Statement'].append(CLOUDWATCH_LOGS)
         if config.subnet_ids and config.security_group_ids:
             app_policy['Statement'].append(VPC_ATTACH_POLICY)
@@ -98,10 +584,9 @@ class PolicyBuilder(object):
     def __init__(self,
                  session: Optional[Any] = None,
                  api_policy_actions: Optional[APIPolicyT] = None,
-                 custom_policy_actions: Optional[CustomPolicyT] = None
+                 custom_policy_actions: Optional[CustomPolicyT] = None,
+                 policy_index: Optional[PolicyIndex] = None,
                  ) -> None:
-        if session is None:
-            session = botocore.session.get_session()
         # The difference between api_policy_actions and custom_policy_actions
         # is that api_policy_actions correspond to the 1-1 method to API calls
         # exposed in boto3/botocore clients whereas custom_policy_actions
@@ -109,18 +594,25 @@ class PolicyBuilder(object):
         # that are typically hand written (e.g s3.download_file()).  These
         # are kept as separate files because we manage these files
         # separately.
-        if api_policy_actions is None:
-            api_policy_actions = load_api_policy_actions()
+        # If api_policy_actions aren't provided, the precomputed policy
+        # index is used instead, which already maps method names to
+        # actions so no botocore clients need to be created.
+        if api_policy_actions is None and policy_index is None:
+            policy_index = PolicyIndex()
         if custom_policy_actions is None:
             custom_policy_actions = load_custom_policy_actions()
         self._session = session
         self._api_policy_actions = api_policy_actions
         self._custom_policy_actions = custom_policy_actions
+        self._policy_index = policy_index
+        self._method_mapping_cache: Dict[str, Dict[str, str]] = {}
 
     def build_policy_from_api_calls(self,
-                                    client_calls: Dict[str, Set[str]]
+                                    client_calls: Dict[str, Set[str]],
+                                    resources: Optional[ResourcesT] = None,
                                     ) -> Dict[str, Any]:
-        statements = self._build_statements_from_client_calls(client_calls)
+        statements = self._build_statements_from_client_calls(
+            client_calls, resources or {})
         policy = {
             'Version': self.VERSION,
             'Statement': statements
@@ -128,7 +620,8 @@ class PolicyBuilder(object):
         return policy
 
     def _build_statements_from_client_calls(self,
-                                            client_calls: Dict[str, Set[str]]
+                                            client_calls: Dict[str, Set[str]],
+                                            resources: ResourcesT,
                                             ) -> List[Dict[str, Any]]:
         statements = []
         # client_calls = service_name -> set([method_calls])
@@ -138,40 +631,93 @@ class PolicyBuilder(object):
             custom_actions = self._get_actions_from_high_level_calls(
                 service, client_calls)
             actions = api_actions + custom_actions
-            if actions:
+            if not actions:
+                continue
+            groups = [(['*'], actions)]
+            if service in resources:
+                groups = self._group_actions_by_resource(
+                    service, client_calls[service], actions,
+                    resources[service])
+            for action_resources, grouped_actions in groups:
                 statements.append({
                     'Effect': 'Allow',
-                    'Action': actions,
-                    # Probably impossible, but it would be nice
-                    # to even keep track of what resources are used
-                    # so we can create ARNs and further restrict the policies.
-                    'Resource': ['*'],
+                    'Action': grouped_actions,
+                    'Resource': action_resources,
                     'Sid': str(uuid.uuid4()).replace('-', ''),
                 })
         return statements
 
+    def _group_actions_by_resource(self,
+                                   service: str,
+                                   method_calls: Set[str],
+                                   actions: List[str],
+                                   method_resources: Dict[str, List[str]]
+                                   ) -> List[Tuple[List[str], List[str]]]:
+        # An action is only scoped if every method that needs it is
+        # only called with known resources.
+        method_actions = self._method_to_action_mapping(service) or {}
+        custom_actions = self._custom_policy_actions.get(service, {})
+        action_resources: Dict[str, Set[str]] = {}
+        for method_name in method_calls:
+            needed = list(custom_actions.get(method_name, []))
+            if method_name in method_actions:
+                needed.append(method_actions[method_name])
+            for action in needed:
+                action_resources.setdefault(action, set()).update(
+                    method_resources.get(method_name, ['*']))
+        groups: Dict[Tuple[str, ...], List[str]] = {}
+        for action in actions:
+            arns = action_resources.get(action, set(['*']))
+            key = ('*',) if '*' in arns else tuple(sorted(arns))
+            groups.setdefault(key, []).append(action)
+        # Unscoped actions come first, in the same statement they'd be
+        # in without any known resources.
+        return [(list(key), groups[key]) for key in
+                sorted(groups, key=lambda k: (k != ('*',), k))]
+
     def _get_actions_from_api_calls(self,
                                     service: str,
                                     client_calls: Dict[str, Set[str]]
                                     ) -> List[str]:
-        if service not in self._api_policy_actions:
+        method_actions = self._method_to_action_mapping(service)
+        if method_actions is None:
             print("Unsupported service for auto policy generation: %s"
                   % service)
             return []
-        service_actions = self._api_policy_actions[service]
         method_calls = client_calls[service]
-        # Next thing we need to do is convert the method_name to
-        # MethodName.  To do this reliably we're going to use
-        # botocore clients.
-        client = self._session.create_client(service,
-                                             region_name='us-east-1')
-        mapping = client.meta.method_to_api_mapping
-        actions = [service_actions[mapping[method_name]]
+        actions = [method_actions[method_name]
                    for method_name in method_calls
-                   if mapping.get(method_name) in service_actions]
+                   if method_name in method_actions]
         actions.sort()
         return actions
 
+    def _method_to_action_mapping(
+            self, service: str) -> Optional[Dict[str, str]]:
+        if self._policy_index is not None:
+            return self._policy_index.get_actions(service)
+        api_policy_actions = cast(APIPolicyT, self._api_policy_actions)
+        if service not in api_policy_actions:
+            return None
+        service_actions = api_policy_actions[service]
+        mapping = self._method_to_api_mapping(service)
+        return {method_name: service_actions[api_name]
+                for method_name, api_name in mapping.items()
+                if api_name in service_actions}
+
+    def _method_to_api_mapping(self, service: str) -> Dict[str, str]:
+        # Next thing we need to do is convert the method_name to
+        # MethodName.  To do this reliably we're going to use
+        # botocore clients.  Creating a client is relatively expensive
+        # so we only do this once per service.
+        if service not in self._method_mapping_cache:
+            if self._session is None:
+                self._session = botocore.session.get_session()
+            client = self._session.create_client(service,
+                                                 region_name='us-east-1')
+            self._method_mapping_cache[service] = \
+                client.meta.method_to_api_mapping
+        return self._method_mapping_cache[service]
+
     def _get_actions_from_high_level_calls(self,
                                            service: str,
                                            client_calls: Dict[str, Set[str]]
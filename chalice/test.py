@@ -1,15 +1,30 @@
 from __future__ import annotations
 import os
 import json
+import math
+import time
+import uuid
 import base64
+import bisect
+import random
+import hashlib
+import datetime
+import itertools
+import threading
 import contextlib
 from types import TracebackType
 
-from typing import Optional, Type, Generator, Dict, Any, List  # noqa
+from typing import (  # noqa
+    Optional, Type, Generator, Dict, Any, List, Iterator, Tuple, Iterable,
+    Callable, Mapping, MutableMapping
+)
 
 from chalice import Chalice  # noqa
 from chalice.config import Config
 from chalice.local import LocalGateway, LambdaContext, LocalGatewayException
+from chalice.local import LambdaEventConverter, RouteMatcher, MatchResult
+from chalice.local import EventType
+from chalice.compat import parse_qs
 from chalice.cli.factory import CLIFactory
 
 
@@ -21,10 +36,12 @@ class Client(object):
     def __init__(self,
                  app: Chalice,
                  stage_name: str = 'dev',
-                 project_dir: str = '.') -> None:
+                 project_dir: str = '.',
+                 fast: bool = False) -> None:
         self._app = app
         self._project_dir = project_dir
         self._stage_name = stage_name
+        self._fast = fast
         self._http_client: Optional[TestHTTPClient] = None
         self._events_client: Optional[TestEventsClient] = None
         self._lambda_client: Optional[TestLambdaClient] = None
@@ -50,7 +67,8 @@ class Client(object):
     @property
     def http(self) -> TestHTTPClient:
         if self._http_client is None:
-            self._http_client = TestHTTPClient(self._app, self._chalice_config)
+            self._http_client = TestHTTPClient(
+                self._app, self._chalice_config, fast=self._fast)
         return self._http_client
 
     @property
@@ -79,28 +97,89 @@ class Client(object):
 
 class BaseClient(object):
 
+    _config: Config
+    _scoped_configs: Dict[str, Tuple[Config, Dict[str, str]]]
+
+    def _scoped_config(self, function_name: str) -> Tuple[Config,
+                                                          Dict[str, str]]:
+        # Scoping a config and merging its environment variables is
+        # relatively expensive, and the result only depends on the
+        # function name, so we only do it once per function.
+        scoped = self._scoped_configs.get(function_name)
+        if scoped is None:
+            config = self._config.scope(self._config.chalice_stage,
+                                        function_name)
+            scoped = (config, config.environment_variables)
+            self._scoped_configs[function_name] = scoped
+        return scoped
+
     @contextlib.contextmanager
-    def _patched_env_vars(self, environment_variables):  # type: ignore
-        # re: the "type: ignore".  Mypy is incredibly pedantic that
-        # os.environ is of type "_Environ[str]" and it can't be assigned
-        # an expression of Dict[str, str].  While that's technically "correct",
-        # that's way too much effort to get the typing right on this, so
-        # we're just ignoring the type checking for this method.
+    def _patched_env_vars(self,
+                          environment_variables: Dict[str, str]
+                          ) -> Iterator[None]:
+        # os.environ is replaced with an overlay rather than a copy, which
+        # avoids copying all of os.environ on every invocation.  Anything
+        # the handler changes only changes the overlay.
         original = os.environ
-        patched = os.environ.copy()
-        patched.update(environment_variables)
-        os.environ = patched
+        os.environ = _EnvironOverlay(  # type: ignore
+            original, environment_variables)
         try:
             yield
         finally:
             os.environ = original
 
 
+class _EnvironOverlay(MutableMapping[str, str]):
+    """A copy on write view of the environment variables."""
+
+    def __init__(self, environ: Mapping[str, str],
+                 overrides: Dict[str, str]) -> None:
+        self._environ = environ
+        # Deleted variables are set to None.
+        self._changes: Dict[str, Optional[str]] = dict(overrides)
+
+    def __getitem__(self, key: str) -> str:
+        if key in self._changes:
+            value = self._changes[key]
+            if value is None:
+                raise KeyError(key)
+            return value
+        return self._environ[key]
+
+    def __setitem__(self, key: str, value: str) -> None:
+        self._changes[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._changes[key] = None
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._environ:
+            if key not in self._changes:
+                yield key
+        for key, value in self._changes.items():
+            if value is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> Dict[str, str]:
+        return dict(self)
+
+
 class TestHTTPClient(BaseClient):
-    def __init__(self, app: Chalice, config: Config) -> None:
+    def __init__(self, app: Chalice, config: Config,
+                 fast: bool = False) -> None:
         self._app = app
         self._config = config
-        self._local_gateway = LocalGateway(app, self._config)
+        self._scoped_configs = {}
+        if fast:
+            self._local_gateway: LocalGateway = FastLocalGateway(
+                app, self._config)
+        else:
+            self._local_gateway = LocalGateway(app, self._config)
 
     def request(self,
                 method: str,
@@ -109,8 +188,8 @@ class TestHTTPClient(BaseClient):
                 body: bytes = b'') -> HTTPResponse:
         if headers is None:
             headers = {}
-        scoped = self._config.scope(self._config.chalice_stage, 'api_handler')
-        with self._patched_env_vars(scoped.environment_variables):
+        _, env_vars = self._scoped_config('api_handler')
+        with self._patched_env_vars(env_vars):
             try:
                 response = self._local_gateway.handle_request(
                     method=method.upper(), path=path,
@@ -149,6 +228,103 @@ class TestHTTPClient(BaseClient):
         return self.request('HEAD', path, **kwargs)
 
 
+class CachedRouteMatcher(RouteMatcher):
+    """Route matcher that remembers the route matched for each path."""
+
+    MAX_CACHE_SIZE = 4096
+
+    def __init__(self, route_urls: List[str]) -> None:
+        super(CachedRouteMatcher, self).__init__(route_urls)
+        self._cache: Dict[str, Tuple[str, Dict[str, str]]] = {}
+
+    def match_route(self, url: str) -> MatchResult:
+        if '#' in url or url.startswith('//'):
+            return super(CachedRouteMatcher, self).match_route(url)
+        path, _, query = url.partition('?')
+        cached = self._cache.get(path)
+        if cached is None:
+            result = super(CachedRouteMatcher, self).match_route(path)
+            if len(self._cache) >= self.MAX_CACHE_SIZE:
+                self._cache.clear()
+            cached = (result.route, result.captured)
+            self._cache[path] = cached
+        query_params = parse_qs(query, keep_blank_values=True)
+        return MatchResult(cached[0], dict(cached[1]), query_params)
+
+
+class TemplatedLambdaEventConverter(LambdaEventConverter):
+    """Event converter that precomputes the event for each route."""
+
+    def __init__(self, route_matcher: RouteMatcher,
+                 binary_types: Optional[List[str]] = None) -> None:
+        super(TemplatedLambdaEventConverter, self).__init__(
+            route_matcher, binary_types)
+        self._templates: Dict[Tuple[str, str], EventType] = {}
+
+    def create_lambda_event(self,
+                            method: str,
+                            path: str,
+                            headers: Dict[str, str],
+                            body: Optional[bytes] = None) -> EventType:
+        view_route = self._route_matcher.match_route(path)
+        template = self._get_template(view_route.route, method)
+        request_context = template['requestContext'].copy()
+        request_context['path'] = path.split('?')[0]
+        event = template.copy()
+        event['requestContext'] = request_context
+        event['headers'] = {k.lower(): v for k, v in headers.items()}
+        event['pathParameters'] = view_route.captured
+        event['multiValueQueryStringParameters'] = \
+            view_route.query_params or None
+        self._add_body(event, headers, body)
+        return event
+
+    def _get_template(self, route: str, method: str) -> EventType:
+        template = self._templates.get((route, method))
+        if template is None:
+            template = {
+                'requestContext': {
+                    'httpMethod': method,
+                    'resourcePath': route,
+                    'identity': {
+                        'sourceIp': self.LOCAL_SOURCE_IP
+                    },
+                },
+                'stageVariables': {},
+            }
+            self._templates[(route, method)] = template
+        return template
+
+
+class FastLocalGateway(LocalGateway):
+    """Local gateway that avoids per request setup costs.
+
+    Route matches and event templates are cached, and request ids
+    are generated from a counter instead of a random uuid.
+    """
+
+    def __init__(self, app_object: Chalice, config: Config) -> None:
+        super(FastLocalGateway, self).__init__(app_object, config)
+        self.event_converter = TemplatedLambdaEventConverter(
+            CachedRouteMatcher(list(app_object.routes)),
+            app_object.api.binary_types
+        )
+        self._request_ids = itertools.count(1)
+        if config.lambda_timeout is None:
+            self._max_runtime_ms: int = self.MAX_LAMBDA_EXECUTION_TIME * 1000
+        else:
+            self._max_runtime_ms = config.lambda_timeout * 1000
+
+    def _generate_lambda_context(self) -> LambdaContext:
+        return LambdaContext(
+            function_name=self._config.function_name,
+            memory_size=self._config.lambda_memory_size,
+            max_runtime_ms=self._max_runtime_ms,
+            aws_request_id='00000000-0000-4000-8000-%012x' % next(
+                self._request_ids)
+        )
+
+
 class HTTPResponse(object):
     def __init__(self,
                  body: bytes,
@@ -186,6 +362,135 @@ class TestEventsClient(BaseClient):
     def __init__(self, app: Chalice) -> None:
         self._app = app
 
+    def stream_sqs_events(self,
+                          num_records: int,
+                          batch_size: int = 10,
+                          profile: Optional[LoadProfile] = None,
+                          queue_name: str = 'queue-name',
+                          ) -> Iterator[Dict[str, Any]]:
+        """Lazily generate SQS events with synthetic messages."""
+        if profile is None:
+            profile = LoadProfile()
+        queue_arn = 'arn:aws:sqs:us-west-2:12345:%s' % queue_name
+
+        def create_record(record: SyntheticRecord) -> Dict[str, Any]:
+            body = record.body.decode('ascii')
+            timestamp = str(int(record.timestamp * 1000))
+            return {
+                'attributes': {
+                    'ApproximateFirstReceiveTimestamp': timestamp,
+                    'ApproximateReceiveCount': '1',
+                    'SenderId': 'sender-id',
+                    'SentTimestamp': timestamp,
+                    'MessageGroupId': record.partition_key,
+                },
+                'awsRegion': 'us-west-2',
+                'body': body,
+                'eventSource': 'aws:sqs',
+                'eventSourceARN': queue_arn,
+                'md5OfBody': hashlib.md5(record.body).hexdigest(),
+                'messageAttributes': {},
+                'messageId': record.record_id,
+                'receiptHandle': 'receipt-handle-%s' % record.sequence_number,
+            }
+
+        return _stream_events(profile, num_records, batch_size, create_record)
+
+    def stream_kinesis_events(self,
+                              num_records: int,
+                              batch_size: int = 100,
+                              profile: Optional[LoadProfile] = None,
+                              stream_name: str = 'stream-name',
+                              ) -> Iterator[Dict[str, Any]]:
+        """Lazily generate Kinesis events with synthetic records."""
+        if profile is None:
+            profile = LoadProfile()
+        stream_arn = 'arn:aws:kinesis:us-west-2:123:stream/%s' % stream_name
+
+        def create_record(record: SyntheticRecord) -> Dict[str, Any]:
+            sequence_number = str(record.sequence_number)
+            return {
+                'kinesis': {
+                    'kinesisSchemaVersion': '1.0',
+                    'partitionKey': record.partition_key,
+                    'sequenceNumber': sequence_number,
+                    'data': base64.b64encode(record.body).decode('ascii'),
+                    'approximateArrivalTimestamp': record.timestamp,
+                },
+                'eventSource': 'aws:kinesis',
+                'eventVersion': '1.0',
+                'eventID': 'shardId-000000000000:%s' % sequence_number,
+                'eventName': 'aws:kinesis:record',
+                'invokeIdentityArn': 'arn:aws:iam::123:role/lambda-role',
+                'awsRegion': 'us-west-2',
+                'eventSourceARN': stream_arn,
+            }
+
+        return _stream_events(profile, num_records, batch_size, create_record)
+
+    def stream_dynamodb_events(self,
+                               num_records: int,
+                               batch_size: int = 100,
+                               profile: Optional[LoadProfile] = None,
+                               table_name: str = 'table-name',
+                               ) -> Iterator[Dict[str, Any]]:
+        """Lazily generate DynamoDB stream events for new items."""
+        if profile is None:
+            profile = LoadProfile()
+        stream_arn = (
+            'arn:aws:dynamodb:us-west-2:12345:table/%s/stream/'
+            '2018-01-01T00:00:00.000' % table_name
+        )
+
+        def create_record(record: SyntheticRecord) -> Dict[str, Any]:
+            keys = {'id': {'S': record.partition_key}}
+            return {
+                'awsRegion': 'us-west-2',
+                'dynamodb': {
+                    'ApproximateCreationDateTime': int(record.timestamp),
+                    'Keys': keys,
+                    'NewImage': {
+                        'id': {'S': record.partition_key},
+                        'payload': {'S': record.body.decode('ascii')},
+                    },
+                    'SequenceNumber': str(record.sequence_number),
+                    'SizeBytes': len(record.body),
+                    'StreamViewType': 'NEW_IMAGE',
+                },
+                'eventID': record.record_id,
+                'eventName': 'INSERT',
+                'eventSource': 'aws:dynamodb',
+                'eventSourceARN': stream_arn,
+                'eventVersion': '1.1',
+            }
+
+        return _stream_events(profile, num_records, batch_size, create_record)
+
+    def stream_s3_events(self,
+                         num_records: int,
+                         profile: Optional[LoadProfile] = None,
+                         bucket: str = 'bucket-name',
+                         event_name: str = 'ObjectCreated:Put',
+                         ) -> Iterator[Dict[str, Any]]:
+        """Lazily generate S3 events, one object per event."""
+        if profile is None:
+            profile = LoadProfile()
+
+        def create_record(record: SyntheticRecord) -> Dict[str, Any]:
+            event_time = datetime.datetime.fromtimestamp(
+                record.timestamp, datetime.timezone.utc)
+            event = self.generate_s3_event(
+                bucket, '%s/%s' % (record.partition_key,
+                                   record.sequence_number),
+                event_name=event_name)['Records'][0]
+            event['eventTime'] = event_time.strftime(
+                '%Y-%m-%dT%H:%M:%S.') + '%03dZ' % (
+                    event_time.microsecond // 1000)
+            event['s3']['object']['size'] = len(record.body)
+            return event
+
+        return _stream_events(profile, num_records, 1, create_record)
+
     def generate_sns_event(self,
                            message: str,
                            subject: str = '',
@@ -328,23 +633,259 @@ class TestLambdaClient(BaseClient):
     def __init__(self, app: Chalice, config: Config) -> None:
         self._app = app
         self._config = config
+        self._scoped_configs = {}
 
     def invoke(self,
                function_name: str,
                payload: Optional[Any] = None) -> InvokeResponse:
         if payload is None:
             payload = {}
-        scoped = self._config.scope(self._config.chalice_stage, function_name)
-        lambda_context = LambdaContext(
-            function_name, memory_size=scoped.lambda_memory_size)
         if function_name not in self._app.handler_map:
             raise FunctionNotFoundError(function_name)
-        with self._patched_env_vars(scoped.environment_variables):
-            response = self._app.handler_map[function_name](
-                payload, lambda_context)
+        _, env_vars = self._scoped_config(function_name)
+        with self._patched_env_vars(env_vars):
+            return self._invoke(function_name, payload)
+
+    def invoke_many(self,
+                    function_name: str,
+                    payloads: Iterable[Any],
+                    concurrency: int = 1) -> LoadTestResult:
+        """Invoke a function once for every payload and time each call.
+
+        Payloads are consumed lazily, so this can be used with the
+        ``stream_*_events`` methods of :class:`TestEventsClient` to
+        benchmark event handlers with a large number of events.
+        """
+        if function_name not in self._app.handler_map:
+            raise FunctionNotFoundError(function_name)
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        result = LoadTestResult()
+        payload_iter = iter(payloads)
+        lock = threading.Lock()
+
+        def worker() -> None:
+            while True:
+                with lock:
+                    payload = next(payload_iter, _SENTINEL)
+                if payload is _SENTINEL:
+                    return
+                start = time.perf_counter()
+                try:
+                    self._invoke(function_name, payload)
+                    error = False
+                except Exception:  # pylint: disable=broad-except
+                    error = True
+                result.record(
+                    (time.perf_counter() - start) * 1000, error=error)
+
+        _, env_vars = self._scoped_config(function_name)
+        # The environment variables are patched once for the whole run
+        # rather than per invoke so concurrent invokes don't race each
+        # other restoring the original environment.
+        with self._patched_env_vars(env_vars):
+            start = time.perf_counter()
+            threads = [threading.Thread(target=worker)
+                       for _ in range(concurrency)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            result.elapsed_seconds = time.perf_counter() - start
+        return result
+
+    def _invoke(self, function_name: str, payload: Any) -> InvokeResponse:
+        scoped, _ = self._scoped_config(function_name)
+        lambda_context = LambdaContext(
+            function_name, memory_size=scoped.lambda_memory_size)
+        response = self._app.handler_map[function_name](
+            payload, lambda_context)
         return InvokeResponse(payload=response)
 
 
 class InvokeResponse(object):
     def __init__(self, payload: Any) -> None:
         self.payload = payload
+
+
+_SENTINEL = object()
+
+
+class SyntheticRecord(object):
+    def __init__(self,
+                 sequence_number: int,
+                 record_id: str,
+                 partition_key: str,
+                 timestamp: float,
+                 body: bytes) -> None:
+        self.sequence_number = sequence_number
+        self.record_id = record_id
+        self.partition_key = partition_key
+        self.timestamp = timestamp
+        self.body = body
+
+
+class LoadProfile(object):
+    """Describes the shape of synthetically generated records.
+
+    Record sizes follow a log-normal distribution around
+    ``median_size``, partition keys follow a Zipf distribution
+    controlled by ``key_skew`` (0 means uniform), and records arrive
+    at ``records_per_second`` on average starting at ``start_time``.
+    A ``seed`` makes the generated records reproducible.
+    """
+
+    def __init__(self,
+                 median_size: int = 256,
+                 max_size: int = 256 * 1024,
+                 size_sigma: float = 1.0,
+                 num_partition_keys: int = 100,
+                 key_skew: float = 1.2,
+                 records_per_second: float = 1000.0,
+                 start_time: Optional[float] = None,
+                 seed: Optional[int] = None) -> None:
+        if median_size < 1 or max_size < median_size:
+            raise ValueError("max_size must be >= median_size >= 1")
+        if num_partition_keys < 1:
+            raise ValueError("num_partition_keys must be at least 1")
+        if records_per_second <= 0:
+            raise ValueError("records_per_second must be positive")
+        self.median_size = median_size
+        self.max_size = max_size
+        self.size_sigma = size_sigma
+        self.num_partition_keys = num_partition_keys
+        self.key_skew = key_skew
+        self.records_per_second = records_per_second
+        if start_time is None:
+            start_time = time.time()
+        self.start_time = start_time
+        self.seed = seed
+
+    def records(self, num_records: int) -> Iterator[SyntheticRecord]:
+        rng = random.Random(self.seed)
+        partition_keys = ['pk-%d' % i for i in range(self.num_partition_keys)]
+        cum_weights = list(itertools.accumulate(
+            1.0 / (rank ** self.key_skew)
+            for rank in range(1, self.num_partition_keys + 1)))
+        # Bodies are slices of a single random buffer so generating
+        # a record doesn't require generating new random data.
+        filler = bytes(rng.getrandbits(8) % 26 + 97
+                       for _ in range(min(self.max_size, 64 * 1024)))
+        mu = math.log(self.median_size)
+        timestamp = self.start_time
+        for sequence_number in range(num_records):
+            size = int(rng.lognormvariate(mu, self.size_sigma))
+            size = max(1, min(size, self.max_size))
+            body = filler * (size // len(filler)) + \
+                filler[:size % len(filler)]
+            key_index = bisect.bisect_left(
+                cum_weights, rng.random() * cum_weights[-1])
+            timestamp += rng.expovariate(self.records_per_second)
+            yield SyntheticRecord(
+                sequence_number=sequence_number,
+                record_id=str(uuid.UUID(int=rng.getrandbits(128),
+                                        version=4)),
+                partition_key=partition_keys[key_index],
+                timestamp=timestamp,
+                body=body,
+            )
+
+
+def _stream_events(profile: LoadProfile,
+                   num_records: int,
+                   batch_size: int,
+                   create_record: Callable[[SyntheticRecord], Dict[str, Any]]
+                   ) -> Iterator[Dict[str, Any]]:
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    records = profile.records(num_records)
+    while True:
+        batch = [create_record(r)
+                 for r in itertools.islice(records, batch_size)]
+        if not batch:
+            return
+        yield {'Records': batch}
+
+
+class LatencyHistogram(object):
+    """Latency histogram with logarithmically sized buckets.
+
+    Each bucket is about 9% wider than the previous one, so memory
+    use is constant regardless of how many latencies are recorded.
+    """
+
+    BUCKETS_PER_DOUBLING = 8
+    MIN_LATENCY_MS = 0.001
+
+    def __init__(self) -> None:
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float('inf')
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float) -> None:
+        index = self._bucket_index(latency_ms)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.min_ms = min(self.min_ms, latency_ms)
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        if not self.count:
+            return 0.0
+        return self.total_ms / self.count
+
+    def percentile(self, percent: float) -> float:
+        """Return the upper bound of the bucket at ``percent``."""
+        if not self.count:
+            return 0.0
+        threshold = self.count * percent / 100.0
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= threshold:
+                return min(self._bucket_upper_bound(index), self.max_ms)
+        return self.max_ms
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """Return (upper bound in ms, count) for each non empty bucket."""
+        return [(self._bucket_upper_bound(index), self._buckets[index])
+                for index in sorted(self._buckets)]
+
+    def _bucket_index(self, latency_ms: float) -> int:
+        if latency_ms <= self.MIN_LATENCY_MS:
+            return 0
+        return int(math.ceil(math.log2(latency_ms / self.MIN_LATENCY_MS)
+                             * self.BUCKETS_PER_DOUBLING))
+
+    def _bucket_upper_bound(self, index: int) -> float:
+        return self.MIN_LATENCY_MS * 2 ** (
+            index / float(self.BUCKETS_PER_DOUBLING))
+
+
+class LoadTestResult(object):
+    def __init__(self) -> None:
+        self.latencies = LatencyHistogram()
+        self.errors = 0
+        self.elapsed_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def invocations(self) -> int:
+        return self.latencies.count
+
+    @property
+    def throughput(self) -> float:
+        """Invocations per second."""
+        if not self.elapsed_seconds:
+            return 0.0
+        return self.invocations / self.elapsed_seconds
+
+    def record(self, latency_ms: float, error: bool = False) -> None:
+        with self._lock:
+            self.latencies.record(latency_ms)
+            if error:
+                self.errors += 1
@@ -3,6 +3,7 @@ import os
 import zipfile
 import json
 import contextlib
+import filecmp
 import tempfile
 import re
 import shutil
@@ -229,6 +230,9 @@ class OSUtils(object):
         with open(filename, mode) as f:
             f.write(contents)
 
+    def file_contents_equal(self, first: str, second: str) -> bool:
+        return filecmp.cmp(first, second, shallow=False)
+
     def extract_zipfile(self, zipfile_path: str, unpack_dir: str) -> None:
         with zipfile.ZipFile(zipfile_path, 'r') as z:
             z.extractall(unpack_dir)
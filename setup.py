@@ -54,7 +54,8 @@ setup(
     },
     license="Apache License 2.0",
     package_data={'chalice': [
-        '*.json', '*.pyi', 'py.typed'] + recursive_include('templates')},
+        '*.json', 'policy-index/*.json', '*.pyi', 'py.typed'] +
+        recursive_include('templates')},
     include_package_data=True,
     zip_safe=False,
     keywords='chalice',
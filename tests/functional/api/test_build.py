@@ -0,0 +1,49 @@
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from chalice.cli import newproj
+from chalice.api import build_app
+from chalice.deploymany import build_project
+
+
+@pytest.fixture
+def runner():
+    return CliRunner()
+
+
+def _write_app(project_dir, name):
+    with open(os.path.join(project_dir, 'app.py'), 'w') as f:
+        f.write(
+            'from chalice import Chalice\n'
+            'from chalicelib import NAME\n'
+            'app = Chalice(app_name=NAME)\n'
+            '@app.route("/")\n'
+            'def index():\n'
+            '    return {"name": NAME}\n'
+        )
+    os.mkdir(os.path.join(project_dir, 'chalicelib'))
+    with open(os.path.join(project_dir, 'chalicelib', '__init__.py'),
+              'w') as f:
+        f.write('NAME = %r\n' % name)
+
+
+def test_can_build_app(runner):
+    with runner.isolated_filesystem():
+        newproj.create_new_project_skeleton('testproject')
+        build_app('testproject', stage='dev')
+        deployments = os.listdir(
+            os.path.join('testproject', '.chalice', 'deployments'))
+        assert len(deployments) == 1
+        assert deployments[0].endswith('.zip')
+
+
+def test_can_build_projects_with_same_module_names(runner):
+    with runner.isolated_filesystem():
+        for name in ['first', 'second']:
+            newproj.create_new_project_skeleton(name)
+            _write_app(name, name)
+            assert build_project(name, 'dev') > 0
+            deployments = os.path.join(name, '.chalice', 'deployments')
+            assert len(os.listdir(deployments)) == 1
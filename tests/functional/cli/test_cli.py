@@ -285,6 +285,81 @@ def test_can_package_with_single_file(runner):
                 'deployment.zip', 'sam.json']
 
 
+def test_can_package_with_swagger_file(runner):
+    with runner.isolated_filesystem():
+        newproj.create_new_project_skeleton('testproject')
+        os.chdir('testproject')
+        result = _run_cli_command(
+            runner, cli.package, ['--swagger-file', 'outdir'])
+        assert result.exit_code == 0, result.output
+        assert sorted(os.listdir('outdir')) == [
+            'deployment.zip', 'sam.json', 'swagger.json']
+        with open(os.path.join('outdir', 'sam.json')) as f:
+            template = json.load(f)
+        properties = template['Resources']['RestAPI']['Properties']
+        assert properties['DefinitionBody'] == {
+            'Fn::Transform': {
+                'Name': 'AWS::Include',
+                'Parameters': {'Location': './swagger.json'},
+            }
+        }
+        with open(os.path.join('outdir', 'swagger.json')) as f:
+            assert json.load(f)['swagger'] == '2.0'
+
+
+def test_can_profile_coldstart(runner):
+    with runner.isolated_filesystem():
+        newproj.create_new_project_skeleton('testproject')
+        os.chdir('testproject')
+        result = _run_cli_command(runner, cli.profile_coldstart,
+                                  ['--budget', '100000'])
+        assert result.exit_code == 0, result.output
+        assert 'Total import time' in result.output
+        assert 'route index' in result.output
+
+
+def test_profile_coldstart_fails_when_over_budget(runner):
+    with runner.isolated_filesystem():
+        newproj.create_new_project_skeleton('testproject')
+        os.chdir('testproject')
+        result = _run_cli_command(
+            runner, cli.profile_coldstart,
+            ['--budget', '0.0001', '--output-format', 'json'])
+        assert result.exit_code == 1
+        assert 'exceeds budget' in result.output
+
+
+def _add_app_dependencies(project_dir, depends_on):
+    config_file = os.path.join(project_dir, '.chalice', 'config.json')
+    with open(config_file) as f:
+        config = json.load(f)
+    config['depends_on'] = depends_on
+    with open(config_file, 'w') as f:
+        json.dump(config, f)
+
+
+def test_deploy_many_aborts_on_unknown_dependency(runner):
+    with runner.isolated_filesystem():
+        newproj.create_new_project_skeleton('web')
+        newproj.create_new_project_skeleton('worker')
+        _add_app_dependencies('web', ['api'])
+        result = _run_cli_command(runner, cli.deploy_many, ['web', 'worker'])
+        assert result.exit_code == 1
+        assert ("web depends on api, which isn't one of the apps being "
+                "deployed.") in result.output
+
+
+def test_deploy_many_aborts_when_not_a_project(runner):
+    with runner.isolated_filesystem():
+        newproj.create_new_project_skeleton('web')
+        os.mkdir('notaproject')
+        result = _run_cli_command(runner, cli.deploy_many,
+                                  ['web', 'notaproject'])
+        assert result.exit_code == 1
+        assert 'notaproject: Unable to load the project config' in (
+            result.output)
+
+
 def test_package_terraform_err_with_single_file_or_merge(runner):
     with runner.isolated_filesystem():
         newproj.create_new_project_skeleton('testproject')
@@ -301,6 +376,12 @@ def test_package_terraform_err_with_single_file_or_merge(runner):
         assert result.exit_code == 1, result.output
         assert "Terraform format does not support" in result.output
 
+        result = _run_cli_command(
+            runner, cli.package, ['--pkg-format', 'terraform',
+                                  '--swagger-file', 'module'])
+        assert result.exit_code == 1, result.output
+        assert "Terraform format does not support" in result.output
+
 
 def test_debug_flag_enables_logging(runner):
     with runner.isolated_filesystem():
@@ -354,7 +435,21 @@ def test_can_deploy_specify_connection_timeout(runner, mock_cli_factory):
                                   cli_factory=mock_cli_factory)
         assert result.exit_code == 0
         mock_cli_factory.create_botocore_session.assert_called_with(
-            connection_timeout=100
+            connection_timeout=100,
+            config=mock_cli_factory.create_config_obj.return_value,
+        )
+
+
+def test_can_delete_with_max_workers(runner, mock_cli_factory):
+    with runner.isolated_filesystem():
+        newproj.create_new_project_skeleton('testproject')
+        os.chdir('testproject')
+        result = _run_cli_command(runner, cli.delete,
+                                  ['--max-workers', '8'],
+                                  cli_factory=mock_cli_factory)
+        assert result.exit_code == 0
+        mock_cli_factory.create_deletion_deployer.assert_called_with(
+            session=mock.sentinel.Session, ui=mock.ANY, max_workers=8,
         )
 
 
@@ -522,7 +617,7 @@ def test_can_provide_lambda_name_for_logs(runner, mock_cli_factory):
             include_lambda_messages=False, max_entries=None)
     )
     mock_cli_factory.create_log_retriever.assert_called_with(
-        mock.sentinel.Session, 'arn:aws:lambda::app-dev-foo', False
+        mock.sentinel.Session, 'arn:aws:lambda::app-dev-foo', False, False
     )
 
 
@@ -551,10 +646,55 @@ def test_can_follow_logs_with_option(runner, mock_cli_factory):
             include_lambda_messages=False, max_entries=None)
     )
     mock_cli_factory.create_log_retriever.assert_called_with(
-        mock.sentinel.Session, 'arn:aws:lambda::app-dev-foo', True
+        mock.sentinel.Session, 'arn:aws:lambda::app-dev-foo', True, False
     )
 
 
+def test_can_retrieve_logs_for_multiple_functions(runner, mock_cli_factory):
+    deployed_resources = DeployedResources({
+        "resources": [
+            {"name": "foo",
+             "lambda_arn": "arn:aws:lambda::app-dev-foo",
+             "resource_type": "lambda_function"},
+            {"name": "bar",
+             "lambda_arn": "arn:aws:lambda::app-dev-bar",
+             "resource_type": "lambda_function"}]
+    })
+    mock_cli_factory.create_config_obj.return_value = FakeConfig(
+        deployed_resources)
+    log_retriever = mock.Mock(spec=LogRetriever)
+    log_retriever.retrieve_logs.return_value = []
+    mock_cli_factory.create_log_retriever.return_value = log_retriever
+    with runner.isolated_filesystem():
+        newproj.create_new_project_skeleton('testproject')
+        os.chdir('testproject')
+        result = _run_cli_command(
+            runner, cli.logs,
+            ['--name', 'foo', '--name', 'bar', '--parallel',
+             '--since', '1h'],
+            cli_factory=mock_cli_factory
+        )
+        assert result.exit_code == 0, result.output
+    assert mock_cli_factory.create_log_retriever.call_args_list == [
+        mock.call(mock.sentinel.Session, 'arn:aws:lambda::app-dev-foo',
+                  False, True),
+        mock.call(mock.sentinel.Session, 'arn:aws:lambda::app-dev-bar',
+                  False, True),
+    ]
+    assert log_retriever.retrieve_logs.call_count == 2
+
+
+def test_parallel_logs_require_since(runner, mock_cli_factory):
+    with runner.isolated_filesystem():
+        newproj.create_new_project_skeleton('testproject')
+        os.chdir('testproject')
+        result = _run_cli_command(runner, cli.logs, ['--parallel'],
+                                  cli_factory=mock_cli_factory)
+        assert result.exit_code == 2
+    assert '--parallel requires -s/--since.' in result.output
+    assert not mock_cli_factory.create_log_retriever.called
+
+
 def test_can_call_invoke(runner, mock_cli_factory, monkeypatch):
     invoke_handler = mock.Mock(spec=LambdaInvokeHandler)
     mock_cli_factory.create_lambda_invoke_handler.return_value = invoke_handler
@@ -14,7 +14,7 @@ from chalice import local
 from chalice.package import PackageOptions
 from chalice.utils import UI
 from chalice import Chalice
-from chalice.logs import LogRetriever
+from chalice.logs import LogRetriever, ParallelLogEventGenerator
 from chalice.invoke import LambdaInvokeHandler
 
 
@@ -92,6 +92,40 @@ def test_can_create_botocore_session_with_multiple_configs():
         session.get_default_client_config())['retries']['max_attempts'] == 5
 
 
+def test_can_create_botocore_session_connection_pool_config():
+    session = factory.create_botocore_session(
+        max_pool_connections=50,
+        tcp_keepalive=True,
+    )
+    config = vars(session.get_default_client_config())
+    assert config['max_pool_connections'] == 50
+    assert config['tcp_keepalive'] is True
+
+
+def test_can_create_botocore_session_from_config(clifactory):
+    config = Config.create(
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        connection_timeout=10,
+        read_timeout=20,
+    )
+    session = clifactory.create_botocore_session(config=config)
+    client_config = vars(session.get_default_client_config())
+    assert client_config['max_pool_connections'] == 50
+    assert client_config['tcp_keepalive'] is True
+    assert client_config['connect_timeout'] == 10
+    assert client_config['read_timeout'] == 20
+
+
+def test_explicit_session_args_override_config(clifactory):
+    config = Config.create(connection_timeout=10, read_timeout=20)
+    session = clifactory.create_botocore_session(
+        connection_timeout=100, config=config)
+    client_config = vars(session.get_default_client_config())
+    assert client_config['connect_timeout'] == 100
+    assert client_config['read_timeout'] == 20
+
+
 def test_can_create_botocore_session_cli_factory(clifactory):
     clifactory.profile = 'myprofile'
     session = clifactory.create_botocore_session()
@@ -252,6 +286,17 @@ def test_can_create_follow_logs_retriever(clifactory):
     assert isinstance(logs, LogRetriever)
 
 
+def test_can_create_parallel_logs_retriever(clifactory):
+    session = clifactory.create_botocore_session()
+    lambda_arn = (
+        'arn:aws:lambda:us-west-2:1:function:app-dev-foo'
+    )
+    logs = clifactory.create_log_retriever(session, lambda_arn,
+                                           follow_logs=False, parallel=True)
+    assert isinstance(logs, LogRetriever)
+    assert isinstance(logs._log_event_generator, ParallelLogEventGenerator)
+
+
 def test_can_create_lambda_invoke_handler(clifactory):
     lambda_arn = (
         'arn:aws:lambda:us-west-2:1:function:app-dev-foo'
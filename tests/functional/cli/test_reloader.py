@@ -11,6 +11,11 @@ try:
     WATCHDOG_AVAILABLE = True
 except ImportError:
     WATCHDOG_AVAILABLE = False
+try:
+    from chalice.cli.filewatch.inotify import InotifyWorkerProcess
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
 
 import chalice.local
 
@@ -19,7 +24,7 @@ DEFAULT_DELAY = 0.1
 SETTLE_DELAY = 1
 MAX_TIMEOUT = 5.0
 use_all_watcher_types = pytest.mark.parametrize(
-    ['worker_class_type'], [('watchdog',), ('stat',)])
+    ['worker_class_type'], [('watchdog',), ('inotify',), ('stat',)])
 
 
 def modify_file_after_n_seconds(filename, contents, delay=DEFAULT_DELAY):
@@ -60,6 +65,10 @@ def get_worker_cls(worker_class_name):
             raise unittest.SkipTest("Test requires watchdog package.")
         else:
             return WatchdogWorkerProcess
+    elif worker_class_name == 'inotify':
+        if not INOTIFY_AVAILABLE:
+            raise unittest.SkipTest("Test requires inotify.")
+        return InotifyWorkerProcess
     elif worker_class_name == 'stat':
         return StatWorkerProcess
     else:
@@ -111,3 +120,33 @@ def test_rc_0_when_no_file_modified(tmpdir, worker_class_type):
     p = worker_cls(http_thread)
     rc = p.main(str(tmpdir), timeout=0.2)
     assert rc == 0
+
+
+@use_all_watcher_types
+def test_no_reload_when_ignored_file_modified(tmpdir, worker_class_type):
+    http_thread = mock.Mock(spec=chalice.local.HTTPServerThread)
+    worker_cls = get_worker_cls(worker_class_type)
+    p = worker_cls(http_thread, ignore_patterns=['*.log'])
+    modify_file_after_n_seconds(str(tmpdir.join('server.log')), 'contents')
+    modify_file_after_n_seconds(
+        str(tmpdir.mkdir('__pycache__').join('app.pyc')), 'contents')
+    rc = p.main(str(tmpdir), timeout=1.5)
+    assert rc == 0
+
+
+@use_all_watcher_types
+def test_can_reload_when_file_created_in_new_subdir(tmpdir, worker_class_type):
+    subdir = tmpdir.join('newdir')
+
+    def create_subdir_file():
+        subdir.mkdir()
+        time.sleep(DEFAULT_DELAY)
+        subdir.join('foo.py').write('contents')
+
+    t = threading.Timer(DEFAULT_DELAY, function=create_subdir_file)
+    t.daemon = True
+    t.start()
+    http_thread = mock.Mock(spec=chalice.local.HTTPServerThread)
+    p = get_worker_cls(worker_class_type)(http_thread)
+    rc = p.main(str(tmpdir), MAX_TIMEOUT)
+    assert rc == chalice.cli.filewatch.RESTART_REQUEST_RC
@@ -1,10 +1,13 @@
 import json
+import asyncio
 import datetime
 import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
 import pytest
 import botocore.exceptions
+import botocore.session
 from botocore.vendored.requests import ConnectionError as \
     RequestsConnectionError
 from botocore.vendored.requests.exceptions import ReadTimeout as \
@@ -13,6 +16,7 @@ from botocore import stub
 from botocore.utils import datetime2timestamp
 
 from chalice.awsclient import TypedAWSClient
+from chalice.awsclient import AsyncTypedAWSClient
 from chalice.awsclient import ResourceDoesNotExistError
 from chalice.awsclient import DeploymentPackageTooLargeError
 from chalice.awsclient import LambdaClientError
@@ -267,6 +271,46 @@ def test_missing_log_events_returns_empty_response(stubbed_session):
     ) == {'events': []}
 
 
+def test_can_filter_log_events_by_stream_name(stubbed_session):
+    stubbed_session.stub('logs').filter_log_events(
+        logGroupName='loggroup', interleaved=True,
+        logStreamNames=['stream'],
+    ).returns({'events': []})
+    stubbed_session.activate_stubs()
+    awsclient = TypedAWSClient(stubbed_session)
+    assert awsclient.filter_log_events(
+        log_group_name='loggroup', log_stream_names=['stream'],
+    ) == {'events': []}
+    stubbed_session.verify_stubs()
+
+
+def test_can_get_log_stream_names(stubbed_session):
+    stubbed_session.stub('logs').describe_log_streams(
+        logGroupName='loggroup').returns({
+            'logStreams': [
+                {'logStreamName': 'old', 'lastIngestionTime': 1000},
+                {'logStreamName': 'new', 'lastIngestionTime': 1577836800000},
+                {'logStreamName': 'empty'},
+            ]
+        })
+    stubbed_session.activate_stubs()
+    awsclient = TypedAWSClient(stubbed_session)
+    assert awsclient.get_log_stream_names(
+        'loggroup', start_time=datetime.datetime(2020, 1, 1)
+    ) == ['new', 'empty']
+    stubbed_session.verify_stubs()
+
+
+def test_missing_log_group_has_no_log_streams(stubbed_session):
+    stubbed_session.stub('logs').describe_log_streams(
+        logGroupName='loggroup').raises_error(
+            error_code='ResourceNotFoundException',
+            message='ResourceNotFound')
+    stubbed_session.activate_stubs()
+    awsclient = TypedAWSClient(stubbed_session)
+    assert awsclient.get_log_stream_names('loggroup') == []
+
+
 def test_rule_arn_requires_expression_or_pattern(stubbed_session):
     client = TypedAWSClient(stubbed_session)
     with pytest.raises(ValueError):
@@ -3910,3 +3954,157 @@ def test_can_delete_retention_policy(stubbed_session):
     client = TypedAWSClient(stubbed_session)
     client.delete_retention_policy(log_group_name='mygroup')
     stubbed_session.verify_stubs()
+
+
+class TestAsyncTypedAWSClient(object):
+
+    def create_client(self, stubbed_session):
+        async def sleep(delay):
+            pass
+        return AsyncTypedAWSClient(stubbed_session, sleep=sleep)
+
+    def test_can_await_client_methods(self, stubbed_session):
+        stubbed_session.stub('logs').delete_log_group(
+            logGroupName='loggroup').returns({})
+        stubbed_session.activate_stubs()
+        awsclient = self.create_client(stubbed_session)
+        asyncio.run(awsclient.delete_log_group('loggroup'))
+        stubbed_session.verify_stubs()
+
+    def test_create_function_polls_for_active_state(self, stubbed_session):
+        client = stubbed_session.stub('lambda')
+        client.create_function(
+            FunctionName='name',
+            Runtime='python3.9',
+            Code={'ZipFile': b'foo'},
+            Handler='app.app',
+            Role='myarn'
+        ).returns({'FunctionArn': 'arn:12345:name', 'State': 'Pending'})
+        client.get_function_configuration(
+            FunctionName='name',
+        ).returns({'State': 'Pending'})
+        client.get_function_configuration(
+            FunctionName='name',
+        ).returns({'State': 'Active'})
+        stubbed_session.activate_stubs()
+        awsclient = self.create_client(stubbed_session)
+        arn = asyncio.run(awsclient.create_function(
+            'name', 'myarn', b'foo', 'python3.9', 'app.app'))
+        assert arn == 'arn:12345:name'
+        stubbed_session.verify_stubs()
+
+    def test_create_function_does_not_poll_when_active(self,
+                                                       stubbed_session):
+        stubbed_session.stub('lambda').create_function(
+            FunctionName='name',
+            Runtime='python3.9',
+            Code={'ZipFile': b'foo'},
+            Handler='app.app',
+            Role='myarn'
+        ).returns({'FunctionArn': 'arn:12345:name', 'State': 'Active'})
+        stubbed_session.activate_stubs()
+        awsclient = self.create_client(stubbed_session)
+        arn = asyncio.run(awsclient.create_function(
+            'name', 'myarn', b'foo', 'python3.9', 'app.app'))
+        assert arn == 'arn:12345:name'
+        stubbed_session.verify_stubs()
+
+    def test_update_function_polls_between_updates(self, stubbed_session):
+        client = stubbed_session.stub('lambda')
+        client.update_function_code(
+            FunctionName='name', ZipFile=b'foo',
+        ).returns({'FunctionArn': 'arn', 'LastUpdateStatus': 'InProgress'})
+        client.get_function_configuration(
+            FunctionName='name',
+        ).returns({'LastUpdateStatus': 'Successful'})
+        client.update_function_configuration(
+            FunctionName='name', Timeout=60,
+        ).returns({'LastUpdateStatus': 'InProgress'})
+        client.get_function_configuration(
+            FunctionName='name',
+        ).returns({'LastUpdateStatus': 'InProgress'})
+        client.get_function_configuration(
+            FunctionName='name',
+        ).returns({'LastUpdateStatus': 'Successful'})
+        stubbed_session.activate_stubs()
+        awsclient = self.create_client(stubbed_session)
+        asyncio.run(awsclient.update_function('name', b'foo', timeout=60))
+        stubbed_session.verify_stubs()
+
+    def test_update_function_code_only(self, stubbed_session):
+        client = stubbed_session.stub('lambda')
+        client.update_function_code(
+            FunctionName='name', ZipFile=b'foo',
+        ).returns({'FunctionArn': 'arn', 'LastUpdateStatus': 'Successful'})
+        stubbed_session.activate_stubs()
+        awsclient = self.create_client(stubbed_session)
+        # Neither of these result in a configuration update.
+        asyncio.run(awsclient.update_function(
+            'name', b'foo', xray=False, subnet_ids=['sn-1']))
+        stubbed_session.verify_stubs()
+
+    def test_update_function_does_not_poll_when_updated(self,
+                                                        stubbed_session):
+        client = stubbed_session.stub('lambda')
+        client.update_function_code(
+            FunctionName='name', ZipFile=b'foo',
+        ).returns({'FunctionArn': 'arn', 'LastUpdateStatus': 'Successful'})
+        client.update_function_configuration(
+            FunctionName='name', Timeout=60,
+        ).returns({'LastUpdateStatus': 'Successful'})
+        stubbed_session.activate_stubs()
+        awsclient = self.create_client(stubbed_session)
+        asyncio.run(awsclient.update_function('name', b'foo', timeout=60))
+        stubbed_session.verify_stubs()
+
+    def test_partial_function_updates_are_not_public(self, stubbed_session):
+        awsclient = self.create_client(stubbed_session)
+        for name in ['update_function_code', 'update_function_config',
+                     'update_function_tags']:
+            with pytest.raises(AttributeError):
+                getattr(awsclient, name)
+
+    def test_raises_waiter_error_on_failed_state(self, stubbed_session):
+        stubbed_session.stub('lambda').get_function_configuration(
+            FunctionName='name',
+        ).returns({'State': 'Failed'})
+        stubbed_session.activate_stubs()
+        awsclient = self.create_client(stubbed_session)
+        with pytest.raises(botocore.exceptions.WaiterError):
+            asyncio.run(awsclient.wait_for_function_active('name'))
+        stubbed_session.verify_stubs()
+
+    def test_can_iterate_log_events(self, stubbed_session):
+        stubbed_session.stub('logs').filter_log_events(
+            logGroupName='loggroup', interleaved=True,
+        ).returns({'events': [{'eventId': 'foo', 'timestamp': 0,
+                               'ingestionTime': 0}],
+                   'nextToken': 'token'})
+        stubbed_session.stub('logs').filter_log_events(
+            logGroupName='loggroup', interleaved=True, nextToken='token',
+        ).returns({'events': [{'eventId': 'bar', 'timestamp': 0,
+                               'ingestionTime': 0}]})
+        stubbed_session.activate_stubs()
+        awsclient = self.create_client(stubbed_session)
+
+        async def collect():
+            return [event['eventId'] async for event in
+                    awsclient.iter_log_events('loggroup')]
+
+        assert asyncio.run(collect()) == ['foo', 'bar']
+        stubbed_session.verify_stubs()
+
+
+def test_clients_are_created_once_across_threads():
+    session = mock.Mock(spec=botocore.session.Session)
+
+    def create_client(service_name):
+        # Give other threads a chance to race to create the client.
+        time.sleep(0.01)
+        return mock.Mock(spec=['delete_log_group'])
+
+    session.create_client.side_effect = create_client
+    awsclient = TypedAWSClient(session)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(awsclient.delete_log_group, ['a', 'b', 'c', 'd']))
+    session.create_client.assert_called_once_with('logs')
@@ -193,6 +193,30 @@ def test_includes_app_and_chalicelib_dir(tmpdir, chalice_deployer):
                        b'{"test": "subconfig"}', f)
 
 
+@slow
+def test_can_inject_lazy_entry_module(tmpdir, chalice_deployer):
+    appdir = _create_app_structure(tmpdir)
+    appdir.join('app.py').write(
+        'import csv\n'
+        'def handler(event, context):\n'
+        '    return csv.__name__\n'
+    )
+    name = chalice_deployer.create_deployment_package(
+        str(appdir), 'python3.11')
+    injector = chalice.deploy.packager.LazyEntryModuleInjector(
+        chalice.utils.OSUtils())
+    handler = injector.inject_entry_module(name, 'app', 'handler', ['csv'])
+    assert handler == '_chalice_entry_handler.handler'
+    with zipfile.ZipFile(name) as f:
+        assert 'chalice/lazyimport.py' in f.namelist()
+        assert b"['csv']" in f.read('_chalice_entry_handler.py')
+    # An out of date entry module is replaced.
+    injector.inject_entry_module(name, 'app', 'handler', [])
+    with zipfile.ZipFile(name) as f:
+        assert f.namelist().count('_chalice_entry_handler.py') == 1
+        assert b"[]" in f.read('_chalice_entry_handler.py')
+
+
 def _assert_in_zip(path, contents, zip):
     allfiles = zip.namelist()
     assert path in allfiles
@@ -371,6 +395,44 @@ def test_zip_filename_changes_on_vendor_symlink(tmpdir, chalice_deployer):
     assert first != second
 
 
+def test_zip_filename_uses_function_requirements(tmpdir, chalice_deployer):
+    appdir = _create_app_structure(tmpdir)
+    appdir.join('requirements.txt').write('requests==2.0\n')
+    appdir.join('requirements-slim.txt').write('six==1.0\n')
+    shared = chalice_deployer.deployment_package_filename(
+        str(appdir), 'python3.11')
+    slim = chalice_deployer.deployment_package_filename(
+        str(appdir), 'python3.11', 'requirements-slim.txt')
+    assert shared != slim
+    appdir.join('requirements-slim.txt').write('requests==2.0\n')
+    # The same requirements result in the same deployment package.
+    assert chalice_deployer.deployment_package_filename(
+        str(appdir), 'python3.11', 'requirements-slim.txt') == shared
+
+
+def test_missing_function_requirements_file_is_error(tmpdir,
+                                                     chalice_deployer):
+    appdir = _create_app_structure(tmpdir)
+    with pytest.raises(chalice.deploy.packager.MissingRequirementsFileError):
+        chalice_deployer.create_deployment_package(
+            str(appdir), 'python3.11', 'requirements-missing.txt')
+
+
+def test_function_package_built_from_its_requirements(tmpdir):
+    appdir = _create_app_structure(tmpdir)
+    appdir.join('requirements-slim.txt').write('six==1.0\n')
+    dependency_builder = mock.Mock(spec=DependencyBuilder)
+    packager = LambdaDeploymentPackager(
+        osutils=chalice.utils.OSUtils(),
+        dependency_builder=dependency_builder,
+        ui=chalice.utils.UI(),
+    )
+    packager.create_deployment_package(
+        str(appdir), 'python3.11', 'requirements-slim.txt')
+    call_args = dependency_builder.build_site_packages.call_args[0]
+    assert call_args[1] == str(appdir.join('requirements-slim.txt'))
+
+
 @slow
 def test_chalice_runtime_injected_on_change(tmpdir, chalice_deployer):
     appdir = _create_app_structure(tmpdir)
@@ -15,7 +15,7 @@ from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
 
 from chalice import app
-from chalice.local import create_local_server
+from chalice.local import create_local_server, SERVER_BACKENDS
 from chalice.config import Config
 from chalice.utils import OSUtils
 
@@ -55,7 +55,7 @@ def basic_app(tmpdir):
 
 
 class ThreadedLocalServer(Thread):
-    def __init__(self, port, host='localhost'):
+    def __init__(self, port, host='localhost', **server_options):
         super(ThreadedLocalServer, self).__init__()
         self._app_object = None
         self._config = None
@@ -63,6 +63,7 @@ class ThreadedLocalServer(Thread):
         self._port = port
         self._server = None
         self._server_ready = Event()
+        self._server_options = server_options
 
     def wait_for_server_ready(self):
         self._server_ready.wait()
@@ -73,7 +74,8 @@ class ThreadedLocalServer(Thread):
 
     def run(self):
         self._server = create_local_server(
-            self._app_object, self._config, self._host, self._port)
+            self._app_object, self._config, self._host, self._port,
+            **self._server_options)
         self._server_ready.set()
         self._server.serve_forever()
 
@@ -84,7 +86,7 @@ class ThreadedLocalServer(Thread):
 
     def shutdown(self):
         if self._server is not None:
-            self._server.server.shutdown()
+            self._server.shutdown()
 
 
 @pytest.fixture
@@ -138,6 +140,27 @@ def local_server_factory(unused_tcp_port):
         threaded_server.shutdown()
 
 
+@pytest.fixture()
+def backend_server_factory(unused_tcp_port):
+    servers = []
+
+    def create_server(app_object, config, **server_options):
+        threaded_server = ThreadedLocalServer(
+            unused_tcp_port, **server_options)
+        servers.append(threaded_server)
+        threaded_server.configure(app_object, config)
+        threaded_server.daemon = True
+        threaded_server.start()
+        threaded_server.wait_for_server_ready()
+        return threaded_server, unused_tcp_port
+
+    try:
+        yield create_server
+    finally:
+        for server in servers:
+            server.shutdown()
+
+
 @pytest.fixture
 def sample_app():
     demo = app.Chalice('demo-app')
@@ -276,6 +299,65 @@ def test_can_accept_multiple_connections(config, sample_app,
     assert response.text == '{"hello":"world"}'
 
 
+@pytest.mark.parametrize('backend', SERVER_BACKENDS)
+def test_can_handle_requests_with_backend(backend, config, sample_app,
+                                          backend_server_factory):
+    local_server, port = backend_server_factory(
+        sample_app, config, backend=backend)
+    session = requests.Session()
+    url = 'http://localhost:%s' % port
+    # The same connection is reused for each of these requests.
+    for i in range(3):
+        response = session.post(url + '/count', json={'counter': i},
+                                timeout=1)
+        assert response.status_code == 200
+    response = session.get(url + '/count', timeout=1)
+    assert sorted(response.json()) == [0, 1, 2]
+    response = session.options(url + '/test-cors', timeout=1)
+    assert response.headers['Content-Length'] == '0'
+    assert response.headers['Access-Control-Allow-Methods'] == 'POST,OPTIONS'
+
+
+@pytest.mark.parametrize('backend', SERVER_BACKENDS)
+def test_can_pipeline_requests_with_backend(backend, config, sample_app,
+                                            backend_server_factory):
+    local_server, port = backend_server_factory(
+        sample_app, config, backend=backend)
+    request = b'GET / HTTP/1.1\r\nHost: localhost\r\n\r\n'
+    with socket.create_connection(('localhost', port), timeout=1) as sock:
+        sock.sendall(request * 2)
+        response = b''
+        while response.count(b'{"hello":"world"}') < 2:
+            data = sock.recv(4096)
+            if not data:
+                break
+            response += data
+    assert response.count(b'HTTP/1.1 200') == 2
+
+
+@pytest.mark.parametrize('backend', SERVER_BACKENDS)
+def test_idle_connection_does_not_block_backend(backend, config, sample_app,
+                                                backend_server_factory):
+    local_server, port = backend_server_factory(
+        sample_app, config, backend=backend, max_threads=2)
+    idle = socket.create_connection(('localhost', port), timeout=1)
+    try:
+        response = local_server.make_call(requests.get, '/', port)
+    finally:
+        idle.close()
+    assert response.status_code == 200
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='Requires fork().')
+def test_can_serve_with_multiple_workers(config, sample_app,
+                                         backend_server_factory):
+    local_server, port = backend_server_factory(
+        sample_app, config, backend='threadpool', workers=2)
+    response = local_server.make_call(requests.get, '/', port, timeout=2)
+    assert response.status_code == 200
+    assert response.text == '{"hello":"world"}'
+
+
 def test_can_import_env_vars(unused_tcp_port, http_session):
     with cd(ENV_APP_DIR):
         p = subprocess.Popen(['chalice', 'local', '--port',
@@ -0,0 +1,132 @@
+import os
+import threading
+
+import pytest
+
+from chalice.cli import filewatch
+from chalice.cli.filewatch import PathFilter, WorkerProcess
+from chalice.utils import OSUtils
+
+
+class FakeHTTPThread(object):
+    def __init__(self):
+        self.started = False
+        self.shutdown_called = False
+        self.server = object()
+
+    def start(self):
+        self.started = True
+
+    def shutdown(self):
+        self.shutdown_called = True
+
+
+class FakeHotReloader(object):
+    def __init__(self, can_reload):
+        self.can_reload = can_reload
+        self.reloaded = []
+
+    def reload(self, server):
+        self.reloaded.append(server)
+        return self.can_reload
+
+
+class ImmediateChangeWorker(WorkerProcess):
+    DEBOUNCE_DELAY = 0.01
+
+    def __init__(self, http_thread, change_count, hot_reloader=None):
+        super(ImmediateChangeWorker, self).__init__(
+            http_thread, hot_reloader=hot_reloader)
+        self.change_count = change_count
+
+    def _start_file_watcher(self, project_dir):
+        t = threading.Thread(target=self._make_changes)
+        t.daemon = True
+        t.start()
+
+    def _make_changes(self):
+        for _ in range(self.change_count):
+            self._restart_event.set()
+
+
+@pytest.mark.parametrize('path,ignored', [
+    ('app.py', False),
+    ('chalicelib/foo.py', False),
+    ('.chalice/config.json', False),
+    ('.git', True),
+    ('.git/HEAD', True),
+    ('__pycache__/app.cpython-310.pyc', True),
+    ('chalicelib/__pycache__', True),
+    ('chalicelib/foo.pyc', True),
+    ('.app.py.swp', True),
+    ('app.py~', True),
+    ('.chalice/deployments/abcd.zip', True),
+    ('.chalice/deployed/dev.json', True),
+    ('vendor/lib.py', False),
+])
+def test_default_ignore_patterns(path, ignored):
+    path_filter = PathFilter('/project')
+    full_path = os.path.join('/project', *path.split('/'))
+    assert path_filter.is_ignored(full_path) == ignored
+
+
+def test_can_add_ignore_patterns():
+    path_filter = PathFilter('/project', ['vendor', '*.log'])
+    assert path_filter.is_ignored(os.path.join('/project', 'vendor', 'a.py'))
+    assert path_filter.is_ignored(os.path.join('/project', 'foo', 'b.log'))
+    assert not path_filter.is_ignored(os.path.join('/project', 'app.py'))
+
+
+def test_root_dir_is_never_ignored():
+    path_filter = PathFilter('/project', ['*'])
+    assert not path_filter.is_ignored('/project')
+
+
+def test_walk_prunes_ignored_directories(tmpdir):
+    tmpdir.join('app.py').write('')
+    tmpdir.join('app.pyc').write('')
+    tmpdir.mkdir('.git').join('HEAD').write('')
+    tmpdir.mkdir('chalicelib').join('foo.py').write('')
+    path_filter = PathFilter(str(tmpdir))
+    walked = []
+    for rootdir, dirnames, filenames in path_filter.walk(
+            OSUtils(), str(tmpdir)):
+        walked.extend(os.path.relpath(os.path.join(rootdir, f), str(tmpdir))
+                      for f in filenames)
+        assert '.git' not in dirnames
+    assert sorted(walked) == ['app.py', os.path.join('chalicelib', 'foo.py')]
+
+
+def test_worker_restarts_once_after_burst_of_changes():
+    http_thread = FakeHTTPThread()
+    worker = ImmediateChangeWorker(http_thread, change_count=5)
+    rc = worker.main('/project', timeout=5)
+    assert rc == filewatch.RESTART_REQUEST_RC
+    assert http_thread.started
+    assert http_thread.shutdown_called
+
+
+def test_worker_rc_0_when_no_changes():
+    http_thread = FakeHTTPThread()
+    worker = ImmediateChangeWorker(http_thread, change_count=0)
+    assert worker.main('/project', timeout=0.05) == 0
+    assert not http_thread.shutdown_called
+
+
+def test_worker_keeps_running_after_hot_reload():
+    http_thread = FakeHTTPThread()
+    hot_reloader = FakeHotReloader(can_reload=True)
+    worker = ImmediateChangeWorker(http_thread, change_count=1,
+                                   hot_reloader=hot_reloader)
+    assert worker.main('/project', timeout=0.5) == 0
+    assert hot_reloader.reloaded == [http_thread.server]
+    assert not http_thread.shutdown_called
+
+
+def test_worker_restarts_if_hot_reload_not_possible():
+    http_thread = FakeHTTPThread()
+    hot_reloader = FakeHotReloader(can_reload=False)
+    worker = ImmediateChangeWorker(http_thread, change_count=1,
+                                   hot_reloader=hot_reloader)
+    assert worker.main('/project', timeout=5) == filewatch.RESTART_REQUEST_RC
+    assert http_thread.shutdown_called
@@ -0,0 +1,167 @@
+import os
+import sys
+import time
+from unittest import mock
+
+import pytest
+
+from chalice.cli.filewatch.hotreload import HotReloader, get_app_shape
+from chalice.local import LocalDevServer, LocalGateway
+
+
+APP_TEMPLATE = '''\
+from chalice import Chalice
+from hotlib import helper
+
+app = Chalice(app_name='hotapp')
+%s
+'''
+ROUTE = '''
+@app.route('%s')
+def %s():
+    return {'value': helper.VALUE}
+'''
+
+
+class FakeProject(object):
+    def __init__(self, tmpdir):
+        self.root = tmpdir
+        self.root.mkdir('hotlib').join('__init__.py').write('')
+        self._write('hotlib/helper.py', 'VALUE = "original"\n', offset=-10)
+        self._write('hotapp.py', APP_TEMPLATE % (ROUTE % ('/', 'view0')),
+                    offset=-10)
+
+    def write_helper(self, value):
+        self._write('hotlib/helper.py', 'VALUE = %r\n' % value)
+
+    def write_app(self, paths):
+        routes = ''.join(ROUTE % (path, 'view%s' % i)
+                         for i, path in enumerate(paths))
+        self._write('hotapp.py', APP_TEMPLATE % routes)
+
+    def _write(self, filename, contents, offset=10):
+        path = os.path.join(str(self.root), *filename.split('/'))
+        with open(path, 'w') as f:
+            f.write(contents)
+        # Make sure the change is visible even with coarse
+        # filesystem timestamps.
+        mtime = time.time() + offset
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def project(tmpdir):
+    project = FakeProject(tmpdir)
+    sys.path.insert(0, str(tmpdir))
+    yield project
+    sys.path.remove(str(tmpdir))
+    for name in ['hotapp', 'hotlib', 'hotlib.helper', 'hotlib.settings',
+                 'hotlib.db']:
+        sys.modules.pop(name, None)
+
+
+def create_server(app):
+    server = mock.Mock(spec=LocalDevServer)
+    server.app_object = app
+    server.workers = 1
+    server.local_gateway = mock.Mock(spec=LocalGateway)
+    return server
+
+
+def load_app(project):
+    reloader = HotReloader(str(project.root), app_module_name='hotapp')
+    import hotapp
+    return reloader, hotapp.app
+
+
+def test_can_reload_changed_module_in_place(project):
+    reloader, app = load_app(project)
+    server = create_server(app)
+    project.write_helper('updated')
+
+    assert reloader.reload(server)
+
+    assert app.routes['/']['GET'].view_function() == {'value': 'updated'}
+    assert sys.modules['hotapp'].app is app
+    server.local_gateway.clear_cache.assert_called_with()
+
+
+def test_can_reload_multiple_times(project):
+    reloader, app = load_app(project)
+    server = create_server(app)
+    project.write_helper('first')
+    assert reloader.reload(server)
+    project._write('hotlib/helper.py', 'VALUE = "second"\n', offset=20)
+    assert reloader.reload(server)
+    assert app.routes['/']['GET'].view_function() == {'value': 'second'}
+
+
+def test_restart_needed_when_routes_change(project):
+    reloader, app = load_app(project)
+    project.write_app(['/', '/new'])
+    assert not reloader.reload(create_server(app))
+
+
+def test_restart_needed_when_no_module_changed(project):
+    reloader, app = load_app(project)
+    assert not reloader.reload(create_server(app))
+
+
+def test_restart_needed_when_module_cant_be_reloaded(project):
+    reloader, app = load_app(project)
+    project._write('hotlib/helper.py', 'VALUE = (\n')
+    assert not reloader.reload(create_server(app))
+
+
+def test_restart_needed_with_multiple_workers(project):
+    reloader, app = load_app(project)
+    server = create_server(app)
+    server.workers = 2
+    project.write_helper('updated')
+    assert not reloader.reload(server)
+
+
+def test_dependents_reloaded_after_dependencies(project):
+    reloader, _ = load_app(project)
+    assert reloader.reload_order({'hotlib.helper'}) == [
+        'hotlib.helper', 'hotapp']
+
+
+def test_reloads_modules_that_import_constants(project):
+    project._write('hotlib/settings.py', 'TABLE = "old"\n', offset=-10)
+    project._write('hotlib/db.py', (
+        'from hotlib.settings import TABLE\n'
+        'def get():\n'
+        '    return TABLE\n'), offset=-10)
+    project._write('hotlib/__init__.py', 'from hotlib import db\n',
+                   offset=-10)
+    reloader, app = load_app(project)
+    import hotlib.db
+    project._write('hotlib/settings.py', 'TABLE = "new"\n')
+
+    assert reloader.reload_order({'hotlib.settings'}) == [
+        'hotlib.settings', 'hotlib.db', 'hotlib', 'hotapp']
+    assert reloader.reload(create_server(app))
+    assert hotlib.db.get() == 'new'
+
+
+def test_restart_needed_when_reloaded_modules_import_each_other(project):
+    project._write('hotlib/settings.py', (
+        'from hotlib import db\n'
+        'TABLE = "old"\n'), offset=-10)
+    project._write('hotlib/db.py', 'from hotlib import settings\n',
+                   offset=-10)
+    reloader, app = load_app(project)
+    import hotlib.settings  # noqa
+    project._write('hotlib/settings.py', (
+        'from hotlib import db\n'
+        'TABLE = "new"\n'))
+
+    assert reloader.reload_order({'hotlib.settings'}) is None
+    assert not reloader.reload(create_server(app))
+
+
+def test_app_shape_includes_routes_and_methods(project):
+    _, app = load_app(project)
+    assert get_app_shape(app) == ((('/', ('GET',)),), tuple(
+        app.api.binary_types))
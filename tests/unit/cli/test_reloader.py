@@ -0,0 +1,82 @@
+import pytest
+
+from chalice.cli import reloader
+from chalice.cli.filewatch import RESTART_REQUEST_RC
+
+
+class FakeProcessAPI(object):
+    def __init__(self, return_codes=None, fork_results=None):
+        if return_codes is None:
+            return_codes = []
+        if fork_results is None:
+            fork_results = []
+        self.return_codes = return_codes
+        self.fork_results = fork_results
+        self.forked = 0
+        self.killed = []
+        self.exit_codes = []
+
+    def fork(self):
+        self.forked += 1
+        if self.fork_results:
+            return self.fork_results.pop(0)
+        return 1234
+
+    def waitpid(self, pid):
+        rc = self.return_codes.pop(0)
+        if isinstance(rc, BaseException):
+            raise rc
+        return rc
+
+    def kill(self, pid):
+        self.killed.append(pid)
+
+    def exit_process(self, rc):
+        self.exit_codes.append(rc)
+
+    def create_parent(self, env, worker_main):
+        return reloader.ZygoteParentProcess(
+            env, worker_main, fork=self.fork, waitpid=self.waitpid,
+            kill=self.kill, exit_process=self.exit_process)
+
+
+def test_zygote_restarts_child_until_not_restart_rc():
+    api = FakeProcessAPI(return_codes=[RESTART_REQUEST_RC,
+                                       RESTART_REQUEST_RC, 0])
+    parent = api.create_parent({}, lambda: 0)
+    parent.main()
+    assert api.forked == 3
+    assert api.exit_codes == []
+
+
+def test_zygote_child_runs_worker_and_exits():
+    env = {}
+    api = FakeProcessAPI(fork_results=[0])
+    parent = api.create_parent(env, lambda: RESTART_REQUEST_RC)
+    parent.main()
+    assert env == {'CHALICE_WORKER': 'true'}
+    assert api.exit_codes == [RESTART_REQUEST_RC]
+
+
+def test_zygote_child_exits_even_if_worker_raises():
+    def worker_main():
+        raise RuntimeError("worker failed")
+
+    api = FakeProcessAPI(fork_results=[0])
+    parent = api.create_parent({}, worker_main)
+    with pytest.raises(RuntimeError):
+        parent.main()
+    assert api.exit_codes == [0]
+
+
+def test_zygote_ctrl_c_kills_child():
+    api = FakeProcessAPI(return_codes=[KeyboardInterrupt()])
+    parent = api.create_parent({}, lambda: 0)
+    with pytest.raises(KeyboardInterrupt):
+        parent.main()
+    assert api.killed == [1234]
+
+
+def test_get_best_worker_process_returns_worker_class():
+    worker_cls = reloader.get_best_worker_process()
+    assert issubclass(worker_cls, reloader.WorkerProcess)
@@ -230,6 +230,45 @@ class TestApplicationGraphBuilder(object):
         second_layer = application.resources[1].managed_layer
         assert first_layer == second_layer
 
+    def test_function_requirements_have_own_deployment_package(
+            self, sample_app_lambda_only):
+
+        @sample_app_lambda_only.lambda_function()
+        def second(event, context):
+            pass
+
+        @sample_app_lambda_only.lambda_function()
+        def third(event, context):
+            pass
+
+        builder = ApplicationGraphBuilder()
+        config = Config(
+            chalice_stage='dev',
+            user_provided_params={'chalice_app': sample_app_lambda_only,
+                                  'project_dir': '.'},
+            config_from_disk={
+                'app_name': 'lambda-only',
+                'automatic_layer': True,
+                'manage_iam_role': False,
+                'iam_role_arn': 'role:arn',
+                'lambda_functions': {
+                    'second': {'requirements_file': 'slim.txt'},
+                    'third': {'requirements_file': 'slim.txt'},
+                },
+            })
+        application = builder.build(config, stage_name='dev')
+        first, second_function, third_function = application.resources
+        assert first.deployment_package.requirements_filename is None
+        assert first.managed_layer is not None
+        package = second_function.deployment_package
+        assert package.requirements_filename == 'slim.txt'
+        assert package is not first.deployment_package
+        # Functions with the same requirements share a package and
+        # don't use the managed layer.
+        assert third_function.deployment_package is package
+        assert second_function.managed_layer is None
+        assert third_function.managed_layer is None
+
     def test_can_build_lambda_function_with_layers(self,
                                                    sample_app_lambda_only):
         # This is the simplest configuration we can get.
@@ -16,13 +16,13 @@ from chalice.app import Chalice
 from chalice.awsclient import LambdaClientError, AWSClientError
 from chalice.awsclient import DeploymentPackageTooLargeError
 from chalice.awsclient import LambdaErrorContext
+from chalice.awsclient import TypedAWSClient
 from chalice.config import Config
 from chalice.policy import AppPolicyGenerator
 from chalice.deploy.deployer import ChaliceDeploymentError
 from chalice.utils import UI
 import unittest
 
-from chalice.awsclient import TypedAWSClient
 from chalice.utils import OSUtils, serialize_to_json
 from chalice.deploy import models
 from chalice.deploy import packager
@@ -30,10 +30,11 @@ from chalice.deploy.deployer import create_default_deployer, \
     create_deletion_deployer, Deployer, BaseDeployStep, \
     InjectDefaults, DeploymentPackager, SwaggerBuilder, \
     PolicyGenerator, BuildStage, ResultsRecorder, DeploymentReporter, \
-    ManagedLayerDeploymentPackager
+    ManagedLayerDeploymentPackager, LazyHandlerImports
 from chalice.deploy.appgraph import ApplicationGraphBuilder, \
-    DependencyBuilder
+    DependencyBuilder, CyclicDependencyError
 from chalice.deploy.executor import Executor
+from chalice.deploy.executor import ParallelDeletionExecutor
 from chalice.deploy.swagger import SwaggerGenerator, TemplatedSwaggerGenerator
 from chalice.deploy.planner import PlanStage
 from chalice.deploy.planner import StringFormat
@@ -342,6 +343,45 @@ class TestDependencyBuilder(object):
         deps = dep_builder.build_dependencies(app)
         assert deps == [leaf, second_parent, first_parent]
 
+    def test_can_build_deep_dependency_chain(self):
+        resource = LeafResource(name='leaf')
+        chain = [resource]
+        for i in range(5000):
+            resource = FooResource(name='foo%s' % i, leaf=resource)
+            chain.append(resource)
+        app = models.Application(stage='dev', resources=[resource])
+
+        dep_builder = DependencyBuilder()
+        deps = dep_builder.build_dependencies(app)
+        assert deps == chain
+
+    def test_error_raised_on_circular_dependency(self):
+        first = FooResource(name='first', leaf=[])
+        second = FooResource(name='second', leaf=[first])
+        first.leaf.append(second)
+        app = models.Application(stage='dev', resources=[first])
+
+        dep_builder = DependencyBuilder()
+        with pytest.raises(CyclicDependencyError) as excinfo:
+            dep_builder.build_dependencies(app)
+        assert str(excinfo.value) == (
+            'Circular dependency between resources: '
+            'FooResource -> FooResource -> FooResource')
+
+    def test_cycle_error_uses_resource_names(self):
+        role = models.ManagedIAMRole(
+            resource_name='role', role_name='role', trust_policy={},
+            policy=models.AutoGenIAMPolicy(document={}))
+        function = FooResource(name='function', leaf=[role])
+        role.policy = function
+        app = models.Application(stage='dev', resources=[function])
+
+        dep_builder = DependencyBuilder()
+        with pytest.raises(CyclicDependencyError) as excinfo:
+            dep_builder.build_dependencies(app)
+        assert str(excinfo.value).endswith(
+            'FooResource -> role -> FooResource')
+
 
 class RoleTestCase(object):
     def __init__(self, given, roles, app_name='appname'):
@@ -742,12 +782,13 @@ class TestDeploymentPackager(object):
 
         config = Config.create(project_dir='.')
 
-        p = ManagedLayerDeploymentPackager(lambda_packager, layer_packager)
+        p = ManagedLayerDeploymentPackager(
+            lambda_packager, layer_packager, lambda_packager)
         p.handle(config, function.managed_layer)
         p.handle(config, function)
         assert function.deployment_package.filename == 'package.zip'
         lambda_packager.create_deployment_package.assert_called_with(
-            '.', config.lambda_python_version
+            '.', config.lambda_python_version, None
         )
         assert function.managed_layer.deployment_package.filename == (
             'package-layer.zip'
@@ -756,6 +797,39 @@ class TestDeploymentPackager(object):
             '.', config.lambda_python_version
         )
 
+    def test_function_requirements_use_function_packager(self):
+        function = create_function_resource('myfunction')
+        function.deployment_package.requirements_filename = 'reqs.txt'
+        other = create_function_resource('other')
+        layer = models.LambdaLayer(
+            resource_name='managed-layer',
+            layer_name='appname-dev-managed-layer',
+            runtime='python2.7',
+            deployment_package=models.DeploymentPackage(
+                models.Placeholder.BUILD_STAGE
+            )
+        )
+        other.managed_layer = layer
+        packagers = {}
+        for name in ['lambda', 'layer', 'function']:
+            packagers[name] = mock.Mock(
+                spec=packager.BaseLambdaDeploymentPackager)
+            packagers[name].deployment_package_filename.return_value = (
+                '%s.zip' % name)
+            packagers[name].create_deployment_package.return_value = (
+                '%s.zip' % name)
+        config = Config.create(project_dir='.')
+
+        p = ManagedLayerDeploymentPackager(
+            packagers['lambda'], packagers['layer'], packagers['function'])
+        p.prepare(config, [layer, function, other])
+
+        assert function.deployment_package.filename == 'function.zip'
+        assert other.deployment_package.filename == 'lambda.zip'
+        assert layer.deployment_package.filename == 'layer.zip'
+        packagers['function'].create_deployment_package.assert_called_with(
+            '.', config.lambda_python_version, 'reqs.txt')
+
     def test_layer_package_not_generated_if_filename_populated(self):
         generator = mock.Mock(spec=packager.BaseLambdaDeploymentPackager)
 
@@ -770,7 +844,7 @@ class TestDeploymentPackager(object):
         function.managed_layer = layer
         config = Config.create(project_dir='.')
 
-        p = ManagedLayerDeploymentPackager(None, generator)
+        p = ManagedLayerDeploymentPackager(None, generator, None)
         p.handle(config, layer)
 
         assert layer.deployment_package.filename == 'original.zip'
@@ -794,7 +868,8 @@ class TestDeploymentPackager(object):
 
         config = Config.create(project_dir='.')
 
-        p = ManagedLayerDeploymentPackager(lambda_packager, layer_packager)
+        p = ManagedLayerDeploymentPackager(
+            lambda_packager, layer_packager, lambda_packager)
         p.handle(config, function.managed_layer)
         p.handle(config, function)
         # If the deployment package for layers would result in an empty
@@ -814,6 +889,27 @@ class TestDeploymentPackager(object):
 
         assert package.filename == 'package.zip'
 
+    def test_can_prepare_function_packages(self):
+        generator = mock.Mock(spec=packager.LambdaDeploymentPackager)
+        generator.deployment_package_filename.side_effect = [
+            'shared.zip', 'slim.zip', 'slim.zip']
+        generator.create_deployment_package.side_effect = \
+            lambda project_dir, version, requirements: '%s.zip' % requirements
+        functions = [create_function_resource(name)
+                     for name in ['shared', 'first', 'second']]
+        functions[1].deployment_package.requirements_filename = 'first.txt'
+        functions[2].deployment_package.requirements_filename = 'second.txt'
+        config = Config.create(project_dir='.')
+
+        p = DeploymentPackager(generator)
+        p.prepare(config, functions)
+
+        assert [f.deployment_package.filename for f in functions] == [
+            'None.zip', 'first.txt.zip', 'first.txt.zip']
+        # The requirements files have the same contents so their
+        # package is only built once.
+        assert generator.create_deployment_package.call_count == 2
+
     def test_package_not_generated_if_filename_populated(self):
         generator = mock.Mock(spec=packager.LambdaDeploymentPackager)
         generator.create_deployment_package.return_value = 'NEWPACKAGE.zip'
@@ -838,6 +934,9 @@ def test_build_stage():
     config = Config.create()
     build.execute(config, [foo_resource, bar_resource])
 
+    first.prepare.assert_called_with(config, [foo_resource, bar_resource])
+    second.prepare.assert_called_with(config, [foo_resource, bar_resource])
+
     assert first.handle.call_args_list == [
         mock.call(config, foo_resource),
         mock.call(config, bar_resource),
@@ -848,6 +947,58 @@ def test_build_stage():
     ]
 
 
+class TestLazyHandlerImports(object):
+    APP_SOURCE = (
+        'import csv\n'
+        'from chalice import Chalice\n'
+        'app = Chalice(app_name="foo")\n'
+        '@app.route("/")\n'
+        'def index():\n'
+        '    return csv.excel\n'
+        '@app.lambda_function()\n'
+        'def myfunction(event, context):\n'
+        '    return {}\n'
+    )
+
+    def create_step(self):
+        injector = mock.Mock(spec=packager.LazyEntryModuleInjector)
+        injector.inject_entry_module.return_value = (
+            '_chalice_entry_myfunction.handler')
+        osutils = mock.Mock(spec=OSUtils)
+        osutils.joinpath = os.path.join
+        osutils.get_file_contents.return_value = self.APP_SOURCE
+        return LazyHandlerImports(injector, osutils), injector
+
+    def test_noop_if_not_enabled(self):
+        step, injector = self.create_step()
+        function = create_function_resource('myfunction')
+        function.deployment_package.filename = 'package.zip'
+        step.handle(Config.create(project_dir='.'), function)
+        assert function.handler == 'app.app'
+        assert not injector.inject_entry_module.called
+
+    def test_can_inject_entry_module(self):
+        step, injector = self.create_step()
+        function = create_function_resource('myfunction')
+        function.handler = 'app.myfunction'
+        function.deployment_package.filename = 'package.zip'
+        config = Config.create(project_dir='.', lazy_handler_imports=True)
+        step.handle(config, function)
+        assert function.handler == '_chalice_entry_myfunction.handler'
+        injector.inject_entry_module.assert_called_with(
+            'package.zip', 'app', 'myfunction', ['csv'])
+
+    def test_blueprint_handlers_not_changed(self):
+        step, injector = self.create_step()
+        function = create_function_resource('myfunction')
+        function.handler = 'chalicelib.blueprint.myfunction'
+        function.deployment_package.filename = 'package.zip'
+        config = Config.create(project_dir='.', lazy_handler_imports=True)
+        step.handle(config, function)
+        assert function.handler == 'chalicelib.blueprint.myfunction'
+        assert not injector.inject_entry_module.called
+
+
 class TestDeployer(unittest.TestCase):
     def setUp(self):
         self.resource_builder = mock.Mock(spec=ApplicationGraphBuilder)
@@ -930,6 +1081,16 @@ def test_can_create_default_deployer():
     assert isinstance(deployer, Deployer)
 
 
+def test_can_create_default_deployer_with_shared_client():
+    session = botocore.session.get_session()
+    client = TypedAWSClient(session)
+    deployer = create_default_deployer(session, Config.create(
+        project_dir='.',
+        chalice_stage='dev',
+    ), UI(), client=client)
+    assert deployer._executor._client is client
+
+
 def test_can_create_deployer_with_layer_builds():
     session = botocore.session.get_session()
     deployer = create_default_deployer(session, Config.create(
@@ -946,6 +1107,14 @@ def test_can_create_deletion_deployer():
     assert isinstance(deployer, Deployer)
 
 
+def test_can_create_parallel_deletion_deployer():
+    session = botocore.session.get_session()
+    deployer = create_deletion_deployer(
+        TypedAWSClient(session), UI(), max_workers=4)
+    assert isinstance(deployer, Deployer)
+    assert isinstance(deployer._executor, ParallelDeletionExecutor)
+
+
 def test_templated_swagger_generator(sample_app):
     doc = TemplatedSwaggerGenerator().generate_swagger(sample_app)
     uri = doc['paths']['/']['get']['x-amazon-apigateway-integration']['uri']
@@ -5,7 +5,8 @@ import pytest
 from chalice.awsclient import TypedAWSClient
 from chalice.deploy import models
 from chalice.deploy.executor import Executor, UnresolvedValueError, \
-    VariableResolver, DisplayOnlyExecutor
+    VariableResolver, DisplayOnlyExecutor, ParallelDeletionExecutor
+from chalice.deploy.sweeper import ResourceSweeper, ResourceDeletion
 from chalice.deploy.models import APICall, RecordResourceVariable, \
     RecordResourceValue, StoreValue, JPSearch, BuiltinFunction, Instruction, \
     CopyVariable
@@ -13,6 +14,80 @@ from chalice.deploy.planner import Variable, StringFormat, KeyDataVariable
 from chalice.utils import UI
 
 
+class TestParallelDeletionExecutor(object):
+    def setup_method(self):
+        self.mock_client = mock.Mock(spec=TypedAWSClient)
+        self.ui = mock.Mock(spec=UI)
+        self.sweeper = ResourceSweeper()
+        self.executor = ParallelDeletionExecutor(
+            self.mock_client, self.ui, self.sweeper, max_workers=4)
+
+    def add_deletion(self, name, resource_type, method_name, params,
+                     message=None):
+        instructions = (APICall(method_name, params),)
+        self.sweeper.deletions.append(ResourceDeletion(
+            resource_name=name, resource_type=resource_type,
+            instructions=instructions, message=message))
+        self.sweeper.plan.instructions.extend(instructions)
+
+    def test_deletes_dependencies_before_dependents(self):
+        calls = []
+        self.mock_client.delete_role.side_effect = \
+            lambda **kwargs: calls.append('role')
+        self.mock_client.delete_function.side_effect = \
+            lambda **kwargs: calls.append('function')
+        self.mock_client.remove_lambda_event_source.side_effect = \
+            lambda **kwargs: calls.append('event_source')
+        self.add_deletion('role', 'iam_role', 'delete_role',
+                          {'name': 'role'})
+        self.add_deletion('function', 'lambda_function', 'delete_function',
+                          {'function_name': 'arn'})
+        self.add_deletion('event', 'sqs_event', 'remove_lambda_event_source',
+                          {'event_uuid': 'uuid'})
+        self.executor.execute(self.sweeper.plan)
+        assert calls == ['event_source', 'function', 'role']
+
+    def test_independent_resources_deleted_concurrently(self):
+        for i in range(4):
+            self.add_deletion('function%s' % i, 'lambda_function',
+                              'delete_function', {'function_name': str(i)})
+        self.executor.execute(self.sweeper.plan)
+        assert self.mock_client.delete_function.call_count == 4
+        assert self.executor.count_per_resource_type == {
+            'lambda_function': 4}
+
+    def test_writes_progress_and_summary(self):
+        self.add_deletion('function', 'lambda_function', 'delete_function',
+                          {'function_name': 'arn'},
+                          message='Deleting function: arn\n')
+        self.executor.execute(self.sweeper.plan)
+        output = ''.join(c[0][0] for c in self.ui.write.call_args_list)
+        assert 'Deleting function: arn\n' in output
+        assert '[1/1] Deleted lambda_function: function' in output
+        assert 'Time spent per resource type' in output
+
+    def test_stops_scheduling_after_error(self):
+        self.mock_client.delete_function.side_effect = RuntimeError('boom')
+        self.add_deletion('function', 'lambda_function', 'delete_function',
+                          {'function_name': 'arn'})
+        self.add_deletion('role', 'iam_role', 'delete_role',
+                          {'name': 'role'})
+        with pytest.raises(RuntimeError):
+            self.executor.execute(self.sweeper.plan)
+        assert not self.mock_client.delete_role.called
+
+    def test_executes_non_deletion_instructions(self):
+        self.add_deletion('role', 'iam_role', 'delete_role',
+                          {'name': 'role'})
+        plan = models.Plan(
+            [APICall('create_log_group', {'log_group_name': 'foo'})] +
+            self.sweeper.plan.instructions, {})
+        self.executor.execute(plan)
+        self.mock_client.create_log_group.assert_called_with(
+            log_group_name='foo')
+        self.mock_client.delete_role.assert_called_with(name='role')
+
+
 class TestExecutor(object):
     def setup_method(self):
         self.mock_client = mock.Mock(spec=TypedAWSClient)
@@ -2698,6 +2698,18 @@ class TestUnreferencedResourcePlanner(BasePlannerTests):
         assert plan[0].method_name == 'delete_function'
         assert plan[0].params == {'function_name': 'arn'}
 
+    def test_records_deletion_per_resource(self):
+        plan = []
+        deployed = self.one_deployed_lambda_function()
+        config = FakeConfig(deployed)
+        self.execute(plan, config)
+        assert len(self.sweeper.deletions) == 1
+        deletion = self.sweeper.deletions[0]
+        assert deletion.resource_name == 'myfunction'
+        assert deletion.resource_type == 'lambda_function'
+        assert deletion.instructions == tuple(plan)
+        assert deletion.message == 'Deleting function: arn\n'
+
     def test_will_delete_log_group(self):
         plan = []
         deployed = {
@@ -0,0 +1,197 @@
+import asyncio
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+
+from chalice import app
+from chalice.adapters import ASGIAdapter, WSGIAdapter
+
+
+@pytest.fixture
+def sample_app():
+    demo = app.Chalice('demo-app')
+
+    @demo.authorizer()
+    def token_auth(auth_request):
+        if auth_request.token == 'allow':
+            return app.AuthResponse(routes=['*'], principal_id='user')
+        return app.AuthResponse(routes=[], principal_id='user')
+
+    @demo.route('/', methods=['GET'])
+    def index():
+        return {'hello': 'world'}
+
+    @demo.route('/echo/{name}', methods=['POST'])
+    def echo(name):
+        request = demo.current_request
+        return {'name': name, 'body': request.json_body,
+                'query': request.query_params}
+
+    @demo.route('/cors', methods=['GET'], cors=True)
+    def cors():
+        return {}
+
+    @demo.route('/secret', methods=['GET'], authorizer=token_auth)
+    def secret():
+        return {'secret': True}
+
+    @demo.route('/headers', methods=['GET'])
+    def multi_value_headers():
+        return app.Response(body='ok', status_code=201,
+                            headers={'Content-Type': 'text/plain',
+                                     'X-Foo': ['a', 'b']})
+
+    return demo
+
+
+def call_wsgi(adapter, method, path, body=b'', query='', headers=None):
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'wsgi.input': BytesIO(body),
+        'CONTENT_LENGTH': str(len(body)),
+    }
+    if body:
+        environ['CONTENT_TYPE'] = 'application/json'
+    for name, value in (headers or {}).items():
+        environ['HTTP_' + name.upper().replace('-', '_')] = value
+    setup_testing_defaults(environ)
+    result = {}
+
+    def start_response(status, response_headers):
+        result['status'] = status
+        result['headers'] = response_headers
+
+    result['body'] = b''.join(adapter(environ, start_response))
+    return result
+
+
+def call_asgi(adapter, method, path, body=b'', query=b'', headers=None):
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query,
+        'headers': [(k.lower().encode('latin-1'), v.encode('latin-1'))
+                    for k, v in (headers or {}).items()],
+    }
+    messages = [
+        {'type': 'http.request', 'body': body[:1], 'more_body': True},
+        {'type': 'http.request', 'body': body[1:], 'more_body': False},
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(adapter(scope, receive, send))
+    return sent
+
+
+def test_can_create_wsgi_and_asgi_adapters_for_same_app(sample_app):
+    wsgi_adapter = WSGIAdapter(sample_app)
+    asgi_adapter = ASGIAdapter(sample_app)
+    result = call_wsgi(wsgi_adapter, 'GET', '/')
+    assert result['status'].startswith('200')
+    assert result['body'] == b'{"hello":"world"}'
+    sent = call_asgi(asgi_adapter, 'GET', '/')
+    assert sent[0]['status'] == 200
+
+
+class TestWSGIAdapter(object):
+    def test_can_handle_get_request(self, sample_app):
+        response = call_wsgi(WSGIAdapter(sample_app), 'GET', '/')
+        assert response['status'] == '200 OK'
+        assert response['body'] == b'{"hello":"world"}'
+        assert ('Content-Type', 'application/json') in response['headers']
+        assert ('Content-Length', '17') in response['headers']
+
+    def test_can_pass_body_params_and_query_string(self, sample_app):
+        response = call_wsgi(WSGIAdapter(sample_app), 'POST', '/echo/bob',
+                             body=b'{"foo": "bar"}', query='a=b')
+        assert response['status'] == '200 OK'
+        assert response['body'] == (
+            b'{"name":"bob","body":{"foo":"bar"},"query":{"a":"b"}}')
+
+    def test_unknown_route_is_forbidden(self, sample_app):
+        response = call_wsgi(WSGIAdapter(sample_app), 'GET', '/unknown')
+        assert response['status'] == '403 Forbidden'
+
+    def test_can_respond_to_cors_preflight(self, sample_app):
+        response = call_wsgi(WSGIAdapter(sample_app), 'OPTIONS', '/cors')
+        headers = dict(response['headers'])
+        assert headers['Access-Control-Allow-Methods'] == 'GET,OPTIONS'
+        assert headers['Content-Length'] == '0'
+        assert response['body'] == b''
+
+    def test_authorizer_is_invoked(self, sample_app):
+        adapter = WSGIAdapter(sample_app)
+        response = call_wsgi(adapter, 'GET', '/secret',
+                             headers={'Authorization': 'allow'})
+        assert response['status'] == '200 OK'
+        response = call_wsgi(adapter, 'GET', '/secret',
+                             headers={'Authorization': 'deny'})
+        assert response['status'] == '403 Forbidden'
+
+    def test_can_send_multi_value_headers(self, sample_app):
+        response = call_wsgi(WSGIAdapter(sample_app), 'GET', '/headers')
+        assert response['status'] == '201 Created'
+        assert ('X-Foo', 'a') in response['headers']
+        assert ('X-Foo', 'b') in response['headers']
+        assert ('Content-Type', 'text/plain') in response['headers']
+
+
+class TestASGIAdapter(object):
+    def test_can_handle_request(self, sample_app):
+        sent = call_asgi(ASGIAdapter(sample_app), 'POST', '/echo/bob',
+                         body=b'{"foo": "bar"}', query=b'a=b',
+                         headers={'Content-Type': 'application/json'})
+        assert sent[0]['type'] == 'http.response.start'
+        assert sent[0]['status'] == 200
+        assert (b'Content-Type', b'application/json') in sent[0]['headers']
+        assert sent[1] == {
+            'type': 'http.response.body',
+            'body': b'{"name":"bob","body":{"foo":"bar"},"query":{"a":"b"}}',
+        }
+
+    def test_authorizer_is_invoked(self, sample_app):
+        adapter = ASGIAdapter(sample_app)
+        sent = call_asgi(adapter, 'GET', '/secret',
+                         headers={'Authorization': 'deny'})
+        assert sent[0]['status'] == 403
+        sent = call_asgi(adapter, 'GET', '/secret',
+                         headers={'Authorization': 'allow'})
+        assert sent[0]['status'] == 200
+        assert sent[1]['body'] == b'{"secret":true}'
+
+    def test_can_handle_lifespan_events(self, sample_app):
+        messages = [{'type': 'lifespan.startup'},
+                    {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(
+            ASGIAdapter(sample_app)({'type': 'lifespan'}, receive, send))
+        assert sent == [{'type': 'lifespan.startup.complete'},
+                        {'type': 'lifespan.shutdown.complete'}]
+
+    def test_unsupported_scope_type_is_error(self, sample_app):
+        async def receive():
+            return {}
+
+        async def send(message):
+            pass
+
+        with pytest.raises(ValueError):
+            asyncio.run(ASGIAdapter(sample_app)(
+                {'type': 'websocket'}, receive, send))
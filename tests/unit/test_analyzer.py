@@ -22,6 +22,11 @@ def chalice_aws_calls(source_code):
     return calls
 
 
+def lazy_imports(source_code, handler_name):
+    handler_imports = analyzer.get_handler_imports(dedent(source_code))
+    return handler_imports.lazy_imports(handler_name)
+
+
 def known_types_for_module(source_code):
     real_source_code = dedent(source_code)
     compiled = analyzer.parse_code(real_source_code)
@@ -865,3 +870,312 @@ def test_can_handle_shadowed_declaration():
 #         h = Helper(ddb)
 #         h.foo()
 #     """) == {'dynamodb': set(['list_tables'])}
+
+
+def test_handler_imports_defer_modules_used_by_other_handlers():
+    source = """\
+        import csv
+        import json
+        from chalice import Chalice
+        app = Chalice(app_name='foo')
+
+        @app.lambda_function()
+        def first(event, context):
+            return json.dumps(event)
+
+        @app.lambda_function()
+        def second(event, context):
+            return list(csv.reader(event))
+    """
+    assert lazy_imports(source, 'first') == ['csv']
+    assert lazy_imports(source, 'second') == ['json']
+    assert lazy_imports(source, 'app') == ['csv', 'json']
+
+
+def test_handler_imports_follow_calls_to_module_functions():
+    source = """\
+        import sqlite3 as db
+        from chalice import Chalice
+        app = Chalice(app_name='foo')
+
+        def helper():
+            return db.connect(':memory:')
+
+        @app.route('/')
+        def index():
+            return helper()
+
+        @app.lambda_function()
+        def other(event, context):
+            return {}
+    """
+    assert lazy_imports(source, 'index') == []
+    assert lazy_imports(source, 'other') == ['sqlite3']
+
+
+def test_handler_imports_used_at_import_time_are_not_deferred():
+    source = """\
+        import os
+        import json
+        import logging
+        import sideeffect
+        import xml.dom
+        from chalice import Chalice
+        app = Chalice(app_name=os.environ['NAME'])
+        logging.basicConfig()
+
+        @app.middleware('all')
+        def mymiddleware(event, get_response):
+            return json.loads(get_response(event))
+
+        @app.route('/', cors=logging.DEBUG)
+        def index():
+            return {'xml': xml.dom, 'logging': logging}
+    """
+    # os and logging are used when the module is imported, json is
+    # used by middleware, sideeffect is never referenced, and
+    # submodule imports always import their parent package.
+    assert lazy_imports(source, 'app') == []
+
+
+def test_can_get_module_imports():
+    source = dedent("""\
+        import os
+        from chalicelib import db
+        from .models import Item, Other
+        from .. import base
+
+        def foo():
+            import json
+    """)
+    assert analyzer.get_module_imports(source, 'chalicelib.sub.mod') == [
+        'chalicelib', 'chalicelib.base', 'chalicelib.db',
+        'chalicelib.sub.models', 'chalicelib.sub.models.Item',
+        'chalicelib.sub.models.Other', 'json', 'os',
+    ]
+
+
+def test_can_resolve_relative_imports_in_package():
+    source = 'from .db import client'
+    assert analyzer.get_module_imports(
+        source, 'chalicelib', is_package=True) == [
+            'chalicelib.db', 'chalicelib.db.client']
+
+
+def test_analyze_module_assumes_library_functions_are_called():
+    analysis = analyzer.analyze_module(dedent("""\
+        import boto3
+        ddb = boto3.client('dynamodb')
+
+        def scan():
+            return ddb.scan()
+
+        def s3_client():
+            return boto3.client('s3')
+    """), 'chalicelib.db', 'chalicelib/db.py')
+    assert analysis.client_calls == {'dynamodb': set(['scan'])}
+    assert analysis.exports == {
+        'ddb': Boto3ClientType('dynamodb'),
+        's3_client': FunctionType(Boto3ClientType('s3')),
+    }
+
+
+def test_analyze_module_uses_imported_types():
+    analysis = analyzer.analyze_module(dedent("""\
+        from chalice import Chalice
+        from chalicelib.db import ddb, s3_client as s3
+        app = Chalice(app_name='foo')
+
+        @app.route('/')
+        def index():
+            s3().list_buckets()
+            return ddb.get_item()
+
+        def not_a_view():
+            ddb.delete_table()
+    """), 'app', 'app.py', is_app=True, imported_types={
+        'chalicelib.db': {
+            'ddb': Boto3ClientType('dynamodb'),
+            's3_client': FunctionType(Boto3ClientType('s3')),
+        },
+    })
+    assert analysis.client_calls == {
+        'dynamodb': set(['get_item']),
+        's3': set(['list_buckets']),
+    }
+
+
+def call_arguments(source_code):
+    return analyzer.analyze_module(
+        dedent(source_code), 'app', 'app.py', is_app=True).call_arguments
+
+
+def test_can_collect_constant_call_arguments():
+    assert call_arguments("""\
+        import os
+        import boto3
+        from chalice import Chalice
+        app = Chalice(app_name='foo')
+        ddb = boto3.client('dynamodb')
+        TABLE = os.environ['TABLE_NAME']
+        BUCKET = 'mybucket'
+
+        @app.route('/')
+        def index():
+            ddb.get_item(TableName=TABLE, Key={})
+            ddb.get_item(TableName='other', Key={})
+            ddb.put_item(TableName=os.environ.get('OTHER'), Item={})
+            ddb.list_tables()
+            boto3.client('s3').get_object(Bucket=BUCKET, Key=index.key)
+            boto3.client('sqs').send_message(QueueUrl=os.getenv('QUEUE'))
+    """) == {
+        'dynamodb': {
+            'get_item': [{'TableName': ['env', 'TABLE_NAME']},
+                         {'TableName': ['string', 'other']}],
+            'put_item': [{'TableName': ['env', 'OTHER']}],
+            'list_tables': [{}],
+        },
+        's3': {'get_object': [{'Bucket': ['string', 'mybucket']}]},
+        'sqs': {'send_message': [{'QueueUrl': ['env', 'QUEUE']}]},
+    }
+
+
+def test_name_with_conflicting_constants_is_not_constant():
+    assert call_arguments("""\
+        import boto3
+        from chalice import Chalice
+        app = Chalice(app_name='foo')
+        TABLE = 'first'
+        TABLE = 'second'
+        SUFFIXED = 'table'
+        SUFFIXED += '-suffix'
+
+        @app.route('/')
+        def index():
+            boto3.client('dynamodb').get_item(TableName=TABLE)
+            boto3.client('dynamodb').put_item(TableName=SUFFIXED)
+    """) == {'dynamodb': {'get_item': [{}], 'put_item': [{}]}}
+
+
+def test_name_reassigned_after_unknown_value_is_not_constant():
+    assert call_arguments("""\
+        import boto3
+        from chalice import Chalice
+        app = Chalice(app_name='foo')
+
+        @app.route('/')
+        def index():
+            name = app.current_request.query_params['t']
+            if not name:
+                name = 'default'
+            boto3.client('dynamodb').get_item(TableName=name)
+    """) == {'dynamodb': {'get_item': [{}]}}
+
+
+def test_name_assigned_in_branch_or_loop_is_not_constant():
+    assert call_arguments("""\
+        import os
+        import boto3
+        from chalice import Chalice
+        app = Chalice(app_name='foo')
+
+        @app.route('/')
+        def index():
+            if os.environ.get('USE_OTHER'):
+                first = 'other'
+            for suffix in ['a', 'b']:
+                second = 'table'
+            third = 'table'
+            third, unused = os.environ['TABLE'], None
+            fourth = 'table'
+            fourth = os.environ['TABLE']
+            client = boto3.client('dynamodb')
+            client.get_item(TableName=first)
+            client.put_item(TableName=second)
+            client.delete_item(TableName=third)
+            client.update_item(TableName=fourth)
+    """) == {
+        'dynamodb': {
+            'get_item': [{}],
+            'put_item': [{}],
+            'delete_item': [{}],
+            'update_item': [{}],
+        },
+    }
+
+
+def test_name_rebound_by_global_or_nonlocal_is_not_constant():
+    assert call_arguments("""\
+        import boto3
+        from chalice import Chalice
+        app = Chalice(app_name='foo')
+        BUCKET = 'b1'
+
+        def set_bucket(name):
+            global BUCKET
+            BUCKET = name
+
+        @app.route('/')
+        def index():
+            table = 'first'
+
+            def set_table():
+                nonlocal table
+                table = 'second'
+            boto3.client('s3').get_object(Bucket=BUCKET)
+            boto3.client('dynamodb').get_item(TableName=table)
+    """) == {
+        's3': {'get_object': [{}]},
+        'dynamodb': {'get_item': [{}]},
+    }
+
+
+def test_can_find_attribute_writes_to_other_modules():
+    assert analyzer.get_module_attribute_writes(dedent("""\
+        import chalicelib.names
+        import chalicelib.config as config
+        from chalicelib import settings
+        from . import sibling
+        settings.BUCKET = 'other'
+        settings.TABLES['users'] = 'users'
+        config.TABLE += '-suffix'
+
+        def configure():
+            chalicelib.names.QUEUE, sibling.TOPIC = 'queue', 'topic'
+            local = object()
+            local.value = 'ignored'
+    """), 'chalicelib.app', is_package=False) == [
+        'chalicelib.config.TABLE',
+        'chalicelib.names.QUEUE',
+        'chalicelib.settings.BUCKET',
+        'chalicelib.sibling.TOPIC',
+    ]
+
+
+def test_service_name_assigned_in_branch_still_infers_client():
+    assert call_arguments("""\
+        import os
+        import boto3
+        from chalice import Chalice
+        app = Chalice(app_name='foo')
+
+        @app.route('/')
+        def index():
+            service = 'sqs'
+            if os.environ.get('USE_S3'):
+                service = 's3'
+            boto3.client(service).list_buckets()
+    """) == {'s3': {'list_buckets': [{}]}}
+
+
+def test_analyze_module_exports_constants():
+    analysis = analyzer.analyze_module(dedent("""\
+        import os
+        TABLE_NAME = os.environ['TABLE_NAME']
+        BUCKET = 'mybucket'
+    """), 'chalicelib.db', 'chalicelib/db.py')
+    assert {name: analyzer.get_constant_value(value)
+            for name, value in analysis.exports.items()} == {
+        'TABLE_NAME': ['env', 'TABLE_NAME'],
+        'BUCKET': ['string', 'mybucket'],
+    }
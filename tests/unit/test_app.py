@@ -1487,6 +1487,40 @@ def test_can_mix_auth_routes_and_strings(auth_request):
     }
 
 
+def test_auth_response_removes_duplicate_resources(auth_request):
+    response = app.AuthResponse(
+        ['/a', '/a', app.AuthRoute('/b', ['GET']),
+         app.AuthRoute('/b', ['GET'])],
+        'principal')
+    serialized = response.to_dict(auth_request)
+    assert serialized['policyDocument']['Statement'][0]['Resource'] == [
+        'arn:aws:execute-api:us-west-2:123:rest-api-id/dev/*/a',
+        'arn:aws:execute-api:us-west-2:123:rest-api-id/dev/GET/b',
+    ]
+
+
+def test_auth_response_collapses_all_methods(auth_request):
+    response = app.AuthResponse(
+        [app.AuthRoute('/a', app.AuthResponse.ALL_HTTP_METHODS),
+         app.AuthRoute('/b', ['GET', '*'])],
+        'principal')
+    serialized = response.to_dict(auth_request)
+    assert serialized['policyDocument']['Statement'][0]['Resource'] == [
+        'arn:aws:execute-api:us-west-2:123:rest-api-id/dev/*/a',
+        'arn:aws:execute-api:us-west-2:123:rest-api-id/dev/*/b',
+    ]
+
+
+def test_auth_response_wildcard_replaces_other_routes(auth_request):
+    response = app.AuthResponse(
+        ['/a', app.AuthRoute('/b', ['GET']), '*'],
+        'principal')
+    serialized = response.to_dict(auth_request)
+    assert serialized['policyDocument']['Statement'][0]['Resource'] == [
+        'arn:aws:execute-api:us-west-2:123:rest-api-id/dev/*/*',
+    ]
+
+
 def test_root_resource(auth_request):
     auth_request.method_arn = (
         "arn:aws:execute-api:us-west-2:123:rest-api-id/dev/GET/")
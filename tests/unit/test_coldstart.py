@@ -0,0 +1,129 @@
+import json
+from unittest import mock
+
+import pytest
+
+from chalice.coldstart import ColdStartProfiler, ColdStartProfileError
+from chalice.coldstart import ColdStartProfile, HandlerRegistration
+from chalice.coldstart import ImportNode, parse_importtime, format_report
+from chalice.coldstart import BEGIN_MARKER, END_MARKER
+from chalice.deploy.packager import LambdaDeploymentPackager
+
+
+IMPORTTIME_OUTPUT = [
+    'import time: self [us] | cumulative | imported package',
+    'import time:       100 |        100 |   _io',
+    'import time:       200 |        300 | site',
+    BEGIN_MARKER,
+    'import time:        50 |         50 |     json.decoder',
+    'import time:        20 |         20 |     json.encoder',
+    'import time:        30 |        100 |   json',
+    'import time:      1000 |       1000 |   boto3',
+    'import time:        10 |       1110 | app',
+    'import time:         5 |          5 | chalice.app',
+    END_MARKER,
+]
+
+
+class FakeCommandRunner(object):
+    def __init__(self, rc=0, stdout='', stderr=''):
+        self.rc = rc
+        self.stdout = stdout
+        self.stderr = stderr
+        self.calls = []
+
+    def __call__(self, cmd, env, cwd):
+        self.calls.append((cmd, env, cwd))
+        return self.rc, self.stdout, self.stderr
+
+
+def create_profiler(runner):
+    packager = mock.Mock(spec=LambdaDeploymentPackager)
+    return ColdStartProfiler(packager, run_command=runner,
+                             python_exe='python')
+
+
+def test_can_parse_importtime_tree():
+    roots = parse_importtime(IMPORTTIME_OUTPUT[4:10])
+    assert [r.name for r in roots] == ['app', 'chalice.app']
+    app = roots[0]
+    assert app.cumulative_ms == 1.11
+    assert app.self_ms == 0.01
+    # Children are sorted by cumulative time, slowest first.
+    assert [c.name for c in app.children] == ['boto3', 'json']
+    json_node = app.children[1]
+    assert [c.name for c in json_node.children] == [
+        'json.decoder', 'json.encoder']
+
+
+def test_profile_only_includes_imports_between_markers():
+    runner = FakeCommandRunner(
+        stdout=json.dumps({'import_time': 0.5,
+                           'registrations': [['route', 'index', 0.001],
+                                             ['on_sns_message', 'foo',
+                                              0.002]]}),
+        stderr='\n'.join(IMPORTTIME_OUTPUT))
+    profile = create_profiler(runner).profile_extracted_package(
+        '/tmp/package', {'FOO': 'BAR'})
+    assert profile.import_time_ms == 500.0
+    assert [r.name for r in profile.imports] == ['app', 'chalice.app']
+    assert [r.name for r in profile.registrations] == ['foo', 'index']
+    cmd, env, cwd = runner.calls[0]
+    assert cmd[:4] == ['python', '-I', '-X', 'importtime']
+    assert cmd[-1] == '/tmp/package'
+    assert env['FOO'] == 'BAR'
+    assert cwd == '/tmp/package'
+
+
+def test_error_raised_when_app_cant_be_imported():
+    runner = FakeCommandRunner(
+        rc=1, stderr='\n'.join([
+            'import time:       100 |        100 | _io',
+            'ModuleNotFoundError: No module named boto3']))
+    with pytest.raises(ColdStartProfileError) as e:
+        create_profiler(runner).profile_extracted_package('/tmp/package', {})
+    assert 'No module named boto3' in str(e.value)
+    assert 'import time' not in str(e.value)
+
+
+def test_error_raised_when_output_cant_be_parsed():
+    runner = FakeCommandRunner(stdout='', stderr='')
+    with pytest.raises(ColdStartProfileError):
+        create_profiler(runner).profile_extracted_package('/tmp/package', {})
+
+
+def test_can_check_budget():
+    profile = ColdStartProfile(import_time_ms=100.0, imports=[],
+                               registrations=[])
+    assert not profile.exceeds_budget(None)
+    assert not profile.exceeds_budget(150)
+    assert profile.exceeds_budget(50)
+
+
+def test_format_report_limits_depth_and_hides_small_imports():
+    child = ImportNode('child', self_us=2000, cumulative_us=2000, children=[
+        ImportNode('grandchild', self_us=1500, cumulative_us=1500)])
+    tiny = ImportNode('tiny', self_us=10, cumulative_us=10)
+    profile = ColdStartProfile(
+        import_time_ms=12.5,
+        imports=[ImportNode('app', self_us=500, cumulative_us=2500,
+                            children=[child, tiny])],
+        registrations=[HandlerRegistration('route', 'index', 0.5)])
+    report = format_report(profile, max_depth=2, min_ms=1.0, budget_ms=10)
+    assert 'Total import time: 12.5 ms' in report
+    assert 'Budget: 10.0 ms (EXCEEDED)' in report
+    assert 'app' in report
+    assert 'child' in report
+    assert 'grandchild' not in report
+    assert 'tiny' not in report
+    assert 'route index' in report
+
+
+def test_profile_dict_is_json_serializable():
+    profile = ColdStartProfile(
+        import_time_ms=1.0,
+        imports=[ImportNode('app', self_us=1000, cumulative_us=1000)],
+        registrations=[HandlerRegistration('route', 'index', 0.5)])
+    data = json.loads(json.dumps(profile.to_dict()))
+    assert data['imports'][0]['name'] == 'app'
+    assert data['registrations'][0]['name'] == 'index'
@@ -136,6 +136,44 @@ def test_can_chain_chalice_stage_values():
     assert not prod.manage_iam_role
 
 
+def test_can_configure_client_connection_settings_per_stage():
+    disk_config = {
+        'max_pool_connections': 20,
+        'stages': {
+            'dev': {},
+            'prod': {
+                'max_pool_connections': 50,
+                'tcp_keepalive': True,
+                'connection_timeout': 10,
+                'read_timeout': 120,
+            },
+        }
+    }
+    dev = Config(chalice_stage='dev', config_from_disk=disk_config)
+    assert dev.max_pool_connections == 20
+    assert dev.tcp_keepalive is None
+    prod = Config(chalice_stage='prod', config_from_disk=disk_config)
+    assert prod.max_pool_connections == 50
+    assert prod.tcp_keepalive is True
+    assert prod.connection_timeout == 10
+    assert prod.read_timeout == 120
+
+
+def test_can_configure_app_dependencies_per_stage():
+    disk_config = {
+        'depends_on': ['users'],
+        'stages': {
+            'dev': {},
+            'prod': {'depends_on': ['users', 'billing']},
+        }
+    }
+    dev = Config(chalice_stage='dev', config_from_disk=disk_config)
+    assert dev.depends_on == ['users']
+    prod = Config(chalice_stage='prod', config_from_disk=disk_config)
+    assert prod.depends_on == ['users', 'billing']
+    assert Config(chalice_stage='dev').depends_on is None
+
+
 def test_can_chain_function_values():
     disk_config = {
         'lambda_timeout': 10,
@@ -160,6 +198,20 @@ def test_can_chain_function_values():
     assert c.lambda_timeout == 30
 
 
+def test_can_set_function_requirements_file():
+    disk_config = {
+        'lambda_functions': {
+            'worker': {
+                'requirements_file': 'requirements-worker.txt',
+            }
+        }
+    }
+    c = Config(chalice_stage='dev', config_from_disk=disk_config)
+    assert c.requirements_file is None
+    worker = c.scope(chalice_stage='dev', function_name='worker')
+    assert worker.requirements_file == 'requirements-worker.txt'
+
+
 def test_can_set_stage_independent_function_values():
     disk_config = {
         'lambda_timeout': 10,
@@ -309,6 +361,63 @@ def test_new_scope_config_is_separate_copy():
     assert new_config.function_name == 'bar'
 
 
+def test_scoped_configs_are_reused_and_read_only():
+    original = Config(chalice_stage='dev', function_name='foo')
+    new_config = original.scope(chalice_stage='prod', function_name='bar')
+    assert original.scope('prod', 'bar') is new_config
+    assert new_config.scope('prod', 'bar') is new_config
+    assert original.scope('dev', 'bar') is not new_config
+    with pytest.raises(AttributeError):
+        new_config.chalice_stage = 'dev'
+
+
+def test_scoped_configs_resolve_their_own_values():
+    disk_config = {
+        'lambda_timeout': 10,
+        'lambda_functions': {'foo': {'lambda_timeout': 20}},
+        'stages': {
+            'dev': {'api_gateway_stage': 'dev-api'},
+            'prod': {
+                'api_gateway_stage': 'prod-api',
+                'lambda_functions': {'foo': {'lambda_timeout': 30}},
+            },
+        },
+    }
+    c = Config(chalice_stage='dev', user_provided_params={'profile': 'p'},
+               config_from_disk=disk_config)
+    scoped = [c.scope(stage, function)
+              for stage in ['dev', 'prod'] for function in ['foo', 'bar']]
+    # Look up the values twice to make sure cached values are correct.
+    for _ in range(2):
+        assert [s.lambda_timeout for s in scoped] == [20, 10, 30, 10]
+        assert [s.api_gateway_stage for s in scoped] == [
+            'dev-api', 'dev-api', 'prod-api', 'prod-api']
+        assert [s.profile for s in scoped] == ['p'] * 4
+
+
+def test_none_values_are_ignored_in_chain_lookup():
+    disk_config = {
+        'lambda_memory_size': 256,
+        'stages': {
+            'dev': {
+                'lambda_memory_size': None,
+                'lambda_functions': {'foo': {'lambda_memory_size': None}},
+            },
+        },
+    }
+    c = Config(chalice_stage='dev', function_name='foo',
+               user_provided_params={'lambda_memory_size': None},
+               config_from_disk=disk_config)
+    assert c.lambda_memory_size == 256
+
+
+def test_chain_merge_returns_a_copy():
+    c = Config('dev', config_from_disk={
+        'environment_variables': {'foo': 'bar'}})
+    c.environment_variables['foo'] = 'baz'
+    assert c.environment_variables == {'foo': 'bar'}
+
+
 def test_environment_from_top_level():
     config_from_disk = {'environment_variables': {"foo": "bar"}}
     c = Config('dev', config_from_disk=config_from_disk)
@@ -0,0 +1,239 @@
+import os
+import sys
+import json
+from concurrent import futures
+
+import pytest
+
+from chalice.deploymany import AppProject, AppDeployResult, DeployManyReport
+from chalice.deploymany import DeployManyError, MultiAppDeployer
+from chalice.deploymany import order_projects, format_report
+from chalice.deploymany import isolated_app_imports
+from chalice.deploymany import DEPLOYED, FAILED, SKIPPED
+from chalice.utils import UI
+
+
+class FakeBuilder(object):
+    def __init__(self, failures=()):
+        self.failures = failures
+        self.calls = []
+
+    def __call__(self, project_dir, stage):
+        self.calls.append((project_dir, stage))
+        if project_dir in self.failures:
+            raise RuntimeError('%s build failed' % project_dir)
+        return 1.5
+
+
+class FakeAppDeployer(object):
+    def __init__(self, failures=()):
+        self.failures = failures
+        self.deployed = []
+
+    def __call__(self, project):
+        self.deployed.append(project.app_name)
+        if project.app_name in self.failures:
+            raise RuntimeError('%s deploy failed' % project.app_name)
+        return {
+            'resources': [{
+                'resource_type': 'lambda_function',
+                'name': 'handler',
+                'lambda_arn': 'arn:aws:lambda:us-west-2:1:function:%s' % (
+                    project.app_name),
+            }],
+            'schema_version': '2.0',
+            'backend': 'api',
+        }
+
+
+class FakeOut(object):
+    def __init__(self):
+        self.written = []
+
+    def write(self, s):
+        self.written.append(s)
+
+    def flush(self):
+        pass
+
+
+def create_deployer(builder=None, app_deployer=None):
+    if builder is None:
+        builder = FakeBuilder()
+    if app_deployer is None:
+        app_deployer = FakeAppDeployer()
+    return MultiAppDeployer(
+        'dev', build_executor=futures.ThreadPoolExecutor(max_workers=2),
+        deploy_app=app_deployer, build_app=builder, ui=UI(out=FakeOut()))
+
+
+def project(name, *depends_on):
+    return AppProject(project_dir=name + 'dir', app_name=name,
+                      depends_on=list(depends_on))
+
+
+def names(projects):
+    return [p.app_name for p in projects]
+
+
+class TestOrderProjects(object):
+    def test_keeps_order_without_dependencies(self):
+        projects = [project('c'), project('a'), project('b')]
+        assert names(order_projects(projects)) == ['c', 'a', 'b']
+
+    def test_dependencies_come_first(self):
+        projects = [project('web', 'api', 'auth'), project('api', 'auth'),
+                    project('auth')]
+        assert names(order_projects(projects)) == ['auth', 'api', 'web']
+
+    def test_error_on_unknown_dependency(self):
+        with pytest.raises(DeployManyError) as e:
+            order_projects([project('web', 'api')])
+        assert str(e.value) == (
+            "web depends on api, which isn't one of the apps being deployed.")
+
+    def test_error_on_duplicate_app_names(self):
+        projects = [project('web'), AppProject('otherdir', 'web')]
+        with pytest.raises(DeployManyError) as e:
+            order_projects(projects)
+        assert 'webdir, otherdir' in str(e.value)
+
+    def test_error_on_cycle(self):
+        projects = [project('a', 'b'), project('b', 'c'), project('c', 'b')]
+        with pytest.raises(DeployManyError) as e:
+            order_projects(projects)
+        assert str(e.value) == (
+            'Circular dependency between apps: b -> c -> b')
+
+
+class TestMultiAppDeployer(object):
+    def test_deploys_in_dependency_order(self):
+        builder = FakeBuilder()
+        app_deployer = FakeAppDeployer()
+        deployer = create_deployer(builder, app_deployer)
+        report = deployer.deploy([project('web', 'api'), project('api'),
+                                  project('worker')])
+        assert report.succeeded
+        assert sorted(builder.calls) == [
+            ('apidir', 'dev'), ('webdir', 'dev'), ('workerdir', 'dev')]
+        assert app_deployer.deployed.index('api') < (
+            app_deployer.deployed.index('web'))
+        assert names(r.project for r in report.results) == [
+            'api', 'web', 'worker']
+        for result in report.results:
+            assert result.status == DEPLOYED
+            assert result.build_time == 1.5
+            assert result.deployed_values['backend'] == 'api'
+
+    def test_skips_apps_depending_on_failed_deploy(self):
+        app_deployer = FakeAppDeployer(failures=['api'])
+        report = create_deployer(app_deployer=app_deployer).deploy(
+            [project('api'), project('web', 'api'), project('admin', 'web'),
+             project('worker')])
+        assert not report.succeeded
+        statuses = {r.project.app_name: (r.status, r.error)
+                    for r in report.results}
+        assert statuses == {
+            'api': (FAILED, 'api deploy failed'),
+            'web': (SKIPPED, "Not deployed because api wasn't deployed."),
+            'admin': (SKIPPED, "Not deployed because web wasn't deployed."),
+            'worker': (DEPLOYED, None),
+        }
+        assert app_deployer.deployed == ['api', 'worker']
+
+    def test_failed_build_is_not_deployed(self):
+        builder = FakeBuilder(failures=['apidir'])
+        app_deployer = FakeAppDeployer()
+        report = create_deployer(builder, app_deployer).deploy(
+            [project('api'), project('web', 'api'), project('worker')])
+        api, web, worker = report.results
+        assert api.status == FAILED
+        assert api.error == 'Build failed: apidir build failed'
+        assert web.status == SKIPPED
+        assert worker.status == DEPLOYED
+        assert app_deployer.deployed == ['worker']
+
+    def test_invalid_dependencies_raise_error(self):
+        builder = FakeBuilder()
+        with pytest.raises(DeployManyError):
+            create_deployer(builder).deploy([project('web', 'api')])
+        assert builder.calls == []
+
+
+class TestReport(object):
+    def create_report(self):
+        return DeployManyReport(stage='prod', results=[
+            AppDeployResult(project('api'), DEPLOYED, 2.0, 10.0,
+                            deployed_values=FakeAppDeployer()(project('api'))),
+            AppDeployResult(project('web', 'api'), FAILED, 1.0,
+                            error='Build failed: boom\nline two'),
+        ])
+
+    def test_to_dict(self):
+        report = self.create_report().to_dict()
+        # The report is serialized with json.dumps by the CLI.
+        assert json.loads(json.dumps(report)) == report
+        assert report['stage'] == 'prod'
+        assert not report['succeeded']
+        assert [app['status'] for app in report['apps']] == [
+            DEPLOYED, FAILED]
+        assert report['apps'][0]['resources'][0]['name'] == 'handler'
+        assert report['apps'][1]['depends_on'] == ['api']
+        assert report['apps'][1]['resources'] == []
+
+    def test_format_report(self):
+        assert format_report(self.create_report()) == (
+            'Deployed 1 of 2 apps to stage prod.\n'
+            '\n'
+            'api (apidir): deployed (build 2.0s, deploy 10.0s)\n'
+            '  Resources deployed:\n'
+            '    - Lambda ARN: arn:aws:lambda:us-west-2:1:function:api\n'
+            '\n'
+            'web (webdir): failed (build 1.0s)\n'
+            '  Build failed: boom\n'
+            '  line two\n'
+        )
+
+
+class TestIsolatedAppImports(object):
+    def test_removes_project_modules(self, tmpdir):
+        project_dir = tmpdir.mkdir('project')
+        project_dir.join('app.py').write('NAME = "first"\n')
+        chalicelib = project_dir.mkdir('chalicelib')
+        chalicelib.join('__init__.py').write('')
+        chalicelib.join('utils.py').write('')
+        # Packages installed in a virtualenv in the project dir.
+        site_packages = project_dir.mkdir('.chalice').mkdir('venv')
+        site_packages.join('deploymany_venv_module.py').write('')
+        original_path = list(sys.path)
+        try:
+            with isolated_app_imports(str(project_dir)):
+                sys.path[:0] = [str(project_dir), str(site_packages)]
+                os.environ['DEPLOYMANY_TEST_VAR'] = 'value'
+                import app
+                import chalicelib.utils  # noqa
+                import deploymany_venv_module  # noqa
+                assert app.NAME == 'first'
+            assert 'app' not in sys.modules
+            assert 'chalicelib' not in sys.modules
+            assert 'chalicelib.utils' not in sys.modules
+            assert 'deploymany_venv_module' in sys.modules
+            assert 'DEPLOYMANY_TEST_VAR' not in os.environ
+            assert sys.path == original_path
+            # Modules outside the project are kept.
+            assert 'chalice.deploymany' in sys.modules
+        finally:
+            sys.modules.pop('deploymany_venv_module', None)
+
+    def test_keeps_app_module_from_other_project(self, tmpdir):
+        other_dir = tmpdir.mkdir('other')
+        other_dir.join('app.py').write('')
+        sys.path.insert(0, str(other_dir))
+        try:
+            import app  # noqa
+            with isolated_app_imports(str(tmpdir.mkdir('project'))):
+                pass
+            assert 'app' in sys.modules
+        finally:
+            sys.path.remove(str(other_dir))
+            sys.modules.pop('app', None)
@@ -0,0 +1,33 @@
+import sys
+import types
+
+import pytest
+
+from chalice.lazyimport import import_app
+
+
+@pytest.fixture
+def app_dir(tmpdir, monkeypatch):
+    tmpdir.join('lazydep.py').write('LOADED = True\n')
+    tmpdir.join('lazyapp.py').write(
+        'import lazydep\n'
+        'def handler():\n'
+        '    return lazydep.LOADED\n'
+    )
+    monkeypatch.syspath_prepend(str(tmpdir))
+    yield tmpdir
+    for name in ['lazyapp', 'lazydep']:
+        sys.modules.pop(name, None)
+
+
+def test_lazy_modules_loaded_on_first_use(app_dir):
+    handler = import_app('lazyapp', 'handler', ['lazydep'])
+    assert type(sys.modules['lazydep']) is not types.ModuleType
+    assert handler() is True
+    assert type(sys.modules['lazydep']) is types.ModuleType
+
+
+def test_other_modules_loaded_normally(app_dir):
+    handler = import_app('lazyapp', 'handler', [])
+    assert type(sys.modules['lazydep']) is types.ModuleType
+    assert handler() is True
@@ -354,6 +354,24 @@ def test_can_convert_request_handler_to_lambda_event(handler):
     assert _get_body_from_response_stream(handler) == {'hello': 'world'}
 
 
+@pytest.mark.parametrize('path', ['/index', '/missing'])
+def test_request_handler_sends_shared_http_response(handler, path):
+    # The server and date headers are added by BaseHTTPRequestHandler,
+    # and error responses have a random request id.
+    ignored = ('Server', 'Date', 'x-amzn-RequestId')
+    set_current_request(handler, method='GET', path=path)
+    status_code, expected_headers, expected_body = local.handle_http_request(
+        handler.local_gateway, 'GET', path, handler.headers, None)
+    handler.do_GET()
+    head, body = handler.wfile.getvalue().split(b'\r\n\r\n', 1)
+    status_line, *header_lines = head.decode().split('\r\n')
+    headers = [tuple(line.split(': ', 1)) for line in header_lines]
+    assert status_line.split()[1] == str(status_code)
+    assert [h for h in headers if h[0] not in ignored] == [
+        h for h in expected_headers if h[0] not in ignored]
+    assert body == expected_body
+
+
 def test_uses_http_11(handler):
     set_current_request(handler, method='GET', path='/index')
     handler.do_GET()
@@ -745,6 +763,51 @@ def test_wraps_custom_sample_app_with_local_chalice(custom_sample_app):
     assert dev_server.app_object.custom_method() == 'foo'
 
 
+def test_make_thread_safe_can_be_called_more_than_once(custom_sample_app):
+    local.make_thread_safe(custom_sample_app)
+    wrapped_cls = custom_sample_app.__class__
+    local.make_thread_safe(custom_sample_app)
+    assert custom_sample_app.__class__ is wrapped_cls
+    assert custom_sample_app.custom_method() == 'foo'
+
+
+def test_make_thread_safe_keeps_each_app_class(sample_app,
+                                               custom_sample_app):
+    local.make_thread_safe(custom_sample_app)
+    local.make_thread_safe(sample_app)
+    assert isinstance(custom_sample_app, CustomSampleChalice)
+    assert not isinstance(sample_app, CustomSampleChalice)
+    assert isinstance(sample_app, local.LocalChalice)
+    assert custom_sample_app.custom_method() == 'foo'
+
+
+def test_can_create_threadpool_local_server(sample_app):
+    dev_server = local.create_local_server(
+        sample_app, None, '127.0.0.1', port=0, backend='threadpool',
+        max_threads=4)
+    try:
+        assert isinstance(dev_server.server, local.ThreadPoolHTTPServer)
+        assert dev_server.server._pool._max_workers == 4
+    finally:
+        dev_server.server.server_close()
+
+
+def test_can_create_asyncio_local_server(sample_app):
+    dev_server = local.create_local_server(
+        sample_app, Config(), '127.0.0.1', port=0, backend='asyncio')
+    try:
+        assert isinstance(dev_server.server, local.AsyncioHTTPServer)
+        assert dev_server.server.server_port != 0
+    finally:
+        dev_server.server.server_close()
+
+
+def test_unknown_server_backend_is_error(sample_app):
+    with pytest.raises(ValueError):
+        local.create_local_server(
+            sample_app, None, '127.0.0.1', port=0, backend='unknown')
+
+
 class TestLambdaContext(object):
     def test_can_get_remaining_time_once(self, lambda_context_args):
         time_source = FakeTimeSource([0, 5])
@@ -775,6 +838,35 @@ class TestLambdaContext(object):
         assert context.function_version == '$LATEST'
 
 
+class TestHandleHTTPRequest(object):
+    def test_converts_gateway_response(self):
+        demo = app.Chalice('app-name')
+        demo.api.binary_types.append('application/octet-stream')
+
+        @demo.route('/binary')
+        def binary_view():
+            return Response(body=b'\xff\xfe', status_code=201, headers={
+                'Content-Type': 'application/octet-stream',
+                'X-Multi': ['a', 'b']})
+
+        status_code, headers, body = local.handle_http_request(
+            LocalGateway(demo, Config()), 'GET', '/binary',
+            {'accept': 'application/octet-stream'}, None)
+        assert status_code == 201
+        assert headers == [('Content-Type', 'application/octet-stream'),
+                           ('Content-Length', '2'),
+                           ('X-Multi', 'a'), ('X-Multi', 'b')]
+        assert body == b'\xff\xfe'
+
+    def test_converts_gateway_errors(self):
+        demo = app.Chalice('app-name')
+        status_code, headers, body = local.handle_http_request(
+            LocalGateway(demo, Config()), 'GET', '/missing', {}, None)
+        assert status_code == 403
+        assert ('Content-Type', 'application/json') in headers
+        assert json.loads(body) == {'message': 'Missing Authentication Token'}
+
+
 class TestLocalGateway(object):
     def test_can_invoke_function(self):
         demo = app.Chalice('app-name')
@@ -1056,6 +1148,107 @@ class TestLocalBuiltinAuthorizers(object):
                 'testing.') in str(warning.message)
 
 
+class TestAuthorizerResultCache(object):
+    def create_app(self, ttl_seconds=None):
+        demo = app.Chalice('app-name')
+        demo.calls = []
+
+        @demo.authorizer(ttl_seconds=ttl_seconds)
+        def counting_auth(auth_request):
+            demo.calls.append(auth_request.token)
+            if auth_request.token == 'allow':
+                return app.AuthResponse(routes=['/allowed'],
+                                        principal_id='user',
+                                        context={'foo': 'bar'})
+            return app.AuthResponse(routes=[], principal_id='user')
+
+        @demo.route('/allowed', authorizer=counting_auth)
+        def allowed():
+            return {}
+
+        @demo.route('/other', authorizer=counting_auth)
+        def other():
+            return {}
+
+        return demo
+
+    def authorize(self, authorizer, path, token, lambda_context_args,
+                  create_event):
+        event = create_event(path, 'GET', {})
+        event['headers']['authorization'] = token
+        context = LambdaContext(*lambda_context_args)
+        event, _ = authorizer.authorize(path, event, context)
+        return event
+
+    def test_caches_result_per_token(self, lambda_context_args,
+                                     create_event):
+        demo = self.create_app()
+        authorizer = LocalGatewayAuthorizer(demo)
+        for _ in range(3):
+            event = self.authorize(authorizer, '/allowed', 'allow',
+                                   lambda_context_args, create_event)
+        assert demo.calls == ['allow']
+        assert event['requestContext']['authorizer'] == {
+            'foo': 'bar', 'principalId': 'user'}
+        with pytest.raises(ForbiddenError):
+            self.authorize(authorizer, '/allowed', 'deny',
+                           lambda_context_args, create_event)
+        assert demo.calls == ['allow', 'deny']
+
+    def test_cached_policy_is_checked_for_each_route(self,
+                                                     lambda_context_args,
+                                                     create_event):
+        demo = self.create_app()
+        authorizer = LocalGatewayAuthorizer(demo)
+        self.authorize(authorizer, '/allowed', 'allow',
+                       lambda_context_args, create_event)
+        with pytest.raises(ForbiddenError):
+            self.authorize(authorizer, '/other', 'allow',
+                           lambda_context_args, create_event)
+        assert demo.calls == ['allow']
+
+    def test_result_expires_after_ttl(self, lambda_context_args,
+                                      create_event):
+        demo = self.create_app(ttl_seconds=10)
+        clock = FakeTimeSource([0, 5, 10, 10])
+        authorizer = LocalGatewayAuthorizer(
+            demo, cache=local.AuthorizerResultCache(clock=clock))
+        # Cached at time 0, hit at time 5, expired at time 10.
+        for _ in range(3):
+            self.authorize(authorizer, '/allowed', 'allow',
+                           lambda_context_args, create_event)
+        assert demo.calls == ['allow', 'allow']
+
+    def test_zero_ttl_disables_cache(self, lambda_context_args,
+                                     create_event):
+        demo = self.create_app(ttl_seconds=0)
+        authorizer = LocalGatewayAuthorizer(demo)
+        for _ in range(2):
+            self.authorize(authorizer, '/allowed', 'allow',
+                           lambda_context_args, create_event)
+        assert demo.calls == ['allow', 'allow']
+
+    def test_cache_is_bounded(self):
+        cache = local.AuthorizerResultCache(
+            clock=FakeTimeSource([0] * 4), max_entries=2)
+        for token in ['a', 'b', 'c']:
+            cache.put(('auth', token), {}, ttl_seconds=60)
+        assert cache.get(('auth', 'a')) is None
+        assert cache.get(('auth', 'c')) is not None
+
+    def test_gateway_is_shared_by_local_server(self, sample_app):
+        dev_server = LocalDevServer(
+            sample_app, Config(), '0.0.0.0', 8000,
+            server_cls=lambda *args: mock.Mock(spec=HTTPServer))
+        first = ChaliceStubbedHandler(
+            None, ('127.0.0.1', 2000), None,
+            **dev_server._wrapped_handler.keywords)
+        second = ChaliceStubbedHandler(
+            None, ('127.0.0.1', 2001), None,
+            **dev_server._wrapped_handler.keywords)
+        assert first.local_gateway is second.local_gateway
+
+
 class TestArnBuilder(object):
     def test_can_create_basic_arn(self, arn_builder):
         arn = ('arn:aws:execute-api:mars-west-1:123456789012:ymy8tbxw7b'
@@ -1188,6 +1381,28 @@ def test_can_deny_multiple_resource_arns(arn, patterns):
     assert does_match is False
 
 
+class TestCompileArnPatterns(object):
+    def test_single_pattern_matches_any_resource(self):
+        prefix = 'arn:aws:execute-api:mars-west-1:123456789012:ymy8tbxw7b/api/'
+        resources = ['%sGET/route%s' % (prefix, i) for i in range(200)]
+        resources.append('%s*/wild/*' % prefix)
+        pattern = local.compile_arn_patterns(tuple(resources))
+        assert pattern.match('%sGET/route150' % prefix)
+        assert pattern.match('%sPUT/wild/card' % prefix)
+        assert not pattern.match('%sPUT/route150' % prefix)
+        assert not pattern.match('%sGET/route1500' % prefix)
+
+    def test_no_resources_never_match(self):
+        pattern = local.compile_arn_patterns(())
+        assert not pattern.match('')
+        assert not pattern.match('arn:aws:execute-api:foo')
+
+    def test_compiled_patterns_are_reused(self):
+        resources = ('arn:aws:execute-api:*:*:*/api/GET/a',)
+        assert local.compile_arn_patterns(resources) is \
+            local.compile_arn_patterns(resources)
+
+
 class TestLocalDevServer(object):
     def test_can_delegate_to_server(self, sample_app):
         http_server = mock.Mock(spec=HTTPServer)
@@ -1215,6 +1430,15 @@ class TestLocalDevServer(object):
 
         assert provided_args[0] == ('0.0.0.0', 8000)
 
+    def test_shutdown_stops_workers_instead_of_server(self, sample_app):
+        http_server = mock.Mock(spec=HTTPServer)
+        dev_server = LocalDevServer(
+            sample_app, Config(), '0.0.0.0', 8000,
+            server_cls=lambda *args: http_server, workers=2,
+        )
+        dev_server.shutdown()
+        assert not http_server.shutdown.called
+
     def test_does_use_daemon_threads(self, sample_app):
         server = LocalDevServer(
             sample_app, Config(), '0.0.0.0', 8000
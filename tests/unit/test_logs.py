@@ -2,12 +2,16 @@ import time
 from unittest import mock
 from datetime import datetime, timedelta
 
+import pytest
+
 from chalice import logs
 from chalice.awsclient import TypedAWSClient
 from six import StringIO
 
 
 NO_OPTIONS = logs.LogRetrieveOptions()
+SINCE_OPTIONS = logs.LogRetrieveOptions(
+    start_time=datetime(2020, 1, 1))
 
 
 def message(log_message, log_stream_name='logStreamName'):
@@ -169,6 +173,55 @@ def test_can_follow_log_events():
     ]
 
 
+def test_follow_logs_counts_duplicate_events():
+    sleep = mock.Mock(spec=time.sleep)
+    client = mock.Mock(spec=TypedAWSClient)
+    client.filter_log_events.side_effect = [
+        {'events': [{'eventId': '1', 'timestamp': 1},
+                    {'eventId': '2', 'timestamp': 2}]},
+        {'events': [{'eventId': '2', 'timestamp': 2}]},
+        {'events': [{'eventId': '2', 'timestamp': 2},
+                    {'eventId': '3', 'timestamp': 3}]},
+        KeyboardInterrupt(),
+    ]
+    event_gen = logs.FollowLogEventGenerator(client, sleep)
+    events = list(event_gen.iter_log_events(
+        log_group_name='mygroup', options=NO_OPTIONS))
+    assert [e['eventId'] for e in events] == ['1', '2', '3']
+    assert event_gen.duplicate_count == 2
+
+
+def test_event_id_cache_evicts_events_before_most_recent():
+    cache = logs.LogEventIdCache()
+    assert cache.add({'eventId': '1', 'timestamp': 1})
+    assert cache.add({'eventId': '2', 'timestamp': 2})
+    assert cache.add({'eventId': '2b', 'timestamp': 2})
+    assert len(cache) == 2
+    assert cache.most_recent == 2
+    assert not cache.add({'eventId': '2b', 'timestamp': 2})
+    assert cache.duplicate_count == 1
+
+
+def test_event_id_cache_keeps_events_in_time_window():
+    cache = logs.LogEventIdCache(window=timedelta(seconds=10))
+    now = datetime(2020, 1, 1)
+    cache.add({'eventId': '1', 'timestamp': now})
+    cache.add({'eventId': '2', 'timestamp': now + timedelta(seconds=5)})
+    assert len(cache) == 2
+    cache.add({'eventId': '3', 'timestamp': now + timedelta(seconds=11)})
+    assert len(cache) == 2
+    assert cache.add({'eventId': '1', 'timestamp': now})
+
+
+def test_event_id_cache_is_bounded():
+    cache = logs.LogEventIdCache(max_entries=3)
+    for i in range(10):
+        cache.add({'eventId': str(i), 'timestamp': 1})
+    assert len(cache) == 3
+    assert not cache.add({'eventId': '9', 'timestamp': 1})
+    assert cache.add({'eventId': '0', 'timestamp': 1})
+
+
 def test_follow_logs_initially_empty():
     sleep = mock.Mock(spec=time.sleep)
     client = mock.Mock(spec=TypedAWSClient)
@@ -277,6 +330,93 @@ def test_follow_logs_all_pages_empty_with_pagination():
     ]
 
 
+def test_can_fetch_log_streams_in_parallel():
+    client = mock.Mock(spec=TypedAWSClient)
+    client.get_log_stream_names.return_value = ['a', 'b']
+    pages = {
+        ('a', None): {'events': [{'eventId': '1', 'timestamp': 1},
+                                 {'eventId': '3', 'timestamp': 3}],
+                      'nextToken': 'a-token'},
+        ('a', 'a-token'): {'events': [{'eventId': '5', 'timestamp': 5}]},
+        ('b', None): {'events': [{'eventId': '2', 'timestamp': 2},
+                                 {'eventId': '4', 'timestamp': 4}]},
+    }
+
+    def filter_log_events(log_group_name, start_time, next_token,
+                          log_stream_names):
+        return pages[(log_stream_names[0], next_token)]
+
+    client.filter_log_events.side_effect = filter_log_events
+    event_gen = logs.ParallelLogEventGenerator(client, max_workers=2)
+    events = list(event_gen.iter_log_events(
+        log_group_name='mygroup', options=SINCE_OPTIONS))
+    assert [e['eventId'] for e in events] == ['1', '2', '3', '4', '5']
+    client.get_log_stream_names.assert_called_with(
+        'mygroup', start_time=SINCE_OPTIONS.start_time)
+    assert client.filter_log_events.call_count == 3
+
+
+def test_parallel_logs_with_no_streams():
+    client = mock.Mock(spec=TypedAWSClient)
+    client.get_log_stream_names.return_value = []
+    event_gen = logs.ParallelLogEventGenerator(client)
+    assert list(event_gen.iter_log_events(
+        log_group_name='mygroup', options=SINCE_OPTIONS)) == []
+    assert not client.filter_log_events.called
+
+
+@pytest.mark.parametrize('options,stream_names', [
+    # Every stream the log group ever had would be fetched.
+    (NO_OPTIONS, ['a', 'b']),
+    # Too many streams to fetch the first page of each.
+    (SINCE_OPTIONS, ['a', 'b', 'c']),
+])
+def test_parallel_logs_paginate_log_group_instead(options, stream_names):
+    client = mock.Mock(spec=TypedAWSClient)
+    client.get_log_stream_names.return_value = stream_names
+    client.iter_log_events.return_value = iter(
+        [{'eventId': '1', 'timestamp': 1}])
+    event_gen = logs.ParallelLogEventGenerator(client, max_streams=2)
+    events = list(event_gen.iter_log_events(
+        log_group_name='mygroup', options=options))
+    assert [e['eventId'] for e in events] == ['1']
+    client.iter_log_events.assert_called_with(
+        log_group_name='mygroup', start_time=options.start_time)
+    assert not client.filter_log_events.called
+
+
+def test_can_merge_logs_from_multiple_retrievers():
+    first = mock.Mock(spec=logs.LogRetriever)
+    first.retrieve_logs.return_value = iter([
+        {'timestamp': 1, 'message': 'one'},
+        {'timestamp': 3, 'message': 'three'},
+    ])
+    second = mock.Mock(spec=logs.LogRetriever)
+    second.retrieve_logs.return_value = iter([
+        {'timestamp': 2, 'message': 'two'},
+    ])
+    retriever = logs.MultiLogRetriever([first, second])
+    messages = list(retriever.retrieve_logs(
+        logs.LogRetrieveOptions(max_entries=2)))
+    assert [m['message'] for m in messages] == ['one', 'two']
+    # max_entries applies to the merged logs, not to each retriever.
+    first.retrieve_logs.assert_called_with(logs.LogRetrieveOptions())
+
+
+def test_can_follow_logs_from_multiple_retrievers():
+    first = mock.Mock(spec=logs.LogRetriever)
+    first.retrieve_logs.return_value = iter([
+        {'timestamp': 3, 'message': 'three'},
+    ])
+    second = mock.Mock(spec=logs.LogRetriever)
+    second.retrieve_logs.return_value = iter([
+        {'timestamp': 1, 'message': 'one'},
+    ])
+    retriever = logs.MultiLogRetriever([first, second], follow=True)
+    messages = list(retriever.retrieve_logs(NO_OPTIONS))
+    assert sorted(m['message'] for m in messages) == ['one', 'three']
+
+
 def test_follow_logs_defaults_to_ten_minutes():
     # To avoid having to patch out/pass in utcnow(), we'll just make sure
     # that the start_time used is more recent than 10 minutes from now.
@@ -1,8 +1,11 @@
+import io
 import os
 import json
+import datetime
 from unittest import mock
 
 import pytest
+import yaml
 from chalice.config import Config
 from chalice import package
 from chalice.constants import LAMBDA_TRUST_POLICY
@@ -89,6 +92,61 @@ def test_terraform_post_processor_moves_files_once():
         'bar']['filename'] == ('${path.module}/deployment.zip')
 
 
+def test_template_post_processor_copies_each_function_package():
+    mock_osutils = mock.Mock(spec=OSUtils)
+    p = package.SAMCodeLocationPostProcessor(mock_osutils)
+    template = {
+        'Resources': {
+            'Foo': {
+                'Type': 'AWS::Serverless::Function',
+                'Properties': {'CodeUri': 'shared.zip'},
+            },
+            'Bar': {
+                'Type': 'AWS::Serverless::Function',
+                'Properties': {'CodeUri': 'slim.zip'},
+            },
+            'Baz': {
+                'Type': 'AWS::Serverless::Function',
+                'Properties': {'CodeUri': 'slim.zip'},
+            },
+        }
+    }
+    p.process(template, config=None,
+              outdir='outdir', chalice_stage_name='dev')
+    assert mock_osutils.copy.call_args_list == [
+        mock.call('shared.zip', os.path.join('outdir', 'deployment.zip')),
+        mock.call('slim.zip', os.path.join('outdir', 'deployment-Bar.zip')),
+    ]
+    code_uris = [r['Properties']['CodeUri']
+                 for r in template['Resources'].values()]
+    assert code_uris == [
+        './deployment.zip', './deployment-Bar.zip', './deployment-Bar.zip']
+
+
+def test_terraform_post_processor_copies_each_function_package():
+    mock_osutils = mock.Mock(spec=OSUtils)
+    p = package.TerraformCodeLocationPostProcessor(mock_osutils)
+    template = {
+        'resource': {
+            'aws_lambda_function': {
+                'foo': {'filename': 'shared.zip'},
+                'bar': {'filename': 'slim.zip'},
+            }
+        }
+    }
+
+    p.process(template, config=None,
+              outdir='outdir', chalice_stage_name='dev')
+    assert mock_osutils.copy.call_args_list == [
+        mock.call('shared.zip', os.path.join('outdir', 'deployment.zip')),
+        mock.call('slim.zip', os.path.join('outdir', 'deployment-bar.zip')),
+    ]
+    bar = template['resource']['aws_lambda_function']['bar']
+    assert bar['filename'] == '${path.module}/deployment-bar.zip'
+    assert bar['source_code_hash'] == (
+        '${filebase64sha256("${path.module}/deployment-bar.zip")}')
+
+
 def test_template_generator_default():
     tgen = package.TemplateGenerator(Config(),
                                      PackageOptions(
@@ -239,6 +297,164 @@ class TestTemplateMergePostProcessor(object):
         assert str(e.value).startswith('Cannot find template file:')
         assert mock_merger.merge.call_count == 0
 
+    def test_loaded_template_is_cached(self):
+        mock_osutils = mock.Mock(spec=OSUtils)
+        mock_osutils.get_file_contents.return_value = '{}'
+        serializer = mock.Mock(spec=package.JSONTemplateSerializer)
+        cache = mock.Mock(spec=package.TemplateCache)
+        cache.get.return_value = {'Resources': {'foo': {}}}
+        p = package.TemplateMergePostProcessor(
+            mock_osutils, package.TemplateDeepMerger(), serializer,
+            merge_template='extras.json', template_cache=cache)
+        template = {'Resources': {}}
+        config = Config.create(project_dir='project')
+        p.process(template, config=config, outdir='outdir',
+                  chalice_stage_name='dev')
+        assert template == {'Resources': {'foo': {}}}
+        assert not serializer.load_template.called
+        assert cache.get.call_args[0][:2] == ('project', 'merge-template')
+
+    def test_can_merge_yaml_template_with_date(self, tmpdir):
+        tmpdir.mkdir('.chalice')
+        extras = tmpdir.join('extras.yaml')
+        extras.write('AWSTemplateFormatVersion: 2010-09-09\n'
+                     'Resources:\n'
+                     '  Bucket:\n'
+                     '    Type: AWS::S3::Bucket\n')
+        p = package.TemplateMergePostProcessor(
+            OSUtils(), package.TemplateDeepMerger(),
+            package.YAMLTemplateSerializer(), merge_template=str(extras),
+            template_cache=package.TemplateCache(OSUtils()))
+        config = Config.create(project_dir=str(tmpdir))
+        for _ in range(2):
+            template = {'Resources': {}}
+            p.process(template, config=config, outdir='outdir',
+                      chalice_stage_name='dev')
+            assert template == {
+                'AWSTemplateFormatVersion': datetime.date(2010, 9, 9),
+                'Resources': {'Bucket': {'Type': 'AWS::S3::Bucket'}},
+            }
+
+
+class TestTemplateCache(object):
+    def test_can_cache_templates(self, tmpdir):
+        tmpdir.mkdir('.chalice')
+        cache = package.TemplateCache(OSUtils())
+        assert cache.get(str(tmpdir), 'sam:dev', 'key') is None
+        cache.set(str(tmpdir), 'sam:dev', 'key', {'Resources': {}})
+        cache.set(str(tmpdir), 'sam:prod', 'key2', {'Outputs': {}})
+        assert cache.get(str(tmpdir), 'sam:dev', 'key') == {'Resources': {}}
+        assert cache.get(str(tmpdir), 'sam:dev', 'other-key') is None
+        # Only the latest template for a name is kept.
+        cache.set(str(tmpdir), 'sam:dev', 'key3', {})
+        assert cache.get(str(tmpdir), 'sam:dev', 'key') is None
+        assert cache.get(str(tmpdir), 'sam:prod', 'key2') == {'Outputs': {}}
+
+    def test_no_cache_without_chalice_dir(self, tmpdir):
+        cache = package.TemplateCache(OSUtils())
+        cache.set(str(tmpdir), 'sam:dev', 'key', {'Resources': {}})
+        assert cache.get(str(tmpdir), 'sam:dev', 'key') is None
+        assert tmpdir.listdir() == []
+
+    def test_does_not_cache_templates_json_cannot_store(self, tmpdir):
+        tmpdir.mkdir('.chalice')
+        cache = package.TemplateCache(OSUtils())
+        cache.set(str(tmpdir), 'merge-template', 'key',
+                  {'AWSTemplateFormatVersion': datetime.date(2010, 9, 9)})
+        cache.set(str(tmpdir), 'other', 'key', {'Mappings': {1: 'one'}})
+        assert cache.get(str(tmpdir), 'merge-template', 'key') is None
+        assert cache.get(str(tmpdir), 'other', 'key') is None
+
+    def test_cache_key_depends_on_model_values(self):
+        def create_role(name, traits):
+            return models.ManagedIAMRole(
+                resource_name='default-role', role_name=name,
+                trust_policy={},
+                policy=models.AutoGenIAMPolicy(document={}, traits=traits))
+
+        key = package.template_cache_key(
+            [create_role('foo', set([models.RoleTraits.VPC_NEEDED]))])
+        assert key == package.template_cache_key(
+            [create_role('foo', set([models.RoleTraits.VPC_NEEDED]))])
+        assert key != package.template_cache_key(
+            [create_role('bar', set([models.RoleTraits.VPC_NEEDED]))])
+        assert key != package.template_cache_key([create_role('foo', set())])
+
+
+class TestAppPackager(object):
+    def create_packager(self, templater, osutils, template_cache=None):
+        resource_builder = mock.Mock(spec=package.ResourceBuilder)
+        resource_builder.construct_resources.return_value = [
+            models.DeploymentPackage(filename='deployment.zip')]
+        return package.AppPackager(
+            templater, resource_builder,
+            package.CompositePostProcessor([]),
+            package.JSONTemplateSerializer(), osutils, template_cache)
+
+    def test_generated_template_is_cached(self, tmpdir):
+        tmpdir.mkdir('.chalice')
+        outdir = tmpdir.join('out')
+        templater = mock.Mock(spec=package.SAMTemplateGenerator)
+        templater.template_file = 'sam'
+        templater.cache_key_inputs.return_value = ['SAMTemplateGenerator']
+        templater.generate.return_value = {'Resources': {}}
+        config = Config.create(project_dir=str(tmpdir))
+        packager = self.create_packager(
+            templater, OSUtils(), package.TemplateCache(OSUtils()))
+        packager.package_app(config, str(outdir), 'dev')
+        packager.package_app(config, str(outdir), 'dev')
+        assert templater.generate.call_count == 1
+        assert json.loads(outdir.join('sam.json').read()) == {
+            'Resources': {}}
+
+    def test_unchanged_template_is_not_rewritten(self, tmpdir):
+        templater = mock.Mock(spec=package.SAMTemplateGenerator)
+        templater.template_file = 'sam'
+        templater.cache_key_inputs.return_value = ['SAMTemplateGenerator']
+        templater.generate.return_value = {'Resources': {}}
+        config = Config.create(project_dir=str(tmpdir))
+        packager = self.create_packager(templater, OSUtils())
+        packager.package_app(config, str(tmpdir), 'dev')
+        template_file = tmpdir.join('sam.json')
+        template_file.setmtime(1)
+        packager.package_app(config, str(tmpdir), 'dev')
+        assert template_file.mtime() == 1
+        assert tmpdir.listdir(lambda p: p.ext == '.tmp') == []
+        templater.generate.return_value = {'Resources': {'Foo': {}}}
+        packager.package_app(config, str(tmpdir), 'dev')
+        assert template_file.mtime() != 1
+        assert json.loads(template_file.read()) == {
+            'Resources': {'Foo': {}}}
+
+
+class TestSAMSwaggerFilePostProcessor(object):
+    def test_swagger_doc_written_to_file(self, tmpdir):
+        swagger_doc = {'swagger': '2.0', 'paths': {}}
+        template = {
+            'Resources': {
+                'RestAPI': {
+                    'Type': 'AWS::Serverless::Api',
+                    'Properties': {'DefinitionBody': swagger_doc},
+                },
+                'APIHandler': {
+                    'Type': 'AWS::Serverless::Function',
+                    'Properties': {},
+                },
+            }
+        }
+        p = package.SAMSwaggerFilePostProcessor(
+            OSUtils(), package.YAMLTemplateSerializer())
+        p.process(template, None, str(tmpdir), 'dev')
+        properties = template['Resources']['RestAPI']['Properties']
+        assert properties['DefinitionBody'] == {
+            'Fn::Transform': {
+                'Name': 'AWS::Include',
+                'Parameters': {'Location': './swagger.yaml'},
+            }
+        }
+        assert yaml.safe_load(tmpdir.join('swagger.yaml').read()) == \
+            swagger_doc
+
 
 class TestCompositePostProcessor(object):
     def test_can_call_no_processors(self):
@@ -2120,6 +2336,25 @@ def test_to_cfn_resource_name(filename, is_yaml):
     assert package.YAMLTemplateSerializer.is_yaml_template(filename) == is_yaml
 
 
+@pytest.mark.parametrize('serializer', [
+    package.JSONTemplateSerializer(),
+    package.YAMLTemplateSerializer(),
+])
+def test_write_template_matches_serialize_template(serializer):
+    template = {
+        'Resources': {
+            'Foo': {'Type': 'AWS::Serverless::Function',
+                    'Properties': {'Handler': 'app.app',
+                                   'Description': u'\u2603'}},
+        },
+        'Outputs': {'Arn': {'Value': {'Fn::GetAtt': ['Foo', 'Arn']}}},
+    }
+    stream = io.StringIO()
+    serializer.write_template(template, stream)
+    assert stream.getvalue() == serializer.serialize_template(template)
+    assert serializer.load_template(stream.getvalue()) == template
+
+
 @pytest.mark.parametrize('yaml_contents,expected', [
     ('foo: bar', {'foo': 'bar'}),
     ('foo: !Ref bar', {'foo': {'Ref': 'bar'}}),
@@ -1,6 +1,19 @@
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import botocore.session
+from botocore import xform_name
+
+import chalice.policy
 from chalice.config import Config
 from chalice.policy import PolicyBuilder, AppPolicyGenerator
 from chalice.policy import diff_policies
+from chalice.policy import load_api_policy_actions
+from chalice.policy import PolicyIndex
+from chalice.policy import ProjectAnalyzer
+from chalice.policy import ResourceArnResolver
 from chalice.utils import OSUtils  # noqa
 
 
@@ -79,6 +92,39 @@ def test_multiple_calls_in_same_service():
     )
 
 
+def test_can_scope_actions_to_resources():
+    builder = PolicyBuilder()
+    policy = builder.build_policy_from_api_calls(
+        {'dynamodb': set(['get_item', 'put_item', 'list_tables'])},
+        {'dynamodb': {
+            'get_item': ['arn:*:dynamodb:*:*:table/users'],
+            'put_item': ['arn:*:dynamodb:*:*:table/users'],
+        }})
+    assert_policy_is(policy, [
+        {
+            'Effect': 'Allow',
+            'Action': ['dynamodb:ListTables'],
+            'Resource': ['*'],
+        },
+        {
+            'Effect': 'Allow',
+            'Action': ['dynamodb:GetItem', 'dynamodb:PutItem'],
+            'Resource': ['arn:*:dynamodb:*:*:table/users'],
+        },
+    ])
+
+
+def test_action_is_unscoped_if_any_method_is_unscoped():
+    # Both methods need s3:GetObject but only one is scoped.
+    builder = PolicyBuilder()
+    policy = builder.build_policy_from_api_calls(
+        {'s3': set(['get_object', 'download_file'])},
+        {'s3': {'get_object': ['arn:*:s3:::mybucket/*']}})
+    for statement in policy['Statement']:
+        if 's3:GetObject' in statement['Action']:
+            assert statement['Resource'] == ['*']
+
+
 def test_multiple_services_used():
     client_calls = {
         'dynamodb': set(['list_tables']),
@@ -179,3 +225,282 @@ def test_can_handle_high_level_abstractions():
 
 def test_noop_for_unknown_methods():
     assert_policy_is(iam_policy({'s3': set(['unknown_method'])}), [])
+
+
+def test_client_created_once_per_service():
+    session = mock.Mock(spec=botocore.session.Session)
+    session.create_client.return_value.meta.method_to_api_mapping = {
+        'list_tables': 'ListTables',
+        'describe_table': 'DescribeTable',
+    }
+    builder = PolicyBuilder(session=session,
+                            api_policy_actions=load_api_policy_actions())
+    builder.build_policy_from_api_calls({'dynamodb': {'list_tables'}})
+    policy = builder.build_policy_from_api_calls(
+        {'dynamodb': {'describe_table'}})
+    assert policy['Statement'][0]['Action'] == ['dynamodb:DescribeTable']
+    session.create_client.assert_called_once_with(
+        'dynamodb', region_name='us-east-1')
+
+
+def test_policy_index_does_not_create_clients():
+    session = mock.Mock(spec=botocore.session.Session)
+    builder = PolicyBuilder(session=session)
+    policy = builder.build_policy_from_api_calls(
+        {'dynamodb': {'describe_table'}})
+    assert policy['Statement'][0]['Action'] == ['dynamodb:DescribeTable']
+    assert not session.create_client.called
+
+
+def test_policy_index_unknown_service():
+    index = PolicyIndex()
+    assert index.get_actions('not-a-service') is None
+    assert index.get_actions('../policies') is None
+
+
+def test_policy_index_matches_policies_json():
+    # The index is generated from policies.json by
+    # scripts/build-policy-index, so it needs to be rebuilt whenever
+    # policies.json changes.
+    index = PolicyIndex()
+    policies = load_api_policy_actions()
+    index_dir = os.path.join(os.path.dirname(chalice.policy.__file__),
+                             PolicyIndex.INDEX_DIR)
+    assert len(os.listdir(index_dir)) == len(policies)
+    for service, actions in policies.items():
+        expected = {xform_name(api_name): action
+                    for api_name, action in actions.items()}
+        assert index.get_actions(service) == expected
+
+
+def create_project(tmpdir):
+    tmpdir.mkdir('.chalice')
+    tmpdir.join('app.py').write(
+        'from chalice import Chalice\n'
+        'from chalicelib.db import ddb\n'
+        'app = Chalice(app_name="foo")\n'
+        '@app.route("/")\n'
+        'def index():\n'
+        '    return ddb.get_item()\n'
+    )
+    lib = tmpdir.mkdir('chalicelib')
+    lib.join('__init__.py').write('')
+    lib.join('db.py').write(
+        'import boto3\n'
+        'from chalicelib import queue\n'
+        'ddb = boto3.client("dynamodb")\n'
+    )
+    lib.join('queue.py').write(
+        'import boto3\n'
+        'def send():\n'
+        '    boto3.client("sqs").send_message()\n'
+    )
+    lib.join('unused.py').write(
+        'import boto3\n'
+        'boto3.client("sns").publish()\n'
+    )
+    return tmpdir
+
+
+class TestProjectAnalyzer(object):
+    def test_follows_imports_into_chalicelib(self, tmpdir):
+        project_dir = str(create_project(tmpdir))
+        analyzer = ProjectAnalyzer(OSUtils())
+        assert analyzer.get_client_calls(project_dir) == {
+            'dynamodb': set(['get_item']),
+            'sqs': set(['send_message']),
+        }
+
+    def test_results_are_cached(self, tmpdir):
+        project = create_project(tmpdir)
+        ProjectAnalyzer(OSUtils()).get_client_calls(str(project))
+        cache_file = project.join('.chalice', ProjectAnalyzer.CACHE_FILENAME)
+        cache = json.loads(cache_file.read())
+        assert len(cache['modules']) == 4
+        # Only the changed module is added, and the stale entry for the
+        # old version of the module is removed.
+        project.join('chalicelib', 'queue.py').write(
+            'import boto3\n'
+            'def send():\n'
+            '    boto3.client("sqs").send_message_batch()\n'
+        )
+        analyzer = ProjectAnalyzer(OSUtils())
+        assert analyzer.get_client_calls(str(project))['sqs'] == set(
+            ['send_message_batch'])
+        new_cache = json.loads(cache_file.read())
+        assert len(new_cache['modules']) == 4
+        assert len(set(new_cache['modules']) - set(cache['modules'])) == 1
+
+    def test_no_cache_written_without_chalice_dir(self, tmpdir):
+        project = create_project(tmpdir)
+        project.join('.chalice').remove()
+        ProjectAnalyzer(OSUtils()).get_client_calls(str(project))
+        assert not project.join('.chalice').check()
+
+    def test_constants_are_tracked_across_modules(self, tmpdir):
+        project = create_project(tmpdir)
+        project.join('chalicelib', 'names.py').write(
+            'import os\n'
+            'TABLE = os.environ["TABLE_NAME"]\n'
+        )
+        project.join('app.py').write(
+            'from chalice import Chalice\n'
+            'from chalicelib.db import ddb\n'
+            'from chalicelib.names import TABLE\n'
+            'app = Chalice(app_name="foo")\n'
+            '@app.route("/")\n'
+            'def index():\n'
+            '    return ddb.get_item(TableName=TABLE)\n'
+        )
+        analyzer = ProjectAnalyzer(OSUtils())
+        client_calls, call_arguments = analyzer.analyze_project(str(project))
+        assert call_arguments['dynamodb'] == {
+            'get_item': [{'TableName': ['env', 'TABLE_NAME']}],
+        }
+        # The second run uses the cached analysis.
+        assert analyzer.analyze_project(str(project)) == (
+            client_calls, call_arguments)
+
+    def test_constants_assigned_by_other_modules_are_not_tracked(
+            self, tmpdir):
+        project = create_project(tmpdir)
+        project.join('chalicelib', 'settings.py').write(
+            'import boto3\n'
+            'BUCKET = "b1"\n'
+            'TABLE = "users"\n'
+            'def get():\n'
+            '    boto3.client("s3").get_object(Bucket=BUCKET)\n'
+        )
+        project.join('app.py').write(
+            'from chalice import Chalice\n'
+            'from chalicelib import settings\n'
+            'from chalicelib.db import ddb\n'
+            'from chalicelib.settings import TABLE\n'
+            'app = Chalice(app_name="foo")\n'
+            'settings.BUCKET = "other"\n'
+            '@app.route("/")\n'
+            'def index():\n'
+            '    return ddb.get_item(TableName=TABLE)\n'
+        )
+        analyzer = ProjectAnalyzer(OSUtils())
+        _, call_arguments = analyzer.analyze_project(str(project))
+        assert call_arguments['s3'] == {'get_object': [{}]}
+        assert call_arguments['dynamodb'] == {
+            'get_item': [{'TableName': ['string', 'users']}],
+        }
+        # The cached analysis is the same.
+        assert analyzer.analyze_project(str(project))[1] == call_arguments
+
+    def test_can_analyze_modules_in_parallel(self, tmpdir):
+        project_dir = str(create_project(tmpdir))
+        analyzer = ProjectAnalyzer(
+            OSUtils(), max_workers=2,
+            executor_factory=lambda n: ThreadPoolExecutor(max_workers=n))
+        assert analyzer.get_client_calls(project_dir) == {
+            'dynamodb': set(['get_item']),
+            'sqs': set(['send_message']),
+        }
+
+
+class TestResourceArnResolver(object):
+    def test_can_resolve_constants_and_env_vars(self):
+        resolver = ResourceArnResolver({'TABLE_NAME': 'users'})
+        assert resolver.resolve({
+            'dynamodb': {
+                'get_item': [{'TableName': ['env', 'TABLE_NAME']},
+                             {'TableName': ['string', 'orders']}],
+            },
+            's3': {'get_object': [{'Bucket': ['string', 'mybucket'],
+                                   'Key': ['string', 'foo']}]},
+            'sqs': {'send_message': [{'QueueUrl': [
+                'string',
+                'https://sqs.us-west-2.amazonaws.com/123456789012/myqueue',
+            ]}]},
+        }) == {
+            'dynamodb': {'get_item': [
+                'arn:*:dynamodb:*:*:table/orders',
+                'arn:*:dynamodb:*:*:table/orders/*',
+                'arn:*:dynamodb:*:*:table/users',
+                'arn:*:dynamodb:*:*:table/users/*',
+            ]},
+            's3': {'get_object': ['arn:*:s3:::mybucket',
+                                  'arn:*:s3:::mybucket/*']},
+            'sqs': {'send_message': [
+                'arn:*:sqs:*:123456789012:myqueue']},
+        }
+
+    def test_global_rebound_in_function_is_not_resolved(self, tmpdir):
+        tmpdir.join('app.py').write(
+            'import boto3\n'
+            'from chalice import Chalice\n'
+            'app = Chalice(app_name="foo")\n'
+            'BUCKET = "b1"\n'
+            'def setb():\n'
+            '    global BUCKET\n'
+            '    BUCKET = "other"\n'
+            '@app.route("/")\n'
+            'def index():\n'
+            '    setb()\n'
+            '    boto3.client("s3").get_object(Bucket=BUCKET, Key="k")\n'
+        )
+        _, call_arguments = ProjectAnalyzer(OSUtils()).analyze_project(
+            str(tmpdir))
+        assert ResourceArnResolver({}).resolve(call_arguments) == {}
+
+    def test_unknown_resources_are_not_resolved(self):
+        resolver = ResourceArnResolver({})
+        assert resolver.resolve({
+            'dynamodb': {
+                # An env var that isn't in the config.
+                'get_item': [{'TableName': ['env', 'TABLE_NAME']}],
+                # One call with an unknown table.
+                'put_item': [{'TableName': ['string', 'users']}, {}],
+                'list_tables': [{}],
+            },
+            'sqs': {'send_message': [{'QueueUrl': ['string', 'foo']}]},
+            'sns': {'publish': [{'TopicArn': ['string', 'arn']}]},
+        }) == {}
+
+
+def test_app_policy_generator_can_scope_resources(tmpdir):
+    tmpdir.join('app.py').write(
+        'import os\n'
+        'import boto3\n'
+        'from chalice import Chalice\n'
+        'app = Chalice(app_name="foo")\n'
+        'TABLE = os.environ["TABLE_NAME"]\n'
+        '@app.route("/")\n'
+        'def index():\n'
+        '    boto3.client("dynamodb").get_item(TableName=TABLE, Key={})\n'
+        '    boto3.client("dynamodb").put_item(\n'
+        '        TableName=os.environ["OTHER_TABLE"], Item={})\n'
+    )
+    config = Config(
+        chalice_stage='dev',
+        config_from_disk={
+            'autogen_policy_scoped_resources': True,
+            'environment_variables': {'TABLE_NAME': 'users',
+                                      'OTHER_TABLE': 'orders'},
+            'stages': {'dev': {'lambda_functions': {'worker': {
+                # A function with a different value means the variable
+                # can't be used to scope the shared policy.
+                'environment_variables': {'OTHER_TABLE': 'archive'},
+            }}}},
+        },
+        user_provided_params={'project_dir': str(tmpdir)},
+    )
+    policy = AppPolicyGenerator(OSUtils()).generate_policy(config)
+    # The last statement is for CloudWatch logs.
+    assert_policy_is({'Statement': policy['Statement'][:-1]}, [
+        {
+            'Effect': 'Allow',
+            'Action': ['dynamodb:PutItem'],
+            'Resource': ['*'],
+        },
+        {
+            'Effect': 'Allow',
+            'Action': ['dynamodb:GetItem'],
+            'Resource': ['arn:*:dynamodb:*:*:table/users',
+                         'arn:*:dynamodb:*:*:table/users/*'],
+        },
+    ])
@@ -1,9 +1,12 @@
 import os
 import json
+import base64
+import collections
 
 import pytest
 
 from chalice.test import Client, FunctionNotFoundError
+from chalice.test import LoadProfile, LatencyHistogram
 from chalice import Response, BadRequestError, Chalice, Blueprint, AuthResponse
 
 
@@ -110,6 +113,109 @@ def test_can_access_env_vars_in_rest_api(sample_app, tmpdir):
         assert response.json_body == {'value': 'TOP LEVEL'}
 
 
+def test_env_vars_restored_after_request(sample_app, tmpdir):
+    fake_config = {
+        "version": "2.0",
+        "app_name": "testenv",
+        "stages": {
+            "prod": {
+                "api_gateway_stage": "api",
+                "environment_variables": {
+                    "MY_ENV_VAR": "TOP LEVEL"
+                },
+            }
+        }
+    }
+    tmpdir.mkdir('.chalice').join('config.json').write(
+        json.dumps(fake_config).encode('utf-8'))
+    os.environ['MY_ENV_VAR'] = 'original'
+
+    @sample_app.route('/env')
+    def env_vars():
+        return {'value': os.environ.get('MY_ENV_VAR')}
+
+    try:
+        with Client(sample_app, project_dir=str(tmpdir),
+                    stage_name='prod') as client:
+            for _ in range(2):
+                response = client.http.get('/env')
+                assert response.json_body == {'value': 'TOP LEVEL'}
+                assert os.environ['MY_ENV_VAR'] == 'original'
+    finally:
+        os.environ.pop('MY_ENV_VAR', None)
+
+
+def test_env_var_changes_in_handlers_do_not_persist(sample_app):
+    os.environ['MY_ENV_VAR'] = 'original'
+
+    @sample_app.route('/env')
+    def env_vars():
+        os.environ['NEW_ENV_VAR'] = 'new'
+        del os.environ['MY_ENV_VAR']
+        return {'new': os.environ.get('NEW_ENV_VAR'),
+                'deleted': 'MY_ENV_VAR' in os.environ}
+
+    @sample_app.lambda_function()
+    def handler(event, context):
+        os.environ['MY_ENV_VAR'] = 'changed'
+        return os.getenv('MY_ENV_VAR')
+
+    try:
+        with Client(sample_app) as client:
+            response = client.http.get('/env')
+            assert response.json_body == {'new': 'new', 'deleted': False}
+            assert client.lambda_.invoke('handler').payload == 'changed'
+        assert 'NEW_ENV_VAR' not in os.environ
+        assert os.environ['MY_ENV_VAR'] == 'original'
+    finally:
+        os.environ.pop('MY_ENV_VAR', None)
+        os.environ.pop('NEW_ENV_VAR', None)
+
+
+@pytest.mark.parametrize('fast', [False, True])
+def test_fast_client_matches_default_client(sample_app, fast):
+    @sample_app.route('/users/{name}', methods=['GET', 'POST'])
+    def user(name):
+        request = sample_app.current_request
+        return {
+            'name': name,
+            'method': request.method,
+            'query': request.query_params,
+            'path': request.context['path'],
+            'resource': request.context['resourcePath'],
+            'header': request.headers.get('x-my-header'),
+            'body': request.raw_body.decode('ascii'),
+        }
+
+    with Client(sample_app, fast=fast) as client:
+        response = client.http.post(
+            '/users/james?a=1&a=2', headers={'X-My-Header': 'foo'},
+            body=b'hello')
+        assert response.json_body == {
+            'name': 'james', 'method': 'POST', 'query': {'a': '2'},
+            'path': '/users/james', 'resource': '/users/{name}',
+            'header': 'foo', 'body': 'hello',
+        }
+        response = client.http.get('/users/bob/')
+        assert response.json_body['name'] == 'bob'
+        assert response.json_body['query'] is None
+        assert client.http.get('/missing').status_code == 403
+
+
+def test_fast_client_uses_unique_request_ids(sample_app):
+    request_ids = []
+
+    @sample_app.route('/id')
+    def request_id():
+        request_ids.append(sample_app.lambda_context.aws_request_id)
+        return {}
+
+    with Client(sample_app, fast=True) as client:
+        client.http.get('/id')
+        client.http.get('/id')
+    assert len(set(request_ids)) == 2
+
+
 def test_authorizers_return_http_response_on_error(sample_app):
     @sample_app.authorizer()
     def myauth(event):
@@ -144,6 +250,26 @@ def test_can_test_authorizers(sample_app):
         assert response.json_body == {'success': True}
 
 
+def test_authorizer_results_are_cached(sample_app):
+    calls = []
+
+    @sample_app.authorizer(ttl_seconds=60)
+    def myauth(event):
+        calls.append(event.token)
+        return AuthResponse(['*'], principal_id='id')
+
+    @sample_app.route('/needs-auth', authorizer=myauth)
+    def needs_auth():
+        return {'success': True}
+
+    with Client(sample_app) as client:
+        for _ in range(2):
+            response = client.http.get('/needs-auth',
+                                       headers={'Authorization': 'allow'})
+            assert response.json_body == {'success': True}
+    assert calls == ['allow']
+
+
 # Tests for pure lambda and event handlers.
 
 def test_can_invoke_pure_lambda_function():
@@ -382,3 +508,134 @@ def test_lambda_function_with_custom_name():
     with Client(app) as client:
         response = client.lambda_.invoke('my-custom-name', {'hello': 'world'})
         assert response.payload == {'event': {'hello': 'world'}}
+
+
+def test_can_stream_sqs_events():
+    app = Chalice('load-test')
+    profile = LoadProfile(median_size=100, max_size=1000, seed=1,
+                          start_time=1000)
+    with Client(app) as client:
+        events = list(client.events.stream_sqs_events(
+            25, batch_size=10, profile=profile, queue_name='myqueue'))
+    assert [len(e['Records']) for e in events] == [10, 10, 5]
+    records = [r for e in events for r in e['Records']]
+    assert all(1 <= len(r['body']) <= 1000 for r in records)
+    assert all(r['eventSourceARN'].endswith(':myqueue') for r in records)
+    timestamps = [int(r['attributes']['SentTimestamp']) for r in records]
+    assert timestamps == sorted(timestamps)
+    assert timestamps[0] >= 1000 * 1000
+    assert len(set(r['messageId'] for r in records)) == 25
+
+
+def test_stream_events_are_reproducible_with_seed():
+    app = Chalice('load-test')
+    with Client(app) as client:
+        first = list(client.events.stream_kinesis_events(
+            20, profile=LoadProfile(seed=10, start_time=0)))
+        second = list(client.events.stream_kinesis_events(
+            20, profile=LoadProfile(seed=10, start_time=0)))
+    assert first == second
+
+
+def test_partition_keys_are_skewed():
+    profile = LoadProfile(num_partition_keys=50, key_skew=1.5, seed=0)
+    counts = collections.Counter(
+        r.partition_key for r in profile.records(2000))
+    most_common = counts.most_common(1)[0][0]
+    assert most_common == 'pk-0'
+    uniform = LoadProfile(num_partition_keys=50, key_skew=0, seed=0)
+    uniform_counts = collections.Counter(
+        r.partition_key for r in uniform.records(2000))
+    assert counts['pk-0'] > 3 * uniform_counts['pk-0']
+
+
+def test_can_invoke_handlers_with_streamed_events():
+    app = Chalice('load-test')
+    seen = []
+
+    @app.on_kinesis_record(stream='mystream')
+    def kinesis_handler(event):
+        for record in event:
+            seen.append(record.data)
+
+    @app.on_dynamodb_record(stream_arn='arn:aws:dynamodb:...:stream')
+    def ddb_handler(event):
+        for record in event:
+            seen.append(record.new_image['id']['S'])
+
+    @app.on_s3_event(bucket='mybucket')
+    def s3_handler(event):
+        seen.append(event.key)
+
+    profile = LoadProfile(seed=0)
+    with Client(app) as client:
+        for event in client.events.stream_kinesis_events(
+                3, profile=profile):
+            client.lambda_.invoke('kinesis_handler', event)
+        for event in client.events.stream_dynamodb_events(
+                3, profile=profile):
+            client.lambda_.invoke('ddb_handler', event)
+        for event in client.events.stream_s3_events(
+                3, profile=profile, bucket='mybucket'):
+            client.lambda_.invoke('s3_handler', event)
+    assert len(seen) == 9
+    records = list(profile.records(3))
+    assert seen[:3] == [r.body for r in records]
+    assert seen[3:6] == [r.partition_key for r in records]
+    assert seen[6] == '%s/0' % records[0].partition_key
+
+
+def test_invoke_many_reports_latencies_and_errors():
+    app = Chalice('load-test')
+    calls = []
+
+    @app.on_sqs_message(queue='myqueue', batch_size=10)
+    def handler(event):
+        records = list(event)
+        calls.append(len(records))
+        if len(records) < 10:
+            raise RuntimeError("partial batch")
+
+    with Client(app) as client:
+        events = client.events.stream_sqs_events(
+            95, batch_size=10, profile=LoadProfile(seed=0))
+        result = client.lambda_.invoke_many('handler', events,
+                                            concurrency=4)
+    assert sum(calls) == 95
+    assert result.invocations == 10
+    assert result.errors == 1
+    assert result.elapsed_seconds > 0
+    assert result.throughput > 0
+    assert result.latencies.percentile(50) <= result.latencies.max_ms
+
+
+def test_invoke_many_requires_existing_function():
+    app = Chalice('load-test')
+    with Client(app) as client:
+        with pytest.raises(FunctionNotFoundError):
+            client.lambda_.invoke_many('missing', [{}])
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for latency in range(1, 101):
+        histogram.record(float(latency))
+    assert histogram.count == 100
+    assert histogram.min_ms == 1.0
+    assert histogram.max_ms == 100.0
+    assert histogram.mean_ms == 50.5
+    # Buckets are ~9% wide, so percentiles are approximate.
+    assert 50 <= histogram.percentile(50) <= 50 * 1.1
+    assert 99 <= histogram.percentile(99) <= 100
+    assert histogram.percentile(100) == 100.0
+    assert sum(count for _, count in histogram.buckets()) == 100
+
+
+def test_kinesis_stream_data_is_base64_encoded():
+    app = Chalice('load-test')
+    with Client(app) as client:
+        event = next(client.events.stream_kinesis_events(
+            1, profile=LoadProfile(median_size=10, max_size=10, seed=0,
+                                   size_sigma=0)))
+    data = event['Records'][0]['kinesis']['data']
+    assert len(base64.b64decode(data)) == 10